@@ -8,12 +8,16 @@ Date: January 2026
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Tuple, List, Optional, Union
+from typing import Callable, Dict, Tuple, List, Optional, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import logging
 from abc import ABC, abstractmethod
 import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from functools import lru_cache
 import hashlib
 import json
@@ -212,7 +216,8 @@ class SuperTrendCalculator:
         high: np.ndarray,
         low: np.ndarray,
         close: np.ndarray,
-        factor: float = 3.0
+        factor: float = 3.0,
+        atr: Optional[np.ndarray] = None
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Calculate SuperTrend for a given factor
@@ -220,12 +225,14 @@ class SuperTrendCalculator:
         Args:
             high, low, close: OHLCV arrays
             factor: ATR multiplier (e.g., 2.5, 3.0, etc.)
+            atr: Precomputed calculate_atr(high, low, close), reused across factors
         
         Returns:
             Tuple of (supertrend_values, trend, upper_band, lower_band)
         """
         hl2 = (high + low) / 2
-        atr = self.calculate_atr(high, low, close)
+        if atr is None:
+            atr = self.calculate_atr(high, low, close)
         
         # Basic bands
         upper_band = hl2 + factor * atr
@@ -366,6 +373,141 @@ class AdaptiveSuperTrendOptimizer:
         
         return self.evaluator.evaluate(returns)
     
+    def _objective_attr(self) -> str:
+        """PerformanceMetrics field for config.metric_objective"""
+        return {
+            'sharpe': 'sharpe_ratio',
+            'sortino': 'sortino_ratio',
+            'calmar': 'calmar_ratio',
+            'win_rate': 'win_rate',
+            'profit_factor': 'profit_factor',
+            'recent_score': 'recent_score',
+        }.get(self.config.metric_objective, self.config.metric_objective)
+    
+    def _factor_return_matrix(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray
+    ) -> np.ndarray:
+        """
+        Strategy returns of every factor over the full history
+        
+        ATR is computed once and SuperTrend once per factor. Row f holds what
+        _calculate_returns_from_signals gives for factor_range[f].
+        
+        Returns:
+            Array of shape (len(factor_range), len(close))
+        """
+        atr = self.calculator.calculate_atr(high, low, close)
+        pct_change = np.zeros(len(close))
+        pct_change[1:] = np.diff(close) / close[:-1]
+        # Leading NaN closes have nothing to carry forward; they earn nothing
+        pct_change[~np.isfinite(pct_change)] = 0.0
+        
+        returns = np.zeros((len(self.factor_range), len(close)))
+        for f, factor in enumerate(self.factor_range):
+            _, trend, _, _ = self.calculator.calculate_supertrend(
+                high, low, close, factor=factor, atr=atr
+            )
+            direction = np.where(trend[:-1] == 1, 1.0, np.where(trend[:-1] == 0, -1.0, 0.0))
+            returns[f, 1:] = direction * pct_change[1:]
+        return returns
+    
+    def _rolling_window_metrics(
+        self,
+        returns: np.ndarray,
+        starts: np.ndarray,
+        length: int,
+        decay_factor: float = 0.95
+    ) -> Dict[str, np.ndarray]:
+        """
+        PerformanceMetrics fields for the windows [start, start + length) of every row
+        
+        Each window's first return is treated as zero, as when the window is
+        evaluated on its own. Moment and count metrics come from prefix sums;
+        drawdown, total return and recent score (path-dependent) from a strided
+        view of the windows.
+        
+        Returns:
+            {field: array of shape (rows, windows)}
+        """
+        bars_per_year = self.evaluator.bars_per_year
+        rf_per_bar = self.evaluator.risk_free_rate / bars_per_year
+        n = float(length)
+        
+        def window_sum(values: np.ndarray) -> np.ndarray:
+            # Sum over (start, start + length), skipping the zeroed first bar
+            csum = np.zeros((values.shape[0], values.shape[1] + 1))
+            np.cumsum(values, axis=1, out=csum[:, 1:])
+            return csum[:, starts + length] - csum[:, starts + 1]
+        
+        def variance(total: np.ndarray, total_sq: np.ndarray, count) -> np.ndarray:
+            # Population variance; clears the cancellation error of prefix-sum differences
+            mean_sq = total_sq / count
+            var = mean_sq - (total / count) ** 2
+            return np.where(var > 1e-12 * mean_sq, var, 0.0)
+        
+        wins = returns > 0
+        losses_mask = returns < 0
+        total = window_sum(returns)
+        total_sq = window_sum(returns ** 2)
+        n_wins = window_sum(wins.astype(float))
+        n_losses = window_sum(losses_mask.astype(float))
+        n_trades = window_sum((returns != 0).astype(float))
+        gross_profit = window_sum(np.where(wins, returns, 0.0))
+        gross_loss = -window_sum(np.where(losses_mask, returns, 0.0))
+        loss_sq = window_sum(np.where(losses_mask, returns ** 2, 0.0))
+        
+        mean = total / n
+        excess = mean - rf_per_bar
+        annualize = np.sqrt(bars_per_year)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(variance(total, total_sq, n))
+            sharpe = np.where(std > 0, excess / std * annualize, 0.0)
+            
+            downside_std = np.where(
+                n_losses > 1,
+                np.sqrt(variance(-gross_loss, loss_sq, n_losses)),
+                0.0
+            )
+            sortino = np.where(
+                n_losses == 0,
+                excess * annualize * 100,
+                np.where(downside_std > 0, excess / downside_std * annualize, 0.0)
+            )
+            profit_factor = np.where(
+                gross_loss > 0,
+                gross_profit / gross_loss,
+                np.where(gross_profit > 0, 1.0, 0.0)
+            )
+        
+        windows = np.lib.stride_tricks.sliding_window_view(returns, length, axis=1)[:, starts]
+        growth = 1 + windows
+        growth[:, :, 0] = 1.0
+        wealth = np.cumprod(growth, axis=2)
+        peak = np.maximum.accumulate(wealth, axis=2)
+        max_drawdown = ((wealth - peak) / peak).min(axis=2)
+        
+        weights = decay_factor ** np.arange(length - 1, -1, -1, dtype=float)
+        weights /= weights.sum()
+        recent_score = windows[:, :, 1:] @ weights[1:]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calmar = np.where(max_drawdown < 0, mean * bars_per_year / np.abs(max_drawdown), 0.0)
+        
+        return {
+            'sharpe_ratio': sharpe,
+            'sortino_ratio': sortino,
+            'calmar_ratio': calmar,
+            'max_drawdown': max_drawdown,
+            'win_rate': n_wins / n,
+            'profit_factor': profit_factor,
+            'total_return': wealth[:, :, -1] - 1,
+            'num_trades': np.rint(n_trades).astype(int),
+            'recent_score': recent_score,
+        }
+    
     def optimize_factor_rolling(
         self,
         high: np.ndarray,
@@ -373,11 +515,19 @@ class AdaptiveSuperTrendOptimizer:
         close: np.ndarray,
         test_period: Optional[int] = None,
         train_period: Optional[int] = None,
-        step: Optional[int] = None
+        step: Optional[int] = None,
+        engine: str = 'prefix'
     ) -> Tuple[np.ndarray, np.ndarray, Dict[str, List]]:
         """
         Walk-forward optimization: find best factor for each period
         
+        Args:
+            engine: 'prefix' computes each factor's SuperTrend and returns once
+                over the full history and scores every training window from
+                prefix sums (O(factors x bars)); 'window' recomputes ATR and
+                SuperTrend from scratch inside each window, so indicator
+                warm-up restarts at every window start
+        
         Returns:
             Tuple of:
             - timestamps (indices)
@@ -388,6 +538,60 @@ class AdaptiveSuperTrendOptimizer:
         train_period = train_period or self.config.train_period
         step = step or (test_period // 4)  # Slide by 1/4 test period
         
+        if engine == 'window':
+            return self._optimize_factor_rolling_windows(
+                high, low, close, test_period, train_period, step
+            )
+        if engine != 'prefix':
+            raise ValueError(f"Unknown engine: {engine}")
+        
+        # A NaN bar would poison the ATR and every prefix sum after it, not just
+        # the windows containing it: carry the last price forward instead
+        high, low, close = (
+            pd.Series(np.asarray(a, dtype=float)).ffill().to_numpy()
+            for a in (high, low, close)
+        )
+        starts = np.arange(train_period, len(close) - test_period, step)
+        if len(starts) == 0:
+            return self._optimize_factor_rolling_windows(
+                high, low, close, test_period, train_period, step
+            )
+        
+        returns = self._factor_return_matrix(high, low, close)
+        metrics = self._rolling_window_metrics(returns, starts - train_period, train_period)
+        
+        # First factor wins ties, as with max() over factor_range
+        best = np.argmax(metrics[self._objective_attr()], axis=0)
+        optimal_factors = self.factor_range[best]
+        
+        order = np.argsort(self.factor_range, kind='stable')
+        columns = {
+            'sharpe': 'sharpe_ratio',
+            'sortino': 'sortino_ratio',
+            'calmar': 'calmar_ratio',
+            'win_rate': 'win_rate',
+            'profit_factor': 'profit_factor',
+            'max_dd': 'max_drawdown',
+        }
+        factor_history = {
+            'timestamp': np.repeat(starts, len(order)).tolist(),
+            'factor': np.tile(self.factor_range[order], len(starts)).tolist(),
+        }
+        for column, field in columns.items():
+            factor_history[column] = metrics[field][order].T.ravel().tolist()
+        
+        return starts, optimal_factors, factor_history
+    
+    def _optimize_factor_rolling_windows(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        test_period: int,
+        train_period: int,
+        step: int
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, List]]:
+        """optimize_factor_rolling with every window evaluated independently"""
         optimal_factors = []
         optimal_factors_timestamps = []
         factor_history = {
@@ -416,15 +620,7 @@ class AdaptiveSuperTrendOptimizer:
                 factor_scores[factor] = metrics
             
             # Select best factor based on objective metric
-            objective = self.config.metric_objective
-            metric_attr = {
-                'sharpe': 'sharpe_ratio',
-                'sortino': 'sortino_ratio',
-                'calmar': 'calmar_ratio',
-                'win_rate': 'win_rate',
-                'profit_factor': 'profit_factor',
-                'recent_score': 'recent_score',
-            }.get(objective, objective)
+            metric_attr = self._objective_attr()
             best_factor = max(
                 factor_scores.items(),
                 key=lambda x: getattr(x[1], metric_attr)
@@ -481,14 +677,7 @@ class AdaptiveSuperTrendOptimizer:
             logger.warning("Not enough trades for evaluation, using default factor 3.0")
             return 3.0, self.evaluate_factor(high_recent, low_recent, close_recent, 3.0)
         
-        metric_attr = {
-            'sharpe': 'sharpe_ratio',
-            'sortino': 'sortino_ratio',
-            'calmar': 'calmar_ratio',
-            'win_rate': 'win_rate',
-            'profit_factor': 'profit_factor',
-            'recent_score': 'recent_score',
-        }.get(self.config.metric_objective, self.config.metric_objective)
+        metric_attr = self._objective_attr()
         best_factor = max(
             factor_scores.items(),
             key=lambda x: getattr(x[1], metric_attr)
@@ -526,6 +715,25 @@ class AdaptiveSuperTrend:
         """Create hash of data for cache validation"""
         return hashlib.md5(data.tobytes()).hexdigest()
     
+    def factor_cache_key(self, symbol: str, timeframe: str, close: np.ndarray) -> str:
+        """Cache key for the optimal factor of a series (hashes the last 100 bars)"""
+        return self._get_cache_key(symbol, timeframe, self._hash_data(close[-100:]))
+    
+    def _fresh_cache_value(self, entry: Dict) -> Optional[Dict]:
+        """Decoded cache value of a row, or None once its TTL has passed"""
+        created_at = datetime.fromisoformat(entry['created_at'])
+        if datetime.utcnow() - created_at < timedelta(hours=self.config.cache_ttl_hours):
+            return json.loads(entry['cache_value'])
+        return None
+    
+    def _cache_row(self, key: str, value: Dict) -> Dict:
+        return {
+            'cache_key': key,
+            'cache_value': json.dumps(value),
+            'created_at': datetime.utcnow().isoformat(),
+            'ttl_hours': self.config.cache_ttl_hours
+        }
+    
     async def cache_get(self, key: str) -> Optional[Dict]:
         """Retrieve cached factor from Supabase"""
         if not self.supabase or not self.config.cache_enabled:
@@ -537,17 +745,37 @@ class AdaptiveSuperTrend:
             ).eq('cache_key', key).limit(1).execute()
             
             if result.data:
-                entry = result.data[0]
-                # Check TTL
-                created_at = datetime.fromisoformat(entry['created_at'])
-                if datetime.utcnow() - created_at < timedelta(hours=self.config.cache_ttl_hours):
-                    return json.loads(entry['cache_value'])
+                return self._fresh_cache_value(result.data[0])
             
             return None
         except Exception as e:
             logger.warning(f"Cache retrieval failed: {e}")
             return None
     
+    async def cache_get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Retrieve cached factors for many keys in one Supabase query
+        
+        Returns:
+            {cache_key: value} for the keys with a fresh entry
+        """
+        if not keys or not self.supabase or not self.config.cache_enabled:
+            return {}
+        
+        try:
+            result = self.supabase.table('adaptive_supertrend_cache').select(
+                '*'
+            ).in_('cache_key', list(keys)).execute()
+            
+            found = {}
+            for entry in result.data or []:
+                value = self._fresh_cache_value(entry)
+                if value is not None:
+                    found[entry['cache_key']] = value
+            return found
+        except Exception as e:
+            logger.warning(f"Batch cache retrieval failed: {e}")
+            return {}
+    
     async def cache_set(self, key: str, value: Dict) -> bool:
         """Store factor calculation in Supabase"""
         if not self.supabase or not self.config.cache_enabled:
@@ -555,18 +783,27 @@ class AdaptiveSuperTrend:
         
         try:
             self.supabase.table('adaptive_supertrend_cache').upsert(
-                {
-                    'cache_key': key,
-                    'cache_value': json.dumps(value),
-                    'created_at': datetime.utcnow().isoformat(),
-                    'ttl_hours': self.config.cache_ttl_hours
-                }
+                self._cache_row(key, value)
             ).execute()
             return True
         except Exception as e:
             logger.warning(f"Cache storage failed: {e}")
             return False
     
+    async def cache_set_many(self, values: Dict[str, Dict]) -> bool:
+        """Store many factor calculations in one Supabase upsert"""
+        if not values or not self.supabase or not self.config.cache_enabled:
+            return False
+        
+        try:
+            self.supabase.table('adaptive_supertrend_cache').upsert(
+                [self._cache_row(key, value) for key, value in values.items()]
+            ).execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Batch cache storage failed: {e}")
+            return False
+    
     async def get_optimal_factor(
         self,
         symbol: str,
@@ -589,8 +826,7 @@ class AdaptiveSuperTrend:
             Tuple of (optimal_factor, metrics)
         """
         # Check cache first
-        data_hash = self._hash_data(close[-100:])  # Hash last 100 bars
-        cache_key = self._get_cache_key(symbol, timeframe, data_hash)
+        cache_key = self.factor_cache_key(symbol, timeframe, close)
         
         if use_cache:
             cached = await self.cache_get(cache_key)
@@ -725,16 +961,69 @@ class AdaptiveSuperTrend:
 # BATCH OPTIMIZATION FOR MULTIPLE SYMBOLS
 # ============================================================================
 
+def _optimize_factor_worker(
+    config: Dict,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray
+) -> Tuple[float, Dict]:
+    """Process-pool entry point: optimal factor and metrics for one series"""
+    optimizer = AdaptiveSuperTrendOptimizer(SuperTrendConfig(**config))
+    factor, metrics = optimizer.get_optimal_factor_for_period(
+        high, low, close, lookback=optimizer.config.lookback_window
+    )
+    return float(factor), asdict(metrics)
+
+
+def _terminate_executor(executor: ProcessPoolExecutor):
+    """Shut a process pool down without waiting, terminating its worker processes
+    
+    Future.cancel() cannot stop a job that is already running, so hung workers
+    are terminated (then killed if they ignore SIGTERM) instead of being left
+    to hold a pool slot and block interpreter exit.
+    """
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
 class BatchOptimizer:
-    """Optimize factors for multiple symbols in parallel"""
+    """Optimize factors for multiple symbols in parallel
     
-    def __init__(self, adaptive_st: AdaptiveSuperTrend, max_workers: int = 4):
+    Cache lookups and writes go to Supabase in one batch per portfolio run;
+    factor optimization for cache misses runs in a process pool with at most
+    max_workers symbols in flight, so a portfolio run scales with cores and
+    never blocks the event loop.
+    """
+    
+    def __init__(
+        self,
+        adaptive_st: AdaptiveSuperTrend,
+        max_workers: int = 4,
+        timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            adaptive_st: AdaptiveSuperTrend supplying config, cache and signals
+            max_workers: Worker processes (and symbols optimized concurrently)
+            timeout: Seconds allowed per symbol optimization (None = no limit)
+        """
         self.adaptive_st = adaptive_st
-        self.max_workers = max_workers
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
     
     async def optimize_portfolio(
         self,
-        symbols_data: Dict[str, Dict[str, np.ndarray]]
+        symbols_data: Dict[str, Dict[str, np.ndarray]],
+        use_cache: bool = True,
+        progress_callback: Optional[Callable[[str, str, int, int], None]] = None
     ) -> Dict[str, SuperTrendSignal]:
         """
         Optimize and generate signals for multiple symbols
@@ -745,31 +1034,130 @@ class BatchOptimizer:
                 'TSLA': {...},
                 ...
             }
+            use_cache: Whether to use cached factors
+            progress_callback: Called as (symbol, status, done, total) after each
+                symbol; status is 'cached', 'optimized', 'timeout' or 'error'
         
         Returns:
             {
                 'AAPL': SuperTrendSignal(...),
-                'TSLA': SuperTrendSignal(...),
+                'TSLA': None,  # optimization failed or timed out
                 ...
             }
         """
-        tasks = []
-        for symbol, data in symbols_data.items():
-            task = self.adaptive_st.generate_signal_with_optimization(
-                symbol=symbol,
-                timeframe=data.get('timeframe', '1h'),
-                high=data['high'],
-                low=data['low'],
-                close=data['close']
-            )
-            tasks.append((symbol, task))
+        adaptive_st = self.adaptive_st
+        total = len(symbols_data)
+        done = 0
+        
+        def report(symbol: str, status: str, elapsed: float = 0.0):
+            nonlocal done
+            done += 1
+            logger.info(f"[{done}/{total}] {symbol}: {status} ({elapsed:.1f}s)")
+            if progress_callback:
+                try:
+                    progress_callback(symbol, status, done, total)
+                except Exception as e:
+                    logger.warning(f"Progress callback failed for {symbol}: {e}")
+        
+        keys = {
+            symbol: adaptive_st.factor_cache_key(symbol, data.get('timeframe', '1h'), data['close'])
+            for symbol, data in symbols_data.items()
+        }
+        cached = await adaptive_st.cache_get_many(list(keys.values())) if use_cache else {}
+        
+        factors: Dict[str, Tuple[float, PerformanceMetrics]] = {}
+        for symbol, key in keys.items():
+            if key in cached:
+                entry = cached[key]
+                factors[symbol] = (entry['factor'], PerformanceMetrics(**entry['metrics']))
+                report(symbol, 'cached')
+        
+        misses = [symbol for symbol in symbols_data if symbol not in factors]
+        new_entries: Dict[str, Dict] = {}
+        if misses:
+            loop = asyncio.get_running_loop()
+            config = adaptive_st.config.model_dump()
+            pool_size = min(self.max_workers, len(misses))
+            semaphore = asyncio.Semaphore(pool_size)
+            
+            def new_executor() -> ProcessPoolExecutor:
+                return ProcessPoolExecutor(
+                    max_workers=pool_size,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            
+            executor = new_executor()
+            
+            def restart(stale: ProcessPoolExecutor):
+                # A running job cannot be cancelled: kill the pool's processes and
+                # start a fresh pool (once per pool, whoever notices first)
+                nonlocal executor
+                if stale is executor:
+                    _terminate_executor(stale)
+                    executor = new_executor()
+            
+            async def optimize(symbol: str):
+                data = symbols_data[symbol]
+                arrays = [np.asarray(data[col], dtype=float) for col in ('high', 'low', 'close')]
+                async with semaphore:
+                    while True:
+                        pool = executor
+                        started = time.monotonic()
+                        try:
+                            factor, metrics = await asyncio.wait_for(
+                                loop.run_in_executor(
+                                    pool, _optimize_factor_worker, config, *arrays
+                                ),
+                                timeout=self.timeout
+                            )
+                            break
+                        except asyncio.TimeoutError:
+                            logger.error(f"Optimizing {symbol} timed out after {self.timeout}s")
+                            restart(pool)
+                            report(symbol, 'timeout', time.monotonic() - started)
+                            return
+                        except BrokenProcessPool as e:
+                            if pool is not executor:
+                                # Pool torn down for another symbol's timeout: run again
+                                continue
+                            restart(pool)
+                            logger.error(f"Error optimizing {symbol}: {e}")
+                            report(symbol, 'error', time.monotonic() - started)
+                            return
+                        except Exception as e:
+                            logger.error(f"Error optimizing {symbol}: {e}")
+                            report(symbol, 'error', time.monotonic() - started)
+                            return
+                
+                factors[symbol] = (factor, PerformanceMetrics(**metrics))
+                new_entries[keys[symbol]] = {'factor': factor, 'metrics': metrics}
+                report(symbol, 'optimized', time.monotonic() - started)
+            
+            try:
+                await asyncio.gather(*(optimize(symbol) for symbol in misses))
+            finally:
+                _terminate_executor(executor)
+            
+            await adaptive_st.cache_set_many(new_entries)
         
         results = {}
-        for symbol, task in tasks:
+        for symbol, data in symbols_data.items():
+            if symbol not in factors:
+                results[symbol] = None
+                continue
+            factor, metrics = factors[symbol]
             try:
-                results[symbol] = await task
+                results[symbol] = adaptive_st.generate_signal(
+                    symbol,
+                    data.get('timeframe', '1h'),
+                    data['high'],
+                    data['low'],
+                    data['close'],
+                    factor,
+                    metrics
+                )
             except Exception as e:
-                logger.error(f"Error optimizing {symbol}: {e}")
+                logger.error(f"Error generating signal for {symbol}: {e}")
                 results[symbol] = None
         
         return results
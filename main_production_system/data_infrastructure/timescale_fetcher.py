@@ -2,17 +2,26 @@
 TimescaleDB Fetcher with Market Hours Enforcement
 
 Fetches OHLCV data from TimescaleDB with strict market hours filtering.
+
+Connections come from a thread-safe pool shared by the dashboard (see
+get_fetcher()). Any number of symbols is fetched in a single round trip:
+one query returns the last N candles of every symbol together with their
+technical indicators, and rows are read off the cursor straight into
+NumPy column arrays.
 """
 
 import pandas as pd
 import numpy as np
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Tuple, Optional, List, Dict
+from typing import Tuple, Optional, List, Dict, Sequence
 import logging
 import os
+import threading
 
 try:
     import psycopg2
+    import psycopg2.pool
     from psycopg2.extras import execute_values
     PSYCOPG2_AVAILABLE = True
 except ImportError:
@@ -23,6 +32,26 @@ from .market_calendar import get_market_calendar
 
 logger = logging.getLogger(__name__)
 
+# Timeframe -> (OHLCV table, interval)
+TIMEFRAME_TABLES = {
+    '1h': ('ohlcv_1h', '1 hour'),
+    '4h': ('ohlcv_4h', '4 hours'),
+    '1d': ('ohlcv_1d', '1 day')
+}
+
+OHLCV_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+FEATURE_COLUMNS = [
+    'rsi',
+    'macd',
+    'macd_signal',
+    'bollinger_upper',
+    'bollinger_lower',
+    'atr',
+    'sma_20',
+    'sma_50',
+    'sma_200'
+]
+
 
 class TimescaleDBFetcher:
     """
@@ -32,7 +61,8 @@ class TimescaleDBFetcher:
     - Fast OHLCV data fetching (<100ms)
     - Market hours filtering (trading days only)
     - Technical indicator support
-    - Batch fetching for multiple symbols
+    - Batch fetching for multiple symbols in one query
+    - Thread-safe connection pool
     """
     
     def __init__(
@@ -41,7 +71,9 @@ class TimescaleDBFetcher:
         port: Optional[int] = None,
         database: Optional[str] = None,
         user: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        min_connections: int = 1,
+        max_connections: Optional[int] = None
     ):
         """
         Initialize TimescaleDB fetcher.
@@ -52,212 +84,282 @@ class TimescaleDBFetcher:
             database: Database name (default: from env or 'timescale')
             user: Database user (default: from env)
             password: Database password (default: from env)
+            min_connections: Connections kept open by the pool
+            max_connections: Pool size (default: from env or 5)
         """
         self.host = host or os.getenv('TIMESCALEDB_HOST', 'localhost')
         self.port = port or int(os.getenv('TIMESCALEDB_PORT', '5432'))
         self.database = database or os.getenv('TIMESCALEDB_DATABASE', 'timescale')
         self.user = user or os.getenv('TIMESCALEDB_USER', 'postgres')
         self.password = password or os.getenv('TIMESCALEDB_PASSWORD', '')
+        self.min_connections = min_connections
+        self.max_connections = max(
+            min_connections,
+            max_connections or int(os.getenv('TIMESCALEDB_POOL_SIZE', '5'))
+        )
         
-        self.connection = None
-        self._connected = False
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # getconn() raises PoolError instead of waiting once every connection
+        # is checked out, so callers queue here for a free slot
+        self._checkout_slots = threading.BoundedSemaphore(self.max_connections)
         
         logger.info(f"TimescaleDBFetcher initialized for {self.host}:{self.port}/{self.database}")
     
     def connect(self) -> bool:
-        """Establish database connection"""
+        """Open the connection pool (no-op when already open)"""
         if not PSYCOPG2_AVAILABLE:
             logger.error("psycopg2 not available - install with: pip install psycopg2-binary")
             return False
         
-        try:
-            self.connection = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                connect_timeout=5
-            )
-            self._connected = True
-            logger.info("✅ Connected to TimescaleDB")
-            return True
-        except Exception as e:
-            logger.error(f"❌ Failed to connect to TimescaleDB: {e}")
-            self._connected = False
-            return False
+        with self._pool_lock:
+            if self._pool is not None and not self._pool.closed:
+                return True
+            
+            try:
+                pool = psycopg2.pool.ThreadedConnectionPool(
+                    self.min_connections,
+                    self.max_connections,
+                    host=self.host,
+                    port=self.port,
+                    database=self.database,
+                    user=self.user,
+                    password=self.password,
+                    connect_timeout=5
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed to connect to TimescaleDB: {e}")
+                return False
+            
+            self._pool = pool
+        
+        logger.info(f"✅ Connected to TimescaleDB (pool size {self.max_connections})")
+        return True
     
     def disconnect(self):
-        """Close database connection"""
-        if self.connection:
-            self.connection.close()
-            self._connected = False
-            logger.info("Disconnected from TimescaleDB")
+        """Close every pooled connection"""
+        with self._pool_lock:
+            if self._pool is not None and not self._pool.closed:
+                self._pool.closeall()
+                logger.info("Disconnected from TimescaleDB")
+            self._pool = None
     
     def is_connected(self) -> bool:
-        """Check if database is connected"""
-        if not self._connected or not self.connection:
-            return False
+        """Check if the connection pool is open
         
-        try:
-            # Quick check
-            with self.connection.cursor() as cur:
-                cur.execute("SELECT 1")
-            return True
-        except Exception:
-            self._connected = False
-            return False
+        Does not hit the database; dropped connections are detected and
+        replaced when a query checks them out.
+        """
+        return self._pool is not None and not self._pool.closed
     
-    def get_ohlcv_extended(
+    @contextmanager
+    def _checkout(self):
+        """Borrow a pooled connection in autocommit mode (reads only)
+        
+        Blocks while all max_connections connections are in use.
+        """
+        with self._checkout_slots:
+            pool = self._pool
+            conn = pool.getconn()
+            broken = False
+            try:
+                if conn.autocommit is False:
+                    conn.autocommit = True
+                yield conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            finally:
+                pool.putconn(conn, close=broken or bool(conn.closed))
+    
+    def _query(self, query: str, params: tuple) -> Tuple[List[str], List[tuple]]:
+        """Run a query; retries once on a dropped connection
+        
+        Returns:
+            (column names, rows)
+        """
+        for attempt in range(2):
+            try:
+                with self._checkout() as conn, conn.cursor() as cur:
+                    cur.execute(query, params)
+                    return [d[0] for d in cur.description], cur.fetchall()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                if attempt:
+                    raise
+                logger.warning(f"TimescaleDB connection dropped ({e}), retrying")
+    
+    def _batch_query(self, table_name: str, timeframe: str, include_features: bool) -> str:
+        """Last-N-candles query for an array of symbols, optionally joined with features"""
+        ohlcv_select = ', '.join(f'o.{c}' for c in OHLCV_COLUMNS)
+        feature_select = ''
+        feature_join = ''
+        if include_features:
+            feature_select = ', ' + ', '.join(f'f.{c}' for c in FEATURE_COLUMNS)
+            feature_join = (
+                f"LEFT JOIN features_{timeframe} f "
+                f"ON f.symbol = s.symbol AND f.time = o.time"
+            )
+        
+        # LATERAL ... LIMIT gives each symbol its own LIMIT served from the
+        # (symbol, time) index, instead of ranking every row with a window function
+        return f"""
+            SELECT s.symbol, {ohlcv_select}{feature_select}
+            FROM unnest(%s::text[]) AS s(symbol)
+            CROSS JOIN LATERAL (
+                SELECT time, open, high, low, close, volume
+                FROM {table_name}
+                WHERE symbol = s.symbol
+                ORDER BY time DESC
+                LIMIT %s
+            ) o
+            {feature_join}
+            ORDER BY s.symbol, o.time ASC
+        """
+    
+    @staticmethod
+    def _column_arrays(columns: List[str], rows: List[tuple]) -> Dict[str, np.ndarray]:
+        """Transpose cursor rows into one NumPy array per column"""
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        arrays = {}
+        for name, column in zip(columns, values):
+            if name == 'symbol':
+                arrays[name] = np.array(column, dtype=object)
+            elif name == 'time':
+                # utc=True: rows may carry different UTC offsets (e.g. across DST)
+                arrays[name] = pd.to_datetime(list(column), utc=True)
+            else:
+                # NULL -> NaN
+                arrays[name] = np.array(column, dtype=float)
+        return arrays
+    
+    def fetch_ohlcv_batch(
         self,
-        symbol: str,
+        symbols: Sequence[str],
         timeframe: str = '1d',
         candle_count: int = 1000,
         include_features: bool = True
-    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    ) -> Dict[str, Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
         """
-        Fetch OHLCV data with optional technical indicators.
+        Fetch OHLCV data (and indicators) for many symbols in one round trip.
         
         Args:
-            symbol: Stock ticker
+            symbols: Stock tickers
             timeframe: '1h', '4h', or '1d'
-            candle_count: Number of candles to fetch
+            candle_count: Number of candles to fetch per symbol
             include_features: Include technical indicators
         
         Returns:
-            (df_ohlcv, df_features) tuple
+            {symbol: (df_ohlcv, df_features)} for every requested symbol;
+            df_features is None when indicators were not requested or could
+            not be fetched. Symbols without data get an empty df_ohlcv.
         """
+        requested = {symbol.upper(): symbol for symbol in symbols}
+        empty = {symbol: (pd.DataFrame(columns=OHLCV_COLUMNS), None) for symbol in symbols}
+        if not requested:
+            return {}
         
         if not self.is_connected():
             if not self.connect():
                 logger.error("Cannot fetch - not connected to TimescaleDB")
-                return pd.DataFrame(), None
+                return empty
         
-        # Map timeframe to table/interval
-        timeframe_map = {
-            '1h': ('ohlcv_1h', '1 hour'),
-            '4h': ('ohlcv_4h', '4 hours'),
-            '1d': ('ohlcv_1d', '1 day')
-        }
-        
-        if timeframe not in timeframe_map:
+        if timeframe not in TIMEFRAME_TABLES:
             logger.error(f"Unsupported timeframe: {timeframe}")
-            return pd.DataFrame(), None
+            return empty
         
-        table_name, interval_str = timeframe_map[timeframe]
+        table_name, interval_str = TIMEFRAME_TABLES[timeframe]
+        params = (list(requested), candle_count)
         
         try:
-            # Base OHLCV query
-            query = f"""
-                SELECT 
-                    time,
-                    open,
-                    high,
-                    low,
-                    close,
-                    volume
-                FROM {table_name}
-                WHERE symbol = %s
-                ORDER BY time DESC
-                LIMIT %s
-            """
-            
-            df_ohlcv = pd.read_sql_query(
-                query,
-                self.connection,
-                params=(symbol.upper(), candle_count),
-                parse_dates=['time']
-            )
-            
-            # Reverse to chronological order (oldest first)
-            if len(df_ohlcv) > 0:
-                df_ohlcv = df_ohlcv.sort_values('time').reset_index(drop=True)
+            try:
+                columns, rows = self._query(
+                    self._batch_query(table_name, timeframe, include_features), params
+                )
+            except psycopg2.Error as e:
+                if not include_features or isinstance(
+                    e,
+                    (psycopg2.OperationalError, psycopg2.InterfaceError, psycopg2.pool.PoolError)
+                ):
+                    raise
+                logger.warning(f"Features fetch failed: {e}")
+                include_features = False
+                columns, rows = self._query(
+                    self._batch_query(table_name, timeframe, include_features), params
+                )
+            arrays = self._column_arrays(columns, rows)
+        except psycopg2.pool.PoolError as e:
+            logger.error(f"❌ No pooled connection for {len(requested)} symbols: {e}")
+            return empty
+        except Exception as e:
+            logger.error(f"❌ Fetch failed for {len(requested)} symbols: {e}")
+            return empty
+        
+        results = dict(empty)
+        
+        # Rows are ordered by symbol: split at each change of symbol
+        symbol_col = arrays['symbol']
+        bounds = np.flatnonzero(symbol_col[1:] != symbol_col[:-1]) + 1
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(symbol_col)]):
+            if start == stop:
+                continue
+            symbol = requested.get(symbol_col[start], symbol_col[start])
+            df_ohlcv = pd.DataFrame({c: arrays[c][start:stop] for c in OHLCV_COLUMNS})
             
-            # Features query (if requested)
             df_features = None
-            if include_features and len(df_ohlcv) > 0:
-                try:
-                    features_query = f"""
-                        SELECT 
-                            time,
-                            rsi,
-                            macd,
-                            macd_signal,
-                            bollinger_upper,
-                            bollinger_lower,
-                            atr,
-                            sma_20,
-                            sma_50,
-                            sma_200
-                        FROM features_{timeframe}
-                        WHERE symbol = %s
-                        AND time >= %s
-                        AND time <= %s
-                        ORDER BY time ASC
-                    """
-                    
-                    if len(df_ohlcv) > 0:
-                        start_time = df_ohlcv['time'].min()
-                        end_time = df_ohlcv['time'].max()
-                        
-                        df_features = pd.read_sql_query(
-                            features_query,
-                            self.connection,
-                            params=(symbol.upper(), start_time, end_time),
-                            parse_dates=['time']
-                        )
-                except Exception as e:
-                    logger.warning(f"Features fetch failed: {e}")
-                    df_features = None
+            if include_features:
+                df_features = pd.DataFrame(
+                    {c: arrays[c][start:stop] for c in ['time'] + FEATURE_COLUMNS}
+                )
+                # Candles without an indicator row
+                df_features = df_features.dropna(
+                    subset=FEATURE_COLUMNS, how='all'
+                ).reset_index(drop=True)
             
-            logger.info(f"✅ Fetched {len(df_ohlcv)} candles for {symbol} ({timeframe})")
-            return df_ohlcv, df_features
+            results[symbol] = (df_ohlcv, df_features)
         
-        except Exception as e:
-            logger.error(f"❌ Fetch failed for {symbol}: {e}")
-            return pd.DataFrame(), None
+        logger.info(
+            f"✅ Fetched {len(rows)} candles for {len(requested)} symbols ({timeframe}) "
+            f"in one query"
+        )
+        return results
     
-    def get_ohlcv_extended_market_hours_only(
+    def get_ohlcv_extended(
         self,
         symbol: str,
         timeframe: str = '1d',
         candle_count: int = 1000,
-        include_features: bool = True,
-        session_type: str = 'regular'
+        include_features: bool = True
     ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
         """
-        Fetch OHLCV with STRICT market hours filtering.
-        
-        Only includes:
-        - Trading days (M-F)
-        - Market hours (9:30 AM - 4:00 PM ET for regular)
-        - Skips weekends, holidays, pre/post-market
-        
-        Performance: Same as base method (<100ms) due to database-level filtering
+        Fetch OHLCV data with optional technical indicators.
         
         Args:
             symbol: Stock ticker
             timeframe: '1h', '4h', or '1d'
-            candle_count: Number of candles
+            candle_count: Number of candles to fetch
             include_features: Include technical indicators
-            session_type: 'regular' (9:30-4:00), 'extended', or 'full'
         
         Returns:
-            (df_ohlcv, df_features) - ONLY market hours data
+            (df_ohlcv, df_features) tuple
         """
-        
-        # Fetch base data
-        df_ohlcv, df_features = self.get_ohlcv_extended(
-            symbol=symbol,
+        return self.fetch_ohlcv_batch(
+            [symbol],
             timeframe=timeframe,
             candle_count=candle_count,
             include_features=include_features
-        )
-        
+        )[symbol]
+    
+    def _filter_market_hours(
+        self,
+        symbol: str,
+        df_ohlcv: pd.DataFrame,
+        df_features: Optional[pd.DataFrame],
+        session_type: str
+    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """Restrict OHLCV (and matching features) to market hours"""
         if len(df_ohlcv) == 0:
             return df_ohlcv, df_features
         
-        # Apply market hours filter
         calendar = get_market_calendar()
         
         try:
@@ -287,24 +389,67 @@ class TimescaleDBFetcher:
             logger.error(f"Market hours filtering failed: {e}")
             return df_ohlcv, df_features
     
+    def get_ohlcv_extended_market_hours_only(
+        self,
+        symbol: str,
+        timeframe: str = '1d',
+        candle_count: int = 1000,
+        include_features: bool = True,
+        session_type: str = 'regular'
+    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """
+        Fetch OHLCV with STRICT market hours filtering.
+        
+        Only includes:
+        - Trading days (M-F)
+        - Market hours (9:30 AM - 4:00 PM ET for regular)
+        - Skips weekends, holidays, pre/post-market
+        
+        Performance: Same as base method (<100ms) due to database-level filtering
+        
+        Args:
+            symbol: Stock ticker
+            timeframe: '1h', '4h', or '1d'
+            candle_count: Number of candles
+            include_features: Include technical indicators
+            session_type: 'regular' (9:30-4:00), 'extended', or 'full'
+        
+        Returns:
+            (df_ohlcv, df_features) - ONLY market hours data
+        """
+        
+        # Fetch base data
+        df_ohlcv, df_features = self.get_ohlcv_extended(
+            symbol=symbol,
+            timeframe=timeframe,
+            candle_count=candle_count,
+            include_features=include_features
+        )
+        
+        return self._filter_market_hours(symbol, df_ohlcv, df_features, session_type)
+    
     def batch_fetch_market_hours(
         self,
         symbols: List[str],
         timeframe: str = '1d',
         candle_count: int = 500,
-        session_type: str = 'regular'
+        session_type: str = 'regular',
+        include_features: bool = True
     ) -> Dict[str, Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
-        """Batch fetch multiple symbols with market hours filtering"""
+        """Batch fetch multiple symbols (one query) with market hours filtering"""
+        fetched = self.fetch_ohlcv_batch(
+            symbols,
+            timeframe=timeframe,
+            candle_count=candle_count,
+            include_features=include_features
+        )
+        
         results = {}
-        for symbol in symbols:
+        for symbol, (df_ohlcv, df_features) in fetched.items():
             try:
-                df_ohlcv, df_features = self.get_ohlcv_extended_market_hours_only(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    candle_count=candle_count,
-                    session_type=session_type
+                results[symbol] = self._filter_market_hours(
+                    symbol, df_ohlcv, df_features, session_type
                 )
-                results[symbol] = (df_ohlcv, df_features)
             except Exception as e:
                 logger.warning(f"⚠️ Skipped {symbol}: {e}")
         
@@ -313,12 +458,16 @@ class TimescaleDBFetcher:
 
 # Global fetcher instance
 _fetcher_instance = None
+_fetcher_lock = threading.Lock()
 
 
 def get_fetcher() -> TimescaleDBFetcher:
-    """Get or create global TimescaleDB fetcher instance"""
+    """Get or create the process-wide TimescaleDB fetcher (thread-safe)"""
     global _fetcher_instance
     if _fetcher_instance is None:
-        _fetcher_instance = TimescaleDBFetcher()
-        _fetcher_instance.connect()
+        with _fetcher_lock:
+            if _fetcher_instance is None:
+                fetcher = TimescaleDBFetcher()
+                fetcher.connect()
+                _fetcher_instance = fetcher
     return _fetcher_instance
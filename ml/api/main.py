@@ -43,6 +43,7 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     logger.info("Starting FastAPI server...")
     yield
+    await options.close_options_clients()
     logger.info("Shutting down FastAPI server...")
 
 
@@ -265,7 +265,7 @@ async def get_chart_data(
         logger.info(f"Chart data requested: {symbol}/{horizon} (days_back={days_back})")
         
         # Fetch OHLC bars
-        bars = fetch_ohlc_bars(symbol.upper(), horizon, days_back)
+        bars = await asyncio.to_thread(fetch_ohlc_bars, symbol.upper(), horizon, days_back)
         
         if not bars:
             raise HTTPException(
@@ -274,7 +274,9 @@ async def get_chart_data(
             )
         
         # Fetch forecast overlays
-        forecasts = fetch_forecast_overlays(symbol.upper(), horizon, days_back)
+        forecasts = await asyncio.to_thread(
+            fetch_forecast_overlays, symbol.upper(), horizon, days_back
+        )
         
         # Latest price
         latest_price = bars[-1].close if bars else 0.0
@@ -305,10 +307,19 @@ async def get_chart_data(
 
 
 class ConnectionManager:
-    """Manage WebSocket connections for real-time forecast updates."""
+    """Manage WebSocket connections for real-time forecast updates.
+
+    Subscribers of the same symbol/horizon share one background poller: it
+    starts with the first subscriber, stops with the last, fetches forecasts
+    in a worker thread and broadcasts only forecasts not yet sent.
+    """
     
-    def __init__(self):
+    def __init__(self, poll_interval: float = 60.0, send_timeout: float = 10.0):
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.poll_interval = poll_interval
+        self.send_timeout = send_timeout
+        self.pollers: Dict[str, asyncio.Task] = {}
+        self.last_forecast_time: Dict[str, int] = {}
     
     async def connect(self, websocket: WebSocket, key: str):
         """Accept new WebSocket connection."""
@@ -318,29 +329,79 @@ class ConnectionManager:
         self.active_connections[key].append(websocket)
         logger.info(f"WebSocket connected: {key} (total: {len(self.active_connections[key])})")
     
+    async def subscribe(self, websocket: WebSocket, symbol: str, horizon: str) -> str:
+        """Connect a live-forecast client and make sure its key has a poller."""
+        key = f'{symbol}_{horizon}'
+        await self.connect(websocket, key)
+        poller = self.pollers.get(key)
+        if poller is None or poller.done():
+            self.pollers[key] = asyncio.create_task(self._poll(key, symbol, horizon))
+            logger.info(f"Started forecast poller: {key}")
+        return key
+    
     def disconnect(self, websocket: WebSocket, key: str):
-        """Remove WebSocket connection."""
+        """Remove WebSocket connection; stop the key's poller with its last subscriber."""
         if key in self.active_connections:
             try:
                 self.active_connections[key].remove(websocket)
                 logger.info(f"WebSocket disconnected: {key} (remaining: {len(self.active_connections[key])})")
             except ValueError:
                 pass
+            if not self.active_connections[key]:
+                del self.active_connections[key]
+                self.last_forecast_time.pop(key, None)
+                poller = self.pollers.pop(key, None)
+                if poller is not None:
+                    poller.cancel()
+                    logger.info(f"Stopped forecast poller: {key}")
+    
+    async def _poll(self, key: str, symbol: str, horizon: str):
+        """Shared polling loop for one symbol/horizon."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                # Supabase client is synchronous: keep it off the event loop
+                forecasts = await asyncio.to_thread(fetch_forecast_overlays, symbol, horizon, 1)
+                if not forecasts:
+                    continue
+                
+                latest = forecasts[-1]
+                # Only broadcast forecasts this key has not sent yet
+                if latest.time <= self.last_forecast_time.get(key, 0):
+                    continue
+                
+                now = int(datetime.now().timestamp())
+                # Only broadcast if less than 5 minutes old
+                if now - latest.time < 300:
+                    update = WebSocketUpdate(
+                        type='new_forecast',
+                        symbol=symbol,
+                        horizon=horizon,
+                        data=latest,
+                        timestamp=now
+                    )
+                    await self.broadcast(key, update.dict())
+                    self.last_forecast_time[key] = latest.time
+                    logger.info(f"Broadcast new forecast: {key} @ ${latest.price:.2f}")
+            
+            except Exception as e:
+                logger.error(f"Error in forecast poller for {key}: {e}")
     
     async def broadcast(self, key: str, message: dict):
         """Broadcast message to all connections for a symbol/horizon."""
-        if key in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[key]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f'Error broadcasting to {key}: {e}')
-                    disconnected.append(connection)
-            
-            # Clean up disconnected websockets
-            for conn in disconnected:
-                self.disconnect(conn, key)
+        connections = list(self.active_connections.get(key, []))
+        if not connections:
+            return
+        
+        async def send(connection: WebSocket):
+            await asyncio.wait_for(connection.send_json(message), self.send_timeout)
+        
+        # Send concurrently so one slow client does not hold up the rest
+        results = await asyncio.gather(*(send(c) for c in connections), return_exceptions=True)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f'Error broadcasting to {key}: {result!r}')
+                self.disconnect(connection, key)
     
     def get_connection_count(self, key: str) -> int:
         """Get number of active connections for a key."""
@@ -353,8 +414,7 @@ manager = ConnectionManager()
 @router.websocket('/ws/live-forecasts/{symbol}/{horizon}')
 async def websocket_live_forecasts(websocket: WebSocket, symbol: str, horizon: str):
     """WebSocket endpoint for real-time forecast updates."""
-    key = f'{symbol.upper()}_{horizon}'
-    await manager.connect(websocket, key)
+    key = await manager.subscribe(websocket, symbol.upper(), horizon)
     
     # Send confirmation message
     try:
@@ -369,42 +429,9 @@ async def websocket_live_forecasts(websocket: WebSocket, symbol: str, horizon: s
         logger.error(f"Error sending confirmation: {e}")
     
     try:
-        # Keep connection alive and check for updates
-        last_forecast_time = 0
-        
+        # Updates come from the shared poller; wait here to notice the disconnect
         while True:
-            # Poll for new forecasts every 60 seconds
-            await asyncio.sleep(60)
-            
-            try:
-                # Fetch latest forecast
-                forecasts = fetch_forecast_overlays(symbol.upper(), horizon, days_back=1)
-                
-                if forecasts:
-                    latest = forecasts[-1]
-                    
-                    # Check if this is a new forecast (not seen before)
-                    if latest.time > last_forecast_time:
-                        age_seconds = int(datetime.now().timestamp()) - latest.time
-                        
-                        # Only broadcast if less than 5 minutes old
-                        if age_seconds < 300:
-                            update = WebSocketUpdate(
-                                type='new_forecast',
-                                symbol=symbol.upper(),
-                                horizon=horizon,
-                                data=latest,
-                                timestamp=int(datetime.now().timestamp())
-                            )
-                            
-                            await manager.broadcast(key, update.dict())
-                            last_forecast_time = latest.time
-                            
-                            logger.info(f"Broadcast new forecast: {symbol}/{horizon} @ ${latest.price:.2f}")
-            
-            except Exception as e:
-                logger.error(f"Error in WebSocket polling loop: {e}")
-                continue
+            await websocket.receive_text()
     
     except WebSocketDisconnect:
         manager.disconnect(websocket, key)
@@ -426,7 +453,9 @@ async def trigger_forecast_update(symbol: str, horizon: str):
     
     try:
         # Fetch latest forecast
-        forecasts = fetch_forecast_overlays(symbol.upper(), horizon, days_back=7)
+        forecasts = await asyncio.to_thread(
+            fetch_forecast_overlays, symbol.upper(), horizon, days_back=7
+        )
         
         if not forecasts:
             raise HTTPException(status_code=404, detail='No recent forecasts found')
@@ -485,5 +514,6 @@ async def health_check():
         },
         'active_connections': total_connections,
         'connection_keys': list(manager.active_connections.keys()),
+        'active_pollers': len(manager.pollers),
         'timestamp': datetime.now().isoformat()
     }
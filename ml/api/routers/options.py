@@ -6,8 +6,18 @@ client can use FastAPI (Docker) for live options data when available.
 
 Optional short-TTL Redis cache for options chain and quotes to reduce Alpaca/Tradier
 calls when the same symbol/contracts are requested repeatedly (e.g. polling).
+
+Provider I/O never blocks the event loop: Alpaca goes through one pooled
+httpx.AsyncClient, while the synchronous Tradier client and Redis calls run
+in worker threads, with per-expiration chain fetches issued concurrently.
+Concurrent identical requests are coalesced into a single upstream call.
+
+Chains are serialized column-wise (vectorized OCC parsing, expiry conversion
+and NaN sanitizing) straight to JSON bytes; ``format=columnar`` returns calls
+and puts as ``{field: [values]}`` for clients that can consume it.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
@@ -18,9 +28,16 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding
+    orjson = None
+
 # Add ml root for imports
 ml_dir = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ml_dir))
@@ -31,6 +48,55 @@ router = APIRouter()
 ALPACA_OPTIONS_BASE = "https://data.alpaca.markets/v1beta1/options"
 _tradier_client = None
 _redis_client = None
+_alpaca_http: httpx.AsyncClient | None = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except Exception:
+        return default
+
+
+def _get_alpaca_http() -> httpx.AsyncClient:
+    """Shared Alpaca client: keeps TLS connections alive across requests."""
+    global _alpaca_http
+    if _alpaca_http is None or _alpaca_http.is_closed:
+        max_connections = _env_int("OPTIONS_HTTP_MAX_CONNECTIONS", 20)
+        _alpaca_http = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+    return _alpaca_http
+
+
+async def close_options_clients() -> None:
+    """Close pooled provider connections (called on app shutdown)."""
+    global _alpaca_http
+    if _alpaca_http is not None:
+        await _alpaca_http.aclose()
+        _alpaca_http = None
+
+
+class _SingleFlight:
+    """Coalesce concurrent calls with the same key into one in-flight task."""
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def run(self, key: str, factory):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        # Shield: one caller disconnecting must not cancel the others' fetch
+        return await asyncio.shield(task)
+
+
+_single_flight = _SingleFlight()
 
 
 def _options_cache_ttl_seconds() -> int:
@@ -56,7 +122,13 @@ def _get_redis():
         import redis
         host = os.getenv("REDIS_HOST", "localhost")
         port = int(os.getenv("REDIS_PORT", "6379"))
-        _redis_client = redis.Redis(host=host, port=port, decode_responses=True)
+        _redis_client = redis.Redis(
+            host=host,
+            port=port,
+            decode_responses=True,
+            socket_timeout=1.0,
+            socket_connect_timeout=1.0,
+        )
         _redis_client.ping()
         return _redis_client
     except Exception as e:
@@ -64,8 +136,35 @@ def _get_redis():
         return None
 
 
-def _options_chain_cache_key(underlying: str, expiration: int | None) -> str:
-    return f"options_chain:v1:{underlying}:{expiration if expiration else 'all'}"
+CHAIN_FORMATS = ("rows", "columnar")
+# Field order of one contract in the options-chain response (Edge shape)
+CONTRACT_FIELDS = (
+    "symbol",
+    "underlying",
+    "strike",
+    "expiration",
+    "type",
+    "bid",
+    "ask",
+    "last",
+    "mark",
+    "volume",
+    "openInterest",
+    "delta",
+    "gamma",
+    "theta",
+    "vega",
+    "rho",
+    "impliedVolatility",
+    "lastTradeTime",
+    "changePercent",
+    "change",
+)
+
+
+def _options_chain_cache_key(underlying: str, expiration: int | None, fmt: str = "rows") -> str:
+    key = f"options_chain:v1:{underlying}:{expiration if expiration else 'all'}"
+    return key if fmt == "rows" else f"{key}:{fmt}"
 
 
 def _options_quotes_cache_key(symbol: str, contracts: list[str]) -> str:
@@ -73,31 +172,41 @@ def _options_quotes_cache_key(symbol: str, contracts: list[str]) -> str:
     return f"options_quotes:v2:{symbol}:{h}"  # v2: includes missing_contracts + stubs
 
 
-def _get_options_chain_cached(underlying: str, expiration: int | None):
+def _get_options_chain_cached(underlying: str, expiration: int | None, fmt: str = "rows"):
+    """Cached chain as serialized JSON (served as-is), or None."""
     r = _get_redis()
     if not r:
         return None
     try:
-        key = _options_chain_cache_key(underlying, expiration)
+        key = _options_chain_cache_key(underlying, expiration, fmt)
         raw = r.get(key)
         if raw:
-            return json.loads(raw)
+            return raw
     except Exception as e:
         logger.debug("Options chain cache get error: %s", e)
     return None
 
 
-def _set_options_chain_cached(underlying: str, expiration: int | None, data: dict) -> None:
+def _set_options_chain_cached(
+    underlying: str, expiration: int | None, payload: bytes, fmt: str = "rows"
+) -> None:
     r = _get_redis()
     if not r:
         return
     try:
-        key = _options_chain_cache_key(underlying, expiration)
-        r.setex(key, _options_cache_ttl_seconds(), json.dumps(data, default=str))
+        key = _options_chain_cache_key(underlying, expiration, fmt)
+        r.setex(key, _options_cache_ttl_seconds(), payload)
     except Exception as e:
         logger.debug("Options chain cache set error: %s", e)
 
 
+def _dump_json(data) -> bytes:
+    """Serialize a response payload of plain Python values to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
 def _get_options_quotes_cached(symbol: str, contracts: list[str]):
     r = _get_redis()
     if not r:
@@ -134,6 +243,173 @@ def _json_safe_float(v):
         return None
 
 
+def _column(df: pd.DataFrame, name: str, default=None) -> pd.Series:
+    """``df[name]``, or a column of ``default`` when absent (like ``row.get``)."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _truthy(values: pd.Series) -> np.ndarray:
+    """Python truthiness per value (NaN is truthy, as in ``float("nan") or x``)."""
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return (values != 0).to_numpy() | values.isna().to_numpy()
+    return values.map(bool).to_numpy(dtype=bool)
+
+
+def _or_column(df: pd.DataFrame, *names: str) -> pd.Series:
+    """Column-wise ``row.get(a) or row.get(b) or ...``."""
+    result = pd.Series([None] * len(df), index=df.index, dtype=object)
+    for i, name in enumerate(reversed(names)):
+        if name not in df.columns:
+            continue
+        values = df[name].astype(object)
+        result = values if i == 0 else values.where(_truthy(df[name]), result)
+    return result
+
+
+def _float_array(values: pd.Series) -> np.ndarray:
+    """Floats with NaN wherever ``_json_safe_float`` would give None."""
+    numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    numbers[~np.isfinite(numbers)] = np.nan
+    return numbers
+
+
+def _json_floats(numbers: np.ndarray) -> np.ndarray:
+    """Object array of Python floats, None for NaN."""
+    out = numbers.astype(object)
+    out[np.isnan(numbers)] = None
+    return out
+
+
+def _int_values(values: pd.Series, invalid=0) -> np.ndarray:
+    """Column-wise ``int(v or 0)``, with ``invalid`` where int() would raise (NaN, junk)."""
+    numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    finite = np.isfinite(numbers)
+    if values.dtype == object:
+        # int("5.5") raises, int(5.5) truncates
+        text = values.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+        integral = values.astype(str).str.fullmatch(r"\s*[+-]?\d+\s*").to_numpy(dtype=bool)
+        finite &= ~text | integral
+    out = np.trunc(np.where(finite, numbers, 0)).astype(np.int64).astype(object)
+    out[~finite] = invalid
+    # None / 0 / "" take the `or 0` branch
+    out[~_truthy(values)] = 0
+    return out
+
+
+def _mark_values(bid: np.ndarray, ask: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """Mid when both sides are quoted, else last."""
+    with np.errstate(invalid="ignore", over="ignore"):
+        mid = (bid + ask) / 2
+    mid[~np.isfinite(mid)] = np.nan
+    return np.where(np.isnan(mid), last, mid)
+
+
+def _parse_occ_symbols(symbols: pd.Series) -> pd.DataFrame:
+    """Vectorized ``_parse_occ_symbol``: underlying, expiration, type, strike and a valid flag."""
+    occ = symbols.fillna("").astype(str).str.strip()
+    digits = occ.str[6:12].str.fullmatch(r"\d{6}") & occ.str[13:21].str.fullmatch(r"\d{8}")
+    valid = (occ.str.len() >= 21) & digits.fillna(False).astype(bool)
+    yy = pd.to_numeric(occ.str[6:8].where(valid), errors="coerce")
+    year = np.where(yy < 80, 2000 + yy, 1900 + yy)
+    dates = pd.to_datetime(
+        pd.Series(year, index=occ.index).astype("Int64").astype(str)
+        + "-"
+        + occ.str[8:10]
+        + "-"
+        + occ.str[10:12],
+        format="%Y-%m-%d",
+        errors="coerce",
+        utc=True,
+    )
+    valid &= dates.notna()
+    expiration = (dates.astype("int64") // 10**9).where(valid, 0)
+    return pd.DataFrame(
+        {
+            "underlying": occ.str[:6].str.rstrip(),
+            "expiration": expiration.astype(np.int64),
+            "type": np.where(occ.str[12:13].str.upper() == "C", "call", "put"),
+            "strike": pd.to_numeric(occ.str[13:21].where(valid), errors="coerce") / 1000.0,
+            "valid": valid,
+        },
+        index=occ.index,
+    )
+
+
+def _contract_columns(
+    df: pd.DataFrame,
+    underlying: str,
+    strike: np.ndarray,
+    expiration: np.ndarray,
+    option_type: np.ndarray,
+    bid: pd.Series,
+    ask: pd.Series,
+    last: pd.Series,
+    volume: np.ndarray,
+    open_interest: np.ndarray,
+    greeks: dict,
+    implied_vol: pd.Series,
+    last_trade_time: np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    """Assemble CONTRACT_FIELDS columns (object arrays of JSON-ready values)."""
+    n = len(df)
+    bid_f, ask_f, last_f = _float_array(bid), _float_array(ask), _float_array(last)
+    none = np.full(n, None, dtype=object)
+    columns = {
+        "symbol": df["symbol"].to_numpy(dtype=object),
+        "underlying": np.full(n, underlying, dtype=object),
+        "strike": strike.astype(object),
+        "expiration": expiration.astype(object),
+        "type": option_type.astype(object),
+        "bid": _json_floats(bid_f),
+        "ask": _json_floats(ask_f),
+        "last": _json_floats(last_f),
+        "mark": _json_floats(_mark_values(bid_f, ask_f, last_f)),
+        "volume": volume,
+        "openInterest": open_interest,
+    }
+    for name in ("delta", "gamma", "theta", "vega", "rho"):
+        columns[name] = _json_floats(_float_array(greeks[name]))
+    columns["impliedVolatility"] = _json_floats(_float_array(implied_vol))
+    columns["lastTradeTime"] = none if last_trade_time is None else last_trade_time
+    columns["changePercent"] = none
+    columns["change"] = none
+    return columns
+
+
+def _split_chain(
+    columns: dict[str, np.ndarray], order: np.ndarray | None = None
+) -> tuple[dict, dict]:
+    """Split contract columns into calls / puts column lists (optionally reordered)."""
+    if order is not None:
+        columns = {name: values[order] for name, values in columns.items()}
+    is_call = columns["type"] == "call"
+    calls = {name: values[is_call].tolist() for name, values in columns.items()}
+    puts = {name: values[~is_call].tolist() for name, values in columns.items()}
+    return calls, puts
+
+
+def _rows_from_columns(columns: dict[str, list]) -> list[dict]:
+    return [dict(zip(CONTRACT_FIELDS, values)) for values in zip(*columns.values())]
+
+
+def _chain_payload(
+    underlying: str, expirations: list[int], calls: dict, puts: dict, fmt: str
+) -> bytes:
+    """Serialize a chain (calls/puts as column dicts) in the requested format."""
+    result = {
+        "underlying": underlying,
+        "timestamp": int(datetime.now(timezone.utc).timestamp()),
+        "expirations": expirations,
+    }
+    if fmt == "columnar":
+        result.update(format="columnar", calls=calls, puts=puts)
+    else:
+        result.update(calls=_rows_from_columns(calls), puts=_rows_from_columns(puts))
+    return _dump_json(result)
+
+
 def _alpaca_configured() -> bool:
     """True if Alpaca API keys are set."""
     try:
@@ -162,8 +438,8 @@ def _parse_occ_symbol(symbol: str) -> dict | None:
         return None
 
 
-def _fetch_alpaca_options_chain(underlying: str, expiration_ts: int | None) -> dict | None:
-    """Fetch options chain from Alpaca; return Edge-shaped dict or None on failure."""
+def _alpaca_headers() -> dict | None:
+    """Alpaca auth headers, or None when credentials are not configured."""
     try:
         from config.settings import settings
         key = getattr(settings, "alpaca_api_key", None)
@@ -172,92 +448,71 @@ def _fetch_alpaca_options_chain(underlying: str, expiration_ts: int | None) -> d
             return None
     except Exception:
         return None
+    return {
+        "APCA-API-KEY-ID": key,
+        "APCA-API-SECRET-KEY": secret,
+        "Accept": "application/json",
+    }
+
+
+async def _fetch_alpaca_options_chain(
+    underlying: str, expiration_ts: int | None
+) -> tuple[list[int], dict, dict] | None:
+    """Fetch options chain from Alpaca; return (expirations, calls, puts) or None on failure."""
+    headers = _alpaca_headers()
+    if headers is None:
+        return None
     url = f"{ALPACA_OPTIONS_BASE}/snapshots/{underlying}?feed=indicative"
     if expiration_ts:
         exp_date = datetime.utcfromtimestamp(expiration_ts).strftime("%Y-%m-%d")
         url += f"&expiration_date={exp_date}"
     try:
-        with httpx.Client(timeout=30.0) as client:
-            r = client.get(
-                url,
-                headers={
-                    "APCA-API-KEY-ID": key,
-                    "APCA-API-SECRET-KEY": secret,
-                    "Accept": "application/json",
-                },
-            )
-            if r.status_code != 200:
-                logger.warning("Alpaca options snapshot status %s: %s", r.status_code, r.text[:200])
-                return None
-            data = r.json()
+        r = await _get_alpaca_http().get(url, headers=headers)
+        if r.status_code != 200:
+            logger.warning("Alpaca options snapshot status %s: %s", r.status_code, r.text[:200])
+            return None
+        data = r.json()
     except Exception as e:
         logger.warning("Alpaca options fetch failed: %s", e)
         return None
+    return _parse_alpaca_options_chain(underlying, data)
+
+
+def _parse_alpaca_options_chain(underlying: str, data: dict) -> tuple[list[int], dict, dict]:
+    """Convert an Alpaca snapshots payload to (expirations, calls, puts) column dicts."""
     snapshots = data.get("snapshots") or {}
-    calls = []
-    puts = []
-    expirations_set = set()
-    for opt_sym, snap in snapshots.items():
-        parsed = _parse_occ_symbol(opt_sym)
-        if not parsed or parsed.get("underlying", "").rstrip() != underlying:
-            continue
-        quote = (snap.get("latestQuote") or {})
-        trade = (snap.get("latestTrade") or {})
-        greeks = (snap.get("greeks") or {})
-        bid = quote.get("bp")
-        ask = quote.get("ap")
-        last = trade.get("p")
-        bid = _json_safe_float(bid)
-        ask = _json_safe_float(ask)
-        last = _json_safe_float(last)
-        mark = (bid + ask) / 2 if (bid is not None and ask is not None) else last
-        mark = _json_safe_float(mark) if mark is not None else None
-        vol = (snap.get("dailyBar") or {}).get("v") or 0
-        oi = snap.get("openInterest") or 0
-        try:
-            vol = int(vol)
-            oi = int(oi)
-        except (TypeError, ValueError):
-            vol = 0
-            oi = 0
-        last_ts = trade.get("t")
-        last_trade_time = int(datetime.fromisoformat(last_ts.replace("Z", "+00:00")).timestamp()) if last_ts else None
-        expirations_set.add(parsed["expiration"])
-        c = {
-            "symbol": opt_sym,
-            "underlying": underlying,
-            "strike": _json_safe_float(parsed["strike"]) or parsed["strike"],
-            "expiration": parsed["expiration"],
-            "type": parsed["type"],
-            "bid": bid,
-            "ask": ask,
-            "last": last,
-            "mark": mark,
-            "volume": vol,
-            "openInterest": oi,
-            "delta": _json_safe_float(greeks.get("delta")),
-            "gamma": _json_safe_float(greeks.get("gamma")),
-            "theta": _json_safe_float(greeks.get("theta")),
-            "vega": _json_safe_float(greeks.get("vega")),
-            "rho": _json_safe_float(greeks.get("rho")),
-            "impliedVolatility": _json_safe_float(snap.get("impliedVolatility")),
-            "lastTradeTime": last_trade_time,
-            "changePercent": None,
-            "change": None,
-        }
-        if parsed["type"] == "call":
-            calls.append(c)
-        else:
-            puts.append(c)
-    calls.sort(key=lambda x: x["strike"])
-    puts.sort(key=lambda x: x["strike"])
-    return {
-        "underlying": underlying,
-        "timestamp": int(datetime.now(timezone.utc).timestamp()),
-        "expirations": sorted(expirations_set),
-        "calls": calls,
-        "puts": puts,
-    }
+    df = pd.DataFrame({"symbol": pd.Series(list(snapshots), dtype=object)})
+    occ = _parse_occ_symbols(df["symbol"])
+    keep = (occ["valid"] & (occ["underlying"] == underlying)).to_numpy()
+    snaps = [snap for snap, k in zip(snapshots.values(), keep) if k]
+    df, occ = df[keep].reset_index(drop=True), occ[keep].reset_index(drop=True)
+
+    def field(section: str, key: str) -> pd.Series:
+        return pd.Series([(s.get(section) or {}).get(key) for s in snaps], dtype=object)
+
+    last_ts = pd.to_datetime(field("latestTrade", "t"), utc=True, errors="coerce", format="ISO8601")
+    last_trade_time = np.full(len(df), None, dtype=object)
+    has_trade = last_ts.notna().to_numpy()
+    last_trade_time[has_trade] = (
+        last_ts[has_trade].astype("int64").to_numpy() // 10**9
+    ).tolist()
+    columns = _contract_columns(
+        df,
+        underlying,
+        strike=occ["strike"].to_numpy(),
+        expiration=occ["expiration"].to_numpy(),
+        option_type=occ["type"].to_numpy(),
+        bid=field("latestQuote", "bp"),
+        ask=field("latestQuote", "ap"),
+        last=field("latestTrade", "p"),
+        volume=_int_values(field("dailyBar", "v")),
+        open_interest=_int_values(pd.Series([s.get("openInterest") for s in snaps], dtype=object)),
+        greeks={name: field("greeks", name) for name in ("delta", "gamma", "theta", "vega", "rho")},
+        implied_vol=pd.Series([s.get("impliedVolatility") for s in snaps], dtype=object),
+        last_trade_time=last_trade_time,
+    )
+    calls, puts = _split_chain(columns, order=np.argsort(occ["strike"].to_numpy(), kind="stable"))
+    return sorted(set(occ["expiration"].tolist())), calls, puts
 
 
 def _occ_to_expiration_date(occ: str) -> str | None:
@@ -277,43 +532,35 @@ def _occ_to_expiration_date(occ: str) -> str | None:
     return None
 
 
-def _fetch_alpaca_options_quotes(symbol: str, contracts: list[str]) -> dict | None:
+async def _fetch_alpaca_options_quotes(symbol: str, contracts: list[str]) -> dict | None:
     """Fetch quotes for given option symbols from Alpaca; return Edge-shaped quotes response or None."""
-    try:
-        from config.settings import settings
-        key = getattr(settings, "alpaca_api_key", None)
-        secret = getattr(settings, "alpaca_api_secret", None)
-        if not key or not secret or not contracts:
-            return None
-    except Exception:
+    headers = _alpaca_headers()
+    if headers is None or not contracts:
         return None
     symbols_param = ",".join(contracts[:120])
     url = f"{ALPACA_OPTIONS_BASE}/quotes/latest?symbols={symbols_param}&feed=indicative"
     try:
-        with httpx.Client(timeout=30.0) as client:
-            r = client.get(
-                url,
-                headers={
-                    "APCA-API-KEY-ID": key,
-                    "APCA-API-SECRET-KEY": secret,
-                    "Accept": "application/json",
+        r = await _get_alpaca_http().get(url, headers=headers)
+        if r.status_code != 200:
+            logger.warning(
+                "options_quotes alpaca non-200",
+                extra={
+                    "provider": "alpaca",
+                    "endpoint": "quotes/latest",
+                    "status_code": r.status_code,
+                    "requested_count": len(contracts),
                 },
             )
-            if r.status_code != 200:
-                logger.warning(
-                    "options_quotes alpaca non-200",
-                    extra={
-                        "provider": "alpaca",
-                        "endpoint": "quotes/latest",
-                        "status_code": r.status_code,
-                        "requested_count": len(contracts),
-                    },
-                )
-                return None
-            data = r.json()
+            return None
+        data = r.json()
     except Exception as e:
         logger.warning("options_quotes alpaca request failed: %s", e)
         return None
+    return _parse_alpaca_options_quotes(symbol, contracts, data)
+
+
+def _parse_alpaca_options_quotes(symbol: str, contracts: list[str], data: dict) -> dict:
+    """Convert an Alpaca latest-quotes payload to the Edge options-quotes shape."""
     quotes_dict = data.get("quotes") or {}
     if not isinstance(quotes_dict, dict):
         quotes_dict = {}
@@ -411,44 +658,69 @@ def _parse_expiration_to_unix(exp_date: str) -> int:
         return 0
 
 
-def _row_to_quote_dict(row, sym: str, now_iso: str) -> dict:
-    """Convert Tradier chain row to Edge-style quote dict."""
-    bid = _json_safe_float(row.get("bid"))
-    ask = _json_safe_float(row.get("ask"))
-    last = _json_safe_float(row.get("last"))
-    mark = None
-    if bid is not None and ask is not None:
-        mark = _json_safe_float((bid + ask) / 2)
-    if mark is None and last is not None:
-        mark = last
-    try:
-        oi = int(row.get("open_interest") or 0)
-    except (TypeError, ValueError):
-        oi = None
-    iv = _json_safe_float(row.get("greek_mid_iv") or row.get("iv"))
-    try:
-        vol = int(row.get("volume") or 0)
-    except (TypeError, ValueError):
-        vol = None
-    return {
-        "contract_symbol": sym,
-        "bid": bid,
-        "ask": ask,
-        "mark": mark,
-        "last": last,
-        "volume": vol,
-        "open_interest": oi,
-        "implied_vol": iv,
-        "delta": _json_safe_float(row.get("greek_delta") or row.get("delta")),
-        "gamma": _json_safe_float(row.get("greek_gamma") or row.get("gamma")),
-        "theta": _json_safe_float(row.get("greek_theta") or row.get("theta")),
-        "vega": _json_safe_float(row.get("greek_vega") or row.get("vega")),
-        "rho": _json_safe_float(row.get("greek_rho") or row.get("rho")),
-        "updated_at": now_iso,
+def _chain_df_to_quotes(chain_df: pd.DataFrame, contract_set: set[str], now_iso: str) -> list[dict]:
+    """Edge-style quote dicts for the chain rows whose symbol is in ``contract_set``."""
+    symbols = _column(chain_df, "symbol", "").astype(str).str.upper()
+    selected = symbols.isin(contract_set).to_numpy()
+    df, symbols = chain_df[selected], symbols[selected]
+    if df.empty:
+        return []
+    bid = _float_array(_column(df, "bid"))
+    ask = _float_array(_column(df, "ask"))
+    last = _float_array(_column(df, "last"))
+    columns = {
+        "contract_symbol": symbols.to_numpy(dtype=object),
+        "bid": _json_floats(bid),
+        "ask": _json_floats(ask),
+        "mark": _json_floats(_mark_values(bid, ask, last)),
+        "last": _json_floats(last),
+        "volume": _int_values(_column(df, "volume"), invalid=None),
+        "open_interest": _int_values(_column(df, "open_interest"), invalid=None),
+        "implied_vol": _json_floats(_float_array(_or_column(df, "greek_mid_iv", "iv"))),
     }
+    for name in ("delta", "gamma", "theta", "vega", "rho"):
+        columns[name] = _json_floats(_float_array(_or_column(df, f"greek_{name}", name)))
+    columns["updated_at"] = np.full(len(df), now_iso, dtype=object)
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*(c.tolist() for c in columns.values()))]
+
+
+async def _fetch_tradier_chains(tradier, symbol: str, expirations: list[str]) -> list:
+    """Fetch Tradier chains for several expirations concurrently (in worker threads).
+
+    Returns one DataFrame (or None on failure) per expiration, in order.
+    """
+    semaphore = asyncio.Semaphore(_env_int("OPTIONS_TRADIER_CONCURRENCY", 4))
+
+    async def fetch(exp_date: str):
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(
+                    tradier.get_options_chain, symbol, exp_date, greeks=True
+                )
+            except Exception as e:
+                logger.warning("Tradier chain fetch for %s %s failed: %s", symbol, exp_date, e)
+                return None
+
+    return await asyncio.gather(*(fetch(exp) for exp in expirations))
+
+
+async def _fetch_tradier_all_chains(tradier, symbol: str, max_expirations: int):
+    """Async counterpart of TradierClient.get_all_chains with concurrent expirations."""
+    expirations = (await asyncio.to_thread(tradier.get_expirations, symbol))[:max_expirations]
+    if not expirations:
+        logger.warning("No expirations found for %s", symbol)
+        return pd.DataFrame()
+    chains = [
+        df for df in await _fetch_tradier_chains(tradier, symbol, expirations)
+        if df is not None and not df.empty
+    ]
+    if not chains:
+        return pd.DataFrame()
+    return pd.concat(chains, ignore_index=True)
 
 
-def _fetch_tradier_quotes_for_contracts(
+async def _fetch_tradier_quotes_for_contracts(
     symbol: str, contracts: list[str], tradier, now_iso: str
 ) -> list[dict]:
     """Fetch Tradier quotes for specific contracts by parsing OCC→expiration and calling get_options_chain."""
@@ -459,18 +731,11 @@ def _fetch_tradier_quotes_for_contracts(
         if exp:
             exp_to_contracts.setdefault(exp, []).append(occ.upper())
     quotes = []
-    for exp_date, occ_list in exp_to_contracts.items():
-        try:
-            chain_df = tradier.get_options_chain(symbol, exp_date, greeks=True)
-        except Exception as e:
-            logger.warning("Tradier chain fetch for %s %s failed: %s", symbol, exp_date, e)
-            continue
+    chains = await _fetch_tradier_chains(tradier, symbol, list(exp_to_contracts))
+    for chain_df in chains:
         if chain_df is None or chain_df.empty:
             continue
-        for _, row in chain_df.iterrows():
-            sym = str(row.get("symbol", "")).upper()
-            if sym in contract_set:
-                quotes.append(_row_to_quote_dict(row, sym, now_iso))
+        quotes.extend(_chain_df_to_quotes(chain_df, contract_set, now_iso))
     return quotes
 
 
@@ -495,12 +760,12 @@ def _merge_supplemental_quotes(result: dict, supplemental: list[dict]) -> dict:
     }
 
 
-def _fetch_tradier_options_quotes_targeted(
+async def _fetch_tradier_options_quotes_targeted(
     symbol: str, contracts: list[str], tradier, now_iso: str, providers_tried: list[str] | None = None
 ) -> dict:
     """Fetch Tradier quotes by expiration for each requested contract; add stubs for still-missing."""
     providers_tried = providers_tried or ["tradier"]
-    supplemental = _fetch_tradier_quotes_for_contracts(symbol, contracts, tradier, now_iso)
+    supplemental = await _fetch_tradier_quotes_for_contracts(symbol, contracts, tradier, now_iso)
     found = {q["contract_symbol"] for q in supplemental}
     missing = sorted(set(c.upper() for c in contracts) - found)
     quotes = list(supplemental)
@@ -529,62 +794,44 @@ def _fetch_tradier_options_quotes_targeted(
     }
 
 
-def _row_to_contract(row, underlying: str) -> dict:
-    """Convert a Tradier chain row to Edge-style contract (calls/puts)."""
-    symbol = str(row.get("symbol", ""))
-    exp_date = str(row.get("expiration_date", ""))
-    strike = _json_safe_float(row.get("strike", 0)) or 0.0
-    opt_type = str(row.get("option_type", "call")).lower()
-    bid = _json_safe_float(row.get("bid"))
-    ask = _json_safe_float(row.get("ask"))
-    last = _json_safe_float(row.get("last"))
-    mark = None
-    if bid is not None and ask is not None:
-        mark = _json_safe_float((bid + ask) / 2)
-    if mark is None and last is not None:
-        mark = last
-    try:
-        volume = int(row.get("volume") or 0)
-    except (TypeError, ValueError):
-        volume = 0
-    try:
-        oi = int(row.get("open_interest") or 0)
-    except (TypeError, ValueError):
-        oi = 0
-    delta = _json_safe_float(row.get("greek_delta") or row.get("delta"))
-    gamma = _json_safe_float(row.get("greek_gamma") or row.get("gamma"))
-    theta = _json_safe_float(row.get("greek_theta") or row.get("theta"))
-    vega = _json_safe_float(row.get("greek_vega") or row.get("vega"))
-    rho = _json_safe_float(row.get("greek_rho") or row.get("rho"))
-    iv = _json_safe_float(row.get("greek_mid_iv") or row.get("iv") or row.get("implied_volatility"))
-    return {
-        "symbol": symbol,
-        "underlying": underlying,
-        "strike": strike,
-        "expiration": _parse_expiration_to_unix(exp_date),
-        "type": "call" if opt_type == "call" else "put",
-        "bid": bid,
-        "ask": ask,
-        "last": last,
-        "mark": mark,
-        "volume": volume,
-        "openInterest": oi,
-        "delta": delta,
-        "gamma": gamma,
-        "theta": theta,
-        "vega": vega,
-        "rho": rho,
-        "impliedVolatility": iv,
-        "lastTradeTime": None,
-        "changePercent": None,
-        "change": None,
-    }
+def _tradier_chain_columns(chain_df: pd.DataFrame, underlying: str) -> tuple[list[int], dict, dict]:
+    """Convert Tradier chain rows to (expirations, calls, puts) column dicts, keeping row order."""
+    exp_dates = _column(chain_df, "expiration_date", "").astype(str)
+    exp_unix = {value: _parse_expiration_to_unix(value) for value in exp_dates.unique()}
+    df = chain_df.assign(symbol=_column(chain_df, "symbol", "").astype(str))
+    option_type = _column(chain_df, "option_type", "call").astype(str).str.lower()
+    strike = _float_array(_column(chain_df, "strike", 0))
+    columns = _contract_columns(
+        df,
+        underlying,
+        strike=np.where(np.isnan(strike) | (strike == 0), 0.0, strike),
+        expiration=exp_dates.map(exp_unix).to_numpy(),
+        option_type=np.where(option_type == "call", "call", "put"),
+        bid=_column(chain_df, "bid"),
+        ask=_column(chain_df, "ask"),
+        last=_column(chain_df, "last"),
+        volume=_int_values(_column(chain_df, "volume")),
+        open_interest=_int_values(_column(chain_df, "open_interest")),
+        greeks={
+            name: _or_column(chain_df, f"greek_{name}", name)
+            for name in ("delta", "gamma", "theta", "vega", "rho")
+        },
+        implied_vol=_or_column(chain_df, "greek_mid_iv", "iv", "implied_volatility"),
+    )
+    calls, puts = _split_chain(columns)
+    expirations = sorted({unix for value, unix in exp_unix.items() if value})
+    return expirations, calls, puts
 
 
 @router.get("/options-chain")
 async def get_options_chain(
     underlying: str = Query(..., description="Underlying symbol (e.g. AAPL)"),
     expiration: int | None = Query(None, description="Optional expiration Unix timestamp (filter to that date)"),
+    response_format: str = Query(
+        "rows",
+        alias="format",
+        description="rows (Edge shape) or columnar (calls/puts as {field: [values]})",
+    ),
 ):
     """
     Fetch live options chain from Alpaca (primary) or Tradier (fallback). Same
@@ -594,18 +841,31 @@ async def get_options_chain(
     underlying = (underlying or "").strip().upper()
     if not underlying:
         raise HTTPException(status_code=400, detail="underlying is required")
+    if response_format not in CHAIN_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be rows or columnar")
 
     # Optional: return cached chain (short TTL)
-    cached = _get_options_chain_cached(underlying, expiration)
-    if cached is not None:
-        return cached
+    cached = await asyncio.to_thread(
+        _get_options_chain_cached, underlying, expiration, response_format
+    )
+    if cached is None:
+        # Concurrent requests for the same chain share one upstream fetch
+        cached = await _single_flight.run(
+            _options_chain_cache_key(underlying, expiration, response_format),
+            lambda: _load_options_chain(underlying, expiration, response_format),
+        )
+    return Response(content=cached, media_type="application/json")
+
 
+async def _load_options_chain(underlying: str, expiration: int | None, fmt: str = "rows") -> bytes:
+    """Fetch a chain from Alpaca, else Tradier, serialize it and cache it."""
     # Try Alpaca first when credentials are set
     if _alpaca_configured():
-        result = _fetch_alpaca_options_chain(underlying, expiration)
-        if result and (result["calls"] or result["puts"]):
-            _set_options_chain_cached(underlying, expiration, result)
-            return result
+        result = await _fetch_alpaca_options_chain(underlying, expiration)
+        if result and (result[1]["symbol"] or result[2]["symbol"]):
+            payload = _chain_payload(underlying, *result, fmt=fmt)
+            await asyncio.to_thread(_set_options_chain_cached, underlying, expiration, payload, fmt)
+            return payload
 
     # Fall back to Tradier
     try:
@@ -616,42 +876,20 @@ async def get_options_chain(
         if expiration:
             from datetime import datetime as dt
             exp_date = dt.utcfromtimestamp(expiration).strftime("%Y-%m-%d")
-            chain_df = tradier.get_options_chain(underlying, exp_date, greeks=True)
+            chain_df = await asyncio.to_thread(
+                tradier.get_options_chain, underlying, exp_date, greeks=True
+            )
         else:
-            chain_df = tradier.get_all_chains(underlying, max_expirations=6, greeks=True)
+            chain_df = await _fetch_tradier_all_chains(tradier, underlying, max_expirations=6)
     except Exception as e:
         logger.exception("Tradier options chain fetch failed")
         raise HTTPException(status_code=502, detail=f"Failed to fetch options chain: {e}") from e
     if chain_df is None or chain_df.empty:
-        return {
-            "underlying": underlying,
-            "timestamp": int(datetime.now(timezone.utc).timestamp()),
-            "expirations": [],
-            "calls": [],
-            "puts": [],
-        }
-    expirations_set = set()
-    calls = []
-    puts = []
-    for _, row in chain_df.iterrows():
-        exp_date = str(row.get("expiration_date", ""))
-        if exp_date:
-            expirations_set.add(_parse_expiration_to_unix(exp_date))
-        contract = _row_to_contract(row, underlying)
-        if contract["type"] == "call":
-            calls.append(contract)
-        else:
-            puts.append(contract)
-    expirations = sorted(expirations_set)
-    result = {
-        "underlying": underlying,
-        "timestamp": int(datetime.now(timezone.utc).timestamp()),
-        "expirations": expirations,
-        "calls": calls,
-        "puts": puts,
-    }
-    _set_options_chain_cached(underlying, expiration, result)
-    return result
+        empty = {name: [] for name in CONTRACT_FIELDS}
+        return _chain_payload(underlying, [], empty, empty, fmt)
+    payload = _chain_payload(underlying, *_tradier_chain_columns(chain_df, underlying), fmt=fmt)
+    await asyncio.to_thread(_set_options_chain_cached, underlying, expiration, payload, fmt)
+    return payload
 
 
 class OptionsQuotesRequest(BaseModel):
@@ -675,36 +913,49 @@ async def post_options_quotes(body: OptionsQuotesRequest):
         raise HTTPException(status_code=400, detail="contracts list is required")
 
     # Optional: return cached quotes (short TTL)
-    cached = _get_options_quotes_cached(symbol, contracts)
+    cached = await asyncio.to_thread(_get_options_quotes_cached, symbol, contracts)
     if cached is not None:
         return cached
 
+    # Concurrent requests for the same contract set share one upstream fetch
+    return await _single_flight.run(
+        _options_quotes_cache_key(symbol, contracts),
+        lambda: _load_options_quotes(symbol, contracts),
+    )
+
+
+async def _load_options_quotes(symbol: str, contracts: list[str]) -> dict:
+    """Fetch quotes from Alpaca (Tradier filling gaps), else Tradier, and cache them."""
     now_iso = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
     # Try Alpaca first when credentials are set
     if _alpaca_configured():
-        result = _fetch_alpaca_options_quotes(symbol, contracts)
+        result = await _fetch_alpaca_options_quotes(symbol, contracts)
         if result is not None:
             missing = result.get("missing_contracts") or []
             if missing:
                 try:
                     tradier = _get_tradier()
-                    supplemental_quotes = _fetch_tradier_quotes_for_contracts(symbol, missing, tradier, now_iso)
+                    supplemental_quotes = await _fetch_tradier_quotes_for_contracts(
+                        symbol, missing, tradier, now_iso
+                    )
                     if supplemental_quotes:
                         result = _merge_supplemental_quotes(result, supplemental_quotes)
                 except HTTPException:
                     pass
-            _set_options_quotes_cached(symbol, contracts, result)
+            await asyncio.to_thread(_set_options_quotes_cached, symbol, contracts, result)
             return result
 
     # Fall back to Tradier: targeted fetch by expiration for each contract's expiry
     try:
         tradier = _get_tradier()
         providers_tried = ["alpaca", "tradier"] if _alpaca_configured() else ["tradier"]
-        result = _fetch_tradier_options_quotes_targeted(symbol, contracts, tradier, now_iso, providers_tried)
+        result = await _fetch_tradier_options_quotes_targeted(
+            symbol, contracts, tradier, now_iso, providers_tried
+        )
     except HTTPException:
         raise
-    _set_options_quotes_cached(symbol, contracts, result)
+    await asyncio.to_thread(_set_options_quotes_cached, symbol, contracts, result)
     return result
 
 
@@ -143,6 +143,24 @@ class Settings(BaseSettings):
         "TSLA",
     ]
     batch_size: int = 10
+    # Unified forecast job parallelism (1 = sequential, >1 = process pool)
+    forecast_max_workers: int = 1
+    # Threads per worker used for DB writes so fits overlap with upserts
+    forecast_io_workers: int = 4
+    # Per-symbol wall-clock budget when running with a worker pool
+    forecast_symbol_timeout_seconds: float = 900.0
+    # How long resolved ticker -> symbols.id lookups stay cached per process
+    symbol_cache_ttl_seconds: float = 3600.0
+    # Bulk DB writes: rows per request, concurrent requests, retries per chunk
+    db_write_chunk_size: int = 500
+    db_write_workers: int = 4
+    db_write_max_retries: int = 2
+    # Local OHLC bar store read first by fetch_ohlc_bars (unset = disabled)
+    ohlc_store_dir: str | None = None
+    # Minimum seconds between delta syncs of one symbol/timeframe per process
+    ohlc_store_sync_seconds: float = 60.0
+    # Trailing bars re-pulled on each delta sync (the newest bars may still change)
+    ohlc_store_resync_bars: int = 3
 
     # Tradier API (Options Data)
     tradier_api_key: str | None = None
@@ -150,6 +168,8 @@ class Settings(BaseSettings):
     tradier_base_url: str = "https://api.tradier.com/v1"
     # Sandbox endpoint
     # tradier_base_url: str = "https://sandbox.tradier.com/v1"
+    # Max requests in flight per client (the RPM limit still bounds the rate)
+    tradier_max_concurrency: int = 8
 
     # Alpaca API (Market Data)
     alpaca_api_key: str | None = None
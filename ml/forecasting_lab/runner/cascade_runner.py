@@ -6,13 +6,14 @@ Flow: 15m predict(4) → indicator recompute on history+pred → rollup to 1h 
 → predict(5) → weekly close = day 5 close.
 
 - Daily (1D) bars are built by session boundaries from the Alpaca calendar (open→close, early-close aware),
-  resampling 15m within those windows; we do not derive 1D from "4×4h."
+  resampling 15m within those windows; we do not derive 1D from "4×4h." All resampling is one vectorized
+  group-by over session ids (src.data.bar_resampler).
 - Lower TF guides higher TF: at each level we append the rolled-up predicted bar as the next input row
   before predicting the next horizon (feed-forward cascade).
 """
 
 import sys
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import numpy as np
@@ -23,7 +24,12 @@ LAB_ROOT = Path(__file__).resolve().parent.parent
 if str(LAB_ROOT) not in sys.path:
     sys.path.insert(0, str(LAB_ROOT))
 
+ML_ROOT = LAB_ROOT.parent
+if str(ML_ROOT) not in sys.path:
+    sys.path.insert(0, str(ML_ROOT))
+
 from forecasting_lab.models.base import OHLCStep, BaseForecaster
+from src.data.bar_resampler import filter_to_sessions, resample_session_bars, rollup_every
 
 
 def _attach_indicator_bundle(
@@ -84,37 +90,10 @@ def rollup_bars(steps: list[OHLCStep]) -> OHLCStep:
 
 def rollup_df(df: pd.DataFrame, group_size: int) -> pd.DataFrame:
     """
-    Roll up a DataFrame of OHLC bars by grouping every group_size rows.
-    Used for 4×15m → 1h and 4×1h → 4h_trading within session-only data.
+    Roll up a DataFrame of OHLC bars by grouping every group_size rows (trailing partial group dropped).
+    Count-based fallback for data without session timestamps; see resample_session_bars.
     """
-    if df is None or len(df) == 0 or group_size <= 0:
-        return pd.DataFrame()
-    required = ["open", "high", "low", "close"]
-    for col in required:
-        if col not in df.columns:
-            df = df.copy()
-            df[col] = df["close"] if col == "close" else df.get("close", 0)
-    if "volume" not in df.columns:
-        df = df.copy()
-        df["volume"] = 0
-    n = (len(df) // group_size) * group_size
-    if n == 0:
-        return pd.DataFrame()
-    df = df.iloc[:n]
-    rows = []
-    for i in range(0, n, group_size):
-        block = df.iloc[i : i + group_size]
-        rows.append({
-            "open": block["open"].iloc[0],
-            "high": block["high"].max(),
-            "low": block["low"].min(),
-            "close": block["close"].iloc[-1],
-            "volume": block["volume"].sum(),
-        })
-    out = pd.DataFrame(rows)
-    if "ts" in df.columns:
-        out["ts"] = df["ts"].iloc[group_size - 1 :: group_size].values
-    return out
+    return rollup_every(df, group_size, drop_partial=True)
 
 
 def _bar_to_row(bar: OHLCStep, ts: datetime | pd.Timestamp | None = None) -> pd.Series:
@@ -146,20 +125,6 @@ def append_bar(df: pd.DataFrame, bar: OHLCStep, ts: datetime | pd.Timestamp | No
     return pd.concat([df, pd.DataFrame([row])], ignore_index=True)
 
 
-def _filter_df_to_session(df: pd.DataFrame, session_open_ts: datetime, session_close_ts: datetime) -> pd.DataFrame:
-    """Keep rows where ts is within [session_open_ts, session_close_ts). ts is bar-start; exclude bar at close."""
-    if df is None or df.empty or "ts" not in df.columns:
-        return pd.DataFrame()
-    ts = pd.to_datetime(df["ts"])
-    if ts.dt.tz is None and session_open_ts.tzinfo is not None:
-        ts = ts.dt.tz_localize(timezone.utc)
-    elif ts.dt.tz is not None and session_open_ts.tzinfo is None:
-        session_open_ts = session_open_ts.replace(tzinfo=timezone.utc)
-        session_close_ts = session_close_ts.replace(tzinfo=timezone.utc)
-    mask = (ts >= session_open_ts) & (ts < session_close_ts)
-    return df.loc[mask].copy()
-
-
 def _calendar_for_df_range(df_15m: pd.DataFrame) -> list:
     """
     Get calendar days with session timestamps for the date range of df_15m.
@@ -197,43 +162,32 @@ def filter_15m_to_regular_session(df_15m: pd.DataFrame, calendar_days: list) ->
     """Filter 15m bars to regular session only (open→close per calendar day). Early-close aware."""
     if not calendar_days or df_15m is None or df_15m.empty:
         return df_15m
-    pieces = []
-    for day in calendar_days:
-        if getattr(day, "session_open_ts", None) is None or getattr(day, "session_close_ts", None) is None:
-            continue
-        chunk = _filter_df_to_session(df_15m, day.session_open_ts, day.session_close_ts)
-        if not chunk.empty:
-            pieces.append(chunk)
-    if not pieces:
-        return df_15m
-    out = pd.concat(pieces, ignore_index=True).sort_values("ts").reset_index(drop=True)
-    return out
+    out = filter_to_sessions(df_15m, calendar_days)
+    return df_15m if out.empty else out
 
 
 def build_daily_bars_from_session_15m(df_15m_session: pd.DataFrame, calendar_days: list) -> pd.DataFrame:
     """
-    Build 1D bars by session boundaries: for each calendar day, take 15m bars within
-    session_open_ts → session_close_ts and roll up to one OHLC bar. Does not use 4×4h.
+    Build 1D bars by session boundaries: 15m bars within session_open_ts → session_close_ts
+    roll up to one OHLC bar per calendar day (ts = last bar). Does not use 4×4h.
     """
     if not calendar_days or df_15m_session is None or df_15m_session.empty:
         return pd.DataFrame()
-    rows = []
-    for day in calendar_days:
-        if getattr(day, "session_open_ts", None) is None or getattr(day, "session_close_ts", None) is None:
-            continue
-        chunk = _filter_df_to_session(df_15m_session, day.session_open_ts, day.session_close_ts)
-        if chunk.empty:
-            continue
-        o = chunk["open"].iloc[0]
-        h = chunk["high"].max()
-        l_ = chunk["low"].min()
-        c = chunk["close"].iloc[-1]
-        v = chunk["volume"].sum() if "volume" in chunk.columns else 0
-        ts = chunk["ts"].iloc[-1] if "ts" in chunk.columns else day.date
-        rows.append({"ts": ts, "open": o, "high": h, "low": l_, "close": c, "volume": v})
-    if not rows:
-        return pd.DataFrame()
-    return pd.DataFrame(rows).sort_values("ts").reset_index(drop=True)
+    return resample_session_bars(df_15m_session, calendar_days)
+
+
+def build_intraday_bars_from_session_15m(df_15m_session: pd.DataFrame, calendar_days: list) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Build 1h and 4h_trading bars anchored at each session open (09:30, 10:30, … / 09:30, 13:30)
+    and cut at the session close. Falls back to 4×15m / 4×1h row counts without a calendar.
+    """
+    if calendar_days:
+        df_1h = resample_session_bars(df_15m_session, calendar_days, freq="1h")
+        df_4h_trading = resample_session_bars(df_15m_session, calendar_days, freq="4h")
+        if not df_1h.empty:
+            return df_1h, df_4h_trading
+    df_1h = rollup_df(df_15m_session, 4)
+    return df_1h, rollup_df(df_1h, 4)
 
 
 def run_cascade(
@@ -244,7 +198,7 @@ def run_cascade(
     """
     Run single cascade with session-based 1D and feed-forward chaining.
 
-    - 15m and 1h/4h_trading: built from 15m filtered to regular session; 1h = 4×15m, 4h_trading = 4×1h (trading-time, not calendar 4h).
+    - 15m and 1h/4h_trading: built from 15m filtered to regular session; 1h and 4h_trading are anchored at each session open and cut at the close (trading-time, not calendar 4h).
     - 1D: built by calendar session boundaries (one bar per trading day, open→close).
     - At each level, the rolled-up predicted bar from the lower level is appended to history
       before predicting the next horizon (lower timeframe guides higher timeframe).
@@ -258,9 +212,8 @@ def run_cascade(
     if df_15m_session.empty:
         df_15m_session = df_15m
 
-    # 1h and 4h_trading from session-only 15m (4×15m = 1h, 4×1h = 4h_trading; not calendar 4h)
-    df_1h = rollup_df(df_15m_session, 4)
-    df_4h_trading = rollup_df(df_1h, 4)
+    # 1h and 4h_trading from session-only 15m (session-anchored buckets; not calendar 4h)
+    df_1h, df_4h_trading = build_intraday_bars_from_session_15m(df_15m_session, calendar_days)
     # 1D by session boundaries (not 4×4h)
     df_1d = build_daily_bars_from_session_15m(df_15m_session, calendar_days)
 
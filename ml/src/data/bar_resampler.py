@@ -0,0 +1,195 @@
+"""Vectorized, session-aware OHLCV resampling.
+
+Every bar is labelled with the trading session it falls in using a single
+``searchsorted`` against the calendar's open/close timestamps, then rolled up
+in one group-by (``ufunc.reduceat`` over contiguous runs). Buckets are anchored
+at the session open and never straddle a session boundary, so an early close
+simply yields a shorter last bucket (and a shorter daily bar) instead of
+bleeding into the next day.
+
+Calendar days are any objects exposing ``session_open_ts`` / ``session_close_ts``
+as timezone-aware datetimes (e.g. ``forecasting_lab.data.market_calendar_resolver.CalendarDay``).
+Naive bar timestamps are treated as UTC.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def to_utc_ns(ts: Any) -> np.ndarray:
+    """Return timestamps as int64 nanoseconds since the epoch (UTC)."""
+    index = pd.DatetimeIndex(pd.to_datetime(ts))
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return index.tz_localize(None).to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def session_bounds(calendar_days: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return sorted (open_ns, close_ns) arrays for days that carry session timestamps."""
+    pairs = [
+        (d.session_open_ts, d.session_close_ts)
+        for d in calendar_days or []
+        if getattr(d, "session_open_ts", None) is not None
+        and getattr(d, "session_close_ts", None) is not None
+    ]
+    if not pairs:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    opens = to_utc_ns([p[0] for p in pairs])
+    closes = to_utc_ns([p[1] for p in pairs])
+    order = np.argsort(opens, kind="stable")
+    return opens[order], closes[order]
+
+
+def assign_sessions(ts_ns: np.ndarray, opens: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """Index of the session containing each bar start ([open, close)), or -1 if none."""
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    if len(opens) == 0:
+        return np.full(len(ts_ns), -1, dtype=np.int64)
+    idx = np.searchsorted(opens, ts_ns, side="right") - 1
+    clipped = np.clip(idx, 0, None)
+    inside = (idx >= 0) & (ts_ns < closes[clipped])
+    return np.where(inside, idx, -1)
+
+
+def trading_dates(ts: Any, tz: str = "America/New_York") -> np.ndarray:
+    """Local calendar date of each timestamp as days since the epoch.
+
+    Used as the session key for data that has no market calendar attached.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(ts))
+    index = index.tz_localize("UTC") if index.tz is None else index
+    local = index.tz_convert(tz).tz_localize(None)
+    return local.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+
+def _column(df: pd.DataFrame, name: str, default: Optional[np.ndarray]) -> np.ndarray:
+    if name in df.columns:
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+    return default
+
+
+def aggregate_ohlcv(df: pd.DataFrame, group_ids: np.ndarray, label: str = "last") -> pd.DataFrame:
+    """Roll up consecutive rows sharing a group id into one OHLCV bar per group.
+
+    Rows must already be ordered so each group is contiguous. open/close come
+    from the first/last row, high/low are NaN-skipping max/min and volume is
+    summed (0 when absent). ``label`` picks the ``ts`` of the first or last row.
+    Missing open/high/low columns fall back to close.
+    """
+    if label not in ("first", "last"):
+        raise ValueError(f"label must be 'first' or 'last', got {label!r}")
+    ids = np.asarray(group_ids)
+    n = len(ids)
+    if df is None or n == 0 or "close" not in df.columns:
+        return pd.DataFrame()
+    if n != len(df):
+        raise ValueError("group_ids must have one entry per row")
+
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    close = _column(df, "close", None)
+    open_ = _column(df, "open", close)
+    high = _column(df, "high", close)
+    low = _column(df, "low", close)
+    volume = _column(df, "volume", np.zeros(n))
+
+    out = {}
+    if "ts" in df.columns:
+        rows = starts if label == "first" else ends
+        out["ts"] = df["ts"].iloc[rows].reset_index(drop=True)
+    out["open"] = open_[starts]
+    out["high"] = np.fmax.reduceat(high, starts)
+    out["low"] = np.fmin.reduceat(low, starts)
+    out["close"] = close[ends]
+    out["volume"] = np.add.reduceat(np.nan_to_num(volume), starts)
+    return pd.DataFrame(out)
+
+
+def rollup_every(
+    df: pd.DataFrame,
+    n: int,
+    sessions: Optional[np.ndarray] = None,
+    label: str = "last",
+    drop_partial: bool = False,
+) -> pd.DataFrame:
+    """Aggregate every ``n`` consecutive rows, restarting the count at each session.
+
+    ``sessions`` is an optional per-row key (e.g. from :func:`assign_sessions`
+    or :func:`trading_dates`); without it the whole frame is one run. With
+    ``drop_partial`` only buckets of exactly ``n`` rows are kept.
+    """
+    if df is None or len(df) == 0 or n <= 0:
+        return pd.DataFrame()
+    size = len(df)
+    if sessions is None:
+        run_change = np.zeros(size, dtype=bool)
+        run_change[0] = True
+    else:
+        keys = np.asarray(sessions)
+        run_change = np.r_[True, keys[1:] != keys[:-1]]
+    run_id = np.cumsum(run_change) - 1
+    run_start = np.flatnonzero(run_change)
+    bucket = (np.arange(size) - run_start[run_id]) // n
+
+    new_group = np.r_[True, (run_id[1:] != run_id[:-1]) | (bucket[1:] != bucket[:-1])]
+    ids = np.cumsum(new_group) - 1
+    if drop_partial:
+        keep = np.bincount(ids)[ids] == n
+        if not keep.any():
+            return pd.DataFrame()
+        df = df.loc[keep]
+        ids = ids[keep]
+    return aggregate_ohlcv(df, ids, label=label)
+
+
+def _sorted_in_sessions(df: pd.DataFrame, calendar_days: Iterable[Any]):
+    opens, closes = session_bounds(calendar_days)
+    frame = df.sort_values("ts", kind="stable").reset_index(drop=True)
+    ts_ns = to_utc_ns(frame["ts"])
+    session = assign_sessions(ts_ns, opens, closes)
+    inside = session >= 0
+    return frame.loc[inside].reset_index(drop=True), ts_ns[inside], session[inside], opens
+
+
+def filter_to_sessions(df: pd.DataFrame, calendar_days: Iterable[Any]) -> pd.DataFrame:
+    """Rows whose ``ts`` falls inside a calendar session, sorted by ``ts``."""
+    if df is None or df.empty or "ts" not in df.columns:
+        return pd.DataFrame()
+    frame, _, _, _ = _sorted_in_sessions(df, calendar_days)
+    return frame
+
+
+def resample_session_bars(
+    df: pd.DataFrame,
+    calendar_days: Iterable[Any],
+    freq: Optional[Union[str, pd.Timedelta]] = None,
+    label: str = "last",
+) -> pd.DataFrame:
+    """Resample bars into session-anchored buckets of ``freq`` (one bar per session if None).
+
+    Buckets start at each session open (``"1h"`` → 09:30, 10:30, ...; ``"4h"``
+    → 09:30, 13:30) and are cut at the session close, so early-close days and
+    missing bars never shift later buckets. Bars outside every session are
+    dropped. Result is sorted by ``ts``.
+    """
+    if df is None or df.empty or "ts" not in df.columns:
+        return pd.DataFrame()
+    frame, ts_ns, session, opens = _sorted_in_sessions(df, calendar_days)
+    if frame.empty:
+        return pd.DataFrame()
+    if freq is None:
+        ids = session
+    else:
+        step = pd.Timedelta(freq).value
+        if step <= 0:
+            raise ValueError(f"freq must be positive, got {freq!r}")
+        offset = (ts_ns - opens[session]) // step
+        ids = np.cumsum(np.r_[True, (session[1:] != session[:-1]) | (offset[1:] != offset[:-1])])
+    return aggregate_ohlcv(frame, ids, label=label)
@@ -0,0 +1,342 @@
+"""Local on-disk OHLC bar store, partitioned by timeframe and symbol.
+
+Each partition (``<root>/<timeframe>/<SYMBOL>/``) holds append-only segment
+files plus a JSON manifest. A segment is one structured numpy array (``.npy``,
+loaded memory-mapped) with the ts as int64 UTC nanoseconds, the OHLCV prices
+as float64, and the provider as an index into the manifest's provider list.
+The manifest records, for each segment, its row count, ts range and SHA-256.
+It also records the covered window:
+``low_water`` (None once the full history is held) up to ``high_water``.
+
+Rows are never rewritten in place. A sync appends a new segment, and on read
+the newest copy of each (provider, ts) wins. ``compact`` folds the segments
+into one. Writers take an exclusive ``flock`` on the partition and readers a
+shared one, so jobs running in several processes can share a store. Checksums
+are verified the first time a process reads a segment; a mismatch raises
+``BarStoreError`` so the caller can drop the partition and re-sync.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+BAR_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+        ("provider", "<i2"),
+    ]
+)
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class BarStoreError(RuntimeError):
+    """A partition failed its integrity checks."""
+
+
+def _to_utc_ns(values: pd.Series) -> np.ndarray:
+    ts = pd.to_datetime(values, utc=True)
+    return ts.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+
+def _iso(ns: int | None) -> str | None:
+    return None if ns is None else pd.Timestamp(ns, tz="UTC").isoformat()
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BarStore:
+    """Append-only columnar bar store with delta-sync bookkeeping."""
+
+    def __init__(self, root: str | Path, max_segments: int = 32) -> None:
+        self.root = Path(root).expanduser()
+        self.max_segments = max_segments
+        self._verified: set[tuple[str, str]] = set()
+
+    # ------------------------------------------------------------------ layout
+
+    def partition_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / timeframe / symbol.strip().upper()
+
+    def partitions(self) -> list[tuple[str, str]]:
+        """(SYMBOL, timeframe) of every partition with a manifest."""
+        if not self.root.exists():
+            return []
+        return sorted(
+            (path.parent.name, path.parent.parent.name)
+            for path in self.root.glob("*/*/manifest.json")
+        )
+
+    @contextmanager
+    def lock(self, symbol: str, timeframe: str, exclusive: bool = True) -> Iterator[None]:
+        """Inter-process lock on one partition (exclusive for writers)."""
+        directory = self.partition_dir(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / ".lock", "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def read_manifest(self, symbol: str, timeframe: str) -> dict | None:
+        path = self.partition_dir(symbol, timeframe) / "manifest.json"
+        try:
+            with open(path) as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    def _write_manifest(self, symbol: str, timeframe: str, manifest: dict) -> None:
+        directory = self.partition_dir(symbol, timeframe)
+        tmp = directory / f".manifest-{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(manifest, fh, indent=1)
+        os.replace(tmp, directory / "manifest.json")
+
+    # ------------------------------------------------------------------ reads
+
+    def load(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """
+        Stored bars in ``[start, end)``, newest copy per (provider, ts), sorted by ts.
+
+        Returns:
+            DataFrame with columns provider, ts (tz-naive UTC), open, high,
+            low, close, volume; empty when the partition does not exist
+        """
+        with self.lock(symbol, timeframe, exclusive=False):
+            manifest = self.read_manifest(symbol, timeframe)
+            if manifest is None:
+                return pd.DataFrame(columns=["provider", "ts", *PRICE_COLUMNS])
+            arrays = self._load_segments(symbol, timeframe, manifest)
+
+        lo = None if start is None else int(_to_utc_ns(pd.Series([start]))[0])
+        hi = None if end is None else int(_to_utc_ns(pd.Series([end]))[0])
+        parts = []
+        for array in arrays:
+            mask = np.ones(len(array), dtype=bool)
+            if lo is not None:
+                mask &= array["ts"] >= lo
+            if hi is not None:
+                mask &= array["ts"] < hi
+            parts.append(np.asarray(array[mask]))
+        bars = np.concatenate(parts) if parts else np.empty(0, dtype=BAR_DTYPE)
+        return self._to_frame(bars, manifest["providers"])
+
+    def _load_segments(self, symbol: str, timeframe: str, manifest: dict) -> list[np.ndarray]:
+        directory = self.partition_dir(symbol, timeframe)
+        arrays = []
+        for segment in manifest["segments"]:
+            path = directory / segment["file"]
+            key = (str(directory), segment["file"])
+            if key not in self._verified:
+                if not path.exists():
+                    raise BarStoreError(f"{path} is missing")
+                if _file_sha256(path) != segment["sha256"]:
+                    raise BarStoreError(f"{path} checksum mismatch")
+            array = np.load(path, mmap_mode="r")
+            if array.dtype != BAR_DTYPE or len(array) != segment["rows"]:
+                raise BarStoreError(f"{path} does not match its manifest entry")
+            if key not in self._verified:
+                if len(array) and np.any(np.diff(array["ts"]) < 0):
+                    raise BarStoreError(f"{path} is not sorted by ts")
+                self._verified.add(key)
+            arrays.append(array)
+        return arrays
+
+    @staticmethod
+    def _to_frame(bars: np.ndarray, providers: list[str]) -> pd.DataFrame:
+        df = pd.DataFrame(
+            {
+                "provider": (
+                    np.asarray(providers, dtype=object)[bars["provider"]]
+                    if len(bars)
+                    else np.empty(0, dtype=object)
+                ),
+                "ts": bars["ts"].astype("datetime64[ns]"),
+                **{col: bars[col] for col in PRICE_COLUMNS},
+            }
+        )
+        # Later segments hold the newer copy of a re-synced bar
+        df = df.drop_duplicates(["provider", "ts"], keep="last")
+        return df.sort_values("ts", kind="stable").reset_index(drop=True)
+
+    def coverage(
+        self, symbol: str, timeframe: str
+    ) -> tuple[bool, pd.Timestamp | None, pd.Timestamp | None]:
+        """(seeded, low_water, high_water); low_water is None when full history is held."""
+        manifest = self.read_manifest(symbol, timeframe)
+        if manifest is None:
+            return False, None, None
+
+        def parse(value):
+            return None if value is None else pd.Timestamp(value)
+
+        return True, parse(manifest["low_water"]), parse(manifest["high_water"])
+
+    # ------------------------------------------------------------------ writes
+
+    def append(
+        self,
+        symbol: str,
+        timeframe: str,
+        rows: pd.DataFrame,
+        low_water: pd.Timestamp | None | bool = False,
+    ) -> int:
+        """
+        Append bars (columns provider, ts, open, high, low, close, volume).
+
+        Args:
+            symbol: Ticker
+            timeframe: Timeframe
+            rows: Bars to add; copies of stored (provider, ts) bars supersede them
+            low_water: New lower bound of the covered window when ``rows``
+                extend it backwards (None = full history); False leaves it as is
+
+        Returns:
+            Number of rows written
+        """
+        with self.lock(symbol, timeframe):
+            manifest = self.read_manifest(symbol, timeframe) or {
+                "version": MANIFEST_VERSION,
+                "symbol": symbol.strip().upper(),
+                "timeframe": timeframe,
+                "providers": [],
+                "low_water": None,
+                "high_water": None,
+                "segments": [],
+            }
+            if low_water is not False:
+                manifest["low_water"] = (
+                    None if low_water is None else _iso(int(_to_utc_ns(pd.Series([low_water]))[0]))
+                )
+            if not rows.empty:
+                self._write_segment(symbol, timeframe, manifest, rows)
+            manifest["synced_at"] = pd.Timestamp.now("UTC").isoformat()
+            self._write_manifest(symbol, timeframe, manifest)
+            if len(manifest["segments"]) > self.max_segments:
+                self._compact_locked(symbol, timeframe, manifest)
+        return len(rows)
+
+    def _write_segment(
+        self, symbol: str, timeframe: str, manifest: dict, rows: pd.DataFrame
+    ) -> None:
+        providers = manifest["providers"]
+        names = rows["provider"].fillna("").astype(str)
+        for name in names.unique():
+            if name not in providers:
+                providers.append(name)
+        codes = {name: i for i, name in enumerate(providers)}
+
+        bars = np.empty(len(rows), dtype=BAR_DTYPE)
+        bars["ts"] = _to_utc_ns(rows["ts"])
+        for col in PRICE_COLUMNS:
+            bars[col] = pd.to_numeric(rows[col], errors="coerce").to_numpy(dtype=float)
+        bars["provider"] = names.map(codes).to_numpy(dtype=np.int16)
+        bars.sort(order="ts", kind="stable")
+        self._save_segment(symbol, timeframe, manifest, bars)
+
+        high = manifest["high_water"]
+        newest = pd.Timestamp(int(bars["ts"][-1]), tz="UTC")
+        if high is None or newest > pd.Timestamp(high):
+            manifest["high_water"] = newest.isoformat()
+
+    def _save_segment(self, symbol: str, timeframe: str, manifest: dict, bars: np.ndarray) -> None:
+        directory = self.partition_dir(symbol, timeframe)
+        name = f"seg-{time.time_ns()}-{os.getpid()}.npy"
+        tmp = directory / f".{name}.tmp"
+        with open(tmp, "wb") as fh:
+            np.save(fh, bars)
+        os.replace(tmp, directory / name)
+        manifest["segments"].append(
+            {
+                "file": name,
+                "rows": int(len(bars)),
+                "min_ts": _iso(int(bars["ts"][0])) if len(bars) else None,
+                "max_ts": _iso(int(bars["ts"][-1])) if len(bars) else None,
+                "sha256": _file_sha256(directory / name),
+            }
+        )
+
+    def compact(self, symbol: str, timeframe: str) -> int:
+        """Fold all segments into one deduplicated segment; returns the rows kept."""
+        with self.lock(symbol, timeframe):
+            manifest = self.read_manifest(symbol, timeframe)
+            if manifest is None:
+                return 0
+            return self._compact_locked(symbol, timeframe, manifest)
+
+    def _compact_locked(self, symbol: str, timeframe: str, manifest: dict) -> int:
+        old = [segment["file"] for segment in manifest["segments"]]
+        arrays = self._load_segments(symbol, timeframe, manifest)
+        bars = np.concatenate([np.asarray(a) for a in arrays]) if arrays else np.empty(0, BAR_DTYPE)
+        if len(bars):
+            # Keep the last copy of each (provider, ts): stable sort, then take run ends
+            order = np.lexsort((np.arange(len(bars)), bars["ts"], bars["provider"]))
+            ranked = bars[order]
+            keys_change = (np.diff(ranked["provider"]) != 0) | (np.diff(ranked["ts"]) != 0)
+            bars = ranked[np.append(keys_change, True)]
+            bars = bars[np.argsort(bars["ts"], kind="stable")]
+
+        manifest["segments"] = []
+        if len(bars):
+            self._save_segment(symbol, timeframe, manifest, bars)
+        self._write_manifest(symbol, timeframe, manifest)
+        directory = self.partition_dir(symbol, timeframe)
+        for name in old:
+            (directory / name).unlink(missing_ok=True)
+        logger.debug(
+            "Compacted %s %s: %d segments -> %d rows", symbol, timeframe, len(old), len(bars)
+        )
+        return int(len(bars))
+
+    def verify(self, symbol: str, timeframe: str) -> list[str]:
+        """Re-check every segment against the manifest; returns the problems found."""
+        manifest = self.read_manifest(symbol, timeframe)
+        if manifest is None:
+            return ["manifest missing"]
+        directory = self.partition_dir(symbol, timeframe)
+        problems = []
+        for segment in manifest["segments"]:
+            self._verified.discard((str(directory), segment["file"]))
+            try:
+                with self.lock(symbol, timeframe, exclusive=False):
+                    self._load_segments(symbol, timeframe, {**manifest, "segments": [segment]})
+            except (BarStoreError, OSError, ValueError) as e:
+                problems.append(str(e))
+        return problems
+
+    def drop(self, symbol: str, timeframe: str) -> None:
+        """Delete a partition (e.g. after a failed integrity check)."""
+        directory = self.partition_dir(symbol, timeframe)
+        self._verified = {key for key in self._verified if key[0] != str(directory)}
+        shutil.rmtree(directory, ignore_errors=True)
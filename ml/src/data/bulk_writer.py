@@ -0,0 +1,183 @@
+"""Chunked, concurrent bulk writes for Supabase tables.
+
+Frames are turned into JSON-ready records one column at a time (missing and
+non-finite values become None, datetimes become ISO strings, numpy scalars
+become Python scalars), then sent in size-bounded chunks from a small thread
+pool. Each chunk is retried with exponential backoff; chunks that still fail
+are reported in the returned ``BulkWriteResult`` instead of being swallowed.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkFailure:
+    """A chunk that could not be written after all retries."""
+
+    start: int
+    size: int
+    error: str
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome of a chunked bulk write."""
+
+    table: str
+    total: int = 0
+    written: int = 0
+    failures: list[ChunkFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    @property
+    def failed(self) -> int:
+        return sum(f.size for f in self.failures)
+
+    def raise_for_failures(self) -> None:
+        if self.failures:
+            raise BulkWriteError(self)
+
+
+class BulkWriteError(RuntimeError):
+    """Raised when some chunks of a bulk write failed; carries the result."""
+
+    def __init__(self, result: BulkWriteResult) -> None:
+        self.result = result
+        super().__init__(
+            f"{result.failed}/{result.total} rows failed to write to {result.table} "
+            f"({len(result.failures)} chunks; first error: {result.failures[0].error})"
+        )
+
+
+def column_to_python(values: pd.Series, kind: str | None = None, default: Any = None) -> list[Any]:
+    """Convert one column to JSON-ready Python values.
+
+    Args:
+        values: Column to convert
+        kind: "float" or "int" to coerce numerically (unparseable -> missing;
+            ints are truncated), "datetime" for ISO strings, None to infer
+            from the dtype
+        default: Replacement for missing / non-finite values
+    """
+    if kind == "datetime" or (kind is None and pd.api.types.is_datetime64_any_dtype(values.dtype)):
+        if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+            try:
+                values = pd.to_datetime(values)
+            except (TypeError, ValueError):
+                return column_to_python(values, default=default)
+        return [default if pd.isna(ts) else ts.isoformat() for ts in values]
+
+    if kind in ("float", "int") or (
+        kind is None
+        and pd.api.types.is_numeric_dtype(values.dtype)
+        and not pd.api.types.is_bool_dtype(values.dtype)
+    ):
+        if pd.api.types.is_integer_dtype(values.dtype) and kind != "float":
+            return values.astype(object).where(values.notna(), default).tolist()
+        numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+        finite = np.isfinite(numbers)
+        if kind == "int":
+            converted = np.trunc(np.where(finite, numbers, 0)).astype(np.int64).astype(object)
+        else:
+            converted = numbers.astype(object)
+        converted[~finite] = default
+        return converted.tolist()
+
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return values.astype(object).tolist()
+    out = values.astype(object)
+    return out.where(out.notna(), default).tolist()
+
+
+def frame_to_records(
+    df: pd.DataFrame,
+    columns: Iterable[str] | None = None,
+    kinds: Mapping[str, str] | None = None,
+    constants: Mapping[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Convert ``df`` to a list of JSON-ready dicts, column-wise.
+
+    Args:
+        df: Source frame
+        columns: Columns to include (those absent from ``df`` are skipped);
+            defaults to all columns
+        kinds: Optional per-column coercion passed to ``column_to_python``
+        constants: Fields added to every record (e.g. symbol_id, timeframe)
+    """
+    kinds = kinds or {}
+    names = [c for c in (columns if columns is not None else df.columns) if c in df.columns]
+    converted = [column_to_python(df[name], kinds.get(name)) for name in names]
+    base = dict(constants or {})
+    if not names:
+        return [dict(base) for _ in range(len(df))]
+    return [{**base, **dict(zip(names, row))} for row in zip(*converted)]
+
+
+def write_chunks(
+    records: Sequence[dict[str, Any]],
+    send: Callable[[list[dict[str, Any]]], Any],
+    table: str,
+    chunk_size: int = 500,
+    max_workers: int = 4,
+    max_retries: int = 2,
+    retry_backoff: float = 0.5,
+) -> BulkWriteResult:
+    """Send ``records`` in chunks through ``send``, concurrently, with retry.
+
+    Args:
+        records: Rows to write
+        send: Writes one chunk; any exception counts as a failed attempt
+        table: Table name, for reporting
+        chunk_size: Maximum rows per request
+        max_workers: Concurrent requests (1 = sequential)
+        max_retries: Extra attempts per chunk after the first failure
+        retry_backoff: Base delay in seconds, doubled after each attempt
+
+    Returns:
+        BulkWriteResult with rows written and the chunks that failed
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    result = BulkWriteResult(table=table, total=len(records))
+    starts = list(range(0, len(records), chunk_size))
+
+    def write(start: int) -> tuple[int, int, Exception | None]:
+        chunk = list(records[start : start + chunk_size])
+        error = None
+        for attempt in range(max_retries + 1):
+            try:
+                send(chunk)
+                return start, len(chunk), None
+            except Exception as e:
+                error = e
+                if attempt < max_retries:
+                    logger.debug("Retrying %s chunk at row %d: %s", table, start, e)
+                    time.sleep(retry_backoff * (2**attempt))
+        return start, len(chunk), error
+
+    if max_workers > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(starts)), thread_name_prefix="bulk-write"
+        ) as pool:
+            outcomes = list(pool.map(write, starts))
+    else:
+        outcomes = [write(start) for start in starts]
+
+    for start, size, error in outcomes:
+        if error is None:
+            result.written += size
+        else:
+            result.failures.append(ChunkFailure(start=start, size=size, error=str(error)))
+    return result
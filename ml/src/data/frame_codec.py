@@ -0,0 +1,173 @@
+"""Versioned binary columnar codec for pandas DataFrames.
+
+Payload layout::
+
+    b"SBFC" | version (1 byte) | flags (1 byte) | body
+
+The body (zlib-compressed when ``FLAG_ZLIB`` is set) is a little-endian
+uint32 header length, a JSON header describing every column, then the raw
+column buffers back to back. Numeric, bool, datetime (naive or tz-aware) and
+timedelta columns are stored as contiguous NumPy buffers so dtypes, NaN and
+NaT survive the round trip; anything else falls back to a JSON list.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"SBFC"
+VERSION = 1
+FLAG_ZLIB = 0x01
+_HEADER_LEN = struct.Struct("<I")
+
+
+class FrameCodecError(ValueError):
+    """Raised when a payload is not a valid encoded frame."""
+
+
+def is_encoded_frame(payload: Any) -> bool:
+    """Return True if ``payload`` starts with the codec magic bytes."""
+    return isinstance(payload, (bytes, bytearray, memoryview)) and bytes(payload[:4]) == MAGIC
+
+
+def _encode_column(series: pd.Series) -> tuple[dict[str, Any], bytes]:
+    dtype = series.dtype
+
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        naive = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        values = np.ascontiguousarray(naive.to_numpy())
+        spec = {"kind": "datetime", "dtype": values.dtype.str, "tz": str(dtype.tz)}
+        return spec, values.view(np.int64).tobytes()
+
+    if isinstance(dtype, np.dtype) and dtype.kind in "Mm":
+        values = np.ascontiguousarray(series.to_numpy())
+        spec = {"kind": "datetime" if dtype.kind == "M" else "timedelta", "dtype": dtype.str}
+        return spec, values.view(np.int64).tobytes()
+
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        values = np.ascontiguousarray(series.to_numpy())
+        return {"kind": "numeric", "dtype": dtype.str}, values.tobytes()
+
+    values = series.astype(object).where(series.notna(), None).tolist()
+    payload = json.dumps(values, default=str).encode("utf-8")
+    return {"kind": "json", "dtype": str(dtype)}, payload
+
+
+def _decode_column(spec: dict[str, Any], buffer: bytes, n_rows: int) -> Any:
+    kind = spec["kind"]
+
+    if kind == "numeric":
+        return np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=n_rows).copy()
+
+    if kind in ("datetime", "timedelta"):
+        raw = np.frombuffer(buffer, dtype=np.int64, count=n_rows).copy()
+        values = pd.Series(raw.view(np.dtype(spec["dtype"])))
+        if spec.get("tz"):
+            values = values.dt.tz_localize("UTC").dt.tz_convert(spec["tz"])
+        return values.array
+
+    values = pd.Series(json.loads(buffer.decode("utf-8")), dtype=object)
+    if spec["dtype"] != "object":
+        try:
+            values = values.astype(spec["dtype"])
+        except (TypeError, ValueError):
+            pass
+    return values.array
+
+
+def encode_frame(df: pd.DataFrame, compress: bool = True) -> bytes:
+    """
+    Serialize a DataFrame to versioned columnar bytes.
+
+    Args:
+        df: Frame to encode (column labels must be JSON-serializable)
+        compress: zlib-compress the body
+
+    Returns:
+        Encoded payload
+    """
+    specs: list[dict[str, Any]] = []
+    buffers: list[bytes] = []
+    for position, name in enumerate(df.columns):
+        spec, buffer = _encode_column(df.iloc[:, position])
+        spec.update({"name": name, "nbytes": len(buffer)})
+        specs.append(spec)
+        buffers.append(buffer)
+
+    index = df.index
+    if isinstance(index, pd.RangeIndex):
+        index_spec: dict[str, Any] = {
+            "kind": "range",
+            "start": index.start,
+            "step": index.step,
+            "name": index.name,
+        }
+    else:
+        index_spec, buffer = _encode_column(index.to_series(index=pd.RangeIndex(len(index))))
+        index_spec.update({"name": index.name, "nbytes": len(buffer)})
+        buffers.append(buffer)
+
+    header = json.dumps(
+        {"n_rows": len(df), "columns": specs, "index": index_spec}, default=str
+    ).encode("utf-8")
+    body = _HEADER_LEN.pack(len(header)) + header + b"".join(buffers)
+
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 1)
+        flags |= FLAG_ZLIB
+    return MAGIC + bytes([VERSION, flags]) + body
+
+
+def decode_frame(payload: bytes) -> pd.DataFrame:
+    """
+    Deserialize bytes produced by :func:`encode_frame`.
+
+    Raises:
+        FrameCodecError: If the payload is not a supported encoded frame
+    """
+    if not is_encoded_frame(payload):
+        raise FrameCodecError("Payload is not an encoded frame")
+    payload = bytes(payload)
+    version, flags = payload[4], payload[5]
+    if version != VERSION:
+        raise FrameCodecError(f"Unsupported frame codec version {version}")
+
+    body = payload[6:]
+    if flags & FLAG_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise FrameCodecError(f"Corrupt frame payload: {e}") from e
+
+    (header_len,) = _HEADER_LEN.unpack_from(body)
+    offset = _HEADER_LEN.size
+    header = json.loads(body[offset : offset + header_len].decode("utf-8"))
+    offset += header_len
+    n_rows = header["n_rows"]
+
+    data: dict[Any, Any] = {}
+    names = []
+    for spec in header["columns"]:
+        buffer = body[offset : offset + spec["nbytes"]]
+        offset += spec["nbytes"]
+        names.append(spec["name"])
+        data[len(names) - 1] = _decode_column(spec, buffer, n_rows)
+
+    index_spec = header["index"]
+    if index_spec["kind"] == "range":
+        start, step = index_spec["start"], index_spec["step"]
+        index = pd.RangeIndex(start, start + step * n_rows, step, name=index_spec["name"])
+    else:
+        buffer = body[offset : offset + index_spec["nbytes"]]
+        index = pd.Index(_decode_column(index_spec, buffer, n_rows), name=index_spec["name"])
+
+    df = pd.DataFrame(data, index=index)
+    df.columns = names
+    return df
@@ -3,17 +3,99 @@
 # flake8: noqa
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
 
 import numpy as np
 import pandas as pd
 from supabase import Client, create_client
 
 from config.settings import settings
+from src.data.bar_store import BarStore, BarStoreError
+from src.data.bulk_writer import (
+    BulkWriteResult,
+    column_to_python,
+    frame_to_records,
+    write_chunks,
+)
+from src.data.symbol_registry import SymbolRegistry
 
 logger = logging.getLogger(__name__)
 ALLOWED_FORECAST_HORIZONS = {"1D", "5D", "10D", "20D"}
+# Tickers per ``in.(...)`` filter when bulk-resolving symbol ids
+SYMBOL_PREFETCH_CHUNK = 200
+# Row caps applied by fetch_ohlc_bars when no limit is given
+OHLC_DEFAULT_LIMITS = {
+    "m15": 500,
+    "h1": 500,
+    "h4": 400,
+    "d1": 400,
+    "w1": 260,
+}
+OHLC_DEFAULT_PROVIDERS = ("alpaca", "polygon", "yfinance")
+# Conservative bars per trading day (regular session), used to size the ts
+# window that should contain the newest ``limit`` bars in batched fetches
+OHLC_BARS_PER_DAY = {"m15": 26, "h1": 7, "h4": 2, "h8": 1, "d1": 1, "w1": 0.2}
+# Bar spacing per timeframe, used to size the delta-sync overlap of the local bar store
+OHLC_BAR_INTERVALS = {
+    "m15": pd.Timedelta(minutes=15),
+    "h1": pd.Timedelta(hours=1),
+    "h4": pd.Timedelta(hours=4),
+    "h8": pd.Timedelta(hours=8),
+    "d1": pd.Timedelta(days=1),
+    "w1": pd.Timedelta(weeks=1),
+}
+# Symbols per symbol_id=in.(...) request; keeps rows sharing one ts well under a page
+OHLC_BATCH_SYMBOLS = 50
+SUPABASE_MAX_ROWS = 1000
+
+# Optional options_ranks columns and their defaults (see upsert_option_rank_extended)
+OPTION_RANK_DEFAULTS: dict[str, Any] = {
+    "composite_rank": 0.0,
+    "momentum_score": 0.0,
+    "value_score": 0.0,
+    "greeks_score": 0.0,
+    "iv_rank": 0.0,
+    "spread_pct": 0.0,
+    "vol_oi_ratio": 0.0,
+    "liquidity_confidence": 1.0,
+    "ranking_mode": None,
+    "relative_value_score": None,
+    "entry_difficulty_score": None,
+    "ranking_stability_score": None,
+    "iv_curve_ok": None,
+    "iv_data_quality_score": None,
+    "strategy_intent": None,
+    "signal_discount": False,
+    "signal_runner": False,
+    "signal_greeks": False,
+    "signal_buy": False,
+    "signals": "",
+    "entry_rank": None,
+    "exit_rank": None,
+    "entry_value_score": None,
+    "catalyst_score": None,
+    "iv_percentile": None,
+    "iv_discount_score": None,
+    "profit_protection_score": None,
+    "deterioration_score": None,
+    "time_urgency_score": None,
+}
+
+# Shared by every SupabaseDatabase in the process
+symbol_registry = SymbolRegistry(ttl_seconds=float(settings.symbol_cache_ttl_seconds))
+_ohlc_store_dir = settings.ohlc_store_dir
+bar_store = (
+    BarStore(_ohlc_store_dir) if isinstance(_ohlc_store_dir, str) and _ohlc_store_dir else None
+)
+
+
+def _utc(value: pd.Timestamp) -> pd.Timestamp:
+    """Tz-aware UTC timestamp (naive values are taken as UTC)."""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
 
 
 class SupabaseDatabase:
@@ -25,8 +107,67 @@ class SupabaseDatabase:
             settings.supabase_url,
             settings.supabase_key,
         )
+        self.symbol_registry = symbol_registry
+        # (TICKER, timeframe) -> (bars, end_ts, limit) loaded by prefetch_ohlc_bars
+        self._ohlc_prefetch: dict[tuple[str, str], tuple[pd.DataFrame, Any, int | None]] = {}
+        self.bar_store = bar_store
+        # (TICKER, timeframe) -> monotonic time of the last bar store delta sync
+        self._bar_store_synced: dict[tuple[str, str], float] = {}
         logger.info("Supabase client initialized")
 
+    def _write_records(
+        self,
+        table: str,
+        records: list[dict[str, Any]],
+        send,
+        chunk_size: int | None = None,
+    ) -> BulkWriteResult:
+        """Send records in concurrent, retried chunks and log any partial failure."""
+        result = write_chunks(
+            records,
+            send,
+            table=table,
+            chunk_size=int(chunk_size or settings.db_write_chunk_size),
+            max_workers=int(settings.db_write_workers),
+            max_retries=int(settings.db_write_max_retries),
+        )
+        if not result.ok:
+            logger.warning(
+                "Wrote %d/%d rows to %s; %d chunks failed (first error: %s)",
+                result.written,
+                result.total,
+                table,
+                len(result.failures),
+                result.failures[0].error,
+            )
+        return result
+
+    def bulk_upsert(
+        self,
+        table: str,
+        records: list[dict[str, Any]],
+        on_conflict: str,
+        chunk_size: int | None = None,
+    ) -> BulkWriteResult:
+        """
+        Upsert records in size-bounded chunks sent concurrently with retry.
+
+        Args:
+            table: Target table
+            records: JSON-ready rows (see ``bulk_writer.frame_to_records``)
+            on_conflict: Conflict target columns
+            chunk_size: Rows per request (default settings.db_write_chunk_size)
+
+        Returns:
+            BulkWriteResult with rows written and any failed chunks
+        """
+        return self._write_records(
+            table,
+            records,
+            lambda chunk: self.client.table(table).upsert(chunk, on_conflict=on_conflict).execute(),
+            chunk_size=chunk_size,
+        )
+
     def fetch_ohlc_bars(
         self,
         symbol: str,
@@ -35,6 +176,7 @@ class SupabaseDatabase:
         providers: list[str] | tuple[str, ...] | None = None,
         end_ts: datetime | str | pd.Timestamp | None = None,
         source: str | None = None,
+        start_ts: datetime | str | pd.Timestamp | None = None,
     ) -> pd.DataFrame:
         """
         Fetch OHLC bars for a symbol from the database.
@@ -45,23 +187,23 @@ class SupabaseDatabase:
             limit: Maximum number of bars to fetch (most recent)
             end_ts: Optional cutoff timestamp (exclusive). Bars at or after this
                 timestamp are excluded.
+            start_ts: Optional lower bound (inclusive). Bars before this
+                timestamp are excluded.
             source: If "alpaca_4h" and timeframe "h4", read from ohlc_bars_h4_alpaca
                 (Alpaca 4h clone for TabPFN experiments). Otherwise use ohlc_bars_v2.
 
         Returns:
             DataFrame with columns: ts, open, high, low, close, volume
         """
+        if not (providers or source or start_ts is not None):
+            prefetched = self._prefetched_ohlc_bars(symbol, timeframe, limit, end_ts)
+            if prefetched is not None:
+                return prefetched
+
         try:
             # Get symbol_id (soft fail if ticker not in symbols table)
             try:
-                symbol_response = (
-                    self.client.table("symbols")
-                    .select("id")
-                    .eq("ticker", symbol.upper())
-                    .single()
-                    .execute()
-                )
-                symbol_id = symbol_response.data["id"]
+                symbol_id = self._resolve_symbol_id(symbol)
             except Exception as sym_err:
                 err_str = str(sym_err).lower()
                 if "pgrst116" in err_str or "0 rows" in err_str or "single json object" in err_str:
@@ -85,6 +227,8 @@ class SupabaseDatabase:
                 if end_ts is not None:
                     ts_iso = pd.to_datetime(end_ts).isoformat()
                     query = query.lt("ts", ts_iso)
+                if start_ts is not None:
+                    query = query.gte("ts", pd.to_datetime(start_ts).isoformat())
                 if limit:
                     query = query.limit(limit)
                 response = query.execute()
@@ -107,6 +251,13 @@ class SupabaseDatabase:
                 )
                 return df
 
+            if self.bar_store is not None and source is None:
+                stored = self._fetch_ohlc_from_store(
+                    symbol, symbol_id, timeframe, limit, providers, start_ts, end_ts
+                )
+                if stored is not None:
+                    return stored
+
             preferred_providers = list(
                 dict.fromkeys(
                     providers
@@ -129,16 +280,7 @@ class SupabaseDatabase:
                 else:
                     attempts.append("any")
 
-                effective_limit = limit
-                if not effective_limit:
-                    default_caps = {
-                        "m15": 500,
-                        "h1": 500,
-                        "h4": 400,
-                        "d1": 400,
-                        "w1": 260,
-                    }
-                    effective_limit = default_caps.get(timeframe)
+                effective_limit = limit or OHLC_DEFAULT_LIMITS.get(timeframe)
 
                 # Supabase caps at 1000 rows per request; paginate using cursor (O(1))
                 # instead of OFFSET (scans all skipped rows)
@@ -164,6 +306,8 @@ class SupabaseDatabase:
                     if end_ts is not None:
                         ts_iso = pd.to_datetime(end_ts).isoformat()
                         chunk_query = chunk_query.lt("ts", ts_iso)
+                    if start_ts is not None:
+                        chunk_query = chunk_query.gte("ts", pd.to_datetime(start_ts).isoformat())
                     if provider:
                         chunk_query = chunk_query.eq("provider", provider)
                     if cursor_ts is not None:
@@ -222,6 +366,446 @@ class SupabaseDatabase:
             )
             raise
 
+    def fetch_ohlc_bars_batch(
+        self,
+        symbols: Iterable[str],
+        timeframes: Iterable[str] = ("d1",),
+        limit: int | dict[str, int] | None = None,
+        providers: list[str] | tuple[str, ...] | None = None,
+        end_ts: datetime | str | pd.Timestamp | None = None,
+        start_ts: datetime | str | pd.Timestamp | None = None,
+        max_workers: int = 4,
+    ) -> dict[str, dict[str, pd.DataFrame]]:
+        """
+        Fetch OHLC bars for many symbols and timeframes in a few requests.
+
+        Rows for up to OHLC_BATCH_SYMBOLS symbols come back per
+        ``symbol_id=in.(...)`` query, windowed by timestamp and paginated on
+        ``ts``; provider precedence is then resolved per symbol in one pass
+        (first provider with bars in the window, else all providers) and each
+        frame is shaped like a ``fetch_ohlc_bars`` result.
+        Without ``start_ts`` the window is sized from the row limit; symbols
+        that come back short of it are re-fetched with ``fetch_ohlc_bars``.
+        With the local bar store enabled each partition is delta-synced and
+        served from the store instead; only partitions the store cannot
+        answer go to the batched queries.
+
+        Args:
+            symbols: Stock ticker symbols
+            timeframes: Timeframes to load
+            limit: Rows per symbol (most recent), or a per-timeframe dict;
+                defaults to the fetch_ohlc_bars caps
+            providers: Provider precedence (default alpaca, polygon, yfinance)
+            end_ts: Optional cutoff timestamp (exclusive)
+            start_ts: Optional lower bound (inclusive)
+            max_workers: Concurrent requests
+
+        Returns:
+            {TICKER: {timeframe: DataFrame}} in fetch_ohlc_bars format
+        """
+        tickers = list(dict.fromkeys(SymbolRegistry.normalize(s) for s in symbols if s))
+        timeframes = list(dict.fromkeys(timeframes))
+        preferred = list(dict.fromkeys(providers or OHLC_DEFAULT_PROVIDERS))
+        symbol_ids = self.prefetch_symbol_ids(tickers)
+        end = pd.to_datetime(end_ts) if end_ts is not None else None
+
+        out: dict[str, dict[str, pd.DataFrame]] = {ticker: {} for ticker in tickers}
+        for ticker in tickers:
+            if ticker not in symbol_ids:
+                for timeframe in timeframes:
+                    empty = pd.DataFrame()
+                    empty.attrs["skip_reason"] = "symbol not in symbols table"
+                    out[ticker][timeframe] = empty
+
+        known = [ticker for ticker in tickers if ticker in symbol_ids]
+        pending = {timeframe: known for timeframe in timeframes}
+        if self.bar_store is not None:
+            pending = self._fetch_ohlc_batch_from_store(
+                out, symbol_ids, pending, limit, providers, start_ts, end_ts, max_workers
+            )
+
+        tasks = []
+        for timeframe in timeframes:
+            tf_limit = limit.get(timeframe) if isinstance(limit, dict) else limit
+            tf_limit = tf_limit or OHLC_DEFAULT_LIMITS.get(timeframe)
+            window_start = pd.to_datetime(start_ts) if start_ts is not None else None
+            estimated = window_start is None and tf_limit is not None
+            if estimated:
+                window_start = self._ohlc_window_start(timeframe, tf_limit, end)
+            tf_known = pending[timeframe]
+            for i in range(0, len(tf_known), OHLC_BATCH_SYMBOLS):
+                chunk = tf_known[i : i + OHLC_BATCH_SYMBOLS]
+                tasks.append((timeframe, tf_limit, window_start, estimated, chunk))
+
+        def load(task):
+            timeframe, _, window_start, _, chunk = task
+            ids = [symbol_ids[ticker] for ticker in chunk]
+            return self._fetch_ohlc_rows(ids, timeframe, window_start, end)
+
+        if max_workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(tasks)), thread_name_prefix="ohlc-batch"
+            ) as pool:
+                loaded = list(pool.map(load, tasks))
+        else:
+            loaded = [load(task) for task in tasks]
+
+        refetch = []
+        for (timeframe, tf_limit, _, estimated, chunk), rows in zip(tasks, loaded):
+            by_symbol = rows.groupby("symbol_id", sort=False) if not rows.empty else None
+            for ticker in chunk:
+                symbol_rows = (
+                    by_symbol.get_group(symbol_ids[ticker])
+                    if by_symbol is not None and symbol_ids[ticker] in by_symbol.groups
+                    else rows.iloc[:0]
+                )
+                df = self._select_provider_bars(symbol_rows, preferred, tf_limit)
+                if estimated and len(df) < tf_limit:
+                    refetch.append((ticker, timeframe, tf_limit))
+                    continue
+                if df.empty:
+                    df.attrs["skip_reason"] = "0 bars returned"
+                out[ticker][timeframe] = df
+
+        # Window too short (gaps, new listings): fall back to the per-symbol cursor walk
+        for ticker, timeframe, tf_limit in refetch:
+            out[ticker][timeframe] = self.fetch_ohlc_bars(
+                ticker,
+                timeframe=timeframe,
+                limit=tf_limit,
+                providers=providers,
+                end_ts=end_ts,
+            )
+
+        logger.info(
+            "Batch-fetched OHLC bars for %d symbols x %d timeframes in %d queries "
+            "(%d re-fetched, %d served from the bar store)",
+            len(tickers),
+            len(timeframes),
+            len(tasks),
+            len(refetch),
+            len(known) * len(timeframes) - sum(len(chunk) for chunk in pending.values()),
+        )
+        return out
+
+    def _fetch_ohlc_batch_from_store(
+        self,
+        out: dict[str, dict[str, pd.DataFrame]],
+        symbol_ids: dict[str, str],
+        pending: dict[str, list[str]],
+        limit: int | dict[str, int] | None,
+        providers: list[str] | tuple[str, ...] | None,
+        start_ts: datetime | str | pd.Timestamp | None,
+        end_ts: datetime | str | pd.Timestamp | None,
+        max_workers: int,
+    ) -> dict[str, list[str]]:
+        """
+        Fill ``out`` from the local bar store (delta-syncing each partition).
+
+        Returns:
+            {timeframe: tickers} the store could not serve
+        """
+        jobs = [(ticker, timeframe) for timeframe, chunk in pending.items() for ticker in chunk]
+
+        def load(job):
+            ticker, timeframe = job
+            tf_limit = limit.get(timeframe) if isinstance(limit, dict) else limit
+            return self._fetch_ohlc_from_store(
+                ticker, symbol_ids[ticker], timeframe, tf_limit, providers, start_ts, end_ts
+            )
+
+        if max_workers > 1 and len(jobs) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(jobs)), thread_name_prefix="ohlc-store"
+            ) as pool:
+                loaded = list(pool.map(load, jobs))
+        else:
+            loaded = [load(job) for job in jobs]
+
+        missed: dict[str, list[str]] = {timeframe: [] for timeframe in pending}
+        for (ticker, timeframe), df in zip(jobs, loaded):
+            if df is None:
+                missed[timeframe].append(ticker)
+            else:
+                out[ticker][timeframe] = df
+        return missed
+
+    @staticmethod
+    def _ohlc_window_start(timeframe: str, limit: int, end: pd.Timestamp | None) -> pd.Timestamp:
+        """Lower ts bound that should contain ``limit`` bars before ``end``."""
+        trading_days = limit / OHLC_BARS_PER_DAY.get(timeframe, 1)
+        calendar_days = trading_days * 7 / 5 * 1.25 + 7  # weekends, holidays, slack
+        anchor = end if end is not None else pd.Timestamp.utcnow()
+        return anchor - pd.Timedelta(days=calendar_days)
+
+    def _fetch_ohlc_rows(
+        self,
+        symbol_ids: list[str],
+        timeframe: str,
+        start: pd.Timestamp | None,
+        end: pd.Timestamp | None,
+    ) -> pd.DataFrame:
+        """All non-forecast ohlc_bars_v2 rows for ``symbol_ids`` in [start, end), newest first."""
+        rows: list[dict] = []
+        seen: set[tuple] = set()
+        cursor_ts: str | None = None
+        while True:
+            query = (
+                self.client.table("ohlc_bars_v2")
+                .select("symbol_id, provider, ts, open, high, low, close, volume")
+                .in_("symbol_id", symbol_ids)
+                .eq("timeframe", timeframe)
+                .eq("is_forecast", False)
+                .order("ts", desc=True)
+                .limit(SUPABASE_MAX_ROWS)
+            )
+            if end is not None:
+                query = query.lt("ts", end.isoformat())
+            if start is not None:
+                query = query.gte("ts", start.isoformat())
+            if cursor_ts is not None:
+                # Inclusive cursor: rows sharing the boundary ts may span two pages
+                query = query.lte("ts", cursor_ts)
+            page = query.execute().data or []
+            for row in page:
+                key = (row["symbol_id"], row.get("provider"), row["ts"])
+                if key not in seen:
+                    seen.add(key)
+                    rows.append(row)
+            if len(page) < SUPABASE_MAX_ROWS or page[-1]["ts"] == cursor_ts:
+                break
+            cursor_ts = page[-1]["ts"]
+        return pd.DataFrame(
+            rows, columns=["symbol_id", "provider", "ts", "open", "high", "low", "close", "volume"]
+        )
+
+    @staticmethod
+    def _select_provider_bars(
+        rows: pd.DataFrame, preferred: list[str], limit: int | None
+    ) -> pd.DataFrame:
+        """Newest ``limit`` bars of the first provider with data (else of all providers)."""
+        provider = "any"
+        selected = rows
+        for candidate in preferred:
+            provider_rows = rows[rows["provider"] == candidate]
+            if not provider_rows.empty:
+                provider, selected = candidate, provider_rows
+                break
+        if selected.empty:
+            df = pd.DataFrame()
+            df.attrs["provider"] = "any"
+            return df
+
+        # Rows arrive newest first
+        if limit:
+            selected = selected.iloc[:limit]
+        df = selected[["ts", "open", "high", "low", "close", "volume"]].copy()
+        df["ts"] = pd.to_datetime(df["ts"])
+        if df["ts"].dt.tz is not None:
+            df["ts"] = df["ts"].dt.tz_localize(None)
+        df = df.sort_values("ts").reset_index(drop=True)
+        df.attrs["provider"] = provider
+        return df
+
+    def prefetch_ohlc_bars(
+        self,
+        symbols: Iterable[str],
+        timeframes: Iterable[str] = ("d1",),
+        limit: int | dict[str, int] | None = None,
+        end_ts: datetime | str | pd.Timestamp | None = None,
+    ) -> int:
+        """
+        Job-level prefetch: batch-load bars that later ``fetch_ohlc_bars`` calls reuse.
+
+        A later call is served from the prefetch when it asks for the same
+        symbol, timeframe and ``end_ts`` with no more rows than were loaded
+        (and no providers/source/start_ts override). Failures only log; the
+        per-symbol path still works. Call ``clear_ohlc_prefetch`` when done.
+
+        Returns:
+            Number of (symbol, timeframe) frames held
+        """
+        try:
+            batch = self.fetch_ohlc_bars_batch(
+                symbols, timeframes=timeframes, limit=limit, end_ts=end_ts
+            )
+        except Exception as e:
+            logger.warning("OHLC prefetch failed; falling back to per-symbol fetches: %s", e)
+            return 0
+
+        end = pd.to_datetime(end_ts) if end_ts is not None else None
+        for ticker, frames in batch.items():
+            for timeframe, df in frames.items():
+                if "skip_reason" in df.attrs and df.attrs["skip_reason"] != "0 bars returned":
+                    continue
+                tf_limit = limit.get(timeframe) if isinstance(limit, dict) else limit
+                tf_limit = tf_limit or OHLC_DEFAULT_LIMITS.get(timeframe)
+                self._ohlc_prefetch[(ticker, timeframe)] = (df, end, tf_limit)
+        return len(self._ohlc_prefetch)
+
+    def clear_ohlc_prefetch(self) -> None:
+        """Drop bars held by ``prefetch_ohlc_bars``."""
+        self._ohlc_prefetch.clear()
+
+    def _prefetched_ohlc_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int | None,
+        end_ts: datetime | str | pd.Timestamp | None,
+    ) -> pd.DataFrame | None:
+        entry = self._ohlc_prefetch.get((SymbolRegistry.normalize(symbol), timeframe))
+        if entry is None:
+            return None
+        df, prefetched_end, prefetched_limit = entry
+        end = pd.to_datetime(end_ts) if end_ts is not None else None
+        if end != prefetched_end:
+            return None
+        wanted = limit or OHLC_DEFAULT_LIMITS.get(timeframe)
+        complete = prefetched_limit is None or len(df) < prefetched_limit
+        if not complete and (wanted is None or wanted > prefetched_limit):
+            return None
+        out = df.tail(wanted).reset_index(drop=True) if wanted else df.copy()
+        out.attrs = dict(df.attrs)
+        return out
+
+    def _fetch_ohlc_from_store(
+        self,
+        symbol: str,
+        symbol_id: str,
+        timeframe: str,
+        limit: int | None,
+        providers: list[str] | tuple[str, ...] | None,
+        start_ts: datetime | str | pd.Timestamp | None,
+        end_ts: datetime | str | pd.Timestamp | None,
+    ) -> pd.DataFrame | None:
+        """
+        Serve fetch_ohlc_bars from the local bar store after a delta sync.
+
+        Returns None (caller queries Supabase) when the store cannot answer:
+        too few stored bars for ``limit``, or a sync / integrity failure.
+        """
+        effective_limit = limit or OHLC_DEFAULT_LIMITS.get(timeframe)
+        start = pd.to_datetime(start_ts) if start_ts is not None else None
+        end = pd.to_datetime(end_ts) if end_ts is not None else None
+        if start is not None:
+            need_from = start
+        elif effective_limit:
+            need_from = self._ohlc_window_start(timeframe, effective_limit, end)
+        else:
+            need_from = None
+
+        try:
+            complete = self._sync_bar_store(symbol, symbol_id, timeframe, need_from, end)
+            rows = self.bar_store.load(symbol, timeframe, start=start, end=end)
+        except BarStoreError as e:
+            logger.warning("Dropping corrupt bar store partition %s %s: %s", symbol, timeframe, e)
+            self.bar_store.drop(symbol, timeframe)
+            return None
+        except Exception as e:
+            logger.warning("Bar store unavailable for %s (%s): %s", symbol, timeframe, e)
+            return None
+
+        preferred = list(dict.fromkeys(providers or OHLC_DEFAULT_PROVIDERS))
+        df = self._select_provider_bars(rows.iloc[::-1], preferred, effective_limit)
+        if effective_limit and len(df) < effective_limit and start is None and not complete:
+            # Gaps made the estimated window too short; take the paginated path
+            return None
+        if df.empty:
+            df.attrs["skip_reason"] = "0 bars returned"
+        logger.debug(
+            "Served %s bars for %s (%s) from the local bar store", len(df), symbol, timeframe
+        )
+        return df
+
+    def _sync_bar_store(
+        self,
+        symbol: str,
+        symbol_id: str,
+        timeframe: str,
+        need_from: pd.Timestamp | None,
+        end: pd.Timestamp | None,
+    ) -> bool:
+        """
+        Bring the local partition up to date and make it cover ``need_from``.
+
+        Older bars are back-filled once; after that each sync pulls only the
+        bars from a few intervals before the high-water mark onwards.
+
+        Returns:
+            True when the partition holds the symbol's full history
+        """
+        store = self.bar_store
+        key = (SymbolRegistry.normalize(symbol), timeframe)
+        seeded, low_water, high_water = store.coverage(symbol, timeframe)
+
+        if not seeded:
+            rows = self._fetch_ohlc_rows([symbol_id], timeframe, need_from, None)
+            store.append(symbol, timeframe, rows, low_water=need_from)
+            self._bar_store_synced[key] = time.monotonic()
+            return need_from is None
+
+        if low_water is not None and (need_from is None or _utc(need_from) < _utc(low_water)):
+            rows = self._fetch_ohlc_rows([symbol_id], timeframe, need_from, low_water)
+            store.append(symbol, timeframe, rows, low_water=need_from)
+            _, low_water, high_water = store.coverage(symbol, timeframe)
+
+        if high_water is not None:
+            overlap = OHLC_BAR_INTERVALS.get(timeframe, pd.Timedelta(days=1)) * int(
+                settings.ohlc_store_resync_bars
+            )
+            resync_from = high_water - overlap
+        else:
+            resync_from = low_water
+        recently_synced = time.monotonic() - self._bar_store_synced.get(key, float("-inf")) < float(
+            settings.ohlc_store_sync_seconds
+        )
+        settled = end is not None and resync_from is not None and _utc(end) <= _utc(resync_from)
+        if not (recently_synced or settled):
+            rows = self._fetch_ohlc_rows([symbol_id], timeframe, resync_from, None)
+            store.append(symbol, timeframe, rows)
+            self._bar_store_synced[key] = time.monotonic()
+        return low_water is None
+
+    def sync_bar_store(
+        self,
+        symbols: Iterable[str],
+        timeframes: Iterable[str] = ("d1",),
+        limit: int | dict[str, int] | None = None,
+    ) -> dict[str, int]:
+        """
+        Delta-sync the local bar store for many symbols (e.g. before a job run).
+
+        Each partition is back-filled to cover ``limit`` bars on first use and
+        then only pulls bars newer than its high-water mark.
+
+        Returns:
+            {timeframe: partitions synced}
+        """
+        if self.bar_store is None:
+            raise RuntimeError("Local bar store disabled; set OHLC_STORE_DIR")
+        symbol_ids = self.prefetch_symbol_ids(symbols)
+        synced: dict[str, int] = {}
+        for timeframe in timeframes:
+            tf_limit = limit.get(timeframe) if isinstance(limit, dict) else limit
+            tf_limit = tf_limit or OHLC_DEFAULT_LIMITS.get(timeframe)
+            need_from = self._ohlc_window_start(timeframe, tf_limit, None) if tf_limit else None
+            synced[timeframe] = 0
+            for ticker, symbol_id in symbol_ids.items():
+                # Force a delta even if this process synced moments ago
+                self._bar_store_synced.pop((ticker, timeframe), None)
+                try:
+                    self._sync_bar_store(ticker, symbol_id, timeframe, need_from, None)
+                    synced[timeframe] += 1
+                except BarStoreError as e:
+                    logger.warning(
+                        "Dropping corrupt bar store partition %s %s: %s", ticker, timeframe, e
+                    )
+                    self.bar_store.drop(ticker, timeframe)
+                except Exception as e:
+                    logger.warning("Bar store sync failed for %s (%s): %s", ticker, timeframe, e)
+        return synced
+
     def fetch_indicator_values(
         self,
         symbol_id: str,
@@ -259,10 +843,14 @@ class SupabaseDatabase:
         symbol_id: str,
         timeframe: str,
         df: pd.DataFrame,
-    ) -> None:
-        """Upsert indicator values for a symbol/timeframe."""
+    ) -> BulkWriteResult:
+        """Upsert indicator values for a symbol/timeframe.
+
+        Returns:
+            BulkWriteResult; failed chunks are logged and reported, not raised
+        """
         if df.empty:
-            return
+            return BulkWriteResult(table="indicator_values")
 
         columns = [
             "ts",
@@ -303,38 +891,57 @@ class SupabaseDatabase:
             "supertrend_metrics",
         ]
 
-        records = []
-        for _, row in df.iterrows():
-            record = {
-                "symbol_id": symbol_id,
-                "timeframe": timeframe,
-            }
-            for col in columns:
-                if col in row.index:
-                    value = row.get(col)
-                    if col == "supertrend_trend" and value is not None:
-                        try:
-                            value = int(float(value))
-                        except (TypeError, ValueError):
-                            value = None
-                    if col == "ts" and value is not None:
-                        try:
-                            value = pd.to_datetime(value).isoformat()
-                        except Exception:
-                            pass
-                    if pd.isna(value):
-                        value = None
-                    record[col] = value
-            records.append(record)
+        records = frame_to_records(
+            df,
+            columns=columns,
+            kinds={"ts": "datetime", "supertrend_trend": "int"},
+            constants={"symbol_id": symbol_id, "timeframe": timeframe},
+        )
+        return self.bulk_upsert("indicator_values", records, on_conflict="symbol_id,timeframe,ts")
 
+    def fetch_indicator_state(self, symbol_id: str, timeframe: str) -> dict | None:
+        """Fetch the persisted incremental indicator state for a symbol/timeframe."""
         try:
-            self.client.table("indicator_values").upsert(
-                records,
-                on_conflict="symbol_id,timeframe,ts",
+            response = (
+                self.client.table("indicator_state")
+                .select("state")
+                .eq("symbol_id", symbol_id)
+                .eq("timeframe", timeframe)
+                .limit(1)
+                .execute()
+            )
+            rows = response.data or []
+            return rows[0].get("state") if rows else None
+        except Exception as e:
+            logger.warning(
+                "Error fetching indicator_state for %s (%s): %s",
+                symbol_id,
+                timeframe,
+                e,
+            )
+            return None
+
+    def upsert_indicator_state(
+        self,
+        symbol_id: str,
+        timeframe: str,
+        state: dict,
+    ) -> None:
+        """Upsert the incremental indicator state for a symbol/timeframe."""
+        try:
+            self.client.table("indicator_state").upsert(
+                {
+                    "symbol_id": symbol_id,
+                    "timeframe": timeframe,
+                    "last_ts": state.get("last_ts"),
+                    "state": state,
+                    "updated_at": datetime.utcnow().isoformat(),
+                },
+                on_conflict="symbol_id,timeframe",
             ).execute()
         except Exception as e:
             logger.warning(
-                "Error upserting indicator_values for %s (%s): %s",
+                "Error upserting indicator_state for %s (%s): %s",
                 symbol_id,
                 timeframe,
                 e,
@@ -666,10 +1273,28 @@ class SupabaseDatabase:
             )
             return None
 
+    def _resolve_symbol_id(self, symbol: str) -> str:
+        """Symbol UUID from the shared registry, querying ``symbols`` on a miss."""
+        symbol_id = self.symbol_registry.get(symbol)
+        if symbol_id is not None:
+            return symbol_id
+        response = (
+            self.client.table("symbols")
+            .select("id")
+            .eq("ticker", symbol.upper())
+            .single()
+            .execute()
+        )
+        symbol_id = response.data["id"]
+        self.symbol_registry.put(symbol, symbol_id)
+        return symbol_id
+
     def get_symbol_id(self, symbol: str) -> str:
         """
         Get the UUID for a symbol ticker.
 
+        Served from the process-wide symbol registry when cached.
+
         Args:
             symbol: Stock ticker symbol
 
@@ -677,14 +1302,7 @@ class SupabaseDatabase:
             Symbol UUID
         """
         try:
-            response = (
-                self.client.table("symbols")
-                .select("id")
-                .eq("ticker", symbol.upper())
-                .single()
-                .execute()
-            )
-            return response.data["id"]
+            return self._resolve_symbol_id(symbol)
         except Exception as e:
             logger.error(
                 "Error fetching symbol_id for %s: %s",
@@ -713,6 +1331,50 @@ class SupabaseDatabase:
                 pass  # e.g. race: another process inserted
             return self.get_symbol_id(symbol)
 
+    def prefetch_symbol_ids(self, symbols: Iterable[str]) -> dict[str, str]:
+        """
+        Resolve many tickers with a few bulk ``symbols`` queries.
+
+        Results land in the shared symbol registry, so later per-symbol
+        lookups in this process skip the round trip. Tickers missing from
+        the table are left out of the result.
+
+        Args:
+            symbols: Stock ticker symbols
+
+        Returns:
+            Mapping of upper-case ticker to symbol UUID
+        """
+        tickers = list(dict.fromkeys(SymbolRegistry.normalize(s) for s in symbols if s))
+        resolved = self.symbol_registry.get_many(tickers)
+        missing = [ticker for ticker in tickers if ticker not in resolved]
+
+        for start in range(0, len(missing), SYMBOL_PREFETCH_CHUNK):
+            chunk = missing[start : start + SYMBOL_PREFETCH_CHUNK]
+            try:
+                response = (
+                    self.client.table("symbols").select("id,ticker").in_("ticker", chunk).execute()
+                )
+            except Exception as e:
+                logger.warning("Error prefetching symbol ids for %d tickers: %s", len(chunk), e)
+                continue
+            found = {row["ticker"].upper(): row["id"] for row in response.data or []}
+            self.symbol_registry.update(found)
+            resolved.update(found)
+
+        if missing:
+            logger.info(
+                "Prefetched %d/%d symbol ids (%d already cached)",
+                len(resolved),
+                len(tickers),
+                len(tickers) - len(missing),
+            )
+        return resolved
+
+    def invalidate_symbol_ids(self, symbols: Iterable[str] | None = None) -> None:
+        """Drop cached symbol ids (all of them when ``symbols`` is None)."""
+        self.symbol_registry.invalidate(symbols)
+
     def fetch_recent_forecast_horizons(
         self,
         symbol_id: str,
@@ -1557,6 +2219,49 @@ class SupabaseDatabase:
             )
             raise
 
+    def upsert_option_ranks(self, records: list[dict[str, Any]]) -> BulkWriteResult:
+        """
+        Bulk version of ``upsert_option_rank_extended``.
+
+        Each record takes that method's keyword arguments; omitted optional
+        columns get the same defaults. Per chunk, existing ranks for the
+        chunk's contracts (and ranking_mode) are deleted and the new rows
+        inserted, with chunks sent concurrently and retried. When a contract
+        appears more than once for a mode, the last record wins, as it would
+        with sequential single-row upserts.
+
+        Returns:
+            BulkWriteResult; failed chunks are logged and reported, not raised
+        """
+        latest: dict[tuple[Any, Any], dict[str, Any]] = {}
+        for record in records:
+            row = {**OPTION_RANK_DEFAULTS, **record}
+            latest.pop((row["contract_symbol"], row["ranking_mode"]), None)
+            latest[(row["contract_symbol"], row["ranking_mode"])] = row
+
+        by_mode: dict[Any, list[dict[str, Any]]] = {}
+        for row in latest.values():
+            by_mode.setdefault(row["ranking_mode"], []).append(row)
+
+        result = BulkWriteResult(table="options_ranks", total=len(latest))
+        for ranking_mode, rows in by_mode.items():
+
+            def send(chunk: list[dict[str, Any]], ranking_mode=ranking_mode) -> None:
+                delete_query = (
+                    self.client.table("options_ranks")
+                    .delete()
+                    .in_("contract_symbol", [row["contract_symbol"] for row in chunk])
+                )
+                if ranking_mode is not None:
+                    delete_query = delete_query.eq("ranking_mode", ranking_mode)
+                delete_query.execute()
+                self.client.table("options_ranks").insert(chunk).execute()
+
+            mode_result = self._write_records("options_ranks", rows, send)
+            result.written += mode_result.written
+            result.failures.extend(mode_result.failures)
+        return result
+
     def insert_options_snapshots(
         self,
         symbol_id: str,
@@ -1570,75 +2275,56 @@ class SupabaseDatabase:
 
         Returns:
             Number of records inserted
+
+        Raises:
+            BulkWriteError: if any chunk still fails after retries (the other
+                chunks stay written; the error carries the full result)
         """
         if snapshots_df.empty:
             return 0
 
-        inserted = 0
-        records = []
-
-        def _safe_float(v: Any) -> float | None:
-            if v is None or (isinstance(v, float) and pd.isna(v)):
-                return None
-            if pd.isna(v):
-                return None
-            try:
-                return float(v)
-            except Exception:
-                return None
+        df = snapshots_df
+        n = len(df)
 
-        def _safe_int(v: Any) -> int:
-            if v is None or (isinstance(v, float) and pd.isna(v)):
-                return 0
-            if pd.isna(v):
-                return 0
-            try:
-                return int(v)
-            except Exception:
-                return 0
+        def column(name: str, default: Any) -> pd.Series:
+            return df[name] if name in df.columns else pd.Series([default] * n, index=df.index)
 
-        for _, row in snapshots_df.iterrows():
-            record = {
-                "underlying_symbol_id": symbol_id,
-                "contract_symbol": str(row.get("contract_symbol", "")),
-                "option_type": str(row.get("option_type", "call")),
-                "strike": float(row.get("strike", 0) or 0),
-                "expiration": str(row.get("expiration", "")),
-                "bid": _safe_float(row.get("bid", 0)),
-                "ask": _safe_float(row.get("ask", 0)),
-                "last": _safe_float(row.get("last", 0)),
-                "underlying_price": _safe_float(row.get("underlying_price", 0)),
-                "volume": _safe_int(row.get("volume", 0)),
-                "open_interest": _safe_int(row.get("open_interest", 0)),
-                "delta": _safe_float(row.get("delta", 0)),
-                "gamma": _safe_float(row.get("gamma", 0)),
-                "theta": _safe_float(row.get("theta", 0)),
-                "vega": _safe_float(row.get("vega", 0)),
-                "rho": _safe_float(row.get("rho", 0)),
-                "iv": _safe_float(row.get("iv", 0)),
-                "snapshot_time": str(row.get("snapshot_time", "")),
-            }
-            records.append(record)
+        # Text columns keep str() of whatever is there; numbers are coerced
+        # (missing/unparseable -> None for floats, 0 for counts)
+        fields: dict[str, list[Any]] = {
+            "contract_symbol": column("contract_symbol", "").astype(str).tolist(),
+            "option_type": column("option_type", "call").astype(str).tolist(),
+            "strike": column_to_python(column("strike", 0), "float", default=0.0),
+            "expiration": column("expiration", "").astype(str).tolist(),
+        }
+        for name in ("bid", "ask", "last", "underlying_price"):
+            fields[name] = column_to_python(column(name, 0), "float")
+        for name in ("volume", "open_interest"):
+            fields[name] = column_to_python(column(name, 0), "int", default=0)
+        for name in ("delta", "gamma", "theta", "vega", "rho", "iv"):
+            fields[name] = column_to_python(column(name, 0), "float")
+        fields["snapshot_time"] = column("snapshot_time", "").astype(str).tolist()
+
+        names = list(fields)
+        records = [
+            {"underlying_symbol_id": symbol_id, **dict(zip(names, values))}
+            for values in zip(*fields.values())
+        ]
 
-        try:
-            # Use upsert with on_conflict to handle duplicates
-            self.client.table("options_snapshots").upsert(
-                records,
-                on_conflict="contract_symbol,snapshot_time",
-            ).execute()
-            inserted = len(records)
-            logger.info(
-                "Inserted %s options snapshots",
-                inserted,
-            )
-        except Exception as e:
+        # Use upsert with on_conflict to handle duplicates
+        result = self.bulk_upsert(
+            "options_snapshots", records, on_conflict="contract_symbol,snapshot_time"
+        )
+        logger.info("Inserted %s options snapshots", result.written)
+        if not result.ok:
             logger.error(
-                "Error inserting options snapshots: %s",
-                e,
+                "Error inserting options snapshots: %d/%d rows failed",
+                result.failed,
+                result.total,
             )
-            raise
+            result.raise_for_failures()
 
-        return inserted
+        return result.written
 
     def get_options_history(
         self,
@@ -2687,138 +3373,119 @@ class SupabaseDatabase:
                 - support_distance_pct, resistance_distance_pct: S/R distance metrics
                 - adx, atr_14, bb_upper, bb_lower: Additional indicators
                 - metadata: Optional JSONB dict
-            batch_size: Number of records per batch upsert (default 100)
+            batch_size: Number of records per upsert request (default 100);
+                requests are sent concurrently
 
         Returns:
-            Number of records upserted
+            Number of records upserted (failed chunks are logged, not raised)
         """
         if not indicators:
             return 0
 
-        def _safe_float(v: Any) -> float | None:
-            """Convert value to float, returning None for invalid values."""
-            if v is None:
-                return None
-            try:
-                f = float(v)
-                if pd.isna(f) or np.isinf(f):
-                    return None
-                return f
-            except (TypeError, ValueError):
-                return None
-
-        def _safe_int(v: Any) -> int | None:
-            """Convert value to int, returning None for invalid values."""
-            if v is None:
-                return None
-            try:
-                i = int(v)
-                if pd.isna(i):
-                    return None
-                return i
-            except (TypeError, ValueError):
-                return None
-
-        total_upserted = 0
-
-        try:
-            # Process in batches
-            for i in range(0, len(indicators), batch_size):
-                batch = indicators[i : i + batch_size]
-
-                records = []
-                for ind in batch:
-                    ts = ind.get("ts")
-                    if hasattr(ts, "isoformat"):
-                        ts = ts.isoformat()
-
-                    record = {
-                        "symbol_id": symbol_id,
-                        "timeframe": timeframe,
-                        "ts": ts,
-                        # OHLC
-                        "open": _safe_float(ind.get("open")),
-                        "high": _safe_float(ind.get("high")),
-                        "low": _safe_float(ind.get("low")),
-                        "close": _safe_float(ind.get("close")),
-                        "volume": _safe_int(ind.get("volume")),
-                        # RSI
-                        "rsi_14": _safe_float(ind.get("rsi_14")),
-                        # MACD
-                        "macd": _safe_float(ind.get("macd")),
-                        "macd_signal": _safe_float(ind.get("macd_signal")),
-                        "macd_hist": _safe_float(ind.get("macd_hist")),
-                        # SuperTrend
-                        "supertrend_value": _safe_float(
-                            ind.get("supertrend_value") or ind.get("supertrend")
-                        ),
-                        "supertrend_trend": _safe_int(ind.get("supertrend_trend")),
-                        "supertrend_factor": _safe_float(
-                            ind.get("supertrend_factor")
-                            or ind.get("supertrend_adaptive_factor")
-                            or ind.get("target_factor")
-                        ),
-                        "supertrend_performance_index": _safe_float(
-                            ind.get("supertrend_performance_index")
-                        ),
-                        "supertrend_signal_strength": _safe_int(
-                            ind.get("supertrend_signal_strength")
-                        ),
-                        "signal_confidence": _safe_int(ind.get("signal_confidence")),
-                        "supertrend_confidence_norm": _safe_float(
-                            ind.get("supertrend_confidence_norm")
-                        ),
-                        "supertrend_distance_norm": _safe_float(
-                            ind.get("supertrend_distance_norm")
-                        ),
-                        "supertrend_distance_pct": _safe_float(ind.get("supertrend_distance_pct")),
-                        "supertrend_metrics": ind.get("supertrend_metrics"),
-                        "perf_ama": _safe_float(ind.get("perf_ama")),
-                        # S/R
-                        "nearest_support": _safe_float(ind.get("nearest_support")),
-                        "nearest_resistance": _safe_float(ind.get("nearest_resistance")),
-                        "support_distance_pct": _safe_float(ind.get("support_distance_pct")),
-                        "resistance_distance_pct": _safe_float(ind.get("resistance_distance_pct")),
-                        # Additional
-                        "adx": _safe_float(ind.get("adx")),
-                        "atr_14": _safe_float(ind.get("atr_14")),
-                        "bb_upper": _safe_float(ind.get("bb_upper")),
-                        "bb_lower": _safe_float(ind.get("bb_lower")),
-                        # Momentum / oscillators
-                        "stoch_k": _safe_float(ind.get("stoch_k")),
-                        "stoch_d": _safe_float(ind.get("stoch_d")),
-                        "williams_r": _safe_float(ind.get("williams_r")),
-                        "cci": _safe_float(ind.get("cci")),
-                        "mfi": _safe_float(ind.get("mfi") or ind.get("mfi_14")),
-                        "obv": _safe_float(ind.get("obv")),
-                        # Metadata
-                        "metadata": ind.get("metadata", {}),
-                    }
-                    records.append(record)
-
-                self.client.table("indicator_values").upsert(
-                    records,
-                    on_conflict="symbol_id,timeframe,ts",
-                ).execute()
+        df = pd.DataFrame(indicators)
+        n = len(df)
+
+        def column(*names: str) -> pd.Series:
+            """``ind.get(a) or ind.get(b) or ...`` over the whole frame."""
+            present = [df[name] for name in names if name in df.columns]
+            if not present:
+                return pd.Series([None] * n, index=df.index, dtype=object)
+            out = present[-1]
+            for values in reversed(present[:-1]):
+                out = values.where(values.notna() & (values != 0), out)
+            return out
+
+        ts_values = column("ts").astype(object)
+        fields: dict[str, list[Any]] = {
+            "ts": [
+                ts.isoformat() if hasattr(ts, "isoformat") else ts
+                for ts in ts_values.where(ts_values.notna(), None)
+            ]
+        }
 
-                total_upserted += len(records)
+        float_columns = {
+            # OHLC
+            "open": ("open",),
+            "high": ("high",),
+            "low": ("low",),
+            "close": ("close",),
+            # RSI / MACD
+            "rsi_14": ("rsi_14",),
+            "macd": ("macd",),
+            "macd_signal": ("macd_signal",),
+            "macd_hist": ("macd_hist",),
+            # SuperTrend
+            "supertrend_value": ("supertrend_value", "supertrend"),
+            "supertrend_factor": (
+                "supertrend_factor",
+                "supertrend_adaptive_factor",
+                "target_factor",
+            ),
+            "supertrend_performance_index": ("supertrend_performance_index",),
+            "supertrend_confidence_norm": ("supertrend_confidence_norm",),
+            "supertrend_distance_norm": ("supertrend_distance_norm",),
+            "supertrend_distance_pct": ("supertrend_distance_pct",),
+            "perf_ama": ("perf_ama",),
+            # S/R
+            "nearest_support": ("nearest_support",),
+            "nearest_resistance": ("nearest_resistance",),
+            "support_distance_pct": ("support_distance_pct",),
+            "resistance_distance_pct": ("resistance_distance_pct",),
+            # Additional
+            "adx": ("adx",),
+            "atr_14": ("atr_14",),
+            "bb_upper": ("bb_upper",),
+            "bb_lower": ("bb_lower",),
+            # Momentum / oscillators
+            "stoch_k": ("stoch_k",),
+            "stoch_d": ("stoch_d",),
+            "williams_r": ("williams_r",),
+            "cci": ("cci",),
+            "mfi": ("mfi", "mfi_14"),
+            "obv": ("obv",),
+        }
+        int_columns = (
+            "volume",
+            "supertrend_trend",
+            "supertrend_signal_strength",
+            "signal_confidence",
+        )
+        for name, aliases in float_columns.items():
+            fields[name] = column_to_python(column(*aliases), "float")
+        for name in int_columns:
+            fields[name] = column_to_python(column(name), "int")
+        fields["supertrend_metrics"] = column_to_python(column("supertrend_metrics"))
+        fields["metadata"] = [
+            {} if meta is None else meta for meta in column_to_python(column("metadata"))
+        ]
 
+        names = list(fields)
+        records = [
+            {"symbol_id": symbol_id, "timeframe": timeframe, **dict(zip(names, values))}
+            for values in zip(*fields.values())
+        ]
+        result = self.bulk_upsert(
+            "indicator_values",
+            records,
+            on_conflict="symbol_id,timeframe,ts",
+            chunk_size=batch_size,
+        )
+        if result.ok:
             logger.info(
                 "Saved %d indicator snapshots for %s (%s)",
-                total_upserted,
+                result.written,
                 symbol_id,
                 timeframe,
             )
-            return total_upserted
-
-        except Exception as e:
+        else:
             logger.error(
-                "Error saving indicator snapshots for %s (%s): %s",
+                "Error saving indicator snapshots for %s (%s): %d/%d rows failed",
                 symbol_id,
                 timeframe,
-                e,
+                result.failed,
+                result.total,
             )
-            return total_upserted
+        return result.written
 
     def execute_rpc(
         self,
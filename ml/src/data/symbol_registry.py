@@ -0,0 +1,83 @@
+"""Process-wide ticker -> ``symbols.id`` registry.
+
+Symbol UUIDs never change once a ticker is seeded, yet every
+``SupabaseDatabase`` lookup used to cost a round trip to the ``symbols``
+table. The registry keeps resolved ids for ``ttl_seconds`` and is shared by
+all database instances in the process; job entry points bulk-prefetch their
+universe up front and hand the mapping to worker processes.
+
+Only hits are cached: a ticker missing from ``symbols`` is looked up again on
+the next call, so seeding or ``get_or_create_symbol_id`` takes effect at once.
+"""
+
+import threading
+import time
+from typing import Iterable, Mapping
+
+
+class SymbolRegistry:
+    """Thread-safe ticker -> symbol id map with TTL and explicit invalidation."""
+
+    def __init__(self, ttl_seconds: float = 3600.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._ids: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(ticker: str) -> str:
+        return ticker.strip().upper()
+
+    def get(self, ticker: str) -> str | None:
+        """Return the cached id for ``ticker``, or None when unknown or expired."""
+        key = self.normalize(ticker)
+        with self._lock:
+            entry = self._ids.get(key)
+            if entry is None:
+                return None
+            symbol_id, loaded_at = entry
+            if time.monotonic() - loaded_at >= self.ttl_seconds:
+                del self._ids[key]
+                return None
+            return symbol_id
+
+    def get_many(self, tickers: Iterable[str]) -> dict[str, str]:
+        """Cached ids for the given tickers (normalized keys; misses omitted)."""
+        found = {}
+        for ticker in tickers:
+            symbol_id = self.get(ticker)
+            if symbol_id is not None:
+                found[self.normalize(ticker)] = symbol_id
+        return found
+
+    def put(self, ticker: str, symbol_id: str) -> None:
+        self.update({ticker: symbol_id})
+
+    def update(self, ids: Mapping[str, str]) -> None:
+        """Store resolved ids, restarting their TTL."""
+        now = time.monotonic()
+        with self._lock:
+            for ticker, symbol_id in ids.items():
+                if symbol_id:
+                    self._ids[self.normalize(ticker)] = (str(symbol_id), now)
+
+    def invalidate(self, tickers: Iterable[str] | None = None) -> None:
+        """Drop the given tickers, or every entry when ``tickers`` is None."""
+        with self._lock:
+            if tickers is None:
+                self._ids.clear()
+                return
+            for ticker in tickers:
+                self._ids.pop(self.normalize(ticker), None)
+
+    def snapshot(self) -> dict[str, str]:
+        """All live entries, e.g. to seed worker processes."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                ticker: symbol_id
+                for ticker, (symbol_id, loaded_at) in self._ids.items()
+                if now - loaded_at < self.ttl_seconds
+            }
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
@@ -3,7 +3,11 @@
 Fetches options chains, OHLCV bars, quotes, tick data, and more from Tradier's API.
 Requires a Tradier brokerage account (free to open).
 
-Rate limiting: Uses requests-per-minute (RPM) limiter: 120/min production, 60/min sandbox.
+Rate limiting: a token bucket refilled at the requests-per-minute (RPM) limit
+(120/min production, 60/min sandbox), shared by all threads using the client and
+re-synced from Tradier's X-Ratelimit-* response headers. Batch methods issue up
+to ``settings.tradier_max_concurrency`` requests at once over the pooled HTTP
+connection, so large batches are bounded by the rate limit, not by latency.
 Do not call get_expirations() inside 5-min ranking loop; use options_expiration_cache.
 
 Supported Data Types:
@@ -30,13 +34,19 @@ Usage:
 
     # Get multiple quotes at once
     quotes = client.get_quotes(["AAPL", "MSFT", "GOOGL"])
+
+    # Batches run concurrently within the rate limit
+    chains = client.get_options_chains([("AAPL", "2024-01-19"), ("MSFT", "2024-01-19")])
+    snapshots = client.snapshot_options_chains(["AAPL", "MSFT", "GOOGL"])
 """
 
 import logging
+import threading
 import time
-from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 import httpx
 import pandas as pd
@@ -48,20 +58,104 @@ logger = logging.getLogger(__name__)
 # Tradier rate limits: 120/min production, 60/min sandbox
 TRADIER_RPM_PRODUCTION = 120
 TRADIER_RPM_SANDBOX = 60
+# Retries of a request rejected with HTTP 429
+TRADIER_MAX_RETRIES = 3
+# Symbols per /markets/quotes request
+TRADIER_QUOTE_BATCH = 100
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class TokenBucket:
+    """Thread-safe token bucket for a requests-per-minute limit.
+
+    Tokens refill continuously at ``rate_per_minute / 60`` per second up to
+    ``capacity`` (a full minute's worth by default). ``sync`` folds in the
+    provider's own count of remaining requests, so calls made with the same
+    key by other processes are accounted for.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now >= self._resume_at and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._resume_at - now, (1 - self._tokens) / self.rate)
+            self._sleep(delay)
+            waited += delay
+
+    def set_rate(self, rate_per_minute: float) -> None:
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = rate_per_minute / 60.0
+            self.capacity = float(rate_per_minute)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def sync(self, available: int, resume_in: float | None = None) -> None:
+        """Cap local tokens at the provider's remaining count.
+
+        When none remain, hold all requests for ``resume_in`` seconds (until
+        the provider's window resets).
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, float(max(available, 0)))
+            if available <= 0 and resume_in is not None:
+                self._resume_at = max(self._resume_at, now + resume_in)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for ``seconds``."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, self._clock() + seconds)
 
 
 class TradierClient:
     """Client for Tradier API - options and market data."""
 
-    def __init__(self, api_key: str | None = None, base_url: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        max_concurrency: int | None = None,
+    ):
         """Initialize Tradier client.
 
         Args:
             api_key: Tradier API key. Defaults to settings.tradier_api_key
             base_url: API base URL. Defaults to settings.tradier_base_url
+            max_concurrency: Max requests in flight for batch methods.
+                Defaults to settings.tradier_max_concurrency
         """
         self.api_key = api_key or settings.tradier_api_key
         self.base_url = base_url or settings.tradier_base_url
+        self.max_concurrency = max(1, max_concurrency or settings.tradier_max_concurrency)
 
         if not self.api_key:
             raise ValueError("Tradier API key required. Set TRADIER_API_KEY environment variable.")
@@ -71,35 +165,58 @@ class TradierClient:
             "Accept": "application/json",
         }
 
+        # Pooled connections, one per request that may be in flight
         self._client = httpx.Client(
             base_url=self.base_url,
             headers=self.headers,
             timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
         )
 
-        # RPM limiter (sliding window): 120/min prod, 60/min sandbox
+        # RPM limiter (token bucket): 120/min prod, 60/min sandbox
         is_sandbox = "sandbox" in (self.base_url or "").lower()
         self._rpm_limit = TRADIER_RPM_SANDBOX if is_sandbox else TRADIER_RPM_PRODUCTION
-        self._request_times: deque[float] = deque(maxlen=self._rpm_limit + 10)
+        self._limiter = TokenBucket(self._rpm_limit)
 
-        logger.info(f"Tradier client initialized (RPM limit={self._rpm_limit})")
+        logger.info(
+            f"Tradier client initialized (RPM limit={self._rpm_limit}, "
+            f"concurrency={self.max_concurrency})"
+        )
 
     def _rate_limit(self) -> None:
-        """Enforce requests-per-minute rate limiting (sliding window)."""
-        now = time.time()
-        self._request_times.append(now)
-        # Prune requests older than 60 seconds
-        while self._request_times and now - self._request_times[0] >= 60.0:
-            self._request_times.popleft()
-        if len(self._request_times) >= self._rpm_limit:
-            sleep_time = 60.0 - (now - self._request_times[0])
-            if sleep_time > 0:
-                logger.debug(f"RPM limit reached, sleeping {sleep_time:.1f}s")
-                time.sleep(sleep_time)
+        """Block until the requests-per-minute budget allows another request."""
+        waited = self._limiter.acquire()
+        if waited > 0.5:
+            logger.debug(f"RPM limit reached, waited {waited:.1f}s")
+
+    def _observe_rate_limit(self, headers: httpx.Headers) -> float | None:
+        """Sync the limiter with X-Ratelimit-* headers; returns seconds until the window resets."""
+        try:
+            available = int(headers["X-Ratelimit-Available"])
+        except (KeyError, ValueError):
+            return None
+        try:
+            allowed = int(headers.get("X-Ratelimit-Allowed", 0))
+            expiry_ms = int(headers.get("X-Ratelimit-Expiry", 0))
+        except ValueError:
+            allowed, expiry_ms = 0, 0
+        if allowed and allowed != self._rpm_limit:
+            logger.info(f"Tradier RPM limit is {allowed} (was {self._rpm_limit})")
+            self._rpm_limit = allowed
+            self._limiter.set_rate(allowed)
+        resume_in = max(0.0, expiry_ms / 1000.0 - time.time()) if expiry_ms else None
+        self._limiter.sync(available, resume_in)
+        return resume_in
 
     def _request(self, method: str, endpoint: str, params: dict | None = None) -> dict:
         """Make API request with rate limiting.
 
+        Safe to call from several threads; requests rejected with HTTP 429 are
+        retried once the provider's rate-limit window resets.
+
         Args:
             method: HTTP method
             endpoint: API endpoint
@@ -108,18 +225,37 @@ class TradierClient:
         Returns:
             JSON response data
         """
-        self._rate_limit()
-
-        try:
-            response = self._client.request(method, endpoint, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Tradier API error: {e.response.status_code} - {e.response.text}")
-            raise
-        except Exception as e:
-            logger.error(f"Tradier request failed: {e}")
-            raise
+        attempt = 0
+        while True:
+            self._rate_limit()
+            try:
+                response = self._client.request(method, endpoint, params=params)
+                resume_in = self._observe_rate_limit(response.headers)
+                if response.status_code == 429 and attempt < TRADIER_MAX_RETRIES:
+                    backoff = resume_in if resume_in is not None else 2.0**attempt
+                    logger.warning(
+                        f"Tradier rate limited on {endpoint}, retrying in {backoff:.1f}s"
+                    )
+                    self._limiter.pause(backoff)
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Tradier API error: {e.response.status_code} - {e.response.text}")
+                raise
+            except Exception as e:
+                logger.error(f"Tradier request failed: {e}")
+                raise
+
+    def _map_concurrent(self, fn: Callable[[T], R], items: list[T]) -> list[R]:
+        """Apply ``fn`` to ``items`` with up to ``max_concurrency`` in flight; keeps order."""
+        if len(items) <= 1 or self.max_concurrency == 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(items)), thread_name_prefix="tradier"
+        ) as pool:
+            return list(pool.map(fn, items))
 
     def get_quote(self, symbol: str) -> dict[str, Any]:
         """Get current quote for a symbol.
@@ -204,6 +340,53 @@ class TradierClient:
         logger.info(f"Fetched {len(df)} options for {symbol} exp {expiration}")
         return df
 
+    def get_expirations_batch(self, symbols: Iterable[str]) -> dict[str, list[str]]:
+        """Get expiration dates for several symbols concurrently.
+
+        Args:
+            symbols: Underlying stock symbols
+
+        Returns:
+            Dict of symbol -> expirations (empty list when the fetch failed)
+        """
+
+        def fetch(symbol: str) -> list[str]:
+            try:
+                return self.get_expirations(symbol)
+            except Exception as e:
+                logger.error(f"Failed to fetch expirations for {symbol}: {e}")
+                return []
+
+        symbols = list(dict.fromkeys(symbols))
+        return dict(zip(symbols, self._map_concurrent(fetch, symbols)))
+
+    def get_options_chains(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        greeks: bool = True,
+    ) -> dict[tuple[str, str], pd.DataFrame]:
+        """Get options chains for many (symbol, expiration) pairs concurrently.
+
+        Args:
+            pairs: (symbol, expiration YYYY-MM-DD) pairs
+            greeks: Include Greeks
+
+        Returns:
+            Dict of (symbol, expiration) -> chain, in input order; a failed
+            fetch yields an empty DataFrame
+        """
+
+        def fetch(pair: tuple[str, str]) -> pd.DataFrame:
+            symbol, expiration = pair
+            try:
+                return self.get_options_chain(symbol, expiration, greeks=greeks)
+            except Exception as e:
+                logger.error(f"Failed to fetch chain for {symbol} {expiration}: {e}")
+                return pd.DataFrame()
+
+        pairs = list(dict.fromkeys(pairs))
+        return dict(zip(pairs, self._map_concurrent(fetch, pairs)))
+
     def get_feature_option_set(
         self,
         symbol: str,
@@ -317,15 +500,8 @@ class TradierClient:
             logger.warning(f"No expirations found for {symbol}")
             return pd.DataFrame()
 
-        chains = []
-        for exp in expirations:
-            try:
-                chain = self.get_options_chain(symbol, exp, greeks=greeks)
-                if not chain.empty:
-                    chains.append(chain)
-            except Exception as e:
-                logger.error(f"Failed to fetch chain for {symbol} {exp}: {e}")
-                continue
+        fetched = self.get_options_chains([(symbol, exp) for exp in expirations], greeks=greeks)
+        chains = [chain for chain in fetched.values() if not chain.empty]
 
         if not chains:
             return pd.DataFrame()
@@ -515,18 +691,23 @@ class TradierClient:
         if not symbols:
             return pd.DataFrame()
 
-        # Tradier accepts comma-separated symbols
-        symbols_str = ",".join(s.upper() for s in symbols)
-        data = self._request("GET", "/markets/quotes", {"symbols": symbols_str})
+        # Tradier accepts comma-separated symbols; large lists go out in concurrent chunks
+        upper = list(dict.fromkeys(s.upper() for s in symbols))
+        chunks = [
+            ",".join(upper[i : i + TRADIER_QUOTE_BATCH])
+            for i in range(0, len(upper), TRADIER_QUOTE_BATCH)
+        ]
+
+        def fetch(symbols_str: str) -> list[dict]:
+            data = self._request("GET", "/markets/quotes", {"symbols": symbols_str})
+            quotes = data.get("quotes", {}).get("quote", [])
+            # Handle single quote returned as dict
+            return [quotes] if isinstance(quotes, dict) else quotes or []
 
-        quotes = data.get("quotes", {}).get("quote", [])
+        quotes = [quote for chunk in self._map_concurrent(fetch, chunks) for quote in chunk]
         if not quotes:
             return pd.DataFrame()
 
-        # Handle single quote returned as dict
-        if isinstance(quotes, dict):
-            quotes = [quotes]
-
         df = pd.DataFrame(quotes)
         df["fetched_at"] = datetime.utcnow().isoformat()
 
@@ -827,6 +1008,68 @@ class TradierClient:
         if chains.empty:
             return pd.DataFrame()
 
+        return self._format_snapshot(chains, symbol, underlying_price)
+
+    def snapshot_options_chains(
+        self,
+        symbols: Iterable[str],
+        max_expirations: int = 6,
+    ) -> dict[str, pd.DataFrame]:
+        """Snapshot the options chains of many symbols.
+
+        Quotes go out in chunked batch requests; expirations and then every
+        (symbol, expiration) chain are fetched concurrently within the rate limit.
+
+        Args:
+            symbols: Underlying stock symbols
+            max_expirations: Maximum expirations to fetch per symbol
+
+        Returns:
+            Dict of symbol -> DataFrame formatted for options_snapshots table
+            (empty when the symbol has no quote or no chains)
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        quotes = self.get_quotes(symbols)
+        prices = {}
+        for quote in quotes.to_dict("records") if not quotes.empty else []:
+            try:
+                price = quote.get("last")
+                if price is None or pd.isna(price):
+                    price = quote.get("close", 0)
+                prices[str(quote.get("symbol", "")).upper()] = float(price)
+            except (TypeError, ValueError):
+                continue
+
+        # Symbols without a quote cannot be snapshotted: spend no rate budget on them
+        quoted = [symbol for symbol in symbols if symbol in prices]
+        for symbol in symbols:
+            if symbol not in prices:
+                logger.warning(f"No quote for {symbol}, skipping snapshot")
+
+        expirations = self.get_expirations_batch(quoted)
+        pairs = [
+            (symbol, exp) for symbol in quoted for exp in expirations[symbol][:max_expirations]
+        ]
+        fetched = self.get_options_chains(pairs, greeks=True)
+
+        by_symbol: dict[str, list[pd.DataFrame]] = {symbol: [] for symbol in symbols}
+        for (symbol, _), chain in fetched.items():
+            if not chain.empty:
+                by_symbol[symbol].append(chain)
+
+        snapshots = {}
+        for symbol, chains in by_symbol.items():
+            if not chains:
+                snapshots[symbol] = pd.DataFrame()
+                continue
+            chains = pd.concat(chains, ignore_index=True)
+            snapshots[symbol] = self._format_snapshot(chains, symbol, prices[symbol])
+        return snapshots
+
+    def _format_snapshot(
+        self, chains: pd.DataFrame, symbol: str, underlying_price: float
+    ) -> pd.DataFrame:
+        """Format fetched chains for the options_snapshots table."""
         # Format for database
         snapshot_time = datetime.utcnow().isoformat()
         chains["underlying_price"] = underlying_price
@@ -5,12 +5,20 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 from datetime import timedelta
 from typing import Optional
 
 import pandas as pd
 
+from src.data.frame_codec import FrameCodecError, decode_frame, encode_frame, is_encoded_frame
 from src.data.supabase_db import SupabaseDatabase
+from src.features.incremental_indicators import (
+    MAX_INCREMENTAL_BARS,
+    IndicatorState,
+    build_indicator_state,
+    extend_indicator_state,
+)
 from src.features.technical_indicators import add_technical_features
 
 # Try to import redis
@@ -25,6 +33,10 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEFRAMES = ["m15", "h1", "h4", "d1", "w1"]
 
+# v2 entries are binary frames (src.data.frame_codec); v1 entries are JSON records
+FEATURE_CACHE_KEY_VERSION = "v2"
+LEGACY_FEATURE_CACHE_KEY_VERSION = "v1"
+
 
 def _bool_env(name: str, default: bool = False) -> bool:
     value = os.getenv(name)
@@ -51,32 +63,200 @@ def _is_cache_fresh(df: pd.DataFrame, since_ts: pd.Timestamp) -> bool:
     return False
 
 
+def _naive_utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def _is_current_cutoff(cutoff_ts) -> bool:
+    """
+    True for a cutoff at or after the current UTC day boundary.
+
+    Bars before such a cutoff are settled history, so persisted features and
+    the incremental state can serve (and be updated by) that request without
+    lookahead. Older cutoffs are backtest windows and always rebuild.
+    """
+    today = pd.Timestamp.now("UTC").tz_localize(None).normalize()
+    return _naive_utc(cutoff_ts) >= today
+
+
+def _ends_before(df: pd.DataFrame, cutoff_ts) -> bool:
+    """True when every row's ts is strictly before ``cutoff_ts``."""
+    if df.empty or "ts" not in df.columns:
+        return True
+    ts = pd.to_datetime(df["ts"], errors="coerce")
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+    return bool(ts.max() < _naive_utc(cutoff_ts))
+
+
+# Binary sibling clients keyed by id() of the source client; the source is kept
+# alongside so a recycled id is never mistaken for a cached entry
+_binary_clients: dict[int, tuple] = {}
+_binary_clients_lock = threading.Lock()
+
+
+def _binary_redis_client(redis_client):
+    """
+    Return a client that hands back raw bytes.
+
+    Clients created with ``decode_responses=True`` would try to UTF-8 decode
+    binary frames, so a sibling client with the same connection settings is
+    built for them, once per source client (one connection pool, reused).
+    """
+    pool = getattr(redis_client, "connection_pool", None)
+    kwargs = getattr(pool, "connection_kwargs", None)
+    if not isinstance(kwargs, dict) or not kwargs.get("decode_responses"):
+        return redis_client
+    with _binary_clients_lock:
+        cached = _binary_clients.get(id(redis_client))
+        if cached is not None and cached[0] is redis_client:
+            return cached[1]
+        binary_pool = redis.ConnectionPool(
+            connection_class=pool.connection_class,
+            **{**kwargs, "decode_responses": False},
+        )
+        binary_client = redis.Redis(connection_pool=binary_pool)
+        _binary_clients[id(redis_client)] = (redis_client, binary_client)
+        return binary_client
+
+
+def _save_indicator_state(
+    db: SupabaseDatabase, symbol_id: str, timeframe: str, features: pd.DataFrame
+) -> None:
+    """Persist incremental state after a full rebuild (skipped when it cannot be captured)."""
+    try:
+        state = build_indicator_state(features)
+    except Exception as e:
+        logger.debug(f"Indicator state capture failed for {symbol_id} {timeframe}: {e}")
+        return
+    if state is not None:
+        db.upsert_indicator_state(symbol_id, timeframe, state.to_dict())
+
+
+def _extend_cached_features(
+    db: SupabaseDatabase,
+    symbol: str,
+    symbol_id: str,
+    timeframe: str,
+    cached: pd.DataFrame,
+    cutoff_ts: pd.Timestamp | None = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Extend stale indicator_values rows with only the bars that arrived since.
+
+    With ``cutoff_ts`` only bars before it are folded in. Returns None when
+    the state is missing, does not line up with the cached rows, already
+    reaches the cutoff, or too many bars have been folded in since the last
+    full rebuild; the caller then rebuilds from OHLC.
+    """
+    if cached.empty or "ts" not in cached.columns:
+        return None
+
+    state = IndicatorState.from_dict(db.fetch_indicator_state(symbol_id, timeframe))
+    if state is None:
+        return None
+
+    cached_ts = pd.to_datetime(cached["ts"], errors="coerce")
+    cached_tz = cached_ts.dt.tz
+    cached_last = cached_ts.max()
+    if cached_tz is not None:
+        cached_last = cached_last.tz_convert("UTC").tz_localize(None)
+    if cached_last != pd.Timestamp(state.last_ts):
+        logger.debug(f"Indicator state out of sync for {symbol} {timeframe}; full rebuild")
+        return None
+    if cutoff_ts is not None and pd.Timestamp(state.last_ts) >= _naive_utc(cutoff_ts):
+        return None
+
+    remaining = MAX_INCREMENTAL_BARS - state.bars_since_rebuild
+    if remaining <= 0:
+        return None
+
+    # Includes the bar at last_ts so a bar persisted while still forming is detected
+    new_bars = db.fetch_ohlc_bars(
+        symbol,
+        timeframe=timeframe,
+        limit=remaining + 2,
+        start_ts=state.last_ts,
+        end_ts=cutoff_ts,
+    )
+    if len(new_bars) > remaining + 1:
+        return None
+
+    try:
+        extended = extend_indicator_state(state, new_bars)
+    except Exception as e:
+        logger.debug(f"Incremental update failed for {symbol} {timeframe}: {e}")
+        extended = None
+    if extended is None:
+        logger.debug(f"Incremental update rejected for {symbol} {timeframe}; full rebuild")
+        return None
+
+    rows, new_state = extended
+    if rows.empty:
+        return cached
+
+    if cached_tz is not None:
+        rows["ts"] = rows["ts"].dt.tz_localize("UTC").dt.tz_convert(cached_tz)
+    db.upsert_indicator_values(symbol_id, timeframe, rows)
+    db.upsert_indicator_state(symbol_id, timeframe, new_state.to_dict())
+    logger.debug(f"Incremental features: {symbol} {timeframe} +{len(rows)} bars")
+    return pd.concat([cached, rows], ignore_index=True)
+
+
 class DistributedFeatureCache:
     """Redis-backed distributed feature cache with TTL."""
 
-    def __init__(self, redis_client=None, ttl_seconds=86400):
+    def __init__(self, redis_client=None, ttl_seconds=86400, compress=True):
         """
         Initialize distributed cache.
 
         Args:
             redis_client: Redis connection (if None, no Redis caching)
             ttl_seconds: Cache TTL in seconds (default 24 hours)
+            compress: zlib-compress encoded frames
         """
-        self.redis_client = redis_client
         self.ttl_seconds = ttl_seconds
+        self.compress = compress
         self.enabled = redis_client is not None and REDIS_AVAILABLE
-
-    def get_cache_key(self, symbol: str, timeframe: str) -> str:
-        """Generate cache key."""
-        return f"features:v1:{symbol}:{timeframe}"
-
-    def get(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        self.redis_client = _binary_redis_client(redis_client) if self.enabled else redis_client
+
+    def get_cache_key(
+        self, symbol: str, timeframe: str, cutoff_ts: pd.Timestamp | None = None
+    ) -> str:
+        """Generate cache key; cutoff-bounded frames get their own entry per cutoff."""
+        key = f"features:{FEATURE_CACHE_KEY_VERSION}:{symbol}:{timeframe}"
+        if cutoff_ts is not None:
+            key += f":lt{_naive_utc(cutoff_ts):%Y%m%dT%H%M}"
+        return key
+
+    def get_legacy_cache_key(self, symbol: str, timeframe: str) -> str:
+        """Generate the pre-v2 (JSON records) cache key."""
+        return f"features:{LEGACY_FEATURE_CACHE_KEY_VERSION}:{symbol}:{timeframe}"
+
+    def _get_legacy(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Read a v1 JSON entry and migrate it to the v2 key."""
+        data = self.redis_client.get(self.get_legacy_cache_key(symbol, timeframe))
+        if not data:
+            return None
+        records = json.loads(data)
+        df = pd.DataFrame(records)
+        if "ts" in df.columns:
+            df["ts"] = pd.to_datetime(df["ts"], errors="coerce")
+        self.set(symbol, timeframe, df)
+        logger.debug(f"Redis cache migrated v1 entry: {symbol} {timeframe}")
+        return df
+
+    def get(
+        self, symbol: str, timeframe: str, cutoff_ts: pd.Timestamp | None = None
+    ) -> Optional[pd.DataFrame]:
         """
         Get features from Redis cache.
 
         Args:
             symbol: Symbol ticker
             timeframe: Timeframe (d1, h1, m15, etc.)
+            cutoff_ts: Cutoff the cached frame was built for, if any
 
         Returns:
             DataFrame of features or None if not cached
@@ -85,20 +265,37 @@ class DistributedFeatureCache:
             return None
 
         try:
-            key = self.get_cache_key(symbol, timeframe)
+            key = self.get_cache_key(symbol, timeframe, cutoff_ts)
             data = self.redis_client.get(key)
-            if data:
-                # Deserialize JSON to dict, then convert to DataFrame
-                records = json.loads(data)
-                df = pd.DataFrame(records)
+            if data and is_encoded_frame(data):
+                df = decode_frame(data)
                 logger.debug(f"Redis cache HIT: {symbol} {timeframe}")
                 return df
+            if data:
+                logger.debug(f"Redis cache entry for {symbol} {timeframe} is not a frame")
+                return None
+            if cutoff_ts is not None:
+                return None
+
+            # Fall back to JSON entries written before the v2 key bump
+            df = self._get_legacy(symbol, timeframe)
+            if df is not None:
+                logger.debug(f"Redis cache HIT (v1): {symbol} {timeframe}")
+                return df
+        except FrameCodecError as e:
+            logger.debug(f"Redis cache decode error for {symbol} {timeframe}: {e}")
         except Exception as e:
             logger.debug(f"Redis cache get error for {symbol} {timeframe}: {e}")
 
         return None
 
-    def set(self, symbol: str, timeframe: str, df: pd.DataFrame) -> bool:
+    def set(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        cutoff_ts: pd.Timestamp | None = None,
+    ) -> bool:
         """
         Set features in Redis cache with TTL.
 
@@ -106,6 +303,7 @@ class DistributedFeatureCache:
             symbol: Symbol ticker
             timeframe: Timeframe
             df: DataFrame to cache
+            cutoff_ts: Cutoff the frame was built for, if any
 
         Returns:
             True if cached successfully
@@ -114,10 +312,10 @@ class DistributedFeatureCache:
             return False
 
         try:
-            key = self.get_cache_key(symbol, timeframe)
-            # Convert DataFrame to JSON (records format)
-            # Note: We exclude 'created_at' if it exists since Redis TTL handles staleness
-            data = df.to_json(orient="records", date_format="iso")
+            key = self.get_cache_key(symbol, timeframe, cutoff_ts)
+            # Binary columnar frame: keeps dtypes (including ts) and is far
+            # smaller and faster to parse than JSON records
+            data = encode_frame(df, compress=self.compress)
             self.redis_client.setex(key, self.ttl_seconds, data)
             logger.debug(f"Redis cache SET: {symbol} {timeframe} (TTL={self.ttl_seconds}s)")
             return True
@@ -141,8 +339,10 @@ class DistributedFeatureCache:
             return False
 
         try:
-            key = self.get_cache_key(symbol, timeframe)
-            self.redis_client.delete(key)
+            self.redis_client.delete(
+                self.get_cache_key(symbol, timeframe),
+                self.get_legacy_cache_key(symbol, timeframe),
+            )
             logger.debug(f"Redis cache DELETE: {symbol} {timeframe}")
             return True
         except Exception as e:
@@ -150,7 +350,7 @@ class DistributedFeatureCache:
 
         return False
 
-    def clear_all(self, pattern: str = "features:v1:*") -> int:
+    def clear_all(self, pattern: str = "features:v*") -> int:
         """
         Clear all features from cache matching pattern.
 
@@ -191,7 +391,8 @@ def fetch_or_build_features(
     Cache priority:
     1. Redis (if redis_cache provided) - 24h TTL
     2. Database indicator_values - 30min freshness
-    3. Rebuild from OHLC data
+    3. Stale indicator_values extended with new bars only (ENABLE_INCREMENTAL_FEATURES)
+    4. Rebuild from OHLC data
 
     Args:
         db: Database connection
@@ -200,7 +401,10 @@ def fetch_or_build_features(
         limits: Optional dict of per-timeframe row limits
         redis_cache: Optional Redis client for distributed caching
         cutoff_ts: Optional cutoff timestamp (exclusive) used to prevent
-            lookahead in training windows. If set, caches are bypassed.
+            lookahead in training windows. A cutoff at or after the current
+            UTC day boundary (the daily job's) uses Redis entries keyed by
+            that cutoff and indicator_values rows that end before it, and
+            extends them up to it; an older cutoff bypasses the caches.
         force_refresh: Skip caches and rebuild features from OHLC data.
 
     Returns:
@@ -211,7 +415,7 @@ def fetch_or_build_features(
     symbol_id = db.get_symbol_id(symbol)
     since_ts = pd.Timestamp.now("UTC") - _cache_window()
     results: dict[str, pd.DataFrame] = {}
-    use_cache = (not force_refresh) and (cutoff_ts is None)
+    use_cache = (not force_refresh) and (cutoff_ts is None or _is_current_cutoff(cutoff_ts))
 
     # Initialize Redis cache wrapper if provided
     redis_enabled = redis_cache is not None and _bool_env("REDIS_FEATURE_CACHE", default=True)
@@ -222,7 +426,7 @@ def fetch_or_build_features(
 
         # === Priority 1: Check Redis cache (fastest) ===
         if use_cache and distributed_cache:
-            redis_cached = distributed_cache.get(symbol, timeframe)
+            redis_cached = distributed_cache.get(symbol, timeframe, cutoff_ts)
             if redis_cached is not None and not redis_cached.empty:
                 # Apply limit if specified
                 if limit:
@@ -233,7 +437,10 @@ def fetch_or_build_features(
         # === Priority 2: Check DB indicator_values cache ===
         if use_cache:
             cached = db.fetch_indicator_values(symbol_id, timeframe, limit=limit)
-            if _bool_env("ENABLE_FEATURE_CACHE", default=True) and _is_cache_fresh(
+            if cutoff_ts is not None and not _ends_before(cached, cutoff_ts):
+                # Rows at/after the cutoff: neither servable nor extendable
+                cached = cached.iloc[:0]
+            elif _bool_env("ENABLE_FEATURE_CACHE", default=True) and _is_cache_fresh(
                 cached,
                 since_ts,
             ):
@@ -241,11 +448,28 @@ def fetch_or_build_features(
 
                 # Store in Redis for next worker
                 if distributed_cache:
-                    distributed_cache.set(symbol, timeframe, cached)
+                    distributed_cache.set(symbol, timeframe, cached, cutoff_ts)
+
+                continue
 
+        # === Priority 3: Extend stale indicator rows with the new bars only ===
+        if (
+            use_cache
+            and _bool_env("ENABLE_FEATURE_CACHE", default=True)
+            and _bool_env("ENABLE_INCREMENTAL_FEATURES", default=True)
+        ):
+            extended = _extend_cached_features(
+                db, symbol, symbol_id, timeframe, cached, cutoff_ts=cutoff_ts
+            )
+            if extended is not None:
+                if limit:
+                    extended = extended.tail(limit).reset_index(drop=True)
+                results[timeframe] = extended
+                if distributed_cache:
+                    distributed_cache.set(symbol, timeframe, extended, cutoff_ts)
                 continue
 
-        # === Priority 3: Rebuild from OHLC data ===
+        # === Priority 4: Rebuild from OHLC data ===
         ohlc = db.fetch_ohlc_bars(
             symbol,
             timeframe=timeframe,
@@ -274,9 +498,10 @@ def fetch_or_build_features(
         # Store in both caches
         if use_cache and _bool_env("ENABLE_FEATURE_CACHE", default=True):
             db.upsert_indicator_values(symbol_id, timeframe, features)
+            _save_indicator_state(db, symbol_id, timeframe, features)
 
         if use_cache and distributed_cache:
-            distributed_cache.set(symbol, timeframe, features)
+            distributed_cache.set(symbol, timeframe, features, cutoff_ts)
 
         results[timeframe] = features
 
@@ -0,0 +1,506 @@
+"""Incremental extension of persisted indicator_values rows.
+
+A full ``add_technical_features`` rebuild recomputes every indicator over the
+whole 252-500 bar history. The columns persisted to ``indicator_values`` are
+either recursive (EMA/Wilder smoothing, ATR, KDJ, OBV, SuperTrend bands) or
+short rolling windows, so they can be carried forward from a small state:
+
+- the last value of every recursive smoother
+- the SuperTrend bands/trend for the factor chosen at the last full rebuild
+- the last ``TAIL_BARS`` OHLCV bars for the rolling-window indicators
+
+Recursive updates replicate pandas' ``ewm(adjust=False)`` arithmetic, so the
+extended rows match a full rebuild for everything except the SuperTrend AI
+factor and performance index, which stay frozen until the next full rebuild
+(see ``MAX_INCREMENTAL_BARS``).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.features.technical_indicators_corrected import TechnicalIndicatorsCorrect
+from src.strategies.supertrend_ai import trend_duration_kernel
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+# Enough history for the longest rolling window (Bollinger/CCI, 20 bars) plus slack
+TAIL_BARS = 30
+
+# New bars folded in incrementally before a full rebuild re-selects the
+# SuperTrend factor and refreshes regime/S-R features
+MAX_INCREMENTAL_BARS = 48
+
+# Periods used by add_technical_features
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+ADX_PERIOD = 14
+ATR_PERIOD = 14
+KDJ_PERIOD, KDJ_K_SMOOTH, KDJ_D_SMOOTH = 9, 5, 5
+SUPERTREND_ATR_LENGTH = 10
+
+OHLCV_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+
+# indicator_values columns produced by extend_indicator_state
+INCREMENTAL_COLUMNS = OHLCV_COLUMNS + [
+    "rsi_14",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+    "adx",
+    "atr_14",
+    "bb_upper",
+    "bb_lower",
+    "supertrend_value",
+    "supertrend_trend",
+    "supertrend_factor",
+    "supertrend_performance_index",
+    "supertrend_signal_strength",
+    "signal_confidence",
+    "supertrend_confidence_norm",
+    "supertrend_distance_norm",
+    "perf_ama",
+    "stoch_k",
+    "stoch_d",
+    "williams_r",
+    "cci",
+    "mfi",
+    "obv",
+]
+
+_REQUIRED_FEATURE_COLUMNS = {
+    "ema_12",
+    "ema_26",
+    "macd_signal",
+    "adx",
+    "atr_14",
+    "kdj_k",
+    "kdj_d",
+    "obv",
+    "atr",
+    "target_factor",
+    "supertrend_trend",
+    "perf_ama",
+    "supertrend_performance_index",
+    "supertrend_signal_strength",
+}
+
+
+@dataclass
+class IndicatorState:
+    """Carry-forward state for the indicators persisted to indicator_values."""
+
+    last_ts: str
+    ema_fast: float
+    ema_slow: float
+    macd_signal: float
+    rsi_avg_gain: float
+    rsi_avg_loss: float
+    atr_14: float
+    adx_plus_dm: float
+    adx_minus_dm: float
+    adx_tr: float
+    adx: float
+    kdj_k: float
+    kdj_d: float
+    obv: float
+    st_factor: float
+    st_atr: float
+    st_final_upper: float
+    st_final_lower: float
+    st_trend: int
+    st_perf_ama: float
+    st_perf_index: float
+    st_signal_strength: int
+    st_trend_duration: int
+    tail: dict[str, list] = field(default_factory=dict)
+    bars_since_rebuild: int = 0
+    version: int = STATE_VERSION
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable representation for persistence."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict[str, Any]]) -> Optional["IndicatorState"]:
+        """Rebuild a state, returning None for missing or incompatible payloads."""
+        if not data or data.get("version") != STATE_VERSION:
+            return None
+        try:
+            state = cls(**data)
+        except TypeError:
+            return None
+        if not state.is_consistent():
+            return None
+        return state
+
+    def is_consistent(self) -> bool:
+        """All smoother values are finite and the OHLCV tail is complete."""
+        scalars = [
+            self.ema_fast,
+            self.ema_slow,
+            self.macd_signal,
+            self.rsi_avg_gain,
+            self.rsi_avg_loss,
+            self.atr_14,
+            self.adx_plus_dm,
+            self.adx_minus_dm,
+            self.adx_tr,
+            self.adx,
+            self.kdj_k,
+            self.kdj_d,
+            self.obv,
+            self.st_factor,
+            self.st_atr,
+            self.st_final_upper,
+            self.st_final_lower,
+            self.st_perf_ama,
+            self.st_perf_index,
+        ]
+        if not all(_is_finite(value) for value in scalars):
+            return False
+        lengths = {len(self.tail.get(col, [])) for col in OHLCV_COLUMNS}
+        return lengths == {TAIL_BARS}
+
+    def tail_frame(self) -> pd.DataFrame:
+        """OHLCV tail as a DataFrame with tz-naive ``ts``."""
+        frame = pd.DataFrame({col: self.tail[col] for col in OHLCV_COLUMNS})
+        frame["ts"] = _naive_ts(frame["ts"])
+        return frame
+
+
+def _is_finite(value: Any) -> bool:
+    try:
+        return math.isfinite(float(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _naive_ts(values: pd.Series) -> pd.Series:
+    """Timestamps as tz-naive UTC (the convention of fetch_ohlc_bars)."""
+    ts = pd.to_datetime(values, errors="coerce")
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+    return ts
+
+
+def _ewm_step(prev: float, value: float, span: int) -> float:
+    """One step of ``Series.ewm(span=span, adjust=False).mean()``."""
+    com = (span - 1) / 2.0
+    alpha = 1.0 / (1.0 + com)
+    old_wt = 1.0 - alpha
+    if prev == value:
+        return prev
+    return (old_wt * prev + alpha * value) / (old_wt + alpha)
+
+
+def _safe_ratio(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator != 0 else float("nan")
+
+
+def _supertrend_band_step(
+    final_upper: float,
+    final_lower: float,
+    trend: int,
+    prev_close: float,
+    high: float,
+    low: float,
+    close: float,
+    atr: float,
+    factor: float,
+) -> tuple[float, float, int]:
+    """Advance the SuperTrend band recursion by one bar (see ``supertrend_kernel``)."""
+    hl2 = (high + low) / 2
+    upper_band = hl2 + atr * factor
+    lower_band = hl2 - atr * factor
+
+    if upper_band < final_upper or prev_close > final_upper:
+        final_upper = upper_band
+    if lower_band > final_lower or prev_close < final_lower:
+        final_lower = lower_band
+
+    if close > final_upper:
+        trend = 1
+    elif close < final_lower:
+        trend = 0
+    return final_upper, final_lower, trend
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+def build_indicator_state(features: pd.DataFrame) -> Optional[IndicatorState]:
+    """
+    Capture carry-forward state from a full ``add_technical_features`` output.
+
+    Returns None when the frame is too short or lacks the SuperTrend AI
+    columns (e.g. the basic SuperTrend fallback ran), in which case the next
+    refresh is a full rebuild.
+    """
+    if len(features) < TAIL_BARS or not _REQUIRED_FEATURE_COLUMNS.issubset(features.columns):
+        return None
+
+    high = features["high"].astype(float)
+    low = features["low"].astype(float)
+    close = features["close"].astype(float)
+
+    # RSI and ADX smoothers are not kept as columns; replay the same ewm calls
+    delta = close.diff()
+    gains = delta.where(delta > 0, 0)
+    losses = -delta.where(delta < 0, 0)
+    avg_gain = gains.ewm(span=RSI_PERIOD, adjust=False).mean().iloc[-1]
+    avg_loss = losses.ewm(span=RSI_PERIOD, adjust=False).mean().iloc[-1]
+
+    up_move = high.diff()
+    down_move = -low.diff()
+    plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0)
+    minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0)
+    true_range = pd.concat(
+        [high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1
+    ).max(axis=1)
+
+    # SuperTrend bands for the factor chosen by this rebuild
+    factor = float(features["target_factor"].iloc[-1])
+    st_atr = features["atr"].astype(float).to_numpy()
+    highs, lows, closes = high.to_numpy(), low.to_numpy(), close.to_numpy()
+    hl2 = (highs[0] + lows[0]) / 2
+    final_upper = hl2 + st_atr[0] * factor
+    final_lower = hl2 - st_atr[0] * factor
+    trend = 1
+    for i in range(1, len(closes)):
+        final_upper, final_lower, trend = _supertrend_band_step(
+            final_upper,
+            final_lower,
+            trend,
+            closes[i - 1],
+            highs[i],
+            lows[i],
+            closes[i],
+            st_atr[i],
+            factor,
+        )
+    if trend != int(features["supertrend_trend"].iloc[-1]):
+        logger.debug("SuperTrend replay diverged from features; skipping state capture")
+        return None
+
+    tail = features[OHLCV_COLUMNS].tail(TAIL_BARS).copy()
+    tail["ts"] = _naive_ts(tail["ts"]).map(lambda ts: ts.isoformat())
+    last = features.iloc[-1]
+
+    state = IndicatorState(
+        last_ts=tail["ts"].iloc[-1],
+        ema_fast=float(last["ema_12"]),
+        ema_slow=float(last["ema_26"]),
+        macd_signal=float(last["macd_signal"]),
+        rsi_avg_gain=float(avg_gain),
+        rsi_avg_loss=float(avg_loss),
+        atr_14=float(last["atr_14"]),
+        adx_plus_dm=float(plus_dm.ewm(span=ADX_PERIOD, adjust=False).mean().iloc[-1]),
+        adx_minus_dm=float(minus_dm.ewm(span=ADX_PERIOD, adjust=False).mean().iloc[-1]),
+        adx_tr=float(true_range.ewm(span=ADX_PERIOD, adjust=False).mean().iloc[-1]),
+        adx=float(last["adx"]),
+        kdj_k=float(last["kdj_k"]),
+        kdj_d=float(last["kdj_d"]),
+        obv=float(last["obv"]),
+        st_factor=factor,
+        st_atr=float(st_atr[-1]),
+        st_final_upper=float(final_upper),
+        st_final_lower=float(final_lower),
+        st_trend=int(trend),
+        st_perf_ama=float(last["perf_ama"]),
+        st_perf_index=float(last["supertrend_performance_index"]),
+        st_signal_strength=int(last["supertrend_signal_strength"]),
+        st_trend_duration=int(trend_duration_kernel(features["supertrend_trend"].to_numpy())[-1]),
+        tail={col: tail[col].tolist() for col in OHLCV_COLUMNS},
+    )
+    return state if state.is_consistent() else None
+
+
+def extend_indicator_state(
+    state: IndicatorState,
+    new_bars: pd.DataFrame,
+) -> Optional[tuple[pd.DataFrame, IndicatorState]]:
+    """
+    Extend persisted indicators over bars newer than ``state.last_ts``.
+
+    Args:
+        state: State captured at the last full rebuild or extension
+        new_bars: OHLCV bars from ``state.last_ts`` onwards. A bar at exactly
+            ``last_ts`` must match the stored one; a changed bar (persisted
+            while still forming) forces a full rebuild.
+
+    Returns:
+        Tuple of (indicator rows for ``new_bars`` with ``INCREMENTAL_COLUMNS``,
+        advanced state), or None when the bars cannot be folded in and a full
+        rebuild is required.
+    """
+    tail = state.tail_frame()
+    last_ts = pd.Timestamp(state.last_ts)
+
+    bars = new_bars.reindex(columns=OHLCV_COLUMNS)
+    bars["ts"] = _naive_ts(bars["ts"])
+    bars = bars.sort_values("ts").reset_index(drop=True)
+    if bars.isna().any().any() or bars["ts"].duplicated().any():
+        return None
+
+    overlap = bars[bars["ts"] <= last_ts]
+    if not overlap.empty:
+        if len(overlap) != 1 or overlap["ts"].iloc[0] != last_ts:
+            return None
+        price_cols = ["open", "high", "low", "close", "volume"]
+        if not np.allclose(
+            overlap[price_cols].astype(float).to_numpy()[0],
+            tail[price_cols].astype(float).to_numpy()[-1],
+        ):
+            return None
+        bars = bars[bars["ts"] > last_ts].reset_index(drop=True)
+
+    if bars.empty:
+        return pd.DataFrame(columns=INCREMENTAL_COLUMNS), state
+
+    window = pd.concat([tail, bars], ignore_index=True)
+    highs = window["high"].astype(float).to_numpy()
+    lows = window["low"].astype(float).to_numpy()
+    closes = window["close"].astype(float).to_numpy()
+    volumes = window["volume"].astype(float).to_numpy()
+
+    s = IndicatorState(**state.to_dict())
+    rows: list[dict[str, Any]] = []
+
+    for i in range(len(tail), len(window)):
+        high, low, close, volume = highs[i], lows[i], closes[i], volumes[i]
+        prev_high, prev_low, prev_close = highs[i - 1], lows[i - 1], closes[i - 1]
+
+        # MACD
+        s.ema_fast = _ewm_step(s.ema_fast, close, MACD_FAST)
+        s.ema_slow = _ewm_step(s.ema_slow, close, MACD_SLOW)
+        macd = s.ema_fast - s.ema_slow
+        s.macd_signal = _ewm_step(s.macd_signal, macd, MACD_SIGNAL)
+
+        # RSI
+        delta = close - prev_close
+        s.rsi_avg_gain = _ewm_step(s.rsi_avg_gain, delta if delta > 0 else 0.0, RSI_PERIOD)
+        s.rsi_avg_loss = _ewm_step(s.rsi_avg_loss, -delta if delta < 0 else 0.0, RSI_PERIOD)
+        rs = _safe_ratio(s.rsi_avg_gain, s.rsi_avg_loss)
+        rsi = 100 - (100 / (1 + rs))
+
+        # ATR and ADX (Wilder smoothing via ewm)
+        true_range = _true_range(high, low, prev_close)
+        s.atr_14 = _ewm_step(s.atr_14, true_range, ATR_PERIOD)
+
+        up_move = high - prev_high
+        down_move = -(low - prev_low)
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+        s.adx_plus_dm = _ewm_step(s.adx_plus_dm, plus_dm, ADX_PERIOD)
+        s.adx_minus_dm = _ewm_step(s.adx_minus_dm, minus_dm, ADX_PERIOD)
+        s.adx_tr = _ewm_step(s.adx_tr, true_range, ADX_PERIOD)
+        plus_di = 100 * _safe_ratio(s.adx_plus_dm, s.adx_tr)
+        minus_di = 100 * _safe_ratio(s.adx_minus_dm, s.adx_tr)
+        dx = 100 * _safe_ratio(abs(plus_di - minus_di), plus_di + minus_di)
+        if not math.isfinite(dx):
+            # pandas skips NaN observations with position-dependent decay
+            return None
+        s.adx = _ewm_step(s.adx, dx, ADX_PERIOD)
+
+        # KDJ (stoch_k / stoch_d)
+        start = max(0, i - KDJ_PERIOD + 1)
+        lowest_low = lows[start : i + 1].min()
+        highest_high = highs[start : i + 1].max()
+        rsv = 100 * _safe_ratio(close - lowest_low, highest_high - lowest_low)
+        if not math.isfinite(rsv):
+            return None
+        s.kdj_k = _ewm_step(s.kdj_k, rsv, KDJ_K_SMOOTH)
+        s.kdj_d = _ewm_step(s.kdj_d, s.kdj_k, KDJ_D_SMOOTH)
+
+        # OBV
+        if close > prev_close:
+            s.obv = s.obv + volume
+        elif close < prev_close:
+            s.obv = s.obv - volume
+
+        # SuperTrend AI with the frozen factor
+        s.st_atr = _ewm_step(s.st_atr, true_range, SUPERTREND_ATR_LENGTH)
+        prev_trend = s.st_trend
+        s.st_final_upper, s.st_final_lower, s.st_trend = _supertrend_band_step(
+            s.st_final_upper,
+            s.st_final_lower,
+            s.st_trend,
+            prev_close,
+            high,
+            low,
+            close,
+            s.st_atr,
+            s.st_factor,
+        )
+        supertrend = s.st_final_lower if s.st_trend == 1 else s.st_final_upper
+        s.st_perf_ama = s.st_perf_ama + s.st_perf_index * (supertrend - s.st_perf_ama)
+        s.st_trend_duration = s.st_trend_duration + 1 if s.st_trend == prev_trend else 0
+
+        distance = abs((close - supertrend) / close)
+        confidence = (
+            s.st_perf_index * 7
+            + np.clip(distance * 100 / 2, 0, 1.5)
+            + np.clip(s.st_trend_duration / 20, 0, 1.5)
+        )
+        signal_confidence = int(np.clip(confidence, 0, 10))
+
+        rows.append(
+            {
+                "ts": window["ts"].iloc[i],
+                "open": window["open"].iloc[i],
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": window["volume"].iloc[i],
+                "rsi_14": rsi,
+                "macd": macd,
+                "macd_signal": s.macd_signal,
+                "macd_hist": macd - s.macd_signal,
+                "adx": s.adx,
+                "atr_14": s.atr_14,
+                "supertrend_value": supertrend,
+                "supertrend_trend": s.st_trend,
+                "supertrend_factor": s.st_factor,
+                "supertrend_performance_index": s.st_perf_index,
+                "supertrend_signal_strength": s.st_signal_strength,
+                "signal_confidence": signal_confidence,
+                "supertrend_confidence_norm": signal_confidence / 10.0,
+                "supertrend_distance_norm": distance,
+                "perf_ama": s.st_perf_ama,
+                "stoch_k": s.kdj_k,
+                "stoch_d": s.kdj_d,
+                "obv": s.obv,
+            }
+        )
+
+    # Short rolling windows: recompute over tail + new bars with the shared implementations
+    n_new = len(bars)
+    bb = TechnicalIndicatorsCorrect.calculate_bollinger_bands(window, period=20, std_dev=2.0)
+    williams_r = TechnicalIndicatorsCorrect.calculate_williams_r(window, period=14)
+    cci = TechnicalIndicatorsCorrect.calculate_cci(window, period=20)
+    mfi = TechnicalIndicatorsCorrect.calculate_mfi(window, period=14)
+
+    out = pd.DataFrame(rows)
+    out["bb_upper"] = bb["bb_upper"].to_numpy()[-n_new:]
+    out["bb_lower"] = bb["bb_lower"].to_numpy()[-n_new:]
+    out["williams_r"] = williams_r.to_numpy()[-n_new:]
+    out["cci"] = cci.to_numpy()[-n_new:]
+    out["mfi"] = mfi.to_numpy()[-n_new:]
+    out = out[INCREMENTAL_COLUMNS]
+
+    new_tail = window.tail(TAIL_BARS)
+    s.tail = {col: new_tail[col].tolist() for col in OHLCV_COLUMNS}
+    s.tail["ts"] = [ts.isoformat() for ts in new_tail["ts"]]
+    s.last_ts = s.tail["ts"][-1]
+    s.bars_since_rebuild = state.bars_since_rebuild + n_new
+    return out, s
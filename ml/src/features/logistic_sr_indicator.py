@@ -21,16 +21,21 @@ Usage:
     print(result["signals"])
 """
 
+import bisect
 import logging
 import math
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
+LOGISTIC_SR_ENGINES = ("vectorized", "sequential")
+
 
 class LogisticSignalType(Enum):
     """Type of signal from logistic regression indicator."""
@@ -135,25 +140,48 @@ class LogisticRegressionModel:
             Probability (0-1)
         """
         # Filter to only same-type pivots
-        same_type_levels = [level for level in existing_levels if level.is_support == is_support]
+        training = (
+            (
+                level.detected_rsi,
+                level.detected_body_size,
+                1.0 if level.times_respected >= target_respects else -1.0,
+            )
+            for level in existing_levels
+            if level.is_support == is_support
+        )
+        return self.predict_from_features(rsi, body_size, training)
 
-        if not same_type_levels:
-            return 0.0
+    def predict_from_features(
+        self,
+        rsi: float,
+        body_size: float,
+        training: Iterable[Tuple[float, float, float]],
+    ) -> float:
+        """
+        Predict from pre-extracted training rows.
 
+        Args:
+            rsi: RSI value (binary: -1 or 1)
+            body_size: Body size (binary: -1 or 1)
+            training: (detected_rsi, detected_body_size, is_respected ±1) per
+                same-type level, in detection order
+
+        Returns:
+            Probability (0-1), or 0.0 when there is nothing to train on
+        """
         # Initialize weights fresh for each prediction (matching PineScript)
         base_bias = 1.0
         rsi_bias = 1.0
         body_size_bias = 1.0
 
-        log_res = 0.0
+        trained = False
 
         # Train on each same-type pivot and update weights
-        for level in same_type_levels:
-            is_respected = 1.0 if level.times_respected >= target_respects else -1.0
-
+        for detected_rsi, detected_body_size, is_respected in training:
+            trained = True
             p = self._logistic(
-                level.detected_rsi,
-                level.detected_body_size,
+                detected_rsi,
+                detected_body_size,
                 base_bias,
                 rsi_bias,
                 body_size_bias,
@@ -162,19 +190,14 @@ class LogisticRegressionModel:
             loss_val = self._loss(is_respected, p)
 
             # Gradient descent update
-            rsi_bias -= self.learning_rate * (p + loss_val) * level.detected_rsi
-            body_size_bias -= self.learning_rate * (p + loss_val) * level.detected_body_size
+            rsi_bias -= self.learning_rate * (p + loss_val) * detected_rsi
+            body_size_bias -= self.learning_rate * (p + loss_val) * detected_body_size
 
-            # Calculate prediction with updated weights
-            log_res = self._logistic(
-                rsi,
-                body_size,
-                base_bias,
-                rsi_bias,
-                body_size_bias,
-            )
+        if not trained:
+            return 0.0
 
-        return log_res
+        # Prediction with the final weights
+        return self._logistic(rsi, body_size, base_bias, rsi_bias, body_size_bias)
 
     def _logistic(
         self,
@@ -205,13 +228,19 @@ class LogisticSRIndicator:
     are most likely to hold.
     """
 
-    def __init__(self, settings: Optional[LogisticSRSettings] = None):
+    def __init__(self, settings: Optional[LogisticSRSettings] = None, engine: str = "vectorized"):
         """
         Initialize the indicator.
 
         Args:
             settings: Configuration settings (uses defaults if not provided)
+            engine: 'vectorized' (array pivot detection and per-level event
+                scans) or 'sequential' (bar-by-bar reference). Both produce
+                identical levels.
         """
+        if engine not in LOGISTIC_SR_ENGINES:
+            raise ValueError(f"Invalid engine: {engine}. Expected one of {LOGISTIC_SR_ENGINES}")
+        self.engine = engine
         self.settings = settings or LogisticSRSettings()
         self._all_levels: List[LogisticSRLevel] = []
         self._regression_levels: List[LogisticSRLevel] = []
@@ -251,8 +280,11 @@ class LogisticSRIndicator:
         self._calculate_body_size(df)
         self._calculate_atr(df)
 
-        # Process bars sequentially (streaming approach like PineScript)
-        self._process_sequentially(df)
+        # Replay the bars (streaming semantics like PineScript)
+        if self.engine == "vectorized":
+            self._process_vectorized(df)
+        else:
+            self._process_sequentially(df)
 
         # Detect signals on the last bar
         self._detect_signals(df)
@@ -374,9 +406,9 @@ class LogisticSRIndicator:
 
     def _calculate_body_size(self, df: pd.DataFrame) -> None:
         """Calculate candle body size for all bars."""
-        self._body_size_values = [
-            abs(float(row["close"]) - float(row["open"])) for _, row in df.iterrows()
-        ]
+        closes = df["close"].to_numpy(dtype=float)
+        opens = df["open"].to_numpy(dtype=float)
+        self._body_size_values = np.abs(closes - opens).tolist()
 
     def _calculate_atr(self, df: pd.DataFrame) -> None:
         """Calculate ATR for all bars."""
@@ -432,6 +464,119 @@ class LogisticSRIndicator:
             if pivot_index >= self.settings.pivot_length:
                 self._detect_and_predict_pivot(pivot_index, df)
 
+    def _process_vectorized(self, df: pd.DataFrame) -> None:
+        """
+        Array equivalent of _process_sequentially.
+
+        Pivots come from one sliding-window comparison over highs/lows. A level's
+        retests and break depend only on bars after its pivot, so each level's
+        events are scanned once with array ops. Predictions then replay the
+        streaming order, reading each older level's respect count as of the bar
+        where the new pivot is confirmed.
+        """
+        n = len(df)
+        length = self.settings.pivot_length
+
+        if n <= length * 2:
+            return
+
+        highs = df["high"].to_numpy(dtype=float)
+        lows = df["low"].to_numpy(dtype=float)
+        closes = df["close"].to_numpy(dtype=float)
+        timestamps = df["ts"].tolist() if "ts" in df.columns else None
+
+        # Pivot at p needs no strictly higher high (lower low) within ±pivot_length.
+        # Pivots are confirmed for p in [length, n - length - 1], so windows never truncate.
+        centers = slice(length, n - length)
+        is_high = ~(sliding_window_view(highs, 2 * length + 1) > highs[centers, None]).any(axis=1)
+        is_low = ~(sliding_window_view(lows, 2 * length + 1) < lows[centers, None]).any(axis=1)
+
+        # Per type: (detected_rsi, detected_body_size, sorted retest bars) in detection order
+        history: Dict[bool, List[Tuple[float, float, List[int]]]] = {True: [], False: []}
+        target = self.settings.target_respects
+
+        for pivot_index in (np.flatnonzero(is_high | is_low) + length).tolist():
+            for is_support in (False, True):
+                if not (is_low if is_support else is_high)[pivot_index - length]:
+                    continue
+
+                price = lows[pivot_index] if is_support else highs[pivot_index]
+                retests, end_index, latest_retest = self._scan_level_events(
+                    is_support, float(price), pivot_index, highs, lows, closes
+                )
+
+                rsi_signed = 1.0 if self._rsi_values[pivot_index] > 50 else -1.0
+                atr = self._atr_values[pivot_index]
+                body_size_signed = (
+                    1.0 if (atr > 0 and self._body_size_values[pivot_index] > atr) else -1.0
+                )
+
+                level = LogisticSRLevel(
+                    is_support=is_support,
+                    level=float(price),
+                    start_index=pivot_index,
+                    start_timestamp=timestamps[pivot_index] if timestamps is not None else None,
+                    end_index=end_index,
+                    times_respected=len(retests),
+                    detected_rsi=rsi_signed,
+                    detected_body_size=body_size_signed,
+                    latest_retest_index=latest_retest,
+                )
+                self._all_levels.append(level)
+
+                same_type = history[is_support]
+                same_type.append((rsi_signed, body_size_signed, retests))
+
+                # Respect counts as of the confirming bar (pivot_index + pivot_length)
+                as_of = pivot_index + length
+                prediction = self._model.predict_from_features(
+                    rsi_signed,
+                    body_size_signed,
+                    (
+                        (r, b, 1.0 if bisect.bisect_right(bars, as_of) >= target else -1.0)
+                        for r, b, bars in same_type
+                    ),
+                )
+                if prediction >= self.settings.probability_threshold:
+                    level.detected_by_regression = True
+                    level.detected_prediction = prediction
+
+    def _scan_level_events(
+        self,
+        is_support: bool,
+        price: float,
+        start_index: int,
+        highs: Any,
+        lows: Any,
+        closes: Any,
+    ) -> Tuple[List[int], Optional[int], int]:
+        """
+        Retest bars, break bar and latest retest index for one level.
+
+        Mirrors _update_existing_levels: updates start after start_index +
+        pivot_length; a touch that closes back inside is a retest, otherwise
+        the level breaks and stops updating.
+        """
+        begin = start_index + self.settings.pivot_length + 1
+        if is_support:
+            touched = lows[begin:] < price
+            held = closes[begin:] > price
+        else:
+            touched = highs[begin:] > price
+            held = closes[begin:] < price
+
+        breaks = np.flatnonzero(touched & ~held)
+        stop = int(breaks[0]) if breaks.size else len(touched)
+        end_index = begin + stop if breaks.size else None
+        retests = (begin + np.flatnonzero((touched & held)[:stop])).tolist()
+
+        latest_retest = 0
+        for bar_index in retests:
+            if bar_index > latest_retest + self.settings.retest_cooldown:
+                latest_retest = bar_index
+
+        return retests, end_index, latest_retest
+
     def _update_existing_levels(
         self,
         current_bar: pd.Series,
@@ -26,12 +26,9 @@ class GarchVolatility:
     # (e.g. 0.01% = 0.0001). * 1000 puts 0.1% at 1.0, reducing DataScaleWarning.
     _SCALE = 1000
 
-    def fit(self, returns: pd.Series) -> None:
-        clean = returns.dropna()
-        if len(clean) < 50:
-            raise ValueError("Not enough data for GARCH fit (need >=50)")
+    def _build_model(self, clean: pd.Series):
         scaled = clean * self._SCALE
-        self.model = arch_model(
+        return arch_model(
             scaled,
             p=1,
             q=1,
@@ -39,9 +36,22 @@ class GarchVolatility:
             vol="GARCH",
             dist=self.dist,
         )
+
+    def fit(self, returns: pd.Series) -> None:
+        clean = returns.dropna()
+        if len(clean) < 50:
+            raise ValueError("Not enough data for GARCH fit (need >=50)")
+        self.model = self._build_model(clean)
         self.res = self.model.fit(disp="off")
         logger.info("Fitted GARCH on %s samples", len(clean))
 
+    def update(self, returns: pd.Series) -> None:
+        """Run the variance recursion over ``returns`` with the fitted parameters."""
+        if self.res is None:
+            raise RuntimeError("GARCH model not fitted")
+        self.model = self._build_model(returns.dropna())
+        self.res = self.model.fix(self.res.params)
+
     def predict_variance(self, steps: int = 1) -> float:
         if self.res is None:
             raise RuntimeError("GARCH model not fitted")
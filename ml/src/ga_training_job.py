@@ -131,6 +131,7 @@ def run_ga_optimization(
     generations: int = 50,
     population_size: int = 100,
     training_days: int = OPTIMAL_TRAINING_DAYS,
+    n_jobs: int = 1,
 ) -> Optional[dict]:
     """
     Run GA optimization for a symbol.
@@ -140,6 +141,7 @@ def run_ga_optimization(
         generations: Number of GA generations
         population_size: Population size for GA
         training_days: Days of historical data to use
+        n_jobs: Worker processes for GA fitness evaluation
 
     Returns:
         Results dictionary or None if failed
@@ -210,6 +212,7 @@ def run_ga_optimization(
             generations=generations,
             elite_fraction=0.10,
             mutation_rate=0.15,
+            n_jobs=n_jobs,
         )
 
         results = ga.evolve(train_df, valid_df, verbose=True)
@@ -362,6 +365,9 @@ def main():
     parser.add_argument(
         "--force", action="store_true", help="Force optimization even if data is insufficient"
     )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Worker processes for GA fitness evaluation"
+    )
 
     args = parser.parse_args()
 
@@ -403,7 +409,10 @@ def main():
         if args.optimize or (not args.collect):
             if is_sufficient or args.force:
                 result = run_ga_optimization(
-                    symbol, generations=args.generations, training_days=args.days
+                    symbol,
+                    generations=args.generations,
+                    training_days=args.days,
+                    n_jobs=args.workers,
                 )
                 if result:
                     results["optimized"] += 1
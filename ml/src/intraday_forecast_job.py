@@ -20,7 +20,9 @@ import pandas as pd
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings  # noqa: E402
+from src.data.bar_resampler import rollup_every, trading_dates  # noqa: E402
 from src.data.supabase_db import db  # noqa: E402
+from src.features.feature_cache import fetch_or_build_features  # noqa: E402
 from src.features.indicator_recompute import attach_indicators_to_forecast_points  # noqa: E402
 from src.features.support_resistance_detector import (  # noqa: E402
     SupportResistanceDetector,
@@ -257,12 +259,14 @@ def _aggregate_h4_to_h8(h4_df: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregate 4-hour bars into 8-hour bars.
 
-    Groups every 2 consecutive h4 bars into 1 h8 bar:
+    Groups every 2 consecutive h4 bars of the same New York trading date into
+    1 h8 bar (a pair never spans two sessions; a day's odd last bar is dropped
+    rather than passed off as a full 8-hour bar):
     - open: first bar's open
-    - high: max of both bars' highs
-    - low: min of both bars' lows
+    - high: max of the bars' highs
+    - low: min of the bars' lows
     - close: last bar's close
-    - volume: sum of both bars' volumes
+    - volume: sum of the bars' volumes
     - ts: first bar's timestamp
 
     Args:
@@ -271,37 +275,17 @@ def _aggregate_h4_to_h8(h4_df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with h8 OHLC bars
     """
-    if len(h4_df) < 2:
+    if len(h4_df) < 2 or "ts" not in h4_df.columns:
         return pd.DataFrame()
 
-    # Ensure ts is datetime
-    if "ts" in h4_df.columns:
-        h4_df = h4_df.copy()
-        if not pd.api.types.is_datetime64_any_dtype(h4_df["ts"]):
-            h4_df["ts"] = pd.to_datetime(h4_df["ts"])
-        h4_df = h4_df.sort_values("ts").reset_index(drop=True)
+    h4_df = h4_df.copy()
+    if not pd.api.types.is_datetime64_any_dtype(h4_df["ts"]):
+        h4_df["ts"] = pd.to_datetime(h4_df["ts"])
+    h4_df = h4_df.sort_values("ts", kind="stable").reset_index(drop=True)
 
-    h8_rows = []
-    for i in range(0, len(h4_df) - 1, 2):  # Process pairs
-        bar1 = h4_df.iloc[i]
-        bar2 = h4_df.iloc[i + 1]
-
-        h8_rows.append(
-            {
-                "ts": bar1["ts"],
-                "open": float(bar1["open"]),
-                "high": max(float(bar1["high"]), float(bar2["high"])),
-                "low": min(float(bar1["low"]), float(bar2["low"])),
-                "close": float(bar2["close"]),
-                "volume": float(bar1.get("volume", 0) or 0) + float(bar2.get("volume", 0) or 0),
-            }
-        )
-
-    if not h8_rows:
-        return pd.DataFrame()
-
-    h8_df = pd.DataFrame(h8_rows)
-    return h8_df
+    return rollup_every(
+        h4_df, 2, sessions=trading_dates(h4_df["ts"]), label="first", drop_partial=True
+    )
 
 
 def get_weight_source_for_intraday(
@@ -1024,6 +1008,45 @@ def run_intraday_forecast_in_memory(
         return None
 
 
+def _intraday_fetch_limit(horizon: str, config: dict) -> int:
+    """OHLC rows needed to train and evaluate one symbol at ``horizon``."""
+    min_bars = config["min_training_bars"]
+    # Return-based models (Kalman) need len(returns)>=min_bars; returns=pct_change().dropna() -> len(df)-1
+    fetch_limit = min_bars + 1 if config.get("kalman_weight", 0) else min_bars
+
+    # Baseline uses start_idx and end_idx=len(df)-lookahead; need len(X)>=min_bars -> len(df)>=start+lookahead+min_bars
+    lookahead_bars = int(config.get("forecast_bars", 1))
+    baseline_required_ohlc = BASELINE_START_IDX + min_bars + lookahead_bars + 10  # buffer for NaNs
+    fetch_limit = max(fetch_limit, baseline_required_ohlc)
+    # Ensure enough bars for GB (needs ~50+ post-SMOTE); short horizons often yield 70-90
+    # 240+ gives ~180 valid samples for more stable walk-forward folds (less noisy metrics)
+    if horizon in ("15m", "1h"):
+        fetch_limit = max(fetch_limit, 240)
+    return fetch_limit
+
+
+# Timeframes refreshed through the indicator cache: fresh indicator_values rows
+# are reused and stale ones are extended with only the bars since the last run.
+INCREMENTAL_FEATURE_TIMEFRAMES = ("m15", "h1")
+
+
+def _fetch_intraday_features(symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+    """Technical-feature frame for ``timeframe`` via the indicator cache."""
+    df = fetch_or_build_features(
+        db=db,
+        symbol=symbol,
+        timeframes=[timeframe],
+        limits={timeframe: limit},
+    )[timeframe]
+    if not df.empty and "ts" in df.columns:
+        ts = pd.to_datetime(df["ts"], errors="coerce")
+        if ts.dt.tz is not None:
+            # indicator_values rows come back tz-aware; OHLC bars are naive UTC
+            ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+        df = df.assign(ts=ts)
+    return df
+
+
 def process_symbol_intraday(symbol: str, horizon: str, *, generate_paths: bool) -> bool:
     """
     Generate an intraday forecast for a single symbol.
@@ -1042,17 +1065,8 @@ def process_symbol_intraday(symbol: str, horizon: str, *, generate_paths: bool)
 
     timeframe = config["timeframe"]
     min_bars = config["min_training_bars"]
-    # Return-based models (Kalman) need len(returns)>=min_bars; returns=pct_change().dropna() -> len(df)-1
-    fetch_limit = min_bars + 1 if config.get("kalman_weight", 0) else min_bars
-
-    # Baseline uses start_idx and end_idx=len(df)-lookahead; need len(X)>=min_bars -> len(df)>=start+lookahead+min_bars
     lookahead_bars = int(config.get("forecast_bars", 1))
-    baseline_required_ohlc = BASELINE_START_IDX + min_bars + lookahead_bars + 10  # buffer for NaNs
-    fetch_limit = max(fetch_limit, baseline_required_ohlc)
-    # Ensure enough bars for GB (needs ~50+ post-SMOTE); short horizons often yield 70-90
-    # 240+ gives ~180 valid samples for more stable walk-forward folds (less noisy metrics)
-    if horizon in ("15m", "1h"):
-        fetch_limit = max(fetch_limit, 240)
+    fetch_limit = _intraday_fetch_limit(horizon, config)
 
     logger.info("Processing %s intraday forecast for %s", horizon, symbol)
     logger.info(
@@ -1065,8 +1079,12 @@ def process_symbol_intraday(symbol: str, horizon: str, *, generate_paths: bool)
     )
 
     try:
-        # Fetch intraday bars
-        df = db.fetch_ohlc_bars(symbol, timeframe=timeframe, limit=fetch_limit)
+        # Fetch intraday bars (already featurized for the cached timeframes)
+        has_features = timeframe in INCREMENTAL_FEATURE_TIMEFRAMES
+        if has_features:
+            df = _fetch_intraday_features(symbol, timeframe, fetch_limit)
+        else:
+            df = db.fetch_ohlc_bars(symbol, timeframe=timeframe, limit=fetch_limit)
         n_ohlc = len(df)
         n_returns = (
             len(df["close"].pct_change().dropna()) if n_ohlc > 0 and "close" in df.columns else 0
@@ -1114,7 +1132,8 @@ def process_symbol_intraday(symbol: str, horizon: str, *, generate_paths: bool)
             return False
 
         # Add technical indicators (will auto-scale for intraday)
-        df = add_technical_features(df)
+        if not has_features:
+            df = add_technical_features(df)
 
         # Extract S/R levels
         sr_detector = SupportResistanceDetector()
@@ -1213,6 +1232,10 @@ def process_symbol_intraday(symbol: str, horizon: str, *, generate_paths: bool)
                 elif "supertrend" in df.columns:
                     record["supertrend_value"] = row.get("supertrend")
                     record["supertrend_trend"] = 1 if row.get("supertrend_signal", 0) > 0 else 0
+                elif "supertrend_value" in df.columns:
+                    # Cached indicator_values rows carry the persisted columns
+                    record["supertrend_value"] = row.get("supertrend_value")
+                    record["supertrend_trend"] = row.get("supertrend_trend")
 
                 indicator_records.append(record)
 
@@ -1786,18 +1809,35 @@ def main() -> None:
     else:
         symbols = settings.intraday_symbols
 
+    # One bulk symbols lookup instead of a round trip per symbol and horizon
+    db.prefetch_symbol_ids(symbols)
+
+    # Batch-load the horizon's training bars for the whole universe up front
+    config = HORIZON_CONFIG.get(args.horizon)
+    if config and len(symbols) > 1:
+        db.prefetch_ohlc_bars(
+            symbols,
+            timeframes=[config["timeframe"]],
+            limit=_intraday_fetch_limit(args.horizon, config),
+        )
+
     success_count = 0
     fail_count = 0
 
-    for symbol in symbols:
-        try:
-            if process_symbol_intraday(symbol, args.horizon, generate_paths=args.generate_paths):
-                success_count += 1
-            else:
+    try:
+        for symbol in symbols:
+            try:
+                if process_symbol_intraday(
+                    symbol, args.horizon, generate_paths=args.generate_paths
+                ):
+                    success_count += 1
+                else:
+                    fail_count += 1
+            except Exception as e:
                 fail_count += 1
-        except Exception as e:
-            fail_count += 1
-            logger.error("Per-symbol exception for %s: %s", symbol, e, exc_info=True)
+                logger.error("Per-symbol exception for %s: %s", symbol, e, exc_info=True)
+    finally:
+        db.clear_ohlc_prefetch()
 
     # Post-write verification: verify forecasts were written
     _log_forecast_verification(args.horizon)
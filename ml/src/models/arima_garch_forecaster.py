@@ -8,14 +8,21 @@ Provides a complementary statistical approach to the ML-based forecasters.
 Key Features:
 - ARIMA(p,d,q) for capturing autocorrelation and trends
 - GARCH(1,1) for volatility clustering and conditional variance
-- Automatic order selection via AIC/BIC
+- Automatic order selection via AIC/BIC (parallel, cached per return series)
+- New bars are filtered through the fitted state; parameters are only
+  re-estimated every ``reestimate_every`` observations
 - Diagnostic tests (Ljung-Box) for residual validation
 - Compatible with existing ensemble framework
 """
 
+import hashlib
 import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -27,6 +34,19 @@ from src.features.volatility_regime import GarchVolatility
 
 logger = logging.getLogger(__name__)
 
+# Order-selection results keyed by the content of the return series
+_ORDER_CACHE_SIZE = 256
+_order_cache: "OrderedDict[Tuple, Tuple[int, int, int]]" = OrderedDict()
+_order_cache_lock = threading.Lock()
+
+
+def _fit_order_aic(returns: pd.Series, order: Tuple[int, int, int]) -> float:
+    """AIC of ARIMA(order) on returns; inf when the fit fails."""
+    try:
+        return float(ARIMA(returns, order=order).fit().aic)
+    except Exception:
+        return np.inf
+
 
 class ArimaGarchForecaster:
     """
@@ -53,6 +73,8 @@ class ArimaGarchForecaster:
         bearish_threshold: float = -0.02,
         auto_select_order: bool = False,
         horizon: str = "1D",
+        reestimate_every: int = 20,
+        order_selection_jobs: int = 1,
     ) -> None:
         """
         Initialize the ARIMA-GARCH forecaster.
@@ -65,6 +87,10 @@ class ArimaGarchForecaster:
             bearish_threshold: Return below this = bearish
             auto_select_order: If True, select ARIMA order via AIC
             horizon: Forecast horizon ("1D", "1W", etc.)
+            reestimate_every: Re-estimate parameters once this many new
+                observations have been filtered in since the last fit
+                (0 re-estimates whenever new data arrives)
+            order_selection_jobs: Worker processes for the order grid search
         """
         self.arima_order = arima_order
         self.garch_p = garch_p
@@ -73,6 +99,8 @@ class ArimaGarchForecaster:
         self.bearish_threshold = bearish_threshold
         self.auto_select_order = auto_select_order
         self.horizon = horizon
+        self.reestimate_every = reestimate_every
+        self.order_selection_jobs = order_selection_jobs
 
         self.fitted_arima = None
         self.garch_model = GarchVolatility()
@@ -82,6 +110,9 @@ class ArimaGarchForecaster:
 
         # Store training data for refitting
         self._train_returns: Optional[pd.Series] = None
+        # Returns covered by fitted_arima, and observations filtered in since its fit
+        self._state_returns: Optional[pd.Series] = None
+        self._obs_since_fit = 0
 
     def _parse_horizon(self, horizon: str) -> int:
         """Parse horizon string to number of trading days."""
@@ -134,6 +165,9 @@ class ArimaGarchForecaster:
         """
         Select optimal ARIMA order using AIC.
 
+        Results are cached per return series; candidate orders are fitted in
+        parallel when order_selection_jobs > 1.
+
         Args:
             returns: Return series
             max_p: Maximum AR order to try
@@ -142,8 +176,15 @@ class ArimaGarchForecaster:
         Returns:
             Optimal (p, d, q) tuple
         """
-        best_aic = np.inf
-        best_order = (1, 0, 1)
+        values = np.ascontiguousarray(returns.to_numpy(dtype=float))
+        key = (len(values), hashlib.sha1(values.tobytes()).hexdigest(), max_p, max_q)
+        with _order_cache_lock:
+            cached = _order_cache.get(key)
+            if cached is not None:
+                _order_cache.move_to_end(key)
+        if cached is not None:
+            logger.info("Auto-selected ARIMA order: %s (cached)", cached)
+            return cached
 
         # Test stationarity - if non-stationary, use d=1
         from statsmodels.tsa.stattools import adfuller
@@ -154,18 +195,19 @@ class ArimaGarchForecaster:
         except Exception:
             d = 0
 
-        for p in range(max_p + 1):
-            for q in range(max_q + 1):
-                if p == 0 and q == 0:
-                    continue
-                try:
-                    model = ARIMA(returns, order=(p, d, q))
-                    fitted = model.fit()
-                    if fitted.aic < best_aic:
-                        best_aic = fitted.aic
-                        best_order = (p, d, q)
-                except Exception:
-                    continue
+        orders = [
+            (p, d, q) for p in range(max_p + 1) for q in range(max_q + 1) if not (p == 0 and q == 0)
+        ]
+        aics = self._evaluate_orders(returns, orders)
+
+        best = int(np.argmin(aics))
+        best_aic = aics[best]
+        best_order = orders[best] if np.isfinite(best_aic) else (1, 0, 1)
+
+        with _order_cache_lock:
+            _order_cache[key] = best_order
+            while len(_order_cache) > _ORDER_CACHE_SIZE:
+                _order_cache.popitem(last=False)
 
         logger.info(
             "Auto-selected ARIMA order: %s (AIC=%.2f)",
@@ -174,6 +216,19 @@ class ArimaGarchForecaster:
         )
         return best_order
 
+    def _evaluate_orders(
+        self, returns: pd.Series, orders: List[Tuple[int, int, int]]
+    ) -> List[float]:
+        """AIC per candidate order, fitted in worker processes when order_selection_jobs > 1."""
+        if self.order_selection_jobs <= 1:
+            return [_fit_order_aic(returns, order) for order in orders]
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.order_selection_jobs, len(orders)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            return list(executor.map(_fit_order_aic, [returns] * len(orders), orders))
+
     def train(
         self,
         df: pd.DataFrame,
@@ -222,14 +277,13 @@ class ArimaGarchForecaster:
             logger.error("ARIMA fitting failed: %s", e)
             raise
 
+        self._state_returns = returns
+        self._obs_since_fit = 0
+
         # Fit GARCH on ARIMA residuals
         logger.info("Fitting GARCH(1,1) on residuals...")
         try:
-            residuals = pd.Series(
-                self.fitted_arima.resid,
-                index=returns.index[-len(self.fitted_arima.resid) :],
-            )
-            self.garch_model.fit(residuals)
+            self.garch_model.fit(self._arima_residuals(returns))
         except Exception as e:
             logger.warning("GARCH fitting failed: %s. Using simple volatility.", e)
 
@@ -246,6 +300,101 @@ class ArimaGarchForecaster:
 
         return self
 
+    def _arima_residuals(self, returns: pd.Series) -> pd.Series:
+        """ARIMA residuals aligned to the tail of ``returns``."""
+        resid = np.asarray(self.fitted_arima.resid)
+        return pd.Series(resid, index=returns.index[-len(resid) :])
+
+    def _count_new_observations(self, returns: pd.Series) -> Optional[int]:
+        """Observations in ``returns`` past the fitted state.
+
+        Returns None when ``returns`` does not continue the state's series
+        (different history, or no overlapping timestamps).
+        """
+        state = self._state_returns
+        if state is None or len(returns) == 0 or not returns.index.is_unique:
+            return None
+
+        last = state.index[-1]
+        overlap = state.index.intersection(returns.index)
+        if last not in overlap:
+            return None
+        if not np.allclose(
+            state.loc[overlap].to_numpy(dtype=float),
+            returns.loc[overlap].to_numpy(dtype=float),
+            equal_nan=True,
+        ):
+            return None
+        return int((returns.index > last).sum())
+
+    def update(self, df: pd.DataFrame, force_reestimate: bool = False) -> "ArimaGarchForecaster":
+        """
+        Bring the fitted state up to date with new price data.
+
+        Bars that continue the fitted series are run through the Kalman filter
+        (ARIMA) and the GARCH recursion with the current parameters. Parameters
+        are re-estimated, warm-started from the current ones, once
+        ``reestimate_every`` new observations have accumulated, when ``df`` is
+        not a continuation of the fitted series, or when forced.
+
+        Args:
+            df: DataFrame with 'close' (and ideally 'ts') columns
+            force_reestimate: Re-estimate parameters regardless of the schedule
+
+        Returns:
+            self
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+        if "close" not in df.columns:
+            raise ValueError("DataFrame must contain 'close' column")
+
+        returns = self._build_returns_series(df)
+        new_obs = self._count_new_observations(returns)
+
+        if force_reestimate or new_obs is None:
+            self._reestimate(returns)
+        elif new_obs == 0:
+            return self
+        elif self._obs_since_fit + new_obs >= self.reestimate_every:
+            self._reestimate(returns)
+        else:
+            try:
+                self._filter(returns)
+                self._obs_since_fit += new_obs
+            except Exception as e:
+                logger.warning("State update failed: %s. Re-estimating.", e)
+                self._reestimate(returns)
+        return self
+
+    def _filter(self, returns: pd.Series) -> None:
+        """Filter ``returns`` through the fitted ARIMA/GARCH without re-estimation."""
+        self.fitted_arima = self.fitted_arima.apply(returns, refit=False)
+        self._state_returns = returns
+        try:
+            self.garch_model.update(self._arima_residuals(returns))
+        except Exception as e:
+            logger.warning("GARCH update failed: %s", e)
+
+    def _reestimate(self, returns: pd.Series) -> None:
+        """Re-estimate ARIMA/GARCH parameters, warm-started from the current fit."""
+        start_params = self.fitted_arima.params if self.fitted_arima is not None else None
+        try:
+            self.fitted_arima = ARIMA(returns, order=self.arima_order).fit(
+                start_params=start_params
+            )
+        except Exception as e:
+            logger.warning("Refit failed: %s. Using original model.", e)
+            return
+
+        self._state_returns = returns
+        self._obs_since_fit = 0
+        self.training_stats["reestimated_at"] = datetime.now().isoformat()
+        try:
+            self.garch_model.fit(self._arima_residuals(returns))
+        except Exception as e:
+            logger.warning("GARCH refit failed: %s", e)
+
     def _run_diagnostics(self) -> None:
         """Run diagnostic tests on fitted model."""
         if self.fitted_arima is None:
@@ -334,7 +483,7 @@ class ArimaGarchForecaster:
         Generate forecast with classification and confidence.
 
         Args:
-            df: Optional new data to refit on (uses training data if None)
+            df: Optional new data to update the fitted state with (uses training data if None)
             steps: Number of steps ahead to forecast
 
         Returns:
@@ -343,14 +492,12 @@ class ArimaGarchForecaster:
         if not self.is_trained:
             raise RuntimeError("Model not trained. Call train() first.")
 
-        # Refit on new data if provided
+        # Filter in new data if provided (re-estimating on schedule)
         if df is not None and "close" in df.columns:
-            returns = self._build_returns_series(df)
             try:
-                arima_model = ARIMA(returns, order=self.arima_order)
-                self.fitted_arima = arima_model.fit()
+                self.update(df)
             except Exception as e:
-                logger.warning("Refit failed: %s. Using original model.", e)
+                logger.warning("Update failed: %s. Using original model.", e)
 
         # Generate ARIMA forecast
         try:
@@ -480,18 +627,14 @@ class ArimaGarchForecaster:
         """
         horizon_days = self._parse_horizon(horizon)
 
-        # Train/refit on provided data
+        # Train, or filter in new data (re-estimating on schedule)
         if not self.is_trained:
             self.train(df)
         else:
-            # Refit on new data
-            returns = df["close"].pct_change().dropna()
             try:
-                arima_model = ARIMA(returns, order=self.arima_order)
-                self.fitted_arima = arima_model.fit()
-                self.garch_model.fit(pd.Series(self.fitted_arima.resid))
+                self.update(df)
             except Exception as e:
-                logger.warning("Refit failed: %s", e)
+                logger.warning("Update failed: %s", e)
 
         # Get prediction
         prediction = self.predict(steps=horizon_days)
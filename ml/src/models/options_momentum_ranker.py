@@ -48,7 +48,7 @@ import os
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -87,6 +87,68 @@ def _get_iv_jump_threshold() -> float:
         return 5.0
 
 
+def _as_timestamp(value):
+    """Coerce a scalar the way ``datetime_series == value`` would, else NaT."""
+    if isinstance(value, (str, datetime, np.datetime64)):
+        try:
+            return pd.Timestamp(value)
+        except (TypeError, ValueError):
+            return pd.NaT
+    return pd.NaT
+
+
+def _align_match_keys(current: pd.Series, history: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Bring a key column pair to types whose hash lookup agrees with ``==``."""
+    if pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(history):
+        return current.astype(float), history.astype(float)
+    if pd.api.types.is_datetime64_any_dtype(history) and not (
+        pd.api.types.is_datetime64_any_dtype(current)
+    ):
+        return current.map(_as_timestamp).astype(object), history.astype(object)
+    return current.astype(object), history.astype(object)
+
+
+def _first_matches(
+    current_keys: List[pd.Series], history_keys: List[pd.Series]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Join current rows to history on equal keys.
+
+    Returns, per current row, the position of the first matching history row
+    (-1 when none) and the number of matching history rows. Missing keys never
+    match, as with elementwise ``==``.
+    """
+    n_current = len(current_keys[0])
+    columns = {}
+    for i, (cur, hist) in enumerate(zip(current_keys, history_keys)):
+        cur, hist = _align_match_keys(cur, hist)
+        columns[i] = pd.concat(
+            [cur.reset_index(drop=True), hist.reset_index(drop=True)], ignore_index=True
+        )
+    codes = pd.DataFrame(columns).groupby(list(columns), sort=False, dropna=True).ngroup()
+    # Rows with a missing key fall out of every group (NaN from ngroup)
+    codes = codes.fillna(-1).to_numpy(dtype=np.int64)
+    n_groups = int(codes.max()) + 1 if len(codes) else 0
+
+    history_codes = codes[n_current:]
+    in_group = np.flatnonzero(history_codes >= 0)
+    first = np.full(n_groups + 1, -1, dtype=np.int64)
+    uniques, first_seen = np.unique(history_codes[in_group], return_index=True)
+    first[uniques] = in_group[first_seen]
+    counts = np.zeros(n_groups + 1, dtype=np.int64)
+    counts[:n_groups] = np.bincount(history_codes[in_group], minlength=n_groups)
+
+    # Unmatched current rows point at the trailing sentinel slot
+    current_codes = codes[:n_current]
+    current_codes = np.where(current_codes >= 0, current_codes, n_groups)
+    return first[current_codes], counts[current_codes]
+
+
+def _clamp_score(values: np.ndarray) -> np.ndarray:
+    """Elementwise ``float(max(0.0, min(100.0, x)))``, including its NaN -> 100 quirk."""
+    capped = np.where(values < 100.0, values, 100.0)
+    return np.where(capped > 0.0, capped, 0.0)
+
+
 @dataclass
 class OptionSignals:
     """Trading signals for an option contract."""
@@ -505,82 +567,85 @@ class OptionsMomentumRanker:
         Where alpha = 2 / (window + 1) for EMA
 
         Only smooths momentum_score and composite_rank, NOT raw Greeks.
+        Contracts are matched to their first previous row in one keyed join.
         """
         alpha = 2 / (self.MOMENTUM_SMOOTHING_WINDOW + 1)  # ~0.5 for 3-day
 
-        # Match contracts between current and previous
-        for idx, row in current.iterrows():
-            # FIX: Include expiration in fallback key to prevent cross-expiry collisions
-            expiration = row.get("expiration", "")
-            contract_id = row.get("contract_symbol", f"{row['strike']}_{row['side']}_{expiration}")
+        prev_pos, _ = self._match_history(current, previous, with_expiration=True)
+        matched = prev_pos >= 0
+        if not matched.any():
+            return current
+        prev_pos = prev_pos[matched]
 
-            # Find previous momentum score
-            if "contract_symbol" in previous.columns:
-                prev_match = previous[previous["contract_symbol"] == contract_id]
-            else:
-                # FIX: Also match on expiration to avoid blending unrelated contracts
-                if "expiration" in previous.columns and expiration:
-                    prev_match = previous[
-                        (previous["strike"] == row["strike"])
-                        & (previous["side"] == row["side"])
-                        & (previous["expiration"] == expiration)
-                    ]
-                else:
-                    prev_match = previous[
-                        (previous["strike"] == row["strike"]) & (previous["side"] == row["side"])
-                    ]
-
-            if len(prev_match) > 0:
-                prev_momentum = prev_match.iloc[0].get("momentum_score", row["momentum_score"])
-
-                # EMA smoothing on momentum score
-                smoothed = alpha * row["momentum_score"] + (1 - alpha) * prev_momentum
-
-                if abs(smoothed - prev_momentum) > self.MOMENTUM_MAX_DAILY_CHANGE:
-                    smoothed = prev_momentum + (
-                        np.sign(smoothed - prev_momentum) * self.MOMENTUM_MAX_DAILY_CHANGE
-                    )
-                current.at[idx, "momentum_score"] = np.clip(smoothed, 0, 100)
-
-                # Recalculate composite with smoothed momentum
-                mode = str(row.get("ranking_mode", "entry") or "entry").lower()
-                if mode == "exit":
-                    # For EXIT mode: profit + deterioration + time_urgency
-                    # Note: temporal smoothing applies to momentum which affects deterioration
-                    weights = self.EXIT_MODE_WEIGHTS
-                    # EXIT uses different component names
-                    composite = (
-                        row.get("profit_protection_score", 0) * weights["profit_protection"]
-                        + row.get("deterioration_score", 0) * weights["deterioration"]
-                        + row.get("time_urgency_score", 0) * weights["time_urgency"]
-                    )
-                elif mode == "entry":
-                    # For ENTRY mode: value + catalyst + greeks
-                    weights = self.ENTRY_MODE_WEIGHTS
-                    composite = (
-                        row.get("entry_value_score", 0) * weights["value"]
-                        + row.get("catalyst_score", 0) * weights["catalyst"]
-                        + row.get("greeks_score", 0) * weights["greeks"]
-                    )
-                else:
-                    # MONITOR mode: momentum + value + greeks
-                    composite = (
-                        smoothed * self.MOMENTUM_WEIGHT
-                        + row["value_score"] * self.VALUE_WEIGHT
-                        + row["greeks_score"] * self.GREEKS_WEIGHT
-                    )
+        def column(name: str, default: float) -> np.ndarray:
+            if name not in current.columns:
+                return np.full(len(prev_pos), default)
+            return current[name].to_numpy(dtype=float)[matched]
 
-                if mode == "entry":
-                    entry_diff = row.get("entry_difficulty_score", 50.0)
-                    rel_val = row.get("relative_value_score", 50.0)
-                    if composite > self.BUY_COMPOSITE_THRESHOLD:
-                        composite = composite * 0.90 + entry_diff * 0.10
-                    composite = composite * 0.90 + rel_val * 0.10
-                elif mode == "exit":
-                    theta_bonus = self._calculate_theta_bonus(current.loc[[idx]]).iloc[0]
-                    composite = composite * 0.90 + theta_bonus * 0.10
+        momentum = column("momentum_score", np.nan)
+        if "momentum_score" in previous.columns:
+            prev_momentum = previous["momentum_score"].to_numpy(dtype=float)[prev_pos]
+        else:
+            prev_momentum = momentum
+
+        # EMA smoothing on momentum score, capped at the max daily change
+        smoothed = alpha * momentum + (1 - alpha) * prev_momentum
+        step = smoothed - prev_momentum
+        smoothed = np.where(
+            np.abs(step) > self.MOMENTUM_MAX_DAILY_CHANGE,
+            prev_momentum + (np.sign(step) * self.MOMENTUM_MAX_DAILY_CHANGE),
+            smoothed,
+        )
 
-                current.at[idx, "composite_rank"] = float(max(0.0, min(100.0, composite)))
+        # Recalculate composite with smoothed momentum
+        raw_modes = (
+            current["ranking_mode"].to_numpy(dtype=object)[matched]
+            if "ranking_mode" in current.columns
+            else ["entry"] * len(prev_pos)
+        )
+        modes = np.array([str(mode or "entry").lower() for mode in raw_modes])
+        is_exit = modes == "exit"
+        is_entry = modes == "entry"
+        is_monitor = ~(is_exit | is_entry)
+
+        # For EXIT mode: profit + deterioration + time_urgency
+        # Note: temporal smoothing applies to momentum which affects deterioration
+        weights = self.EXIT_MODE_WEIGHTS
+        exit_composite = (
+            column("profit_protection_score", 0) * weights["profit_protection"]
+            + column("deterioration_score", 0) * weights["deterioration"]
+            + column("time_urgency_score", 0) * weights["time_urgency"]
+        )
+        if is_exit.any():
+            theta_bonus = self._calculate_theta_bonus(current).to_numpy(dtype=float)[matched]
+            exit_composite = exit_composite * 0.90 + theta_bonus * 0.10
+
+        # For ENTRY mode: value + catalyst + greeks
+        weights = self.ENTRY_MODE_WEIGHTS
+        entry_composite = (
+            column("entry_value_score", 0) * weights["value"]
+            + column("catalyst_score", 0) * weights["catalyst"]
+            + column("greeks_score", 0) * weights["greeks"]
+        )
+        entry_composite = np.where(
+            entry_composite > self.BUY_COMPOSITE_THRESHOLD,
+            entry_composite * 0.90 + column("entry_difficulty_score", 50.0) * 0.10,
+            entry_composite,
+        )
+        entry_composite = entry_composite * 0.90 + column("relative_value_score", 50.0) * 0.10
+
+        composite = np.where(is_exit, exit_composite, entry_composite)
+        if is_monitor.any():
+            # MONITOR mode: momentum + value + greeks
+            monitor_composite = (
+                smoothed * self.MOMENTUM_WEIGHT
+                + current["value_score"].to_numpy(dtype=float)[matched] * self.VALUE_WEIGHT
+                + current["greeks_score"].to_numpy(dtype=float)[matched] * self.GREEKS_WEIGHT
+            )
+            composite = np.where(is_monitor, monitor_composite, composite)
+
+        current.loc[matched, "momentum_score"] = np.clip(smoothed, 0, 100)
+        current.loc[matched, "composite_rank"] = _clamp_score(composite)
 
         return current
 
@@ -668,36 +733,71 @@ class OptionsMomentumRanker:
         if previous is None or previous.empty:
             return pd.Series(np.nan, index=current.index)
 
-        scores = pd.Series(np.nan, index=current.index)
+        scores = np.full(len(current), np.nan)
+        prev_pos, _ = self._match_history(current, previous, with_expiration=True)
+        matched = np.flatnonzero(prev_pos >= 0)
 
-        for idx, row in current.iterrows():
-            # FIX: Include expiration in fallback key for consistent matching
-            expiration = row.get("expiration", "")
-            contract_id = row.get("contract_symbol", f"{row['strike']}_{row['side']}_{expiration}")
+        if "composite_rank" in previous.columns and "composite_rank" in current.columns:
+            prev_rank = previous["composite_rank"].to_numpy(dtype=float)[prev_pos[matched]]
+            curr_rank = current["composite_rank"].to_numpy(dtype=float)[matched]
+            finite = np.isfinite(prev_rank) & np.isfinite(curr_rank)
+            delta = np.abs(curr_rank[finite] - prev_rank[finite])
+            scores[matched[finite]] = _clamp_score(100.0 - (delta * 2.0))
 
-            if "contract_symbol" in previous.columns:
-                prev_match = previous[previous["contract_symbol"] == contract_id]
-            else:
-                # FIX: Also match on expiration to avoid cross-expiry collisions
-                if "expiration" in previous.columns and expiration:
-                    prev_match = previous[
-                        (previous["strike"] == row["strike"])
-                        & (previous["side"] == row["side"])
-                        & (previous["expiration"] == expiration)
-                    ]
-                else:
-                    prev_match = previous[
-                        (previous["strike"] == row["strike"]) & (previous["side"] == row["side"])
-                    ]
-
-            if len(prev_match) > 0:
-                prev_rank = prev_match.iloc[0].get("composite_rank", np.nan)
-                curr_rank = row.get("composite_rank", np.nan)
-                if np.isfinite(prev_rank) and np.isfinite(curr_rank):
-                    delta = abs(curr_rank - prev_rank)
-                    scores[idx] = max(0.0, min(100.0, 100.0 - (delta * 2.0)))
+        return pd.Series(scores, index=current.index)
 
-        return scores
+    def _match_history(
+        self,
+        current: pd.DataFrame,
+        history: pd.DataFrame,
+        with_expiration: bool,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Match each current contract to history rows with a keyed join.
+
+        Contracts match on contract_symbol when history carries it (current rows
+        without one use a synthetic "strike_side[_expiration]" id), otherwise on
+        strike+side, plus expiration when ``with_expiration`` is set, history has
+        the column and the current row has a non-empty expiration.
+
+        Returns:
+            (position of the first matching history row or -1, match count) per row
+        """
+        if "contract_symbol" in history.columns:
+            if "contract_symbol" in current.columns:
+                contract_ids = current["contract_symbol"]
+            else:
+                parts = [current["strike"].astype(object), current["side"].astype(object)]
+                if with_expiration:
+                    parts.append(
+                        current["expiration"].astype(object)
+                        if "expiration" in current.columns
+                        else pd.Series("", index=current.index)
+                    )
+                contract_ids = pd.Series(
+                    ["_".join(str(v) for v in key) for key in zip(*parts)],
+                    index=current.index,
+                    dtype=object,
+                )
+            return _first_matches([contract_ids], [history["contract_symbol"]])
+
+        current_keys = [current["strike"], current["side"]]
+        history_keys = [history["strike"], history["side"]]
+        first, counts = _first_matches(current_keys, history_keys)
+        if not with_expiration or "expiration" not in history.columns:
+            return first, counts
+        if "expiration" not in current.columns:
+            # A missing expiration reads as "" and falls back to strike+side
+            return first, counts
+
+        expiration = current["expiration"]
+        by_expiry = np.array([bool(v) for v in expiration.to_numpy(dtype=object)], dtype=bool)
+        if by_expiry.any():
+            first_exp, counts_exp = _first_matches(
+                current_keys + [expiration], history_keys + [history["expiration"]]
+            )
+            first = np.where(by_expiry, first_exp, first)
+            counts = np.where(by_expiry, counts_exp, counts)
+        return first, counts
 
     def _normalize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize column names for consistent processing."""
@@ -1200,29 +1300,28 @@ class OptionsMomentumRanker:
                 return vol_normalized * 20 - 10  # Range -10% to +10%
             return pd.Series(0.0, index=df.index)
 
-        # Match current options to history by contract_symbol or strike+side+expiration
-        momentum = pd.Series(0.0, index=df.index)
+        # Match current options to history by contract_symbol or strike+side
+        hist_pos, counts = self._match_history(df, history, with_expiration=False)
+        matched = np.flatnonzero(counts >= 2)
 
-        for idx, row in df.iterrows():
-            contract_id = row.get("contract_symbol", f"{row['strike']}_{row['side']}")
-
-            # Find matching historical data
-            if "contract_symbol" in history.columns:
-                hist_match = history[history["contract_symbol"] == contract_id]
-            else:
-                hist_match = history[
-                    (history["strike"] == row["strike"]) & (history["side"] == row["side"])
-                ]
+        old_price = self._column_values(history, ("last", "mark"), hist_pos[matched])
+        new_price = self._column_values(df, ("last", "mark"), matched)
+        rising = old_price > 0
 
-            if len(hist_match) >= 2:
-                # Calculate price change
-                old_price = hist_match.iloc[0].get("last", hist_match.iloc[0].get("mark", 0))
-                new_price = row.get("last", row.get("mark", 0))
+        momentum = np.zeros(len(df))
+        momentum[matched[rising]] = (
+            (new_price[rising] - old_price[rising]) / old_price[rising]
+        ) * 100
 
-                if old_price > 0:
-                    momentum[idx] = ((new_price - old_price) / old_price) * 100
+        return pd.Series(momentum, index=df.index)
 
-        return momentum
+    @staticmethod
+    def _column_values(frame: pd.DataFrame, columns: tuple, positions: np.ndarray) -> np.ndarray:
+        """Values of the first present column at ``positions``, or 0 when none is."""
+        for name in columns:
+            if name in frame.columns:
+                return frame[name].to_numpy(dtype=float)[positions]
+        return np.zeros(len(positions))
 
     def _normalize_momentum(self, momentum: pd.Series) -> pd.Series:
         """Normalize price momentum to 0-100 score.
@@ -1264,26 +1363,17 @@ class OptionsMomentumRanker:
         if history is None or history.empty:
             return pd.Series(0.0, index=df.index)
 
-        growth = pd.Series(0.0, index=df.index)
-
-        for idx, row in df.iterrows():
-            contract_id = row.get("contract_symbol", f"{row['strike']}_{row['side']}")
-
-            if "contract_symbol" in history.columns:
-                hist_match = history[history["contract_symbol"] == contract_id]
-            else:
-                hist_match = history[
-                    (history["strike"] == row["strike"]) & (history["side"] == row["side"])
-                ]
+        hist_pos, counts = self._match_history(df, history, with_expiration=False)
+        matched = np.flatnonzero(counts >= 1)
 
-            if len(hist_match) >= 1:
-                old_oi = hist_match.iloc[0].get("open_interest", 0)
-                new_oi = row.get("open_interest", 0)
+        old_oi = self._column_values(history, ("open_interest",), hist_pos[matched])
+        new_oi = self._column_values(df, ("open_interest",), matched)
+        growing = old_oi > 0
 
-                if old_oi > 0:
-                    growth[idx] = ((new_oi - old_oi) / old_oi) * 100
+        growth = np.zeros(len(df))
+        growth[matched[growing]] = ((new_oi[growing] - old_oi[growing]) / old_oi[growing]) * 100
 
-        return growth
+        return pd.Series(growth, index=df.index)
 
     def _normalize_oi_growth(self, growth: pd.Series) -> pd.Series:
         """Normalize OI growth to 0-100 score.
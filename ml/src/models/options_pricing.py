@@ -27,6 +27,16 @@ Usage:
     )
     print(f"Implied Vol: {iv:.2%}")
 
+    # Solve a whole chain at once (arrays broadcast against each other)
+    result = bs.calculate_implied_volatility_batch(
+        market_prices=chain["mid"], S=100, K=chain["strike"], T=chain["T"],
+        option_type=chain["side"],
+    )
+    greeks = bs.calculate_greeks_batch(
+        S=100, K=chain["strike"], T=chain["T"], sigma=result.implied_vol,
+        option_type=chain["side"],
+    )
+
 References:
     - Black, F., & Scholes, M. (1973). "The Pricing of Options and Corporate Liabilities"
     - Hull, J. C. (2018). "Options, Futures, and Other Derivatives" (10th ed.)
@@ -35,13 +45,26 @@ References:
 
 import logging
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence, Tuple, Union
 
 import numpy as np
+from scipy.special import ndtr
 from scipy.stats import norm
 
 logger = logging.getLogger(__name__)
 
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+OptionTypes = Union[str, Sequence[str], np.ndarray]
+
+# Per-contract status codes returned by calculate_implied_volatility_batch
+IV_STATUS_NEWTON = 0  # converged with Newton-Raphson
+IV_STATUS_BRACKETED = 1  # converged with the bisection fallback
+IV_STATUS_NOT_CONVERGED = 2  # no volatility within bounds reproduces the price
+IV_STATUS_EXPIRED = 3  # T <= 0
+IV_STATUS_INVALID = 4  # non-positive price or outside no-arbitrage bounds
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
 
 @dataclass
 class OptionsPricing:
@@ -79,6 +102,42 @@ class OptionsPricing:
         )
 
 
+@dataclass
+class OptionsGreeksBatch:
+    """Vectorized Black-Scholes results, one element per contract.
+
+    Units match OptionsPricing: theta per day, vega and rho per 1%.
+    """
+
+    theoretical_price: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    theta: np.ndarray
+    vega: np.ndarray
+    rho: np.ndarray
+
+
+@dataclass
+class ImpliedVolatilityBatch:
+    """Vectorized implied volatility results, one element per contract.
+
+    Attributes:
+        implied_vol: Solved volatility (NaN for expired/invalid contracts; the
+            nearest volatility bound when the price is unreachable)
+        status: IV_STATUS_* code per contract
+        iterations: Solver iterations used per contract (Newton + fallback)
+    """
+
+    implied_vol: np.ndarray
+    status: np.ndarray
+    iterations: np.ndarray
+
+    @property
+    def converged(self) -> np.ndarray:
+        """Boolean mask of contracts whose IV reproduces the market price."""
+        return (self.status == IV_STATUS_NEWTON) | (self.status == IV_STATUS_BRACKETED)
+
+
 class BlackScholesModel:
     """Black-Scholes-Merton model for European options pricing.
 
@@ -312,6 +371,280 @@ class BlackScholesModel:
         )
         return sigma
 
+    def _d1_d2(
+        self, S: np.ndarray, K: np.ndarray, T: np.ndarray, sigma: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized d1/d2 for unexpired contracts."""
+        sigma_sqrt_t = sigma * np.sqrt(T)
+        d1 = (np.log(S / K) + (self.risk_free_rate + 0.5 * sigma**2) * T) / sigma_sqrt_t
+        return d1, d1 - sigma_sqrt_t
+
+    def _price_arrays(
+        self,
+        S: np.ndarray,
+        K: np.ndarray,
+        T: np.ndarray,
+        sigma: np.ndarray,
+        is_call: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Price unexpired contracts; also returns d1 for vega."""
+        d1, d2 = self._d1_d2(S, K, T, sigma)
+        discounted_strike = K * np.exp(-self.risk_free_rate * T)
+        price = np.where(
+            is_call,
+            S * ndtr(d1) - discounted_strike * ndtr(d2),
+            discounted_strike * ndtr(-d2) - S * ndtr(-d1),
+        )
+        return price, d1
+
+    @staticmethod
+    def _broadcast_chain(
+        option_type: OptionTypes, *arrays: ArrayLike
+    ) -> Tuple[Tuple[int, ...], np.ndarray, list]:
+        """Broadcast inputs to a common shape and flatten them.
+
+        Returns the common shape, a flat boolean call mask and the flat float arrays.
+        """
+        types = np.char.lower(np.asarray(option_type, dtype=str))
+        broadcast = np.broadcast_arrays(types, *[np.asarray(a, dtype=float) for a in arrays])
+        shape = broadcast[0].shape
+        is_call = (broadcast[0] == "call").ravel()
+        flat = [np.array(a, dtype=float).ravel() for a in broadcast[1:]]
+        return shape, is_call, flat
+
+    def price_batch(
+        self,
+        S: ArrayLike,
+        K: ArrayLike,
+        T: ArrayLike,
+        sigma: ArrayLike,
+        option_type: OptionTypes = "call",
+    ) -> np.ndarray:
+        """Vectorized price_call/price_put over broadcast arrays.
+
+        Args:
+            S: Underlying price(s)
+            K: Strike price(s)
+            T: Time(s) to expiration (years); T <= 0 prices at intrinsic value
+            sigma: Volatility(ies) (annualized)
+            option_type: 'call'/'put', or an array of them per contract
+
+        Returns:
+            Array of theoretical prices with the broadcast shape
+        """
+        shape, is_call, (S, K, T, sigma) = self._broadcast_chain(option_type, S, K, T, sigma)
+        price = np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+
+        live = T > 0
+        if live.any():
+            with np.errstate(divide="ignore", invalid="ignore"):
+                price[live], _ = self._price_arrays(
+                    S[live], K[live], T[live], sigma[live], is_call[live]
+                )
+        return price.reshape(shape)
+
+    def calculate_greeks_batch(
+        self,
+        S: ArrayLike,
+        K: ArrayLike,
+        T: ArrayLike,
+        sigma: ArrayLike,
+        option_type: OptionTypes = "call",
+    ) -> OptionsGreeksBatch:
+        """Vectorized calculate_greeks for a whole chain.
+
+        Price and all Greeks are derived from a single pair of d1/d2 arrays.
+        Expired contracts get the same simplified Greeks as calculate_greeks.
+
+        Args:
+            S: Underlying price(s)
+            K: Strike price(s)
+            T: Time(s) to expiration (years)
+            sigma: Volatility(ies) (annualized), e.g. ImpliedVolatilityBatch.implied_vol
+            option_type: 'call'/'put', or an array of them per contract
+
+        Returns:
+            OptionsGreeksBatch with arrays in the broadcast shape
+        """
+        shape, is_call, (S, K, T, sigma) = self._broadcast_chain(option_type, S, K, T, sigma)
+        r = self.risk_free_rate
+
+        price = np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+        delta = np.where(is_call, (S > K).astype(float), -(S < K).astype(float))
+        gamma = np.zeros_like(S)
+        theta = np.zeros_like(S)
+        vega = np.zeros_like(S)
+        rho = np.zeros_like(S)
+
+        live = T > 0
+        if live.any():
+            s, k, t, v, c = S[live], K[live], T[live], sigma[live], is_call[live]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                d1, d2 = self._d1_d2(s, k, t, v)
+                sqrt_t = np.sqrt(t)
+                pdf_d1 = np.exp(-0.5 * d1**2) * _INV_SQRT_2PI
+                discounted_strike = k * np.exp(-r * t)
+                n_d1, n_d2 = ndtr(d1), ndtr(d2)
+                n_neg_d1, n_neg_d2 = ndtr(-d1), ndtr(-d2)
+                decay = -s * pdf_d1 * v / (2 * sqrt_t)
+
+                price[live] = np.where(
+                    c,
+                    s * n_d1 - discounted_strike * n_d2,
+                    discounted_strike * n_neg_d2 - s * n_neg_d1,
+                )
+                delta[live] = np.where(c, n_d1, -n_neg_d1)
+                gamma[live] = pdf_d1 / (s * v * sqrt_t)
+                vega[live] = s * pdf_d1 * sqrt_t / 100
+                theta[live] = (
+                    np.where(
+                        c,
+                        decay - r * discounted_strike * n_d2,
+                        decay + r * discounted_strike * n_neg_d2,
+                    )
+                    / 365
+                )
+                rho[live] = (
+                    np.where(c, t * discounted_strike * n_d2, -t * discounted_strike * n_neg_d2)
+                    / 100
+                )
+
+        return OptionsGreeksBatch(
+            theoretical_price=price.reshape(shape),
+            delta=delta.reshape(shape),
+            gamma=gamma.reshape(shape),
+            theta=theta.reshape(shape),
+            vega=vega.reshape(shape),
+            rho=rho.reshape(shape),
+        )
+
+    def calculate_implied_volatility_batch(
+        self,
+        market_prices: ArrayLike,
+        S: ArrayLike,
+        K: ArrayLike,
+        T: ArrayLike,
+        option_type: OptionTypes = "call",
+        initial_guess: float = 0.3,
+        max_iterations: int = 100,
+        tolerance: float = 1e-6,
+        vol_bounds: Tuple[float, float] = (0.01, 5.0),
+        max_bracket_iterations: int = 100,
+    ) -> ImpliedVolatilityBatch:
+        """Solve implied volatility for a whole chain at once.
+
+        Runs vectorized Newton-Raphson over every contract still unsolved, then
+        falls back to bisection on ``vol_bounds`` for contracts where Newton
+        stalls (vega ~ 0) or fails to converge. Instead of raising or logging
+        per contract, the outcome of each contract is reported in ``status``.
+
+        Args:
+            market_prices: Observed option prices
+            S: Underlying price(s)
+            K: Strike price(s)
+            T: Time(s) to expiration (years)
+            option_type: 'call'/'put', or an array of them per contract
+            initial_guess: Starting volatility for Newton
+            max_iterations: Maximum Newton-Raphson iterations
+            tolerance: Convergence threshold for price difference
+            vol_bounds: (min, max) volatility searched by both solvers
+            max_bracket_iterations: Maximum bisection iterations in the fallback
+
+        Returns:
+            ImpliedVolatilityBatch with arrays in the broadcast shape
+        """
+        shape, is_call, (price, S, K, T) = self._broadcast_chain(
+            option_type, market_prices, S, K, T
+        )
+        vol_lo, vol_hi = vol_bounds
+        n = price.size
+
+        iv = np.full(n, np.nan)
+        status = np.full(n, IV_STATUS_NOT_CONVERGED, dtype=np.int8)
+        iterations = np.zeros(n, dtype=np.int32)
+
+        expired = T <= 0
+        status[expired] = IV_STATUS_EXPIRED
+
+        # Same sanity bounds as the scalar solver: discounted intrinsic <= price <= S (call) / K (put)
+        with np.errstate(invalid="ignore"):
+            discounted_strike = K * np.exp(-self.risk_free_rate * np.where(expired, 0.0, T))
+            lower = np.where(is_call, S - discounted_strike, discounted_strike - S)
+            upper = np.where(is_call, S, K)
+            valid = (
+                ~expired
+                & (price > 0)
+                & (price >= np.maximum(lower, 0.0))
+                & (price <= upper)
+                & (S > 0)
+                & (K > 0)
+            )
+        status[~expired & ~valid] = IV_STATUS_INVALID
+
+        # Newton-Raphson over the still-active subset
+        idx = np.flatnonzero(valid)
+        sigma = np.full(idx.size, float(initial_guess))
+        for iteration in range(max_iterations):
+            if idx.size == 0:
+                break
+            s, k, t, c = S[idx], K[idx], T[idx], is_call[idx]
+            theo, d1 = self._price_arrays(s, k, t, sigma, c)
+            diff = price[idx] - theo
+
+            done = np.abs(diff) < tolerance
+            iv[idx[done]] = sigma[done]
+            status[idx[done]] = IV_STATUS_NEWTON
+            iterations[idx] = iteration + 1
+
+            vega = s * np.exp(-0.5 * d1**2) * _INV_SQRT_2PI * np.sqrt(t)
+            keep = ~done & (vega >= 1e-10)
+            idx = idx[keep]
+            sigma = np.clip(sigma[keep] + diff[keep] / vega[keep], vol_lo, vol_hi)
+
+        # Bisection fallback for everything valid that Newton did not solve
+        idx = np.flatnonzero(valid & (status == IV_STATUS_NOT_CONVERGED))
+        if idx.size:
+            s, k, t, c, target = S[idx], K[idx], T[idx], is_call[idx], price[idx]
+            price_lo, _ = self._price_arrays(s, k, t, np.full(idx.size, vol_lo), c)
+            price_hi, _ = self._price_arrays(s, k, t, np.full(idx.size, vol_hi), c)
+
+            # Price is monotone in sigma; unreachable targets pin to the nearest bound
+            below = target < price_lo - tolerance
+            above = target > price_hi + tolerance
+            iv[idx[below]] = vol_lo
+            iv[idx[above]] = vol_hi
+
+            bracketed = ~below & ~above
+            idx, s, k, t, c, target = (a[bracketed] for a in (idx, s, k, t, c, target))
+            lo = np.full(idx.size, vol_lo)
+            hi = np.full(idx.size, vol_hi)
+            active = np.ones(idx.size, dtype=bool)
+            for iteration in range(max_bracket_iterations):
+                if not active.any():
+                    break
+                mid = 0.5 * (lo[active] + hi[active])
+                theo, _ = self._price_arrays(s[active], k[active], t[active], mid, c[active])
+                diff = target[active] - theo
+
+                pos = np.flatnonzero(active)
+                iterations[idx[pos]] += 1
+                done = np.abs(diff) < tolerance
+                iv[idx[pos[done]]] = mid[done]
+                status[idx[pos[done]]] = IV_STATUS_BRACKETED
+
+                lo[pos] = np.where(diff > 0, mid, lo[pos])
+                hi[pos] = np.where(diff > 0, hi[pos], mid)
+                active[pos[done]] = False
+
+            unsolved = active
+            iv[idx[unsolved]] = 0.5 * (lo[unsolved] + hi[unsolved])
+
+        return ImpliedVolatilityBatch(
+            implied_vol=iv.reshape(shape),
+            status=status.reshape(shape),
+            iterations=iterations.reshape(shape),
+        )
+
     def verify_put_call_parity(
         self, S: float, K: float, T: float, sigma: float, tolerance: float = 0.01
     ) -> bool:
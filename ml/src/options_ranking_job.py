@@ -15,6 +15,7 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import requests
 
@@ -378,122 +379,126 @@ def _sanitize_number(value: float | int | None, default: float = 0.0) -> float:
     return num
 
 
+def _sanitize_column(df: pd.DataFrame, *names: str, default: float = 0.0) -> list[float]:
+    """Column-wise ``_sanitize_number`` of the first present column (``default`` if none)."""
+    for name in names:
+        if name in df.columns:
+            values = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+            values[~np.isfinite(values)] = default
+            return values.tolist()
+    return [default] * len(df)
+
+
+def _expiry_date(expiration) -> str | None:
+    try:
+        return datetime.fromtimestamp(expiration).strftime("%Y-%m-%d")
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
 def save_rankings_to_db(
     symbol_id: str,
     ranked_df: pd.DataFrame,
     ranking_mode: str = "monitor",
     strategy_intent: str = "long_premium",
 ) -> int:
-    """Save ranked options to database with momentum framework scores and entry/exit rankings."""
-    saved_count = 0
+    """Save ranked options to database with momentum framework scores and entry/exit rankings.
+
+    Records are built column-wise and written with one chunked bulk upsert.
+    """
+    if ranked_df.empty:
+        return 0
+
+    df = ranked_df
+    n = len(df)
     run_at = datetime.utcnow().isoformat()
 
-    for _, row in ranked_df.iterrows():
-        try:
-            # Convert expiration timestamp to date string
-            expiry_date = datetime.fromtimestamp(row["expiration"]).strftime("%Y-%m-%d")
-
-            # Get composite_rank (primary score from Momentum Framework)
-            composite_rank = _sanitize_number(row.get("composite_rank", 0))
-
-            # Build record with all columns
-            # ml_score is derived from composite_rank for backwards compatibility
-            record = {
-                "underlying_symbol_id": symbol_id,
-                "contract_symbol": row["contract_symbol"],
-                "expiry": expiry_date,
-                "strike": _sanitize_number(row["strike"]),
-                "side": row["side"],
-                "ml_score": composite_rank / 100.0,  # Normalize to 0-1 for legacy field
-                "implied_vol": _sanitize_number(row.get("impliedVolatility", row.get("iv", 0))),
-                "delta": _sanitize_number(row.get("delta", 0)),
-                "gamma": _sanitize_number(row.get("gamma", 0)),
-                "theta": _sanitize_number(row.get("theta", 0)),
-                "vega": _sanitize_number(row.get("vega", 0)),
-                "rho": _sanitize_number(row.get("rho", 0)),
-                "bid": _sanitize_number(row.get("bid", 0)),
-                "ask": _sanitize_number(row.get("ask", 0)),
-                "mark": _sanitize_number(row.get("mark", 0)),
-                "last_price": _sanitize_number(row.get("last_price", 0)),
-                "volume": int(_sanitize_number(row.get("volume", 0))),
-                "open_interest": int(
-                    _sanitize_number(row.get("openInterest", row.get("open_interest", 0)))
-                ),
-                "run_at": run_at,
-                # Mode tracking
-                "ranking_mode": ranking_mode,
-                "strategy_intent": strategy_intent,
-                # Momentum Framework scores (always populated)
-                "composite_rank": composite_rank,
-                "momentum_score": _sanitize_number(row.get("momentum_score", 0)),
-                "value_score": _sanitize_number(row.get("value_score", 0)),
-                "greeks_score": _sanitize_number(row.get("greeks_score", 0)),
-                # Entry/Exit mode-specific ranks
-                "entry_rank": (
-                    _sanitize_number(row.get("entry_rank")) if "entry_rank" in row else None
-                ),
-                "exit_rank": _sanitize_number(row.get("exit_rank")) if "exit_rank" in row else None,
-                # Entry mode component scores
-                "entry_value_score": (
-                    _sanitize_number(row.get("entry_value_score"))
-                    if "entry_value_score" in row
-                    else None
-                ),
-                "catalyst_score": (
-                    _sanitize_number(row.get("catalyst_score")) if "catalyst_score" in row else None
-                ),
-                "iv_percentile": (
-                    _sanitize_number(row.get("iv_percentile")) if "iv_percentile" in row else None
-                ),
-                "iv_discount_score": (
-                    _sanitize_number(row.get("iv_discount_score"))
-                    if "iv_discount_score" in row
-                    else None
-                ),
-                # Exit mode component scores
-                "profit_protection_score": (
-                    _sanitize_number(row.get("profit_protection_score"))
-                    if "profit_protection_score" in row
-                    else None
-                ),
-                "deterioration_score": (
-                    _sanitize_number(row.get("deterioration_score"))
-                    if "deterioration_score" in row
-                    else None
-                ),
-                "time_urgency_score": (
-                    _sanitize_number(row.get("time_urgency_score"))
-                    if "time_urgency_score" in row
-                    else None
-                ),
-                # Other scores
-                "iv_rank": _sanitize_number(row.get("iv_rank", 0)),
-                "spread_pct": _sanitize_number(row.get("spread_pct", 0)),
-                "vol_oi_ratio": _sanitize_number(row.get("vol_oi_ratio", 0)),
-                "liquidity_confidence": _sanitize_number(row.get("liquidity_confidence", 1.0)),
-                "relative_value_score": _sanitize_number(row.get("relative_value_score", 0)),
-                "entry_difficulty_score": _sanitize_number(row.get("entry_difficulty_score", 0)),
-                "ranking_stability_score": _sanitize_number(row.get("ranking_stability_score", 0)),
-                "iv_curve_ok": bool(row.get("iv_curve_ok", True)),
-                "iv_data_quality_score": _sanitize_number(row.get("iv_data_quality_score", 1.0)),
-                # Signals
-                "signal_discount": bool(row.get("signal_discount", False)),
-                "signal_runner": bool(row.get("signal_runner", False)),
-                "signal_greeks": bool(row.get("signal_greeks", False)),
-                "signal_buy": bool(row.get("signal_buy", False)),
-                # FIX: Store signals as JSON array for consistent parsing
-                "signals": json.dumps(
-                    row.get("signals", "").split(",") if row.get("signals") else []
-                ),
-            }
+    # Convert expiration timestamps to date strings; rows without one are skipped
+    expiry = [_expiry_date(ts) for ts in df["expiration"]]
+
+    # Get composite_rank (primary score from Momentum Framework)
+    composite_rank = _sanitize_column(df, "composite_rank")
+
+    def optional(name: str) -> list:
+        # Entry/exit-specific scores are only stored when the mode produced them
+        return _sanitize_column(df, name) if name in df.columns else [None] * n
+
+    def flags(name: str, default: bool) -> list[bool]:
+        return [bool(v) for v in df[name]] if name in df.columns else [default] * n
+
+    signals = df["signals"] if "signals" in df.columns else [""] * n
+    columns = {
+        "underlying_symbol_id": [symbol_id] * n,
+        "contract_symbol": df["contract_symbol"].tolist(),
+        "expiry": expiry,
+        "strike": _sanitize_column(df, "strike"),
+        "side": df["side"].tolist(),
+        # ml_score is derived from composite_rank for backwards compatibility
+        "ml_score": [rank / 100.0 for rank in composite_rank],  # Normalize to 0-1
+        "implied_vol": _sanitize_column(df, "impliedVolatility", "iv"),
+        "delta": _sanitize_column(df, "delta"),
+        "gamma": _sanitize_column(df, "gamma"),
+        "theta": _sanitize_column(df, "theta"),
+        "vega": _sanitize_column(df, "vega"),
+        "rho": _sanitize_column(df, "rho"),
+        "bid": _sanitize_column(df, "bid"),
+        "ask": _sanitize_column(df, "ask"),
+        "mark": _sanitize_column(df, "mark"),
+        "last_price": _sanitize_column(df, "last_price"),
+        "volume": [int(v) for v in _sanitize_column(df, "volume")],
+        "open_interest": [int(v) for v in _sanitize_column(df, "openInterest", "open_interest")],
+        "run_at": [run_at] * n,
+        # Mode tracking
+        "ranking_mode": [ranking_mode] * n,
+        "strategy_intent": [strategy_intent] * n,
+        # Momentum Framework scores (always populated)
+        "composite_rank": composite_rank,
+        "momentum_score": _sanitize_column(df, "momentum_score"),
+        "value_score": _sanitize_column(df, "value_score"),
+        "greeks_score": _sanitize_column(df, "greeks_score"),
+        # Entry/Exit mode-specific ranks and component scores
+        "entry_rank": optional("entry_rank"),
+        "exit_rank": optional("exit_rank"),
+        "entry_value_score": optional("entry_value_score"),
+        "catalyst_score": optional("catalyst_score"),
+        "iv_percentile": optional("iv_percentile"),
+        "iv_discount_score": optional("iv_discount_score"),
+        "profit_protection_score": optional("profit_protection_score"),
+        "deterioration_score": optional("deterioration_score"),
+        "time_urgency_score": optional("time_urgency_score"),
+        # Other scores
+        "iv_rank": _sanitize_column(df, "iv_rank"),
+        "spread_pct": _sanitize_column(df, "spread_pct"),
+        "vol_oi_ratio": _sanitize_column(df, "vol_oi_ratio"),
+        "liquidity_confidence": _sanitize_column(df, "liquidity_confidence", default=1.0),
+        "relative_value_score": _sanitize_column(df, "relative_value_score"),
+        "entry_difficulty_score": _sanitize_column(df, "entry_difficulty_score"),
+        "ranking_stability_score": _sanitize_column(df, "ranking_stability_score"),
+        "iv_curve_ok": flags("iv_curve_ok", True),
+        "iv_data_quality_score": _sanitize_column(df, "iv_data_quality_score", default=1.0),
+        # Signals
+        "signal_discount": flags("signal_discount", False),
+        "signal_runner": flags("signal_runner", False),
+        "signal_greeks": flags("signal_greeks", False),
+        "signal_buy": flags("signal_buy", False),
+        # FIX: Store signals as JSON array for consistent parsing
+        "signals": [
+            json.dumps(value.split(",") if isinstance(value, str) and value else [])
+            for value in signals
+        ],
+    }
 
-            db.upsert_option_rank_extended(**record)
-            saved_count += 1
-        except Exception as e:
-            logger.error(f"Error saving rank for {row.get('contract_symbol')}: {e}")
-            logger.error(f"Row data: {row.to_dict()}")
+    names = list(columns)
+    records = []
+    for values in zip(*columns.values()):
+        record = dict(zip(names, values))
+        if record["expiry"] is None:
+            logger.error(f"Error saving rank for {record['contract_symbol']}: invalid expiration")
+            continue
+        records.append(record)
 
-    return saved_count
+    result = db.upsert_option_ranks(records)
+    return result.written
 
 
 def fetch_previous_rankings(symbol_id: str, ranking_mode: str) -> pd.DataFrame:
@@ -902,7 +907,7 @@ def process_symbol_options(
 
                 # Save strategy options to options_ranks
                 run_at = datetime.utcnow().isoformat()
-                strategy_saved = 0
+                strategy_records = []
 
                 for opt in missing_options:
                     contract_sym = opt["contract_symbol"]
@@ -944,12 +949,9 @@ def process_symbol_options(
                         "signals": "[]",
                     }
 
-                    try:
-                        db.upsert_option_rank_extended(**record)
-                        strategy_saved += 1
-                    except Exception as e:
-                        logger.error(f"Failed to save strategy option {contract_sym}: {e}")
+                    strategy_records.append(record)
 
+                strategy_saved = db.upsert_option_ranks(strategy_records).written
                 logger.info(f"Saved {strategy_saved} strategy options for {symbol}")
 
     except Exception as e:
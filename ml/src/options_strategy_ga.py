@@ -14,24 +14,31 @@ Usage:
     results = run_ga_optimization("AAPL", generations=50)
 
     # Or use the class directly
-    ga = OptionsStrategyGA(population_size=100, generations=50)
+    ga = OptionsStrategyGA(population_size=100, generations=50, n_jobs=4)
     results = ga.evolve(training_data, validation_data)
 """
 
+import bisect
+import hashlib
 import json
 import logging
+import multiprocessing
 import random
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+BACKTEST_ENGINES = ("array", "rows")
+PRICE_COLUMNS = ("mark", "last_price", "price", "mid")
+
 
 # ============================================================================
 # DATA STRUCTURES
@@ -193,6 +200,11 @@ class StrategyGenes:
         """Convert to dictionary for storage."""
         return asdict(self)
 
+    def fingerprint(self) -> str:
+        """Stable hash of the genome, used to memoize fitness across generations."""
+        payload = json.dumps(self.to_dict(), sort_keys=True, default=lambda value: value.item())
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
     @classmethod
     def from_dict(cls, data: Dict) -> "StrategyGenes":
         """Create from dictionary."""
@@ -300,6 +312,146 @@ class StrategyFitness:
         return asdict(self)
 
 
+# ============================================================================
+# PRECOMPILED BACKTEST FRAME
+# ============================================================================
+
+
+class BacktestFrame:
+    """Column arrays of a time-sorted ranking frame, reusable across backtests.
+
+    Built once per dataset (e.g. once per GA run) so each OptionsStrategy.backtest
+    only evaluates gene thresholds against arrays. Sorting, defaults and price
+    selection mirror the row-based backtest exactly.
+    """
+
+    def __init__(self, options_data: pd.DataFrame):
+        self.data = options_data
+        df = options_data.copy()
+        self.time_col = "datetime" if "datetime" in df.columns else "run_at"
+
+        if self.time_col in df.columns:
+            df[self.time_col] = pd.to_datetime(df[self.time_col])
+            df = df.sort_values(self.time_col)
+
+        self.n = len(df)
+        times = df[self.time_col] if self.time_col in df.columns else None
+        # The array engine needs real timestamps at microsecond resolution
+        # (trade durations round-trip through isoformat); otherwise use rows
+        self.supported = (
+            times is not None and not times.isna().any() and not (times.dt.nanosecond != 0).any()
+        )
+        if not self.supported:
+            return
+
+        self.timestamps = list(times)
+        self.time_ns = pd.DatetimeIndex(times).as_unit("ns").asi8.tolist()
+        self.hour = times.dt.hour.to_numpy()
+        self.day = [ts.date() for ts in self.timestamps]
+        self._iso: List[Optional[str]] = [None] * self.n
+
+        if "symbol" in df.columns:
+            self.symbol = df["symbol"].tolist()
+        elif "underlying_symbol" in df.columns:
+            self.symbol = df["underlying_symbol"].tolist()
+        else:
+            self.symbol = ["UNKNOWN"] * self.n
+
+        has_contract = "contract_symbol" in df.columns
+        if has_contract:
+            self.contract = df["contract_symbol"].tolist()
+        else:
+            self.contract = [f"{sym}_{idx}" for sym, idx in zip(self.symbol, df.index)]
+
+        price = np.ones(self.n)
+        for col in reversed(PRICE_COLUMNS):
+            if col in df.columns:
+                values = self._numeric(df, col, np.nan)
+                valid = ~np.isnan(values) & (values > 0)
+                price[valid] = values[valid]
+        self.price = price.tolist()
+
+        # Entry filters (row.get defaults as in OptionsStrategy._should_enter)
+        self.rank = self._numeric(df, "composite_rank", 0)
+        self.momentum = self._numeric(df, "momentum_score", 0)
+        self.value = self._numeric(df, "value_score", 0)
+        self.theta = self._numeric(df, "theta", 0)
+        self.iv_rank = self._numeric(df, "iv_rank", 50)
+        self.signals = {
+            col: np.array([bool(v) for v in df[col].tolist()], dtype=bool)
+            for col in df.columns
+            if isinstance(col, str) and col.startswith("signal_")
+        }
+
+        # Trade bookkeeping values (row.get defaults as in backtest/_check_exit_conditions)
+        self.entry_rank = self._numeric(df, "composite_rank", 50).tolist()
+        self.iv_rank_trade = self.iv_rank.tolist()
+        self.delta = self._numeric(df, "delta", 0).tolist()
+        self.gamma = self._numeric(df, "gamma", 0).tolist()
+        self.vega = self._numeric(df, "vega", 0).tolist()
+        self.theta_trade = self.theta.tolist()
+        self.abs_delta_exit = np.abs(self._numeric(df, "delta", 0.5)).tolist()
+        self.vega_exit = self._numeric(df, "vega", 0.1).tolist()
+
+        labels = np.full(self.n, "RANK", dtype=object)
+        for col, label in reversed(
+            [
+                ("signal_buy", "BUY"),
+                ("signal_discount", "DISCOUNT"),
+                ("signal_runner", "RUNNER"),
+                ("signal_greeks", "GREEKS"),
+            ]
+        ):
+            if col in self.signals:
+                labels[self.signals[col]] = label
+        self.entry_signal = labels.tolist()
+
+        # Rows sharing a timestamp are contiguous after the sort; per group, map
+        # contract -> last row (later rows win, as in the row-based lookup table)
+        new_group = np.ones(self.n, dtype=bool)
+        if self.n:
+            new_group[1:] = np.diff(np.asarray(self.time_ns)) != 0
+        self.group = (np.cumsum(new_group) - 1).tolist()
+        self.group_contracts: List[Dict[Any, int]] = []
+        if has_contract:
+            for i, contract in enumerate(self.contract):
+                if new_group[i]:
+                    self.group_contracts.append({})
+                if contract:
+                    self.group_contracts[-1][contract] = i
+        else:
+            self.group_contracts = [{} for _ in range(int(new_group.sum()))]
+
+    @staticmethod
+    def _numeric(df: pd.DataFrame, col: str, default: float) -> np.ndarray:
+        if col not in df.columns:
+            return np.full(len(df), float(default))
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+    def isoformat(self, i: int) -> str:
+        """ISO timestamp of row ``i`` (cached)."""
+        iso = self._iso[i]
+        if iso is None:
+            iso = self._iso[i] = self.timestamps[i].isoformat()
+        return iso
+
+    def entry_mask(self, genes: StrategyGenes) -> np.ndarray:
+        """Rows passing the gene thresholds that do not depend on backtest state."""
+        mask = (self.hour >= genes.entry_hour_min) & (self.hour <= genes.entry_hour_max)
+        # Negated comparisons so NaN passes, exactly like the scalar checks
+        mask &= ~(self.rank < genes.min_composite_rank)
+        mask &= ~(self.momentum < genes.min_momentum_score * 100)
+        mask &= ~(self.value < genes.min_value_score * 100)
+        if genes.signal_filter != "any":
+            signal = self.signals.get(f"signal_{genes.signal_filter}")
+            if signal is None:
+                return np.zeros(self.n, dtype=bool)
+            mask &= signal
+        mask &= ~(self.theta < genes.theta_min)
+        mask &= ~((self.iv_rank < genes.iv_rank_min) | (self.iv_rank > genes.iv_rank_max))
+        return mask
+
+
 # ============================================================================
 # OPTIONS STRATEGY BACKTESTER
 # ============================================================================
@@ -315,9 +467,10 @@ class OptionsStrategy:
 
     def backtest(
         self,
-        options_data: pd.DataFrame,
+        options_data: Union[pd.DataFrame, BacktestFrame],
         price_data: Optional[pd.DataFrame] = None,
         initial_capital: float = 100000,
+        engine: str = "array",
     ) -> StrategyFitness:
         """
         Backtest strategy on historical options ranking data.
@@ -334,10 +487,141 @@ class OptionsStrategy:
                 - iv_rank: IV percentile
             price_data: Optional underlying price data for price simulation
             initial_capital: Starting capital for position sizing
+            engine: 'array' runs the precompiled kernel over BacktestFrame
+                columns; 'rows' walks the frame row by row (reference
+                implementation). Both produce identical results.
 
         Returns:
             StrategyFitness with performance metrics
         """
+        if engine not in BACKTEST_ENGINES:
+            raise ValueError(f"Invalid engine: {engine}. Expected one of {BACKTEST_ENGINES}")
+
+        frame = options_data if isinstance(options_data, BacktestFrame) else None
+        if engine == "array":
+            frame = frame or BacktestFrame(options_data)
+            if frame.supported:
+                return self._backtest_arrays(frame, initial_capital)
+        if frame is not None:
+            options_data = frame.data
+        return self._backtest_rows(options_data, initial_capital)
+
+    def _backtest_arrays(self, frame: BacktestFrame, initial_capital: float) -> StrategyFitness:
+        """Event loop over BacktestFrame arrays; mirrors _backtest_rows step for step."""
+        genes = self.genes
+        self.trades = []
+        capital = initial_capital
+        # contract -> (trade, entry time in ns)
+        open_positions: Dict[Any, Tuple[OptionTrade, int]] = {}
+        daily_trades: Dict = {}
+        symbol_trades: Dict[Any, int] = {}
+
+        entry_ok = frame.entry_mask(genes).tolist()
+        candidates = np.flatnonzero(entry_ok).tolist()
+        time_ns, price = frame.time_ns, frame.price
+        size_pct = genes.position_size_pct / 100
+
+        i = 0
+        while i < frame.n:
+            if not open_positions:
+                # Nothing to exit: jump to the next row that can open a trade
+                k = bisect.bisect_left(candidates, i)
+                if k == len(candidates):
+                    break
+                i = candidates[k]
+
+            # === CHECK EXITS ===
+            if open_positions:
+                group_contracts = frame.group_contracts[frame.group[i]]
+                positions_to_close = []
+                for contract, (trade, entry_ns) in open_positions.items():
+                    j = group_contracts.get(contract)
+                    if j is None:
+                        continue
+                    exit_reason = self._exit_reason_at(frame, trade, j, time_ns[i] - entry_ns)
+                    if exit_reason:
+                        positions_to_close.append((contract, exit_reason, j))
+
+                for contract, exit_reason, j in positions_to_close:
+                    trade = open_positions.pop(contract)[0]
+                    trade.exit_date = frame.isoformat(i)
+                    trade.exit_price = price[j]
+                    trade.exit_reason = exit_reason
+                    trade.delta_exit = frame.delta[j]
+                    trade.gamma_exit = frame.gamma[j]
+                    trade.vega_exit = frame.vega[j]
+                    trade.theta_exit = frame.theta_trade[j]
+
+                    capital += trade.pnl_pct * capital / 100
+                    self.trades.append(trade)
+
+            # === CHECK ENTRIES ===
+            if entry_ok[i] and len(open_positions) < genes.max_concurrent_trades:
+                day, symbol, contract = frame.day[i], frame.symbol[i], frame.contract[i]
+                if (
+                    daily_trades.get(day, 0) < genes.max_trades_per_day
+                    and symbol_trades.get(symbol, 0) < genes.max_trades_per_symbol
+                    and contract not in open_positions
+                ):
+                    trade = OptionTrade(
+                        symbol=symbol,
+                        contract_symbol=contract,
+                        entry_date=frame.isoformat(i),
+                        entry_price=price[i],
+                        entry_rank=frame.entry_rank[i],
+                        entry_hour=int(frame.hour[i]),
+                        entry_signal=frame.entry_signal[i],
+                        delta_entry=frame.delta[i],
+                        gamma_entry=frame.gamma[i],
+                        vega_entry=frame.vega[i],
+                        theta_entry=frame.theta_trade[i],
+                        iv_rank_entry=frame.iv_rank_trade[i],
+                        size_pct=size_pct,
+                    )
+                    open_positions[contract] = (trade, time_ns[i])
+                    daily_trades[day] = daily_trades.get(day, 0) + 1
+                    symbol_trades[symbol] = symbol_trades.get(symbol, 0) + 1
+
+            i += 1
+
+        # Close remaining positions at the last row, as the row-based backtest does
+        for trade, _ in open_positions.values():
+            trade.exit_date = frame.isoformat(frame.n - 1)
+            trade.exit_price = price[frame.n - 1]
+            trade.exit_reason = "END_OF_BACKTEST"
+            self.trades.append(trade)
+
+        self.fitness = self._calculate_fitness(initial_capital, capital)
+        return self.fitness
+
+    def _exit_reason_at(
+        self, frame: BacktestFrame, trade: OptionTrade, j: int, held_ns: int
+    ) -> str:
+        """Array counterpart of _check_exit_conditions for row ``j``."""
+        hold_minutes = held_ns / 1e9 / 60
+        if hold_minutes < self.genes.min_hold_minutes:
+            return ""
+        if hold_minutes > self.genes.max_hold_minutes:
+            return "MAX_HOLD_TIME"
+
+        current_price = frame.price[j]
+        if trade.entry_price > 0 and current_price > 0:
+            pnl_pct = ((current_price - trade.entry_price) / trade.entry_price) * 100
+            if pnl_pct >= self.genes.profit_target_pct:
+                return "PROFIT_TARGET"
+            if pnl_pct <= self.genes.stop_loss_pct:
+                return "STOP_LOSS"
+
+        if frame.abs_delta_exit[j] < self.genes.delta_exit:
+            return "DELTA_EXIT"
+        if frame.gamma[j] > self.genes.gamma_exit:
+            return "GAMMA_EXIT"
+        if frame.vega_exit[j] < self.genes.vega_exit:
+            return "VEGA_EXIT"
+        return ""
+
+    def _backtest_rows(self, options_data: pd.DataFrame, initial_capital: float) -> StrategyFitness:
+        """Row-by-row reference backtest (see backtest)."""
         self.trades = []
         capital = initial_capital
         open_positions: Dict[str, OptionTrade] = {}
@@ -681,6 +965,7 @@ class OptionsStrategyGA:
         mutation_rate: float = 0.15,
         crossover_rate: float = 0.70,
         tournament_size: int = 3,
+        n_jobs: int = 1,
     ):
         self.population_size = population_size
         self.generations = generations
@@ -688,8 +973,12 @@ class OptionsStrategyGA:
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.tournament_size = tournament_size
+        # Worker processes for fitness evaluation (1 = in-process)
+        self.n_jobs = max(1, n_jobs)
 
         self.population: List[OptionsStrategy] = []
+        # Fitness by StrategyGenes.fingerprint() for the current training frame
+        self._fitness_memo: Dict[str, StrategyFitness] = {}
         self.fitness_history: List[List[float]] = []
         self.best_strategies: List[OptionsStrategy] = []
 
@@ -733,17 +1022,41 @@ class OptionsStrategyGA:
             Dictionary with best strategies and metrics
         """
         self.initialize_population()
+        self._fitness_memo = {}
+
+        executor = None
+        if self.n_jobs > 1:
+            # The training frame is sent once per worker by the initializer;
+            # tasks only carry genes
+            executor = ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_fitness_worker,
+                initargs=(training_data,),
+            )
 
+        try:
+            # Compiled once and shared by every in-process backtest of this run
+            frame = BacktestFrame(training_data)
+            return self._run_generations(frame, validation_data, executor, verbose)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def _run_generations(
+        self,
+        training_data: BacktestFrame,
+        validation_data: Optional[pd.DataFrame],
+        executor: Optional[ProcessPoolExecutor],
+        verbose: bool,
+    ) -> Dict:
+        """Generation loop for evolve()."""
         best_fitness_overall = 0
         generations_without_improvement = 0
 
         for generation in range(self.generations):
             # Evaluate all strategies
-            fitnesses = []
-            for strategy in self.population:
-                strategy.backtest(training_data)
-                fitness_score = strategy.fitness.score(self.fitness_weights)
-                fitnesses.append(fitness_score)
+            fitnesses = self._evaluate_population(training_data, executor)
 
             self.fitness_history.append(fitnesses)
 
@@ -802,14 +1115,13 @@ class OptionsStrategyGA:
                 )
 
         # Final evaluation
-        final_fitnesses = []
-        for strategy in self.population:
-            strategy.backtest(training_data)
-            final_fitnesses.append(strategy.fitness.score(self.fitness_weights))
+        final_fitnesses = self._evaluate_population(training_data, executor)
 
-        # Get top 5 strategies
+        # Get top 5 strategies; re-run them in-process so their trade lists are populated
         best_indices = np.argsort(final_fitnesses)[-5:][::-1]
         self.best_strategies = [self.population[i] for i in best_indices]
+        for strategy in self.best_strategies:
+            strategy.backtest(training_data)
 
         # Validation
         validation_results = None
@@ -826,6 +1138,35 @@ class OptionsStrategyGA:
             "generations_run": len(self.fitness_history),
         }
 
+    def _evaluate_population(
+        self, training_data: BacktestFrame, executor: Optional[ProcessPoolExecutor]
+    ) -> List[float]:
+        """Score the population, backtesting only genomes not seen before."""
+        keys = [strategy.genes.fingerprint() for strategy in self.population]
+
+        pending: Dict[str, StrategyGenes] = {}
+        for key, strategy in zip(keys, self.population):
+            if key not in self._fitness_memo:
+                pending.setdefault(key, strategy.genes)
+
+        if pending:
+            if executor is None:
+                results = [
+                    OptionsStrategy(genes).backtest(training_data) for genes in pending.values()
+                ]
+            else:
+                chunksize = max(1, len(pending) // (self.n_jobs * 4))
+                results = executor.map(
+                    _backtest_genes_in_worker, pending.values(), chunksize=chunksize
+                )
+            self._fitness_memo.update(zip(pending, results))
+
+        fitnesses = []
+        for key, strategy in zip(keys, self.population):
+            strategy.fitness = self._fitness_memo[key]
+            fitnesses.append(strategy.fitness.score(self.fitness_weights))
+        return fitnesses
+
     def _tournament_select(self, fitnesses: List[float]) -> OptionsStrategy:
         """Tournament selection."""
         indices = np.random.choice(len(self.population), self.tournament_size, replace=False)
@@ -973,6 +1314,21 @@ class OptionsStrategyGA:
         return str(output_path)
 
 
+# Per-process training frame for fitness workers (set by _init_fitness_worker)
+_worker_training_data: Optional[BacktestFrame] = None
+
+
+def _init_fitness_worker(training_data: pd.DataFrame) -> None:
+    """Pool initializer: compile one read-only copy of the training frame per worker."""
+    global _worker_training_data
+    _worker_training_data = BacktestFrame(training_data)
+
+
+def _backtest_genes_in_worker(genes: StrategyGenes) -> StrategyFitness:
+    """Pool task: backtest a genome against the worker's training frame."""
+    return OptionsStrategy(genes).backtest(_worker_training_data)
+
+
 # ============================================================================
 # DATABASE INTEGRATION
 # ============================================================================
@@ -1120,6 +1476,7 @@ def run_ga_optimization(
     training_days: int = 30,
     validation_split: float = 0.2,
     save_to_db: bool = True,
+    n_jobs: int = 1,
 ) -> Dict:
     """
     Run full GA optimization for a symbol.
@@ -1131,6 +1488,7 @@ def run_ga_optimization(
         training_days: Days of historical data
         validation_split: Fraction for validation
         save_to_db: Whether to save results to database
+        n_jobs: Worker processes for fitness evaluation
 
     Returns:
         Optimization results dictionary
@@ -1152,7 +1510,7 @@ def run_ga_optimization(
     validation_data = data.iloc[split_idx:] if validation_split > 0 else None
 
     # Run GA
-    ga = OptionsStrategyGA(population_size=population_size, generations=generations)
+    ga = OptionsStrategyGA(population_size=population_size, generations=generations, n_jobs=n_jobs)
 
     results = ga.evolve(training_data, validation_data)
 
@@ -1236,6 +1594,9 @@ if __name__ == "__main__":
     parser.add_argument("--population", type=int, default=100, help="Population size")
     parser.add_argument("--days", type=int, default=30, help="Training data days")
     parser.add_argument("--no-save", action="store_true", help="Don't save to database")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Worker processes for fitness evaluation"
+    )
 
     args = parser.parse_args()
 
@@ -1245,6 +1606,7 @@ if __name__ == "__main__":
         population_size=args.population,
         training_days=args.days,
         save_to_db=not args.no_save,
+        n_jobs=args.workers,
     )
 
     if "error" not in results:
@@ -0,0 +1,93 @@
+"""
+Local OHLC Bar Store Maintenance
+
+Manages the on-disk bar store that SupabaseDatabase.fetch_ohlc_bars reads
+first when OHLC_STORE_DIR is set.
+
+Usage:
+    python -m src.scripts.ohlc_store sync --symbols AAPL MSFT --timeframes d1 h1
+    python -m src.scripts.ohlc_store sync --timeframes m15 h1 d1   # settings universe
+    python -m src.scripts.ohlc_store verify --repair
+    python -m src.scripts.ohlc_store compact
+
+Commands:
+    - sync: back-fill new partitions, then pull only bars past the high-water mark
+    - verify: re-check every segment checksum; --repair drops bad partitions
+    - compact: fold each partition's delta segments into a single segment
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config.settings import settings  # noqa: E402
+from src.data.bar_store import BarStore  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def _selected(store: BarStore, args: argparse.Namespace) -> list[tuple[str, str]]:
+    symbols = {s.upper() for s in args.symbols} if args.symbols else None
+    timeframes = set(args.timeframes) if args.timeframes else None
+    return [
+        (symbol, timeframe)
+        for symbol, timeframe in store.partitions()
+        if (symbols is None or symbol in symbols)
+        and (timeframes is None or timeframe in timeframes)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Maintain the local OHLC bar store")
+    parser.add_argument("command", choices=["sync", "verify", "compact"])
+    parser.add_argument("--symbols", nargs="*", help="Symbols (default: all / settings universe)")
+    parser.add_argument("--timeframes", nargs="*", help="Timeframes (default: all / d1)")
+    parser.add_argument("--limit", type=int, default=None, help="Bars to cover on first sync")
+    parser.add_argument("--repair", action="store_true", help="verify: drop bad partitions")
+    parser.add_argument(
+        "--store-dir", default=settings.ohlc_store_dir, help="Store root (default OHLC_STORE_DIR)"
+    )
+    args = parser.parse_args()
+
+    if not args.store_dir:
+        logger.error("No store directory: set OHLC_STORE_DIR or pass --store-dir")
+        return 2
+    store = BarStore(args.store_dir)
+
+    if args.command == "sync":
+        from src.data.supabase_db import SupabaseDatabase
+
+        db = SupabaseDatabase()
+        db.bar_store = store
+        symbols = args.symbols or list(settings.symbols_to_process)
+        synced = db.sync_bar_store(symbols, args.timeframes or ["d1"], limit=args.limit)
+        for timeframe, count in synced.items():
+            logger.info("Synced %d/%d partitions for %s", count, len(symbols), timeframe)
+        return 0
+
+    failures = 0
+    for symbol, timeframe in _selected(store, args):
+        if args.command == "verify":
+            problems = store.verify(symbol, timeframe)
+            if problems:
+                failures += 1
+                logger.error("%s %s: %s", symbol, timeframe, "; ".join(problems))
+                if args.repair:
+                    store.drop(symbol, timeframe)
+                    logger.info("Dropped %s %s; it will re-sync on next use", symbol, timeframe)
+        else:
+            rows = store.compact(symbol, timeframe)
+            logger.info("Compacted %s %s to %d rows", symbol, timeframe, rows)
+    return 1 if failures and not args.repair else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
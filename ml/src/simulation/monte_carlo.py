@@ -24,18 +24,26 @@ Usage:
     # Calculate Greeks
     greeks = sim.calculate_greeks(K=100, option_type='call')
 
+    # Price a strike ladder with pathwise/likelihood-ratio Greeks in one pass
+    ladder = sim.calculate_greeks_ladder(strikes=[90, 95, 100, 105, 110])
+
 References:
     - Glasserman, P. (2004). "Monte Carlo Methods in Financial Engineering"
     - Hull, J. C. (2018). "Options, Futures, and Other Derivatives"
 """
 
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, Optional, Sequence, Tuple
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+GREEKS_METHODS = ("finite_difference", "pathwise")
+
+# Antithetic pairs per independent substream in PathGenerator.jump_diffusion_blocks
+JUMP_SUBSTREAM_PAIRS = 256
+
 
 class PathGenerator:
     """Generate stock price paths using various models."""
@@ -108,11 +116,16 @@ class PathGenerator:
         jump_mean: float = -0.1,
         jump_std: float = 0.2,
         seed: Optional[int] = None,
+        antithetic: bool = True,
+        compensated: bool = False,
     ) -> np.ndarray:
         """Generate paths using Jump Diffusion model (Merton, 1976).
 
         Model: dS = μS dt + σS dW + S dJ
 
+        Materializes every block of jump_diffusion_blocks; use that generator
+        directly for large path counts to keep memory bounded.
+
         Args:
             S0: Initial stock price
             r: Risk-free rate
@@ -124,39 +137,121 @@ class PathGenerator:
             jump_mean: Mean of log-jump size
             jump_std: Std dev of log-jump size
             seed: Random seed
+            antithetic: Pair each path with its antithetic counterpart
+            compensated: Subtract the jump compensator λκ from the drift so
+                the discounted price is a martingale
 
         Returns:
             Array of shape (n_steps + 1, n_paths) with price paths
         """
-        if seed is not None:
-            np.random.seed(seed)
-
-        dt = T / n_steps
-
-        # GBM component
-        paths = PathGenerator.geometric_brownian_motion(
-            S0, r, sigma, T, n_steps, n_paths, seed=seed
+        blocks = PathGenerator.jump_diffusion_blocks(
+            S0,
+            r,
+            sigma,
+            T,
+            n_steps,
+            n_paths,
+            lambda_jump=lambda_jump,
+            jump_mean=jump_mean,
+            jump_std=jump_std,
+            seed=seed,
+            block_size=max(n_paths, 1),
+            antithetic=antithetic,
+            compensated=compensated,
         )
+        return np.concatenate([np.full((n_steps + 1, 0), S0), *blocks], axis=1)
 
-        # Jump component
-        # Number of jumps follows Poisson distribution
-        n_jumps = np.random.poisson(lambda_jump * T, n_paths)
-
-        for path_idx in range(n_paths):
-            if n_jumps[path_idx] > 0:
-                # Random jump times
-                jump_times = np.sort(np.random.uniform(0, T, n_jumps[path_idx]))
+    @staticmethod
+    def jump_diffusion_blocks(
+        S0: float,
+        r: float,
+        sigma: float,
+        T: float,
+        n_steps: int,
+        n_paths: int,
+        lambda_jump: float = 0.1,
+        jump_mean: float = -0.1,
+        jump_std: float = 0.2,
+        seed: Optional[int] = None,
+        block_size: int = 10_000,
+        antithetic: bool = True,
+        compensated: bool = False,
+    ) -> Iterator[np.ndarray]:
+        """Stream Merton jump-diffusion paths in blocks of ``block_size`` paths.
+
+        Each step draws a Poisson jump count per path and the summed log-jump
+        N·μ_J + σ_J·√N·Z_J (exact for a sum of N normal jumps), so jumps are
+        handled for all paths at once. With ``antithetic``, paths come in
+        adjacent pairs sharing jump counts with negated Brownian and jump-size
+        shocks.
+
+        Random numbers come from independent substreams of JUMP_SUBSTREAM_PAIRS
+        pairs keyed on ``seed``, so for a given seed the concatenated output is
+        identical for every ``block_size``.
 
-                # Jump sizes (log-normal)
-                jump_sizes = np.exp(jump_mean + jump_std * np.random.randn(n_jumps[path_idx]))
+        Args:
+            S0, r, sigma, T, n_steps, n_paths, lambda_jump, jump_mean, jump_std,
+            seed, antithetic, compensated: See geometric_brownian_motion_with_jumps
+            block_size: Paths per yielded block (the last block may be smaller)
 
-                # Apply jumps at corresponding time steps
-                for jump_time, jump_size in zip(jump_times, jump_sizes):
-                    jump_step = int(jump_time / dt)
-                    if jump_step < n_steps:
-                        paths[jump_step:, path_idx] *= jump_size
+        Yields:
+            Arrays of shape (n_steps + 1, <= block_size) with price paths
+        """
+        if block_size < 1:
+            raise ValueError(f"block_size must be >= 1, got {block_size}")
 
-        return paths
+        dt = T / n_steps
+        drift = (r - 0.5 * sigma**2) * dt
+        if compensated:
+            kappa = np.exp(jump_mean + 0.5 * jump_std**2) - 1
+            drift -= lambda_jump * kappa * dt
+        vol = sigma * np.sqrt(dt)
+        root = np.random.SeedSequence(seed)
+
+        def substream(index: int) -> np.ndarray:
+            rng = np.random.default_rng(np.random.SeedSequence(root.entropy, spawn_key=(index,)))
+            shape = (n_steps, JUMP_SUBSTREAM_PAIRS)
+            diffusion = vol * rng.standard_normal(shape)
+            counts = rng.poisson(lambda_jump * dt, shape)
+
+            # Jumps are rare per step: only draw sizes where the count is non-zero
+            jumped = np.flatnonzero(counts)
+            n_jumps = counts.ravel()[jumped]
+            jump_drift = n_jumps * jump_mean
+            jump_shock = jump_std * np.sqrt(n_jumps) * rng.standard_normal(jumped.size)
+
+            increments = drift + diffusion
+            increments.ravel()[jumped] += jump_drift + jump_shock
+            if not antithetic:
+                return increments
+
+            mirrored = drift - diffusion
+            mirrored.ravel()[jumped] += jump_drift - jump_shock
+            paired = np.empty((n_steps, 2 * JUMP_SUBSTREAM_PAIRS))
+            paired[:, 0::2] = increments
+            paired[:, 1::2] = mirrored
+            return paired
+
+        pending = np.empty((n_steps, 0))
+        stream_index = 0
+        produced = 0
+        while produced < n_paths:
+            take = min(block_size, n_paths - produced)
+            parts = [pending]
+            available = pending.shape[1]
+            while available < take:
+                parts.append(substream(stream_index))
+                stream_index += 1
+                available += parts[-1].shape[1]
+            log_returns = np.concatenate(parts, axis=1) if len(parts) > 1 else pending
+            pending = log_returns[:, take:]
+
+            paths = np.zeros((n_steps + 1, take))
+            np.cumsum(log_returns[:, :take], axis=0, out=paths[1:])
+            np.exp(paths, out=paths)
+            paths *= S0
+            yield paths
+            produced += take
 
 
 class MonteCarloSimulator:
@@ -275,18 +370,32 @@ class MonteCarloSimulator:
         }
 
     def calculate_greeks(
-        self, K: float, option_type: str = "call", epsilon: float = 0.01
+        self,
+        K: float,
+        option_type: str = "call",
+        epsilon: float = 0.01,
+        method: str = "finite_difference",
     ) -> Dict[str, float]:
-        """Calculate Greeks using finite differences.
+        """Calculate Greeks using finite differences or pathwise estimators.
 
         Args:
             K: Strike price
             option_type: 'call' or 'put'
             epsilon: Bump size for finite differences
+            method: 'finite_difference' (re-simulates once per bump) or
+                'pathwise' (single pass, see calculate_greeks_ladder)
 
         Returns:
             Dictionary with delta, gamma, vega, theta, rho
         """
+        if method not in GREEKS_METHODS:
+            raise ValueError(f"Invalid method: {method}. Expected one of {GREEKS_METHODS}")
+        if method == "pathwise":
+            ladder = self.calculate_greeks_ladder([K], option_type)
+            return {
+                name: float(ladder[name][0]) for name in ("delta", "gamma", "vega", "theta", "rho")
+            }
+
         # Base price
         base_price = self.price_european_option(K, option_type)["price"]
 
@@ -376,6 +485,102 @@ class MonteCarloSimulator:
             "rho": float(rho / 100),  # Per 1% change
         }
 
+    def _terminal_normal_chunks(self, chunk_size: int) -> Iterator[np.ndarray]:
+        """Yield standard normal draws driving S_T, ``chunk_size`` paths at a time.
+
+        European payoffs depend only on S_T and GBM is exact at any step size, so
+        a single terminal draw per path stands in for the full step tensor.
+        Draws are antithetic pairs (Z, -Z) taken from one seeded stream in
+        order, so every strike and Greek shares the same numbers and the set of
+        simulated paths does not depend on ``chunk_size``.
+        """
+        rng = np.random.default_rng(self.seed)
+        half_paths = self.n_simulations // 2
+        half_chunk = max(chunk_size // 2, 1)
+        for start in range(0, half_paths, half_chunk):
+            Z = rng.standard_normal(min(half_chunk, half_paths - start))
+            yield np.concatenate([Z, -Z])
+        if self.n_simulations % 2 == 1:
+            yield rng.standard_normal(1)
+
+    def calculate_greeks_ladder(
+        self,
+        strikes: Sequence[float],
+        option_type: str = "call",
+        chunk_size: int = 50_000,
+    ) -> Dict[str, np.ndarray]:
+        """Price a strike ladder and its Greeks from one set of simulated paths.
+
+        All strikes and Greeks reuse the same draws (common random numbers), so
+        the cost is one valuation instead of one per bump. Estimators:
+
+        - Delta, vega, rho, theta: pathwise derivatives of the discounted payoff
+        - Gamma: pathwise delta differentiated with the likelihood ratio
+          (mixed estimator), which stays finite for the kinked payoff
+
+        Paths are generated and reduced ``chunk_size`` at a time, so memory stays
+        bounded at roughly ``len(strikes) * chunk_size`` floats.
+
+        Args:
+            strikes: Strike prices to evaluate
+            option_type: 'call' or 'put'
+            chunk_size: Paths simulated per chunk
+
+        Returns:
+            Dictionary of arrays aligned with ``strikes``: strike, price, std_error,
+            delta, gamma, vega (per 1%), theta (per day), rho (per 1%)
+        """
+        if option_type not in ("call", "put"):
+            raise ValueError(f"Invalid option_type: {option_type}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+        K = np.asarray(strikes, dtype=float).reshape(-1, 1)
+        S0, r, sigma, T = self.S0, self.r, self.sigma, self.T
+        sqrt_T = np.sqrt(T)
+        discount = np.exp(-r * T)
+        sign = 1.0 if option_type == "call" else -1.0
+
+        names = ("price", "price_sq", "delta", "gamma", "vega", "theta", "rho")
+        sums = {name: np.zeros(K.shape[0]) for name in names}
+
+        for Z in self._terminal_normal_chunks(chunk_size):
+            S_T = S0 * np.exp((r - 0.5 * sigma**2) * T + sigma * sqrt_T * Z)
+            # dS_T/dsigma and dS_T/dT along each path
+            dS_dsigma = S_T * (sqrt_T * Z - sigma * T)
+            dS_dT = S_T * (r - 0.5 * sigma**2 + 0.5 * sigma * Z / sqrt_T)
+
+            payoff = np.maximum(sign * (S_T - K), 0.0)
+            # Payoff slope g'(S_T): +1 ITM call, -1 ITM put, 0 otherwise
+            slope = sign * (payoff > 0)
+            discounted = discount * payoff
+
+            sums["price"] += discounted.sum(axis=1)
+            sums["price_sq"] += (discounted**2).sum(axis=1)
+            sums["delta"] += discount * (slope * S_T).sum(axis=1) / S0
+            sums["gamma"] += (
+                discount * (slope * S_T * (Z / (sigma * sqrt_T) - 1.0)).sum(axis=1) / S0**2
+            )
+            sums["vega"] += discount * (slope * dS_dsigma).sum(axis=1)
+            sums["rho"] += (slope * discount * T * S_T).sum(axis=1) - T * discounted.sum(axis=1)
+            # dV/dT; theta is its negative in calendar time
+            sums["theta"] += discount * (slope * dS_dT).sum(axis=1) - r * discounted.sum(axis=1)
+
+        n = self.n_simulations
+        price = sums["price"] / n
+        variance = np.maximum(sums["price_sq"] / n - price**2, 0.0)
+
+        return {
+            "strike": K.ravel(),
+            "price": price,
+            "std_error": np.sqrt(variance / n),
+            "delta": sums["delta"] / n,
+            "gamma": sums["gamma"] / n,
+            "vega": sums["vega"] / n / 100,  # Per 1% change
+            "theta": -sums["theta"] / n / 365,  # Per day
+            "rho": sums["rho"] / n / 100,  # Per 1% change
+        }
+
     def calculate_var(
         self, confidence_level: float = 0.95, holding_period_days: int = 1
     ) -> Dict[str, float]:
@@ -18,6 +18,11 @@ Usage:
     result_df, info = supertrend.calculate()
     # result_df contains 'supertrend', 'trend', 'signal', 'signal_confidence' columns
     # info contains 'target_factor', 'performance_index', 'signal_strength', 'signals'
+
+Engines:
+    engine="numpy" (default) evaluates every factor in a single pass over
+    contiguous float64 arrays (see ``supertrend_kernel``). engine="pandas" runs
+    the original bar-by-bar implementation and is kept as the reference.
 """
 
 import logging
@@ -29,6 +34,97 @@ from sklearn.cluster import KMeans
 
 logger = logging.getLogger(__name__)
 
+SUPERTREND_ENGINES = ("numpy", "pandas")
+
+
+def supertrend_kernel(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr: np.ndarray,
+    factors: np.ndarray,
+    perf_alpha: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate SuperTrend bands and LuxAlgo performance for many factors at once.
+
+    Walks the bars once, updating the band recursion for all factors as a
+    vector. Arithmetic matches ``SuperTrendAI.calculate_supertrend`` and
+    ``SuperTrendAI.calculate_performance`` operation for operation, so results
+    are identical to the reference implementation.
+
+    Args:
+        high, low, close, atr: Price and ATR arrays of length n
+        factors: ATR multipliers, shape (F,)
+        perf_alpha: Smoothing period for the performance EMA
+
+    Returns:
+        Tuple of (supertrend (n, F), trend (n, F) with 1=bullish/0=bearish,
+        performance (F,))
+    """
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    atr = np.ascontiguousarray(atr, dtype=np.float64)
+    factors = np.atleast_1d(np.asarray(factors, dtype=np.float64))
+
+    n, n_factors = len(close), len(factors)
+    final_upper = np.empty((n, n_factors))
+    final_lower = np.empty((n, n_factors))
+    trend = np.empty((n, n_factors), dtype=np.int64)
+    perf = np.zeros(n_factors)
+    if n == 0:
+        return final_lower, trend, perf
+
+    hl2 = (high + low) / 2
+    offset = atr[:, None] * factors[None, :]
+    upper_band = hl2[:, None] + offset
+    lower_band = hl2[:, None] - offset
+
+    final_upper[0] = upper_band[0]
+    final_lower[0] = lower_band[0]
+    trend[0] = 1
+    alpha = 2 / (perf_alpha + 1)
+
+    for i in range(1, n):
+        prev_close = close[i - 1]
+        curr_close = close[i]
+        prev_upper = final_upper[i - 1]
+        prev_lower = final_lower[i - 1]
+        prev_trend = trend[i - 1]
+
+        final_upper[i] = np.where(
+            (upper_band[i] < prev_upper) | (prev_close > prev_upper), upper_band[i], prev_upper
+        )
+        final_lower[i] = np.where(
+            (lower_band[i] > prev_lower) | (prev_close < prev_lower), lower_band[i], prev_lower
+        )
+        trend[i] = np.where(
+            curr_close > final_upper[i],
+            1,
+            np.where(curr_close < final_lower[i], 0, prev_trend),
+        )
+
+        signal = np.where(prev_trend == 1, 1.0, -1.0)
+        perf = perf + alpha * ((curr_close - prev_close) * signal - perf)
+
+    supertrend = np.where(trend == 1, final_lower, final_upper)
+    return supertrend, trend, perf
+
+
+def trend_duration_kernel(trend: np.ndarray) -> np.ndarray:
+    """Bars since the last trend flip (0 on the flip bar and on the first bar)."""
+    trend = np.asarray(trend)
+    n = len(trend)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    positions = np.arange(n)
+    flips = np.empty(n, dtype=bool)
+    flips[0] = True
+    flips[1:] = trend[1:] != trend[:-1]
+    last_flip = np.maximum.accumulate(np.where(flips, positions, 0))
+    return positions - last_flip
+
 
 class SuperTrendAI:
     """
@@ -48,6 +144,7 @@ class SuperTrendAI:
         from_cluster: Which cluster to select from ('Best', 'Average', 'Worst')
         max_iter: Maximum iterations for K-means (default: 1000)
         max_data: Maximum data points for clustering (default: 10000)
+        engine: 'numpy' (array kernel) or 'pandas' (bar-by-bar reference)
     """
 
     def __init__(
@@ -61,6 +158,7 @@ class SuperTrendAI:
         from_cluster: str = "Best",
         max_iter: int = 1000,
         max_data: int = 10000,
+        engine: str = "numpy",
     ):
         self.df = df.copy()
         self.atr_length = atr_length
@@ -74,6 +172,9 @@ class SuperTrendAI:
 
         if min_mult > max_mult:
             raise ValueError("Minimum multiplier cannot be greater than maximum")
+        if engine not in SUPERTREND_ENGINES:
+            raise ValueError(f"engine must be one of {SUPERTREND_ENGINES}, got {engine!r}")
+        self.engine = engine
 
         self.factors = np.arange(min_mult, max_mult + step, step)
         logger.info(
@@ -96,6 +197,9 @@ class SuperTrendAI:
         """
         Calculate SuperTrend for a given ATR multiplier.
 
+        Bar-by-bar reference implementation; ``supertrend_kernel`` is the
+        array equivalent used by the default engine.
+
         Args:
             atr: ATR series
             factor: ATR multiplier
@@ -193,6 +297,42 @@ class SuperTrendAI:
 
         return perf
 
+    def evaluate_factors(
+        self, atr: pd.Series, factors: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate SuperTrend and performance for several factors.
+
+        Args:
+            atr: ATR series
+            factors: ATR multipliers to evaluate
+
+        Returns:
+            Tuple of (supertrend (n, F), trend (n, F), performance (F,))
+        """
+        factors = np.atleast_1d(np.asarray(factors, dtype=np.float64))
+        if self.engine == "numpy":
+            return supertrend_kernel(
+                self.df["high"].to_numpy(dtype=np.float64),
+                self.df["low"].to_numpy(dtype=np.float64),
+                self.df["close"].to_numpy(dtype=np.float64),
+                atr.to_numpy(dtype=np.float64),
+                factors,
+                self.perf_alpha,
+            )
+
+        st_columns, trend_columns, performances = [], [], []
+        for factor in factors:
+            st, trend = self.calculate_supertrend(atr, factor)
+            st_columns.append(st.to_numpy())
+            trend_columns.append(trend.to_numpy())
+            performances.append(self.calculate_performance(st, trend))
+        return (
+            np.column_stack(st_columns),
+            np.column_stack(trend_columns),
+            np.asarray(performances, dtype=np.float64),
+        )
+
     def run_kmeans_clustering(
         self, performances: list, factors: list
     ) -> Tuple[float, Dict[int, str]]:
@@ -273,11 +413,8 @@ class SuperTrendAI:
         atr = self.calculate_atr()
 
         # Test all factors
-        all_performances = []
-        for factor in self.factors:
-            st, trend = self.calculate_supertrend(atr, factor)
-            perf = self.calculate_performance(st, trend)
-            all_performances.append(perf)
+        _, _, performances = self.evaluate_factors(atr, self.factors)
+        all_performances = performances.tolist()
 
         # Find optimal factor via clustering
         target_factor, cluster_mapping = self.run_kmeans_clustering(
@@ -285,22 +422,18 @@ class SuperTrendAI:
         )
 
         # Calculate final SuperTrend with optimal factor
-        final_st, final_trend = self.calculate_supertrend(atr, target_factor)
+        st_values, trend_values, final_perf = self.evaluate_factors(atr, [target_factor])
+        final_st = pd.Series(st_values[:, 0], index=self.df.index)
+        final_trend = pd.Series(trend_values[:, 0], index=self.df.index)
 
         # Performance index (0-1 normalized)
         close = self.df["close"]
         den = close.diff().abs().ewm(span=self.perf_alpha, adjust=False).mean()
-        perf_idx = max(self.calculate_performance(final_st, final_trend), 0) / (
-            den.iloc[-1] + 1e-10
-        )
+        perf_idx = max(final_perf[0], 0) / (den.iloc[-1] + 1e-10)
         perf_idx = min(max(perf_idx, 0), 1)
 
         # Performance-adaptive MA
-        perf_ama = pd.Series(final_st.iloc[0], index=self.df.index)
-        for i in range(1, len(self.df)):
-            perf_ama.iloc[i] = perf_ama.iloc[i - 1] + perf_idx * (
-                final_st.iloc[i] - perf_ama.iloc[i - 1]
-            )
+        perf_ama = self._calculate_perf_ama(final_st, perf_idx)
 
         # Store results
         self.df["supertrend"] = final_st
@@ -310,14 +443,7 @@ class SuperTrendAI:
         self.df["atr"] = atr
 
         # Generate signals (trend changes)
-        self.df["supertrend_signal"] = 0
-        for i in range(1, len(self.df)):
-            prev_trend = self.df["supertrend_trend"].iloc[i - 1]
-            curr_trend = self.df["supertrend_trend"].iloc[i]
-            if prev_trend == 0 and curr_trend == 1:
-                self.df.loc[self.df.index[i], "supertrend_signal"] = 1
-            elif prev_trend == 1 and curr_trend == 0:
-                self.df.loc[self.df.index[i], "supertrend_signal"] = -1
+        self.df["supertrend_signal"] = self._calculate_trend_signals(final_trend)
 
         # Calculate per-bar confidence scores
         self.df["signal_confidence"] = self.calculate_signal_confidence(perf_idx)
@@ -353,6 +479,48 @@ class SuperTrendAI:
 
         return self.df, info
 
+    def _calculate_perf_ama(self, supertrend: pd.Series, perf_idx: float) -> pd.Series:
+        """Performance-adaptive moving average of the SuperTrend line."""
+        if self.engine == "pandas":
+            perf_ama = pd.Series(supertrend.iloc[0], index=self.df.index)
+            for i in range(1, len(self.df)):
+                perf_ama.iloc[i] = perf_ama.iloc[i - 1] + perf_idx * (
+                    supertrend.iloc[i] - perf_ama.iloc[i - 1]
+                )
+            return perf_ama
+
+        # Scalar recurrence over plain floats: same arithmetic, no per-bar indexing
+        values = supertrend.tolist()
+        out = np.empty(len(values))
+        prev = values[0]
+        out[0] = prev
+        for i in range(1, len(values)):
+            prev = prev + perf_idx * (values[i] - prev)
+            out[i] = prev
+        return pd.Series(out, index=self.df.index)
+
+    def _calculate_trend_signals(self, trend: pd.Series) -> pd.Series:
+        """+1 on bearish->bullish flips, -1 on bullish->bearish flips, else 0."""
+        if self.engine == "pandas":
+            signals = pd.Series(0, index=self.df.index)
+            for i in range(1, len(self.df)):
+                prev_trend = trend.iloc[i - 1]
+                curr_trend = trend.iloc[i]
+                if prev_trend == 0 and curr_trend == 1:
+                    signals.iloc[i] = 1
+                elif prev_trend == 1 and curr_trend == 0:
+                    signals.iloc[i] = -1
+            return signals
+
+        values = trend.to_numpy()
+        signals = np.zeros(len(values), dtype=np.int64)
+        if len(values) > 1:
+            prev, curr = values[:-1], values[1:]
+            signals[1:] = np.where((prev == 0) & (curr == 1), 1, 0) - np.where(
+                (prev == 1) & (curr == 0), 1, 0
+            )
+        return pd.Series(signals, index=self.df.index)
+
     def calculate_signal_confidence(self, perf_idx: float) -> pd.Series:
         """
         Calculate per-bar confidence score based on multiple factors.
@@ -380,14 +548,17 @@ class SuperTrendAI:
         distance_bonus = np.clip(distance_pct / 2, 0, 1.5)
 
         # Trend duration bonus: longer trends get slight boost
-        trend_duration = pd.Series(0, index=self.df.index)
-        duration = 0
-        for i in range(1, len(self.df)):
-            if trend.iloc[i] == trend.iloc[i - 1]:
-                duration += 1
-            else:
-                duration = 0
-            trend_duration.iloc[i] = duration
+        if self.engine == "pandas":
+            trend_duration = pd.Series(0, index=self.df.index)
+            duration = 0
+            for i in range(1, len(self.df)):
+                if trend.iloc[i] == trend.iloc[i - 1]:
+                    duration += 1
+                else:
+                    duration = 0
+                trend_duration.iloc[i] = duration
+        else:
+            trend_duration = pd.Series(trend_duration_kernel(trend.to_numpy()), index=self.df.index)
 
         duration_bonus = np.clip(trend_duration / 20, 0, 1.5)
 
@@ -421,8 +592,9 @@ class SuperTrendAI:
         atr = self.df["atr"]
         confidence = self.calculate_signal_confidence(perf_idx)
 
-        for i in range(1, len(self.df)):
-            signal = self.df["supertrend_signal"].iloc[i]
+        signal_values = self.df["supertrend_signal"].to_numpy()
+        for i in np.flatnonzero(signal_values[1:]) + 1:
+            signal = signal_values[i]
             if signal != 0:
                 entry_price = float(self.df["close"].iloc[i])
                 stop_level = float(self.df["supertrend"].iloc[i])
@@ -492,11 +664,9 @@ class SuperTrendAI:
         current_stop = self.df["supertrend"].iloc[-1]
 
         # Calculate trend duration (bars since last signal)
-        trend_duration = 0
-        for i in range(len(self.df) - 1, 0, -1):
-            if self.df["supertrend_signal"].iloc[i] != 0:
-                break
-            trend_duration += 1
+        signal_bars = np.flatnonzero(self.df["supertrend_signal"].to_numpy()[1:]) + 1
+        last_bar = len(self.df) - 1
+        trend_duration = int(last_bar - signal_bars[-1]) if len(signal_bars) else last_bar
 
         return {
             "current_trend": "BULLISH" if current_trend == 1 else "BEARISH",
@@ -523,7 +693,9 @@ class SuperTrendAI:
         """
         self.df = new_df.copy()
         atr = self.calculate_atr()
-        supertrend, trend = self.calculate_supertrend(atr, target_factor)
+        st_values, trend_values, _ = self.evaluate_factors(atr, [target_factor])
+        supertrend = pd.Series(st_values[:, 0], index=self.df.index)
+        trend = pd.Series(trend_values[:, 0], index=self.df.index)
 
         self.df["supertrend"] = supertrend
         self.df["supertrend_trend"] = trend
@@ -1,6 +1,10 @@
 """Live Greeks calculator for real-time options pricing.
 
-Calculates Greeks in real-time as market data streams in.
+Calculates Greeks in real-time as market data streams in. Options are kept in
+a struct-of-arrays book per underlying, so each underlying tick reprices every
+dependent contract in one vectorized Black-Scholes call. Ticks arriving within
+``update_interval`` are coalesced: the latest price is kept and emitted by a
+per-underlying timer once the interval has elapsed (or earlier by ``flush()``).
 
 Usage:
     from src.streaming.live_greeks import LiveGreeksCalculator
@@ -9,9 +13,12 @@ Usage:
     # Initialize
     greeks_calc = LiveGreeksCalculator(r=0.05, sigma=0.25)
 
-    # Set up callback
-    def on_greeks_update(symbol, greeks):
-        print(f"{symbol}: Delta={greeks['delta']:.4f}")
+    # Track a strike ladder on one underlying
+    greeks_calc.add_options("AAPL", K=[140, 150, 160], T=30 / 365, option_type="call")
+
+    # Set up callback (per contract) or batch callback (per underlying)
+    def on_greeks_update(option_id, greeks):
+        print(f"{option_id}: Delta={greeks['delta']:.4f}")
 
     greeks_calc.set_callback(on_greeks_update)
 
@@ -22,10 +29,87 @@ Usage:
 """
 
 import logging
-from typing import Callable, Dict, Optional
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..models.options_pricing import BlackScholesModel, OptionsGreeksBatch
 
 logger = logging.getLogger(__name__)
 
+BatchCallback = Callable[[str, List[str], OptionsGreeksBatch, float], None]
+
+
+class OptionBook:
+    """Struct-of-arrays book of the options tracked on one underlying.
+
+    Contracts are appended to plain lists; the numpy arrays handed to the
+    pricer are rebuilt lazily after the book changes.
+    """
+
+    def __init__(self):
+        self.option_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._K: List[float] = []
+        self._T: List[float] = []
+        self._sigma: List[float] = []
+        self._types: List[str] = []
+        self._arrays: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self.option_ids)
+
+    def __contains__(self, option_id: str) -> bool:
+        return option_id in self._index
+
+    def upsert(self, option_id: str, K: float, T: float, option_type: str, sigma: float):
+        """Add a contract, or replace the spec of an existing one."""
+        i = self._index.get(option_id)
+        if i is None:
+            self._index[option_id] = len(self.option_ids)
+            self.option_ids.append(option_id)
+            self._K.append(K)
+            self._T.append(T)
+            self._sigma.append(sigma)
+            self._types.append(option_type)
+        else:
+            self._K[i], self._T[i], self._sigma[i], self._types[i] = K, T, sigma, option_type
+        self._arrays = None
+
+    def remove(self, option_id: str) -> bool:
+        """Remove a contract (swap with the last row); returns False if untracked."""
+        i = self._index.pop(option_id, None)
+        if i is None:
+            return False
+        last = len(self.option_ids) - 1
+        for column in (self.option_ids, self._K, self._T, self._sigma, self._types):
+            column[i] = column[last]
+            column.pop()
+        if i != last:
+            self._index[self.option_ids[i]] = i
+        self._arrays = None
+        return True
+
+    def spec(self, option_id: str) -> Optional[Dict]:
+        """Spec of one contract as {K, T, type, sigma}."""
+        i = self._index.get(option_id)
+        if i is None:
+            return None
+        return {"K": self._K[i], "T": self._T[i], "type": self._types[i], "sigma": self._sigma[i]}
+
+    def arrays(self) -> tuple:
+        """(K, T, sigma, option_type) arrays in option_ids order."""
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self._K, dtype=float),
+                np.array(self._T, dtype=float),
+                np.array(self._sigma, dtype=float),
+                np.array(self._types, dtype=str),
+            )
+        return self._arrays
+
 
 class LiveGreeksCalculator:
     """Calculate Greeks in real-time from streaming prices."""
@@ -35,17 +119,23 @@ class LiveGreeksCalculator:
 
         Args:
             r: Risk-free rate
-            sigma: Default volatility (can be overridden per symbol)
-            update_interval: Minimum seconds between updates
+            sigma: Default volatility (can be overridden per option)
+            update_interval: Minimum seconds between updates per underlying;
+                ticks in between are coalesced, not dropped
         """
         self.r = r
         self.sigma = sigma
         self.update_interval = update_interval
+        self.bs = BlackScholesModel(risk_free_rate=r)
 
-        self.option_specs: Dict[str, Dict] = {}  # {symbol: {K, T, type}}
+        self.books: Dict[str, OptionBook] = {}  # {underlying: OptionBook}
         self.last_prices: Dict[str, float] = {}
         self.last_update_times: Dict[str, float] = {}
+        self.pending: Dict[str, float] = {}  # {underlying: latest price not yet emitted}
+        self._timers: Dict[str, threading.Timer] = {}  # {underlying: scheduled emission}
         self.callback: Optional[Callable] = None
+        self.batch_callback: Optional[BatchCallback] = None
+        self._lock = threading.Lock()
 
         logger.info(f"LiveGreeksCalculator initialized: r={r:.2%}, σ={sigma:.2%}")
 
@@ -56,6 +146,7 @@ class LiveGreeksCalculator:
         T: float,
         option_type: str = "call",
         sigma: Optional[float] = None,
+        option_id: Optional[str] = None,
     ):
         """Add option for Greeks tracking.
 
@@ -65,106 +156,262 @@ class LiveGreeksCalculator:
             T: Time to maturity (years)
             option_type: 'call' or 'put'
             sigma: Custom volatility (optional)
+            option_id: Contract identifier; defaults to the underlying symbol,
+                so re-adding without an id replaces the tracked option
         """
-        self.option_specs[symbol] = {
-            "K": K,
-            "T": T,
-            "type": option_type,
-            "sigma": sigma or self.sigma,
-        }
+        with self._lock:
+            self.books.setdefault(symbol, OptionBook()).upsert(
+                option_id or symbol, float(K), float(T), option_type.lower(), sigma or self.sigma
+            )
 
         logger.info(f"Added option: {symbol} {K} {option_type}")
 
+    def add_options(
+        self,
+        symbol: str,
+        K: Sequence[float],
+        T: Union[float, Sequence[float]],
+        option_type: Union[str, Sequence[str]] = "call",
+        sigma: Optional[Union[float, Sequence[float]]] = None,
+        option_ids: Optional[Sequence[str]] = None,
+    ):
+        """Add many options on one underlying (scalars broadcast against K).
+
+        Args:
+            symbol: Underlying symbol
+            K: Strike prices
+            T: Time(s) to maturity (years)
+            option_type: 'call'/'put', or one per contract
+            sigma: Custom volatility(ies) (optional)
+            option_ids: Contract identifiers; default "{symbol}:{type}:{K}:{T}"
+        """
+        strikes = np.asarray(K, dtype=float).ravel()
+        n = len(strikes)
+        maturities = np.broadcast_to(np.asarray(T, dtype=float), (n,))
+        types = np.broadcast_to(np.char.lower(np.asarray(option_type, dtype=str)), (n,))
+        vols = np.broadcast_to(
+            np.asarray(self.sigma if sigma is None else sigma, dtype=float), (n,)
+        )
+        if option_ids is None:
+            option_ids = [
+                f"{symbol}:{t}:{k:g}:{m:g}" for k, m, t in zip(strikes, maturities, types)
+            ]
+        elif len(option_ids) != n:
+            raise ValueError(f"Expected {n} option_ids, got {len(option_ids)}")
+
+        with self._lock:
+            book = self.books.setdefault(symbol, OptionBook())
+            for option_id, k, m, t, v in zip(
+                option_ids, strikes.tolist(), maturities.tolist(), types.tolist(), vols.tolist()
+            ):
+                book.upsert(option_id, k, m, t, v)
+
+        logger.info(f"Added {n} options on {symbol} ({len(book)} tracked)")
+
+    def remove_option(self, symbol: str, option_id: Optional[str] = None) -> bool:
+        """Stop tracking an option (option_id defaults to the underlying symbol)."""
+        with self._lock:
+            book = self.books.get(symbol)
+            if book is None or not book.remove(option_id or symbol):
+                return False
+            if not book:
+                del self.books[symbol]
+                self.pending.pop(symbol, None)
+                self._cancel_timer(symbol)
+            return True
+
     def set_callback(self, callback: Callable[[str, Dict], None]):
-        """Set callback for Greeks updates.
+        """Set callback for per-contract Greeks updates.
 
         Args:
-            callback: Function(symbol, greeks_dict)
+            callback: Function(option_id, greeks_dict)
         """
         self.callback = callback
 
+    def set_batch_callback(self, callback: BatchCallback):
+        """Set callback receiving each underlying's whole book in one call.
+
+        Args:
+            callback: Function(symbol, option_ids, OptionsGreeksBatch, underlying_price)
+        """
+        self.batch_callback = callback
+
     def on_price_update(self, message):
         """Handle price update from stream.
 
         Args:
             message: StreamMessage object
         """
-        import time
-
         symbol = message.symbol
         price = message.price
 
         # Check if we're tracking this symbol
-        if symbol not in self.option_specs:
+        if symbol not in self.books:
             return
 
-        # Rate limiting
-        last_update = self.last_update_times.get(symbol, 0)
-        if time.time() - last_update < self.update_interval:
-            return
+        now = time.time()
+        with self._lock:
+            self.last_prices[symbol] = price
+            # Rate limiting: keep the latest price and emit it when the interval ends
+            elapsed = now - self.last_update_times.get(symbol, 0)
+            if elapsed < self.update_interval:
+                self.pending[symbol] = price
+                if symbol not in self._timers:
+                    self._schedule(symbol, self.update_interval - elapsed)
+                return
+            self.last_update_times[symbol] = now
+            self.pending.pop(symbol, None)
+            self._cancel_timer(symbol)
 
-        # Store price
-        self.last_prices[symbol] = price
-        self.last_update_times[symbol] = time.time()
+        self._emit(symbol, price)
 
-        # Calculate Greeks
-        try:
-            greeks = self._calculate_greeks(symbol, price)
+    def flush(self, force: bool = False) -> int:
+        """Emit coalesced updates whose update_interval has elapsed.
 
-            if self.callback and greeks:
-                self.callback(symbol, greeks)
-
-        except Exception as e:
-            logger.error(f"Error calculating Greeks for {symbol}: {e}")
-
-    def _calculate_greeks(self, symbol: str, S: float) -> Optional[Dict]:
-        """Calculate Greeks for current price.
+        Pending updates are emitted by their timers anyway; this emits them
+        without waiting for the timer thread (or, with ``force``, right away).
 
         Args:
-            symbol: Option symbol
-            S: Current underlying price
+            force: Emit every pending update regardless of update_interval
 
         Returns:
-            Dictionary with Greeks
+            Number of underlyings emitted
         """
-        spec = self.option_specs.get(symbol)
-        if not spec:
-            return None
-
+        now = time.time()
+        due = {}
+        with self._lock:
+            for symbol, price in list(self.pending.items()):
+                if force or now - self.last_update_times.get(symbol, 0) >= self.update_interval:
+                    due[symbol] = self.pending.pop(symbol)
+                    self.last_update_times[symbol] = now
+                    self._cancel_timer(symbol)
+
+        for symbol, price in due.items():
+            self._emit(symbol, price)
+        return len(due)
+
+    def stop(self):
+        """Cancel scheduled emissions; held-back prices stay pending for flush()."""
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+
+    def _schedule(self, symbol: str, delay: float):
+        """Start the timer emitting ``symbol``'s pending price (caller holds the lock)."""
+        timer = threading.Timer(delay, self._emit_pending, args=(symbol,))
+        timer.daemon = True
+        self._timers[symbol] = timer
+        timer.start()
+
+    def _cancel_timer(self, symbol: str):
+        """Cancel ``symbol``'s scheduled emission (caller holds the lock)."""
+        timer = self._timers.pop(symbol, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _emit_pending(self, symbol: str):
+        """Timer target: emit the price the rate limit held back."""
+        with self._lock:
+            # A timer cancelled after it fired must not emit ahead of its successor
+            if self._timers.get(symbol) is not threading.current_thread():
+                return
+            del self._timers[symbol]
+            price = self.pending.pop(symbol, None)
+            if price is None:
+                return
+            self.last_update_times[symbol] = time.time()
+
+        self._emit(symbol, price)
+
+    def _emit(self, symbol: str, price: float):
+        """Reprice the book of an underlying and fire the callbacks."""
         try:
-            from ..models.options_pricing import BlackScholesModel
-        except ImportError:
-            from src.models.options_pricing import BlackScholesModel
+            with self._lock:
+                book = self.books.get(symbol)
+                if not book:
+                    return
+                option_ids = list(book.option_ids)
+                greeks = self._calculate_book(book, price)
+
+            if self.batch_callback:
+                self.batch_callback(symbol, option_ids, greeks, price)
+            if self.callback:
+                columns = [
+                    greeks.theoretical_price.tolist(),
+                    greeks.delta.tolist(),
+                    greeks.gamma.tolist(),
+                    greeks.theta.tolist(),
+                    greeks.vega.tolist(),
+                    greeks.rho.tolist(),
+                ]
+                for option_id, row in zip(option_ids, zip(*columns)):
+                    self.callback(option_id, self._as_dict(row, price))
 
-        bs = BlackScholesModel(risk_free_rate=self.r)
+        except Exception as e:
+            logger.error(f"Error calculating Greeks for {symbol}: {e}")
 
-        pricing = bs.calculate_greeks(
-            S=S, K=spec["K"], T=spec["T"], sigma=spec["sigma"], option_type=spec["type"]
-        )
+    def _calculate_book(self, book: OptionBook, S: float) -> OptionsGreeksBatch:
+        K, T, sigma, option_type = book.arrays()
+        return self.bs.calculate_greeks_batch(S=S, K=K, T=T, sigma=sigma, option_type=option_type)
 
+    @staticmethod
+    def _as_dict(row, S: float) -> Dict:
+        price, delta, gamma, theta, vega, rho = row
         return {
-            "price": pricing.theoretical_price,
-            "delta": pricing.delta,
-            "gamma": pricing.gamma,
-            "theta": pricing.theta,
-            "vega": pricing.vega,
-            "rho": pricing.rho,
+            "price": price,
+            "delta": delta,
+            "gamma": gamma,
+            "theta": theta,
+            "vega": vega,
+            "rho": rho,
             "underlying_price": S,
         }
 
-    def get_current_greeks(self, symbol: str) -> Optional[Dict]:
-        """Get current Greeks for a symbol.
+    def get_book_greeks(self, symbol: str) -> Optional[OptionsGreeksBatch]:
+        """Get current Greeks for every option on an underlying.
 
         Args:
-            symbol: Option symbol
+            symbol: Underlying symbol
 
         Returns:
-            Greeks dictionary or None
+            OptionsGreeksBatch in books[symbol].option_ids order, or None
         """
-        if symbol not in self.last_prices:
-            return None
+        with self._lock:
+            book = self.books.get(symbol)
+            if not book or symbol not in self.last_prices:
+                return None
+            return self._calculate_book(book, self.last_prices[symbol])
 
-        return self._calculate_greeks(symbol, self.last_prices[symbol])
+    def get_current_greeks(self, symbol: str, option_id: Optional[str] = None) -> Optional[Dict]:
+        """Get current Greeks for one option.
+
+        Args:
+            symbol: Underlying symbol
+            option_id: Contract identifier (defaults to the underlying symbol)
+
+        Returns:
+            Greeks dictionary or None
+        """
+        with self._lock:
+            book = self.books.get(symbol)
+            spec = book.spec(option_id or symbol) if book else None
+            if spec is None or symbol not in self.last_prices:
+                return None
+            S = self.last_prices[symbol]
+
+        greeks = self.bs.calculate_greeks_batch(
+            S=S, K=spec["K"], T=spec["T"], sigma=spec["sigma"], option_type=spec["type"]
+        )
+        row = (
+            greeks.theoretical_price,
+            greeks.delta,
+            greeks.gamma,
+            greeks.theta,
+            greeks.vega,
+            greeks.rho,
+        )
+        return self._as_dict([float(v) for v in row], S)
 
 
 if __name__ == "__main__":
@@ -209,8 +456,6 @@ if __name__ == "__main__":
     calc.on_price_update(MockMessage("AAPL", 148.50))
 
     # Simulate SPY update
-    import time
-
     time.sleep(1.1)  # Wait for rate limit
     calc.on_price_update(MockMessage("SPY", 452.75))
 
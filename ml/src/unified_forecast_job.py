@@ -16,9 +16,13 @@ Goals:
 import argparse
 import json
 import logging
+import multiprocessing
 import os
 import sys
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -31,7 +35,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.settings import settings
 from src.data.data_validator import OHLCValidator
 from src.data.supabase_db import db
-from src.features.feature_cache import fetch_or_build_features
+from src.features.feature_cache import DEFAULT_TIMEFRAMES, fetch_or_build_features
 from src.features.lookahead_checks import (
     LookaheadViolation,
     assert_truncation_stable,
@@ -60,6 +64,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds between checks for a submitted symbol that no worker has started yet
+_WORKER_START_POLL = 1.0
+# Times a symbol is retried after the pool broke (a worker died) while it was in flight
+_MAX_POOL_CRASH_RETRIES = 1
+
+# Per-timeframe OHLC rows used to build features for one symbol
+FEATURE_BAR_LIMITS = {
+    "m15": 500,
+    "h1": 500,
+    "h4": 400,
+    "d1": 252,
+    "w1": 260,
+}
+
 
 class UnifiedForecastProcessor:
     """Central forecast processor for framework horizons (1D, 5D, 10D, 20D)."""
@@ -88,6 +106,10 @@ class UnifiedForecastProcessor:
             "version_id": None,
         }
 
+        # Optional thread pool for DB writes (set by the worker-pool mode)
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: list = []
+
         # Initialize global calibrator once
         self.calibrator = ConfidenceCalibrator()
         self._load_calibrator()
@@ -373,13 +395,8 @@ class UnifiedForecastProcessor:
             features_by_tf = fetch_or_build_features(
                 db=db,
                 symbol=symbol,
-                limits={
-                    "m15": 500,
-                    "h1": 500,
-                    "h4": 400,
-                    "d1": 252,
-                    "w1": 260,
-                },
+                limits=FEATURE_BAR_LIMITS,
+                redis_cache=self.redis_cache,
                 cutoff_ts=cutoff_ts,
                 force_refresh=force_refresh,
             )
@@ -876,7 +893,12 @@ class UnifiedForecastProcessor:
                     # === STEP 6: Write to database ===
                     # When model_type=='all', both models were already saved in the loop; skip main write to avoid duplicate
                     if self.model_type != "all":
-                        db.upsert_forecast(
+                        self._submit_write(
+                            horizon_key,
+                            f"Saved {horizon_key} forecast for {symbol}: "
+                            f"{forecast['label'].upper()} "
+                            f"({forecast['confidence']:.0%} conf, source={weight_source})",
+                            db.upsert_forecast,
                             symbol_id=symbol_id,
                             horizon=forecast["horizon"],
                             overall_label=forecast["label"],
@@ -890,17 +912,6 @@ class UnifiedForecastProcessor:
                             timeframe="d1",
                             model_type=current_model_type,
                         )
-                        self.metrics["db_writes"] += 1
-                        logger.info(
-                            f"Saved {horizon_key} forecast for {symbol}: "
-                            f"{forecast['label'].upper()} "
-                            f"({forecast['confidence']:.0%} conf, source={weight_source})"
-                        )
-                    else:
-                        self.metrics["db_writes"] += 2  # Both models saved in loop
-                        logger.info(
-                            f"Saved both forecasts for {symbol} {horizon_key}: tabpfn + ensemble"
-                        )
 
                 except Exception as e:
                     logger.error(f"Error generating {horizon_key} forecast for {symbol}: {e}")
@@ -927,12 +938,59 @@ class UnifiedForecastProcessor:
             )
 
         finally:
+            failed_writes = self._drain_writes(symbol)
+            if failed_writes:
+                result["success"] = False
+                result["error"] = result["error"] or (
+                    f"db_write_failed: {', '.join(failed_writes)}"
+                )
             result["processing_time"] = time.time() - start_time
             self.metrics["forecast_times"].append(result["processing_time"])
             self.metrics["symbols_processed"] += 1
 
         return result
 
+    def _submit_write(self, horizon: str, saved_message: str, fn, /, **kwargs) -> None:
+        """
+        Run a DB write, deferring it to the I/O pool when one is attached.
+
+        Without an I/O pool the write runs inline and exceptions propagate to
+        the caller exactly as before. A write is counted in ``db_writes`` and
+        ``saved_message`` is logged only once it has completed.
+        """
+        if self._io_executor is None:
+            fn(**kwargs)
+            self._record_write(saved_message)
+            return
+        future = self._io_executor.submit(fn, **kwargs)
+        self._pending_writes.append((horizon, saved_message, future))
+
+    def _record_write(self, saved_message: str) -> None:
+        self.metrics["db_writes"] += 1
+        logger.info(saved_message)
+
+    def _drain_writes(self, symbol: str) -> list:
+        """Wait for deferred writes of the current symbol; return the horizons that failed."""
+        pending, self._pending_writes = self._pending_writes, []
+        failed = []
+        for horizon, saved_message, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Deferred write failed for {symbol} {horizon}: {e}")
+                self.metrics["errors"].append(
+                    {
+                        "symbol": symbol,
+                        "horizon": horizon,
+                        "error": str(e),
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                )
+                failed.append(horizon)
+            else:
+                self._record_write(saved_message)
+        return failed
+
     def _build_forecast_points(self, synth_result, current_ts, horizon_days):
         """Build forecast points from synthesis result."""
         target_ts = current_ts + timedelta(days=horizon_days)
@@ -1073,7 +1131,11 @@ class UnifiedForecastProcessor:
             if "inference_time_sec" in ml_pred:
                 synthesis_data["inference_time_sec"] = ml_pred["inference_time_sec"]
 
-            db.upsert_forecast(
+            self._submit_write(
+                horizon,
+                f"Saved {model_type} forecast for {symbol_id} {horizon}: "
+                f"{ml_pred.get('label', 'unknown').upper()} ({ml_pred.get('confidence', 0):.0%})",
+                db.upsert_forecast,
                 symbol_id=symbol_id,
                 horizon=horizon,
                 overall_label=ml_pred.get("label", "neutral"),
@@ -1088,11 +1150,6 @@ class UnifiedForecastProcessor:
                 model_type=model_type,
             )
 
-            logger.info(
-                f"Saved {model_type} forecast for {symbol_id} {horizon}: "
-                f"{ml_pred.get('label', 'unknown').upper()} ({ml_pred.get('confidence', 0):.0%})"
-            )
-
         except Exception as e:
             logger.error(f"Failed to save {model_type} forecast: {e}")
 
@@ -1100,6 +1157,9 @@ class UnifiedForecastProcessor:
         self,
         symbols: Optional[list] = None,
         force_refresh: bool = False,
+        max_workers: Optional[int] = None,
+        io_workers: Optional[int] = None,
+        symbol_timeout: Optional[float] = None,
     ) -> Dict:
         """
         Process entire symbol universe.
@@ -1107,6 +1167,10 @@ class UnifiedForecastProcessor:
         Args:
             symbols: Optional list of symbols (if None, uses settings)
             force_refresh: Skip cache
+            max_workers: Worker processes for model fits (1 = sequential;
+                default from settings.forecast_max_workers)
+            io_workers: DB write threads per worker process
+            symbol_timeout: Per-symbol wall-clock budget in seconds (pool mode only)
 
         Returns:
             Aggregated results
@@ -1114,15 +1178,44 @@ class UnifiedForecastProcessor:
         # Get symbol universe if not provided
         if symbols is None:
             symbols = list(settings.symbols_to_process)
+        if max_workers is None:
+            max_workers = settings.forecast_max_workers
+        if io_workers is None:
+            io_workers = settings.forecast_io_workers
+        if symbol_timeout is None:
+            symbol_timeout = settings.forecast_symbol_timeout_seconds
 
         logger.info(f"Processing {len(symbols)} symbols...")
 
-        results = []
-        for i, symbol in enumerate(symbols):
-            if (i + 1) % 10 == 0:
-                logger.info(f"Progress: {i + 1}/{len(symbols)}")
-            result = self.process_symbol(symbol, force_refresh=force_refresh)
-            results.append(result)
+        # Resolve the universe's symbol ids once; workers are seeded with the map
+        db.prefetch_symbol_ids(symbols)
+
+        if max_workers > 1 and len(symbols) > 1:
+            results = self._process_symbols_parallel(
+                symbols,
+                force_refresh=force_refresh,
+                max_workers=max_workers,
+                io_workers=io_workers,
+                symbol_timeout=symbol_timeout,
+            )
+        else:
+            # Load every symbol's bars in a few batched queries; process_symbol's
+            # fetch_ohlc_bars calls (same daily cutoff) are served from the prefetch
+            db.prefetch_ohlc_bars(
+                symbols,
+                timeframes=DEFAULT_TIMEFRAMES,
+                limit=FEATURE_BAR_LIMITS,
+                end_ts=pd.Timestamp.utcnow().normalize(),
+            )
+            results = []
+            try:
+                for i, symbol in enumerate(symbols):
+                    if (i + 1) % 10 == 0:
+                        logger.info(f"Progress: {i + 1}/{len(symbols)}")
+                    result = self.process_symbol(symbol, force_refresh=force_refresh)
+                    results.append(result)
+            finally:
+                db.clear_ohlc_prefetch()
 
         # Aggregate results
         aggregated = {
@@ -1186,6 +1279,169 @@ class UnifiedForecastProcessor:
 
         return aggregated
 
+    def _process_symbols_parallel(
+        self,
+        symbols: list,
+        force_refresh: bool,
+        max_workers: int,
+        io_workers: int,
+        symbol_timeout: float,
+    ) -> list:
+        """
+        Fan symbols out to a bounded process pool.
+
+        At most ``max_workers`` symbols are in flight. A symbol's deadline
+        starts when a worker picks it up (workers stamp a shared start-time
+        array). A running task cannot be cancelled, so on timeout the pool's
+        processes are terminated, the pool is recreated and the other
+        in-flight symbols are resubmitted. When a worker dies the pool breaks
+        and fails every in-flight task; those symbols are resubmitted one at a
+        time, so only the one that keeps killing its worker is reported failed
+        (after ``_MAX_POOL_CRASH_RETRIES`` retries). Results are returned in
+        input order and worker metrics are merged into ``self.metrics``.
+        """
+        max_workers = min(max_workers, len(symbols))
+        logger.info(
+            f"Using {max_workers} worker processes ({io_workers} I/O threads each, "
+            f"{symbol_timeout:.0f}s per-symbol timeout)"
+        )
+
+        ctx = multiprocessing.get_context("spawn")
+        started = ctx.Array("d", len(symbols), lock=False)
+        results: list = [None] * len(symbols)
+        queue = deque(enumerate(symbols))
+        in_flight: Dict[Any, tuple] = {}
+        crashes = [0] * len(symbols)
+        completed = 0
+
+        def new_executor() -> ProcessPoolExecutor:
+            return ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=ctx,
+                initializer=_init_worker,
+                initargs=(self.model_type, io_workers, db.symbol_registry.snapshot(), started),
+            )
+
+        executor = new_executor()
+        try:
+            while queue or in_flight:
+                while queue and len(in_flight) < max_workers:
+                    # A symbol in flight when the pool broke runs alone until it finishes
+                    if in_flight and (
+                        crashes[queue[0][0]] or any(crashes[i] for i, _ in in_flight.values())
+                    ):
+                        break
+                    idx, symbol = queue.popleft()
+                    started[idx] = 0.0
+                    future = executor.submit(_process_symbol_in_worker, idx, symbol, force_refresh)
+                    in_flight[future] = (idx, symbol)
+
+                now = time.time()
+                waits = [
+                    started[idx] + symbol_timeout - now if started[idx] else _WORKER_START_POLL
+                    for idx, _ in in_flight.values()
+                ]
+                done, _ = wait(
+                    list(in_flight),
+                    timeout=max(0.0, min(waits)),
+                    return_when=FIRST_COMPLETED,
+                )
+
+                broken = False
+                for future in done:
+                    idx, symbol = in_flight[future]
+                    try:
+                        result, worker_metrics = future.result()
+                        self._merge_worker_metrics(worker_metrics)
+                    except BrokenProcessPool:
+                        # Requeued below with the rest of the in-flight symbols
+                        broken = True
+                        continue
+                    except Exception as e:
+                        logger.error(f"Worker failed for {symbol}: {e}")
+                        result = self._failed_result(symbol, str(e), symbol_timeout)
+                    del in_flight[future]
+                    results[idx] = result
+                    completed += 1
+                    if completed % 10 == 0:
+                        logger.info(f"Progress: {completed}/{len(symbols)}")
+
+                now = time.time()
+                expired = [
+                    future
+                    for future, (idx, _) in in_flight.items()
+                    if started[idx] and started[idx] + symbol_timeout <= now and not future.done()
+                ]
+                if not expired and not broken:
+                    continue
+
+                for future in expired:
+                    idx, symbol = in_flight.pop(future)
+                    logger.error(f"Timed out processing {symbol} after {symbol_timeout:.0f}s")
+                    results[idx] = self._failed_result(symbol, "timeout", symbol_timeout)
+                    completed += 1
+
+                # Terminating the pool also stops the other in-flight symbols; requeue
+                # them in input order (a finished one is picked up by the next wait)
+                _terminate_executor(executor)
+                for future, (idx, symbol) in sorted(
+                    in_flight.items(), key=lambda item: item[1][0], reverse=True
+                ):
+                    if future.done() and not future.cancelled() and future.exception() is None:
+                        continue
+                    del in_flight[future]
+                    if broken:
+                        crashes[idx] += 1
+                        if crashes[idx] > _MAX_POOL_CRASH_RETRIES:
+                            logger.error(f"Worker crashed {crashes[idx]} times on {symbol}")
+                            elapsed = time.time() - started[idx] if started[idx] else 0.0
+                            results[idx] = self._failed_result(symbol, "worker crashed", elapsed)
+                            completed += 1
+                            continue
+                    queue.appendleft((idx, symbol))
+                if broken:
+                    logger.warning(
+                        "Worker pool broke; retrying its in-flight symbols one at a time"
+                    )
+                executor = new_executor()
+            executor.shutdown(wait=True)
+        finally:
+            _terminate_executor(executor)
+
+        return results
+
+    def _failed_result(self, symbol: str, error: str, processing_time: float) -> Dict:
+        """Build a failure result for a symbol that never returned from a worker."""
+        self.metrics["errors"].append(
+            {
+                "symbol": symbol,
+                "error": error,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+        self.metrics["forecast_times"].append(processing_time)
+        self.metrics["symbols_processed"] += 1
+        return {
+            "symbol": symbol,
+            "success": False,
+            "error": error,
+            "forecasts": {},
+            "processing_time": processing_time,
+            "feature_cache_hit": False,
+            "weight_source": {},
+        }
+
+    def _merge_worker_metrics(self, worker_metrics: Dict) -> None:
+        """Fold per-symbol metrics returned by a worker into the job metrics."""
+        for key in ("symbols_processed", "feature_cache_hits", "feature_cache_misses", "db_writes"):
+            self.metrics[key] += worker_metrics.get(key, 0)
+        self.metrics["forecast_times"].extend(worker_metrics.get("forecast_times", []))
+        self.metrics["errors"].extend(worker_metrics.get("errors", []))
+        for source, count in worker_metrics.get("weight_sources", {}).items():
+            self.metrics["weight_sources"][source] = (
+                self.metrics["weight_sources"].get(source, 0) + count
+            )
+
     def save_metrics(self):
         """Save processing metrics to file."""
         self.metrics["end_time"] = datetime.now().isoformat()
@@ -1199,6 +1455,81 @@ class UnifiedForecastProcessor:
         logger.info(f"Metrics saved to {self.metrics_file}")
 
 
+# Per-process state for the worker-pool mode of process_universe
+_worker_processor: Optional[UnifiedForecastProcessor] = None
+# Shared start-time array (one slot per symbol index) written when a task starts
+_worker_started = None
+
+
+def _terminate_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Shut a process pool down without waiting on running tasks.
+
+    ``Future.cancel`` cannot stop a task that is already running, so the
+    worker processes are terminated (then killed if they ignore SIGTERM).
+    """
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def _init_worker(
+    model_type: str,
+    io_workers: int,
+    symbol_ids: Optional[Dict[str, str]] = None,
+    started=None,
+) -> None:
+    """Build one processor (calibrator, validation metrics, I/O pool) per worker process."""
+    global _worker_processor, _worker_started
+    _worker_started = started
+    if symbol_ids:
+        db.symbol_registry.update(symbol_ids)
+    _worker_processor = UnifiedForecastProcessor(metrics_file=os.devnull, model_type=model_type)
+    if io_workers > 0:
+        _worker_processor._io_executor = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix="forecast-io"
+        )
+
+
+def _process_symbol_in_worker(idx: int, symbol: str, force_refresh: bool) -> tuple:
+    """Process one symbol in a worker and return (result, metrics for that symbol)."""
+    if _worker_started is not None:
+        _worker_started[idx] = time.time()
+    processor = _worker_processor
+    processor.metrics.update(
+        {
+            "symbols_processed": 0,
+            "feature_cache_hits": 0,
+            "feature_cache_misses": 0,
+            "forecast_times": [],
+            "weight_sources": {},
+            "db_writes": 0,
+            "errors": [],
+        }
+    )
+    result = processor.process_symbol(symbol, force_refresh=force_refresh)
+    worker_metrics = {
+        key: processor.metrics[key]
+        for key in (
+            "symbols_processed",
+            "feature_cache_hits",
+            "feature_cache_misses",
+            "forecast_times",
+            "weight_sources",
+            "db_writes",
+            "errors",
+        )
+    }
+    return result, worker_metrics
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Unified ML Forecast Job")
@@ -1221,6 +1552,24 @@ def main():
     parser.add_argument(
         "--horizons", help="Comma-separated horizons (e.g. 1D,5D,10D,20D). Default: from settings."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for the universe run (default: settings.forecast_max_workers)",
+    )
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=None,
+        help="DB write threads per worker process (default: settings.forecast_io_workers)",
+    )
+    parser.add_argument(
+        "--symbol-timeout",
+        type=float,
+        default=None,
+        help="Per-symbol timeout in seconds when running with workers",
+    )
     parser.add_argument(
         "--skip-sentiment-backfill",
         action="store_true",
@@ -1309,11 +1658,19 @@ def main():
         results = processor.process_universe(
             symbols=symbols,
             force_refresh=args.force_refresh,
+            max_workers=args.workers,
+            io_workers=args.io_workers,
+            symbol_timeout=args.symbol_timeout,
         )
         logger.info(f"\nAggregated: {json.dumps(results, indent=2, default=str)}")
     else:
         logger.info("Processing full universe")
-        results = processor.process_universe(force_refresh=args.force_refresh)
+        results = processor.process_universe(
+            force_refresh=args.force_refresh,
+            max_workers=args.workers,
+            io_workers=args.io_workers,
+            symbol_timeout=args.symbol_timeout,
+        )
         logger.info(f"\nAggregated: {json.dumps(results, indent=2, default=str)}")
 
     # Close database connections
@@ -12,8 +12,15 @@ errors; it does not provide a usable client.
 """
 
 import os
+import sys
+import threading
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+import pandas as pd
+import pytest
+
 # Ensure dummy credentials are present before any src.* imports so that
 # pydantic-settings (Settings class) can construct without raising a
 # ValidationError for the required ``supabase_url`` field.
@@ -26,3 +33,210 @@ os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "placeholder-key-for-ci")
 # supabase_db.py does not crash with a network/auth error.
 _supabase_patch = patch("supabase.create_client", return_value=MagicMock())
 _supabase_patch.start()
+
+
+@pytest.fixture(scope="module")
+def real_settings():
+    """Import src.* modules against the real ``config.settings``.
+
+    Several test modules replace ``sys.modules["config.settings"]`` with a
+    MagicMock at import time and never restore it, which breaks any module
+    imported afterwards that reads a setting (e.g. ``settings.log_level``).
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        if isinstance(sys.modules.get("config.settings"), MagicMock):
+            mp.delitem(sys.modules, "config.settings")
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Shared fakes and fixtures (src.* imports stay inside functions so the
+# Supabase patch above is active before any of them run)
+# ---------------------------------------------------------------------------
+
+
+def _make_indicator_bars(n: int = 260) -> pd.DataFrame:
+    np.random.seed(11)
+    close = 100 * np.cumprod(1 + np.random.randn(n) * 0.012)
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    high = np.maximum(open_, close) * (1 + np.abs(np.random.randn(n)) * 0.004)
+    low = np.minimum(open_, close) * (1 - np.abs(np.random.randn(n)) * 0.004)
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2025-01-01 14:30", periods=n, freq="h"),
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": np.random.randint(10_000, 50_000, n).astype(float),
+        }
+    )
+
+
+def _core_indicator_features(bars: pd.DataFrame, factor: float | None = None) -> pd.DataFrame:
+    """The subset of add_technical_features that feeds indicator_values."""
+    from src.features.technical_indicators_corrected import TechnicalIndicatorsCorrect
+    from src.strategies.supertrend_ai import SuperTrendAI
+
+    df = TechnicalIndicatorsCorrect.add_moving_averages(bars)
+    df["macd"], df["macd_signal"], df["macd_hist"] = TechnicalIndicatorsCorrect.calculate_macd(
+        df["close"], fast=12, slow=26, signal=9
+    )
+    df["rsi_14"] = TechnicalIndicatorsCorrect.calculate_rsi(df["close"], period=14)
+    df = TechnicalIndicatorsCorrect.calculate_bollinger_bands(df, period=20, std_dev=2.0)
+    df = TechnicalIndicatorsCorrect.calculate_adx_correct(df, period=14)
+    df = TechnicalIndicatorsCorrect.calculate_kdj_correct(df, period=9, k_smooth=5, d_smooth=5)
+    df["williams_r"] = TechnicalIndicatorsCorrect.calculate_williams_r(df, period=14)
+    df["cci"] = TechnicalIndicatorsCorrect.calculate_cci(df, period=20)
+
+    st_ai = SuperTrendAI(df, atr_length=10, perf_alpha=10)
+    df, info = st_ai.calculate()
+    if factor is not None:
+        # Re-run the bands with a fixed factor, as the incremental path does
+        df = SuperTrendAI(df, atr_length=10, perf_alpha=10).predict(df, factor)
+    df["supertrend_performance_index"] = info["performance_index"]
+    df["supertrend_signal_strength"] = info["signal_strength"]
+    df["supertrend_value"] = df["supertrend"]
+    df["supertrend_factor"] = info["target_factor"] if factor is None else factor
+    df["supertrend_confidence_norm"] = df["signal_confidence"] / 10.0
+    df["supertrend_distance_norm"] = ((df["close"] - df["supertrend"]) / df["close"]).abs()
+
+    df["atr_14"] = TechnicalIndicatorsCorrect.calculate_atr(df, period=14)
+    df["mfi"] = TechnicalIndicatorsCorrect.calculate_mfi(df, period=14)
+    df["obv"] = TechnicalIndicatorsCorrect.calculate_obv(df)
+    return df
+
+
+@pytest.fixture
+def indicator_bars() -> pd.DataFrame:
+    """Seeded hourly OHLCV bars long enough for every incremental indicator."""
+    return _make_indicator_bars()
+
+
+@pytest.fixture
+def core_features():
+    """Callable building the indicator_values feature subset for a bar frame."""
+    return _core_indicator_features
+
+
+OHLC_SYMBOLS = {"AAPL": "id-aapl", "MSFT": "id-msft", "SPY": "id-spy", "NEW": "id-new"}
+
+
+def _make_ohlc_rows(symbol_id, provider, start, periods, freq="D", timeframe="d1"):
+    """ohlc_bars_v2 rows with ISO timestamps, as PostgREST returns them."""
+    ts = pd.date_range(start, periods=periods, freq=freq, tz="UTC")
+    return [
+        {
+            "symbol_id": symbol_id,
+            "timeframe": timeframe,
+            "provider": provider,
+            "is_forecast": False,
+            "ts": t.isoformat(),
+            "open": float(i),
+            "high": float(i) + 1,
+            "low": float(i) - 1,
+            "close": float(i) + 0.5,
+            "volume": 1000 + i,
+        }
+        for i, t in enumerate(ts)
+    ]
+
+
+class _FakeSupabaseQuery:
+    """Evaluates the PostgREST filters used by SupabaseDatabase against in-memory rows."""
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.predicates = []
+        self.filters = []
+        self.columns = None
+        self.row_limit = None
+        self.desc = False
+        self.single_row = False
+
+    def select(self, columns):
+        self.columns = [c.strip() for c in columns.split(",")]
+        return self
+
+    def _add(self, column, op, value, predicate):
+        self.filters.append((column, op, value))
+        self.predicates.append(predicate)
+        return self
+
+    def eq(self, column, value):
+        return self._add(column, "eq", value, lambda r: r.get(column) == value)
+
+    def in_(self, column, values):
+        values = list(values)
+        return self._add(column, "in", tuple(values), lambda r: r.get(column) in values)
+
+    def gte(self, column, value):
+        bound = _utc_ts(value)
+        return self._add(column, "gte", value, lambda r: _utc_ts(r[column]) >= bound)
+
+    def lt(self, column, value):
+        bound = _utc_ts(value)
+        return self._add(column, "lt", value, lambda r: _utc_ts(r[column]) < bound)
+
+    def lte(self, column, value):
+        bound = _utc_ts(value)
+        return self._add(column, "lte", value, lambda r: _utc_ts(r[column]) <= bound)
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def order(self, column, desc=False):
+        self.desc = desc
+        return self
+
+    def limit(self, n):
+        self.row_limit = n
+        return self
+
+    def execute(self):
+        with self.client.lock:
+            self.client.calls.append((self.name, self.filters))
+        if self.name == "symbols":
+            tickers = next(v for c, _, v in self.filters if c == "ticker")
+            tickers = tickers if isinstance(tickers, tuple) else [tickers]
+            found = [{"id": OHLC_SYMBOLS[t], "ticker": t} for t in tickers if t in OHLC_SYMBOLS]
+            return SimpleNamespace(data=found[0] if self.single_row else found)
+        rows = [r for r in self.client.rows if all(p(r) for p in self.predicates)]
+        rows.sort(key=lambda r: _utc_ts(r["ts"]), reverse=self.desc)
+        rows = rows[: self.row_limit] if self.row_limit else rows
+        return SimpleNamespace(data=[{c: r[c] for c in self.columns} for r in rows])
+
+
+def _utc_ts(value):
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts
+
+
+class _FakeSupabaseClient:
+    """In-memory supabase client serving symbols and ohlc_bars_v2 rows; records queries."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return _FakeSupabaseQuery(self, name)
+
+    def bar_queries(self):
+        return [filters for name, filters in self.calls if name == "ohlc_bars_v2"]
+
+
+@pytest.fixture
+def make_ohlc_rows():
+    """Factory for in-memory ohlc_bars_v2 rows."""
+    return _make_ohlc_rows
+
+
+@pytest.fixture
+def fake_supabase_client():
+    """Factory building a _FakeSupabaseClient over a list of rows."""
+    return _FakeSupabaseClient
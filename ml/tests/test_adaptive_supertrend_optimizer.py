@@ -0,0 +1,284 @@
+"""
+Tests for the batch and walk-forward factor optimizers in adaptive_supertrend.
+
+Spawn workers unpickle the fake worker below by importing this module, so it
+only pulls in numpy and adaptive_supertrend itself.
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Same import path setup as src/strategies/adaptive_supertrend_adapter.py
+_local_ast = Path(__file__).resolve().parents[2] / "adaptive_supertrend"
+if str(_local_ast) not in sys.path:
+    sys.path.insert(0, str(_local_ast))
+
+import adaptive_supertrend as ast_module  # noqa: E402
+from adaptive_supertrend import (  # noqa: E402
+    AdaptiveSuperTrend,
+    AdaptiveSuperTrendOptimizer,
+    BatchOptimizer,
+    SuperTrendConfig,
+)
+
+HANG_MARKER = -1.0
+ERROR_MARKER = -2.0
+
+
+def _fake_optimize_worker(config, high, low, close):
+    if close[0] == HANG_MARKER:
+        time.sleep(120)
+    if close[0] == ERROR_MARKER:
+        raise ValueError("bad series")
+    time.sleep(0.2)
+    return 2.5, {
+        "sharpe_ratio": 1.0,
+        "sortino_ratio": 1.0,
+        "calmar_ratio": 1.0,
+        "max_drawdown": 0.1,
+        "win_rate": 0.5,
+        "profit_factor": 1.2,
+        "total_return": 0.1,
+        "num_trades": 10,
+        "recent_score": 0.0,
+    }
+
+
+def make_series(seed, n=600):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.0, n))
+    high = close + np.abs(rng.normal(0, 0.5, n))
+    low = close - np.abs(rng.normal(0, 0.5, n))
+    return {"high": high, "low": low, "close": close, "timeframe": "1h"}
+
+
+class _FakeCacheQuery:
+    def __init__(self, client):
+        self.client = client
+        self.keys = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.keys = [value]
+        return self
+
+    def in_(self, column, values):
+        self.keys = list(values)
+        return self
+
+    def limit(self, n):
+        return self
+
+    def upsert(self, rows):
+        self.client.upserts.append(rows if isinstance(rows, list) else [rows])
+        for row in self.client.upserts[-1]:
+            self.client.rows[row["cache_key"]] = row
+        return self
+
+    def execute(self):
+        if self.keys is None:
+            return SimpleNamespace(data=[])
+        self.client.queries.append(self.keys)
+        return SimpleNamespace(
+            data=[self.client.rows[k] for k in self.keys if k in self.client.rows]
+        )
+
+
+class _FakeSupabase:
+    """adaptive_supertrend_cache table held in memory; records queries and upserts."""
+
+    def __init__(self):
+        self.rows = {}
+        self.queries = []
+        self.upserts = []
+
+    def table(self, name):
+        assert name == "adaptive_supertrend_cache"
+        return _FakeCacheQuery(self)
+
+
+def _run_portfolio(optimizer, symbols_data, **kwargs):
+    statuses = []
+
+    def progress(symbol, status, done, total):
+        statuses.append((symbol, status, done, total))
+
+    signals = asyncio.run(
+        optimizer.optimize_portfolio(symbols_data, progress_callback=progress, **kwargs)
+    )
+    return signals, statuses
+
+
+def test_cache_get_many_and_set_many_batch_round_trips():
+    client = _FakeSupabase()
+    adaptive_st = AdaptiveSuperTrend(supabase_client=client)
+    values = {f"k{i}": {"factor": 1.0 + i, "metrics": {"n": i}} for i in range(3)}
+
+    assert asyncio.run(adaptive_st.cache_set_many(values))
+    assert len(client.upserts) == 1 and len(client.upserts[0]) == 3
+
+    # An expired row is ignored
+    client.rows["k2"]["created_at"] = (datetime.utcnow() - timedelta(hours=48)).isoformat()
+    found = asyncio.run(adaptive_st.cache_get_many(["k0", "k1", "k2", "missing"]))
+
+    assert found == {"k0": values["k0"], "k1": values["k1"]}
+    assert client.queries == [["k0", "k1", "k2", "missing"]]
+    assert asyncio.run(adaptive_st.cache_get_many([])) == {}
+    assert not asyncio.run(AdaptiveSuperTrend().cache_set_many(values))
+
+
+def test_portfolio_reports_cached_optimized_timeout_and_error(monkeypatch):
+    monkeypatch.setattr(ast_module, "_optimize_factor_worker", _fake_optimize_worker)
+    client = _FakeSupabase()
+    adaptive_st = AdaptiveSuperTrend(supabase_client=client)
+    symbols_data = {name: make_series(i) for i, name in enumerate(["CACHED", "HANG", "A", "B"])}
+    symbols_data["BAD"] = make_series(9)
+    symbols_data["HANG"]["close"][0] = HANG_MARKER
+    symbols_data["BAD"]["close"][0] = ERROR_MARKER
+
+    cached = symbols_data["CACHED"]
+    key = adaptive_st.factor_cache_key("CACHED", "1h", cached["close"])
+    metrics = _fake_optimize_worker(None, None, None, [0.0])[1]
+    asyncio.run(adaptive_st.cache_set_many({key: {"factor": 3.5, "metrics": metrics}}))
+    client.upserts.clear()
+
+    signals, statuses = _run_portfolio(
+        BatchOptimizer(adaptive_st, max_workers=2, timeout=8.0), symbols_data
+    )
+
+    status = {symbol: s for symbol, s, _, _ in statuses}
+    assert status == {
+        "CACHED": "cached",
+        "HANG": "timeout",
+        "A": "optimized",
+        "B": "optimized",
+        "BAD": "error",
+    }
+    assert [done for _, _, done, _ in statuses] == [1, 2, 3, 4, 5]
+    assert all(total == 5 for _, _, _, total in statuses)
+    assert signals["CACHED"].factor == 3.5
+    assert signals["A"].factor == 2.5 and signals["B"].factor == 2.5
+    assert signals["HANG"] is None and signals["BAD"] is None
+    # Only the optimized symbols are written back, in one upsert
+    assert len(client.upserts) == 1
+    assert {row["cache_key"] for row in client.upserts[0]} == {
+        adaptive_st.factor_cache_key(s, "1h", symbols_data[s]["close"]) for s in ("A", "B")
+    }
+    # The hung worker was terminated instead of being left running
+    assert not multiprocessing.active_children()
+
+
+def test_portfolio_factors_match_single_symbol_optimization():
+    config = SuperTrendConfig(lookback_window=300)
+    symbols_data = {f"S{i}": make_series(100 + i) for i in range(3)}
+
+    signals, statuses = _run_portfolio(
+        BatchOptimizer(AdaptiveSuperTrend(config=config), max_workers=2), symbols_data
+    )
+
+    assert {s for _, s, _, _ in statuses} == {"optimized"}
+    single = AdaptiveSuperTrend(config=config)
+    for symbol, data in symbols_data.items():
+        expected = asyncio.run(
+            single.generate_signal_with_optimization(
+                symbol, "1h", data["high"], data["low"], data["close"]
+            )
+        )
+        assert signals[symbol].factor == expected.factor
+        assert asdict(signals[symbol].metrics) == pytest.approx(asdict(expected.metrics))
+        assert signals[symbol].trend == expected.trend
+
+
+def _window_engine_on_full_history_returns(optimizer, close):
+    """Make the 'window' engine score windows of the full-history return matrix.
+
+    The engines then differ only in how the metrics are computed, so their
+    selections and histories must agree.
+    """
+    returns = optimizer._factor_return_matrix(close + 0.5, close - 0.5, close)
+    row = {factor: f for f, factor in enumerate(optimizer.factor_range)}
+
+    def evaluate_factor(train_high, train_low, train_close, factor):
+        start = int(np.flatnonzero(close == train_close[0])[0])
+        window = returns[row[factor], start : start + len(train_close)].copy()
+        window[0] = 0.0
+        return optimizer.evaluator.evaluate(window)
+
+    optimizer.evaluate_factor = evaluate_factor
+
+
+@pytest.mark.parametrize("objective", ["sharpe", "sortino", "calmar", "win_rate"])
+def test_prefix_engine_matches_window_engine(objective):
+    close = make_series(5, n=900)["close"]
+    assert len(np.unique(close)) == len(close)
+    config = SuperTrendConfig(metric_objective=objective, train_period=250, test_period=100)
+    prefix = AdaptiveSuperTrendOptimizer(config)
+    window = AdaptiveSuperTrendOptimizer(config)
+    _window_engine_on_full_history_returns(window, close)
+
+    args = (close + 0.5, close - 0.5, close)
+    starts, factors, history = prefix.optimize_factor_rolling(*args)
+    w_starts, w_factors, w_history = window.optimize_factor_rolling(*args, engine="window")
+
+    np.testing.assert_array_equal(starts, w_starts)
+    np.testing.assert_array_equal(factors, w_factors)
+    assert history.keys() == w_history.keys()
+    assert history["timestamp"] == w_history["timestamp"]
+    assert history["factor"] == w_history["factor"]
+    for column in ("sharpe", "sortino", "calmar", "win_rate", "profit_factor", "max_dd"):
+        np.testing.assert_allclose(history[column], w_history[column], rtol=1e-9, atol=1e-12)
+
+
+def test_rolling_window_metrics_match_evaluator():
+    optimizer = AdaptiveSuperTrendOptimizer(SuperTrendConfig())
+    series = make_series(11, n=700)
+    returns = optimizer._factor_return_matrix(series["high"], series["low"], series["close"])
+    # A flat stretch covers the no-trade and no-loss branches
+    returns[:, 300:420] = np.abs(returns[:, 300:420]) * (np.arange(120) % 3 == 0)
+    starts = np.arange(0, 600, 37)
+    length = 80
+
+    metrics = optimizer._rolling_window_metrics(returns, starts, length)
+
+    for f in range(returns.shape[0]):
+        for w, start in enumerate(starts):
+            window = returns[f, start : start + length].copy()
+            window[0] = 0.0
+            expected = asdict(optimizer.evaluator.evaluate(window))
+            for field, value in expected.items():
+                assert metrics[field][f, w] == pytest.approx(value, rel=1e-9, abs=1e-12), field
+
+
+def test_prefix_engine_carries_prices_over_nan_bars():
+    series = make_series(3, n=900)
+    high, low, close = series["high"], series["low"], series["close"]
+    gappy = [a.copy() for a in (high, low, close)]
+    for a in gappy:
+        a[:3] = np.nan
+        a[400] = np.nan
+    filled = [a.copy() for a in (high, low, close)]
+    for a in filled:
+        a[400] = a[399]
+
+    optimizer = AdaptiveSuperTrendOptimizer(SuperTrendConfig(train_period=250, test_period=100))
+    starts, factors, history = optimizer.optimize_factor_rolling(*gappy)
+    _, _, expected = optimizer.optimize_factor_rolling(*filled)
+
+    assert np.isfinite(history["sharpe"]).all() and np.isfinite(history["max_dd"]).all()
+    # Windows entirely past the gap score as if the missing bar repeated its predecessor
+    after = [i for i, t in enumerate(history["timestamp"]) if t - 250 > 400]
+    assert after
+    np.testing.assert_allclose(
+        np.array(history["sharpe"])[after], np.array(expected["sharpe"])[after], rtol=1e-9
+    )
@@ -228,6 +228,77 @@ class TestArimaGarchForecasterPrediction:
         assert prediction["confidence"] > 0
 
 
+class TestArimaGarchForecasterStateUpdate:
+    """Test filter-based updates and scheduled re-estimation."""
+
+    def test_new_bars_are_filtered_without_refit(self, sample_ohlc_df):
+        """Test that a few new bars update the state with fixed parameters."""
+        forecaster = ArimaGarchForecaster(reestimate_every=20)
+        forecaster.train(sample_ohlc_df.iloc[:280])
+        params = forecaster.fitted_arima.params.copy()
+
+        forecaster.update(sample_ohlc_df.iloc[:285])
+
+        assert forecaster._obs_since_fit == 5
+        assert forecaster.fitted_arima.nobs == 284
+        np.testing.assert_allclose(forecaster.fitted_arima.params, params)
+        assert "reestimated_at" not in forecaster.training_stats
+
+        # Same data again is a no-op; a sliding window is still a continuation
+        forecaster.update(sample_ohlc_df.iloc[:285])
+        forecaster.update(sample_ohlc_df.iloc[10:290])
+        assert forecaster._obs_since_fit == 10
+
+    def test_reestimates_on_schedule(self, sample_ohlc_df):
+        """Test that parameters are re-estimated once enough bars accumulate."""
+        forecaster = ArimaGarchForecaster(reestimate_every=20)
+        forecaster.train(sample_ohlc_df.iloc[:250])
+
+        forecaster.update(sample_ohlc_df.iloc[:265])
+        assert forecaster._obs_since_fit == 15
+        forecaster.update(sample_ohlc_df.iloc[:275])
+
+        assert forecaster._obs_since_fit == 0
+        assert "reestimated_at" in forecaster.training_stats
+        assert forecaster.fitted_arima.nobs == 274
+
+    def test_unrelated_series_is_reestimated(self, sample_ohlc_df):
+        """Test that data that does not continue the fitted series triggers a refit."""
+        forecaster = ArimaGarchForecaster()
+        forecaster.train(sample_ohlc_df.iloc[:200])
+
+        other = sample_ohlc_df.iloc[:200].copy()
+        other["close"] = other["close"][::-1].to_numpy()
+        forecaster.update(other)
+
+        assert "reestimated_at" in forecaster.training_stats
+        assert forecaster._obs_since_fit == 0
+
+    def test_order_selection_is_cached(self, sample_ohlc_df, monkeypatch):
+        """Test that repeated order selection on the same returns skips the grid."""
+        from src.models import arima_garch_forecaster as module
+
+        calls = []
+
+        def fake_aic(returns, order):
+            calls.append(order)
+            return float(sum(order[::2]) != 3)
+
+        monkeypatch.setattr(module, "_fit_order_aic", fake_aic)
+        monkeypatch.setattr(module, "_order_cache", module.OrderedDict())
+        forecaster = ArimaGarchForecaster()
+        returns = forecaster._build_returns_series(sample_ohlc_df)
+
+        first = forecaster._select_arima_order(returns, max_p=2, max_q=2)
+        n_calls = len(calls)
+        second = forecaster._select_arima_order(returns, max_p=2, max_q=2)
+
+        assert n_calls == 8
+        assert len(calls) == n_calls
+        assert first == second
+        assert first[0] + first[2] == 3
+
+
 class TestArimaGarchForecasterGenerateForecast:
     """Test full forecast generation."""
 
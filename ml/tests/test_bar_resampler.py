@@ -0,0 +1,205 @@
+"""Tests for session-aware OHLCV resampling (src/data/bar_resampler.py)."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.bar_resampler import (
+    aggregate_ohlcv,
+    assign_sessions,
+    filter_to_sessions,
+    resample_session_bars,
+    rollup_every,
+    session_bounds,
+    to_utc_ns,
+    trading_dates,
+)
+
+NY = "America/New_York"
+
+
+def session(day, open_="09:30", close="16:00"):
+    return SimpleNamespace(
+        session_open_ts=pd.Timestamp(f"{day} {open_}", tz=NY).tz_convert("UTC").to_pydatetime(),
+        session_close_ts=pd.Timestamp(f"{day} {close}", tz=NY).tz_convert("UTC").to_pydatetime(),
+    )
+
+
+def bars_15m(days, start="04:00", end="20:00"):
+    """15m bars covering extended hours so session filtering has something to drop."""
+    frames = []
+    for day in days:
+        ts = pd.date_range(f"{day} {start}", f"{day} {end}", freq="15min", inclusive="left", tz=NY)
+        frames.append(pd.DataFrame({"ts": ts.tz_convert("UTC")}))
+    df = pd.concat(frames, ignore_index=True)
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 0.2, len(df)))
+    df["open"] = close + rng.normal(0, 0.05, len(df))
+    df["high"] = np.maximum(df["open"], close) + 0.1
+    df["low"] = np.minimum(df["open"], close) - 0.1
+    df["close"] = close
+    df["volume"] = rng.integers(100, 1000, len(df)).astype(float)
+    return df
+
+
+def reference(df, calendar_days, freq=None):
+    """Per-day loop the vectorized path replaces."""
+    rows = []
+    for day in calendar_days:
+        ts = df["ts"]
+        chunk = df[(ts >= day.session_open_ts) & (ts < day.session_close_ts)]
+        if freq is None:
+            groups = [chunk]
+        else:
+            offset = (chunk["ts"] - pd.Timestamp(day.session_open_ts)) // pd.Timedelta(freq)
+            groups = [g for _, g in chunk.groupby(offset, sort=True)]
+        for g in groups:
+            if g.empty:
+                continue
+            rows.append(
+                {
+                    "ts": g["ts"].iloc[-1],
+                    "open": g["open"].iloc[0],
+                    "high": g["high"].max(),
+                    "low": g["low"].min(),
+                    "close": g["close"].iloc[-1],
+                    "volume": g["volume"].sum(),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def test_assign_sessions_respects_bounds():
+    days = [session("2024-07-03", close="13:00"), session("2024-07-05")]
+    opens, closes = session_bounds(reversed(days))
+    assert (np.diff(opens) > 0).all()
+
+    ts = pd.to_datetime(
+        [
+            "2024-07-03 09:15",
+            "2024-07-03 09:30",
+            "2024-07-03 12:45",
+            "2024-07-03 13:00",
+            "2024-07-05 15:45",
+        ]
+    ).tz_localize(NY)
+    assert assign_sessions(to_utc_ns(ts), opens, closes).tolist() == [-1, 0, 0, -1, 1]
+    assert assign_sessions(to_utc_ns(ts), *session_bounds([])).tolist() == [-1] * 5
+
+
+@pytest.mark.parametrize("freq", [None, "1h", "4h"])
+def test_resample_matches_per_day_loop(freq):
+    days = ["2024-07-01", "2024-07-02", "2024-07-03", "2024-07-05"]
+    calendar = [session(d, close="13:00" if d == "2024-07-03" else "16:00") for d in days]
+    df = bars_15m(days).sample(frac=1.0, random_state=3)  # unsorted input
+
+    out = resample_session_bars(df, calendar, freq=freq)
+    expected = reference(df.sort_values("ts"), calendar, freq)
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+
+
+def test_session_anchored_buckets_and_early_close():
+    calendar = [session("2024-07-03", close="13:00"), session("2024-07-05")]
+    df = bars_15m(["2024-07-03", "2024-07-05"])
+
+    hourly = resample_session_bars(df, calendar, freq="1h", label="first")
+    local = pd.DatetimeIndex(hourly["ts"]).tz_convert(NY)
+    early = local[local.day == 3].strftime("%H:%M").tolist()
+    full = local[local.day == 5].strftime("%H:%M").tolist()
+    assert early == ["09:30", "10:30", "11:30", "12:30"]
+    assert full == ["09:30", "10:30", "11:30", "12:30", "13:30", "14:30", "15:30"]
+
+    four_hour = resample_session_bars(df, calendar, freq="4h", label="first")
+    assert pd.DatetimeIndex(four_hour["ts"]).tz_convert(NY).strftime("%d %H:%M").tolist() == [
+        "03 09:30",
+        "05 09:30",
+        "05 13:30",
+    ]
+
+    daily = resample_session_bars(df, calendar)
+    assert len(daily) == 2
+    assert pd.Timestamp(daily["ts"].iloc[0]).tz_convert(NY).strftime("%H:%M") == "12:45"
+
+
+def test_missing_bars_do_not_shift_buckets():
+    calendar = [session("2024-07-01")]
+    df = bars_15m(["2024-07-01"])
+    gap = df.drop(df.index[df["ts"] == pd.Timestamp("2024-07-01 09:45", tz=NY)])
+
+    hourly = resample_session_bars(gap, calendar, freq="1h", label="first")
+    starts = pd.DatetimeIndex(hourly["ts"]).tz_convert(NY).strftime("%H:%M").tolist()
+    assert starts[:2] == ["09:30", "10:30"]
+
+
+def test_filter_to_sessions_and_naive_utc_input():
+    calendar = [session("2024-07-01")]
+    df = bars_15m(["2024-07-01"])
+    df["ts"] = df["ts"].dt.tz_localize(None)  # naive timestamps are UTC
+
+    kept = filter_to_sessions(df, calendar)
+    assert len(kept) == 26
+    assert kept["ts"].is_monotonic_increasing
+    assert resample_session_bars(df, []).empty
+
+
+def test_rollup_every_restarts_per_session_and_drops_partial():
+    df = pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=5, freq="h"),
+            "open": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "high": [1.5, np.nan, 3.5, 4.5, 5.5],
+            "low": [0.5, 1.5, 2.5, 3.5, 4.5],
+            "close": [1.2, 2.2, 3.2, 4.2, 5.2],
+        }
+    )
+    rolled = rollup_every(df, 2, drop_partial=True)
+    assert rolled["close"].tolist() == [2.2, 4.2]
+    assert rolled["high"].tolist() == [1.5, 4.5]
+    assert rolled["volume"].tolist() == [0.0, 0.0]
+    assert rolled["ts"].tolist() == df["ts"].iloc[[1, 3]].tolist()
+
+    by_session = rollup_every(df, 2, sessions=np.array([0, 0, 0, 1, 1]), label="first")
+    assert by_session["open"].tolist() == [1.0, 3.0, 4.0]
+    assert by_session["close"].tolist() == [2.2, 3.2, 5.2]
+
+
+def test_trading_dates_use_new_york_date():
+    ts = pd.to_datetime(["2024-07-01 23:30", "2024-07-02 03:30", "2024-07-02 13:30"])
+    dates = trading_dates(ts.tz_localize("UTC"))
+    assert dates[0] == dates[1] != dates[2]
+
+
+def test_aggregate_ohlcv_validates_inputs():
+    df = pd.DataFrame({"close": [1.0, 2.0]})
+    with pytest.raises(ValueError):
+        aggregate_ohlcv(df, np.array([0]))
+    with pytest.raises(ValueError):
+        aggregate_ohlcv(df, np.array([0, 0]), label="middle")
+    assert aggregate_ohlcv(df, np.array([0, 0]))[["open", "close"]].iloc[0].tolist() == [1.0, 2.0]
+
+
+def test_h8_aggregation_pairs_h4_bars_per_day_and_drops_odd_bar(real_settings):
+    from src.intraday_forecast_job import _aggregate_h4_to_h8
+
+    days = ["2024-07-01", "2024-07-01", "2024-07-02", "2024-07-02", "2024-07-03"]
+    times = ["09:30", "13:30"] * 2 + ["09:30"]
+    ts = pd.to_datetime([f"{d} {t}" for d, t in zip(days, times)]).tz_localize(NY)
+    h4 = pd.DataFrame(
+        {
+            "ts": ts.tz_convert("UTC"),
+            "open": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "high": [1.5, 2.5, 3.5, 4.5, 5.5],
+            "low": [0.5, 1.5, 2.5, 3.5, 4.5],
+            "close": [1.2, 2.2, 3.2, 4.2, 5.2],
+            "volume": [10.0, 20.0, 30.0, 40.0, 50.0],
+        }
+    ).iloc[::-1]
+
+    h8 = _aggregate_h4_to_h8(h4)
+    assert h8["ts"].tolist() == h4["ts"].sort_values().iloc[[0, 2]].tolist()
+    assert h8[["open", "high", "low", "close", "volume"]].values.tolist() == [
+        [1.0, 2.5, 0.5, 2.2, 30.0],
+        [3.0, 4.5, 2.5, 4.2, 70.0],
+    ]
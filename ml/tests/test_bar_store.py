@@ -0,0 +1,179 @@
+"""Tests for the local OHLC bar store (src/data/bar_store.py) and its use by fetch_ohlc_bars."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import supabase_db
+from src.data.bar_store import BarStore, BarStoreError
+from src.data.supabase_db import SupabaseDatabase
+from src.data.symbol_registry import SymbolRegistry
+
+END = pd.Timestamp("2024-06-01", tz="UTC")
+
+
+def bars(provider, start, periods, close=None, freq="D"):
+    ts = pd.date_range(start, periods=periods, freq=freq, tz="UTC")
+    values = np.arange(periods, dtype=float) if close is None else np.full(periods, close)
+    return pd.DataFrame(
+        {
+            "provider": provider,
+            "ts": ts,
+            "open": values,
+            "high": values + 1,
+            "low": values - 1,
+            "close": values,
+            "volume": 100.0,
+        }
+    )
+
+
+def test_append_dedupes_and_compacts(tmp_path):
+    store = BarStore(tmp_path, max_segments=3)
+    store.append("aapl", "d1", bars("alpaca", "2024-01-01", 10), low_water=None)
+    # A re-synced tail: the last two bars changed, one new bar
+    store.append("AAPL", "d1", bars("alpaca", "2024-01-09", 3, close=50.0))
+    store.append("AAPL", "d1", bars("polygon", "2024-01-05", 2))
+
+    loaded = store.load("AAPL", "d1")
+    assert len(loaded) == 13
+    alpaca = loaded[loaded["provider"] == "alpaca"]
+    assert alpaca["ts"].is_monotonic_increasing and alpaca["ts"].is_unique
+    assert alpaca["close"].tolist()[-3:] == [50.0, 50.0, 50.0]
+    assert store.coverage("AAPL", "d1") == (True, None, pd.Timestamp("2024-01-11", tz="UTC"))
+
+    window = store.load("AAPL", "d1", start=pd.Timestamp("2024-01-05"), end=END)
+    assert window["ts"].min() == pd.Timestamp("2024-01-05")
+
+    # A fourth segment exceeds max_segments and triggers compaction
+    store.append("AAPL", "d1", bars("alpaca", "2024-01-11", 1, close=60.0))
+    assert len(store.read_manifest("AAPL", "d1")["segments"]) == 1
+    compacted = store.load("AAPL", "d1")
+    pd.testing.assert_frame_equal(compacted[["provider", "ts"]], loaded[["provider", "ts"]])
+    assert store.load("AAPL", "d1")["close"].iloc[-1] == 60.0
+    assert len(list(store.partition_dir("AAPL", "d1").glob("seg-*.npy"))) == 1
+
+
+def test_corrupt_segment_is_detected(tmp_path):
+    store = BarStore(tmp_path)
+    store.append("AAPL", "d1", bars("alpaca", "2024-01-01", 5), low_water=None)
+    segment = next(store.partition_dir("AAPL", "d1").glob("seg-*.npy"))
+    data = bytearray(segment.read_bytes())
+    data[-1] ^= 0xFF
+    segment.write_bytes(bytes(data))
+
+    assert store.verify("AAPL", "d1")
+    with pytest.raises(BarStoreError):
+        BarStore(tmp_path).load("AAPL", "d1")
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch, make_ohlc_rows, fake_supabase_client):
+    for name, value in (
+        ("ohlc_store_sync_seconds", 0.0),
+        ("ohlc_store_resync_bars", 3),
+    ):
+        monkeypatch.setattr(supabase_db.settings, name, value, raising=False)
+    rows = make_ohlc_rows("id-aapl", "alpaca", "2023-01-01", 500) + make_ohlc_rows(
+        "id-aapl", "yfinance", "2023-01-01", 500
+    )
+    db = SupabaseDatabase()
+    db.client = fake_supabase_client(rows)
+    db.symbol_registry = SymbolRegistry(ttl_seconds=60)
+    db.bar_store = BarStore(tmp_path)
+    return db
+
+
+def test_fetch_reads_store_and_syncs_deltas(database, make_ohlc_rows):
+    remote = SupabaseDatabase()
+    remote.client = database.client
+    remote.symbol_registry = database.symbol_registry
+    remote.bar_store = None
+    expected = remote.fetch_ohlc_bars("AAPL", "d1", limit=100, end_ts=END)
+    database.client.calls.clear()
+
+    first = database.fetch_ohlc_bars("AAPL", "d1", limit=100, end_ts=END)
+    pd.testing.assert_frame_equal(first, expected, check_dtype=False)
+    assert first.attrs["provider"] == "alpaca"
+
+    # New bars upstream: the next fetch pulls only the tail past the high-water mark
+    database.client.rows += make_ohlc_rows("id-aapl", "alpaca", "2024-05-15", 2)
+    for row in database.client.rows[-2:]:
+        row["open"] = row["close"] = 999.0
+    database.client.calls.clear()
+
+    second = database.fetch_ohlc_bars("AAPL", "d1", limit=100, end_ts=END)
+    queries = database.client.bar_queries()
+    assert len(queries) == 1
+    delta_from = next(pd.Timestamp(v) for c, op, v in queries[0] if op == "gte")
+    assert delta_from == pd.Timestamp("2024-05-11", tz="UTC")
+    assert second["close"].iloc[-1] == 999.0 and len(second) == 100
+    assert second["ts"].iloc[-1] == pd.Timestamp("2024-05-16")
+
+    # Older cutoffs inside the stored window need no query at all
+    database.client.calls.clear()
+    past = database.fetch_ohlc_bars("AAPL", "d1", limit=50, end_ts=END - pd.Timedelta(days=60))
+    assert database.client.bar_queries() == []
+    assert len(past) == 50
+
+
+def test_store_backfills_older_window(database):
+    database.fetch_ohlc_bars("AAPL", "d1", limit=30, end_ts=END)
+    _, low_water, _ = database.bar_store.coverage("AAPL", "d1")
+
+    start = pd.Timestamp("2023-03-01")
+    out = database.fetch_ohlc_bars("AAPL", "d1", start_ts=start, limit=1000, end_ts=END)
+    assert out["ts"].iloc[0] == start
+    _, new_low_water, _ = database.bar_store.coverage("AAPL", "d1")
+    assert new_low_water == start.tz_localize("UTC") < low_water
+
+
+def test_store_errors_fall_back_to_supabase(database):
+    database.fetch_ohlc_bars("AAPL", "d1", limit=20, end_ts=END)
+    segment = next(database.bar_store.partition_dir("AAPL", "d1").glob("seg-*.npy"))
+    segment.write_bytes(b"garbage")
+    database.bar_store = BarStore(database.bar_store.root)
+
+    out = database.fetch_ohlc_bars("AAPL", "d1", limit=20, end_ts=END)
+    assert len(out) == 20 and out.attrs["provider"] == "alpaca"
+    assert not database.bar_store.coverage("AAPL", "d1")[0]
+
+
+def test_prefetch_serves_from_store_and_syncs_only_deltas(
+    database, tmp_path, make_ohlc_rows, fake_supabase_client
+):
+    rows = database.client.rows + make_ohlc_rows("id-msft", "alpaca", "2023-01-01", 500)
+    remote = SupabaseDatabase()
+    remote.client = fake_supabase_client(rows)
+    remote.symbol_registry = database.symbol_registry
+    remote.bar_store = None
+    expected = remote.fetch_ohlc_bars_batch(["AAPL", "MSFT"], limit=100, end_ts=END)
+
+    def job_run():
+        # A fresh client per run, sharing only the on-disk store
+        db = SupabaseDatabase()
+        db.client = remote.client
+        db.symbol_registry = SymbolRegistry(ttl_seconds=60)
+        db.bar_store = BarStore(tmp_path)
+        remote.client.calls.clear()
+        db.prefetch_ohlc_bars(["AAPL", "MSFT"], limit=100, end_ts=END)
+        frames = {t: db.fetch_ohlc_bars(t, "d1", limit=100, end_ts=END) for t in ("AAPL", "MSFT")}
+        return frames, remote.client.bar_queries()
+
+    first, _ = job_run()
+    for ticker in ("AAPL", "MSFT"):
+        pd.testing.assert_frame_equal(first[ticker], expected[ticker]["d1"], check_dtype=False)
+        assert database.bar_store.coverage(ticker, "d1")[0]
+
+    remote.client.rows += make_ohlc_rows("id-msft", "alpaca", "2024-05-15", 2)
+    second, queries = job_run()
+
+    # One delta per partition, starting a few bars before its high-water mark
+    assert len(queries) == 2
+    for filters in queries:
+        (symbol_ids,) = [v for c, op, v in filters if c == "symbol_id"]
+        assert len(symbol_ids) == 1
+        delta_from = next(pd.Timestamp(v) for c, op, v in filters if op == "gte")
+        assert delta_from == pd.Timestamp("2024-05-11", tz="UTC")
+    assert second["MSFT"]["ts"].iloc[-1] == pd.Timestamp("2024-05-16")
+    assert second["AAPL"]["ts"].iloc[-1] == first["AAPL"]["ts"].iloc[-1]
@@ -0,0 +1,198 @@
+"""Tests for chunked bulk writes (src/data/bulk_writer.py) and the SupabaseDatabase writers."""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import bulk_writer, supabase_db
+from src.data.bulk_writer import BulkWriteError, column_to_python, frame_to_records, write_chunks
+from src.data.supabase_db import SupabaseDatabase
+
+
+class _FakeTable:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.op = None
+        self.payload = None
+        self.filters = []
+
+    def upsert(self, rows, on_conflict=None):
+        self.op, self.payload = "upsert", rows
+        return self
+
+    def insert(self, rows):
+        self.op, self.payload = "insert", rows
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, tuple(values)))
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def execute(self):
+        with self.client.lock:
+            self.client.calls.append((self.name, self.op, self.payload, self.filters))
+            if self.client.fail_next:
+                self.client.fail_next -= 1
+                raise RuntimeError("503 upstream")
+        return SimpleNamespace(data=[])
+
+
+class _FakeClient:
+    def __init__(self, fail_next=0):
+        self.calls = []
+        self.fail_next = fail_next
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return _FakeTable(self, name)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    monkeypatch.setattr(bulk_writer.time, "sleep", lambda seconds: None)
+    # Other test modules may leave a stubbed settings object behind
+    for name, value in (
+        ("db_write_chunk_size", 500),
+        ("db_write_workers", 4),
+        ("db_write_max_retries", 2),
+    ):
+        monkeypatch.setattr(supabase_db.settings, name, value, raising=False)
+    db = SupabaseDatabase()
+    db.client = _FakeClient()
+    return db
+
+
+def test_column_conversion():
+    df = pd.DataFrame(
+        {
+            "ts": pd.to_datetime(["2024-01-02", None]).tz_localize("UTC"),
+            "x": [1.5, np.inf],
+            "n": np.array([3, 4], dtype=np.int64),
+            "trend": [1.0, np.nan],
+            "label": ["a", None],
+        }
+    )
+    records = frame_to_records(
+        df, columns=["ts", "x", "n", "trend", "label", "absent"], constants={"id": "s"}
+    )
+
+    assert records == [
+        {
+            "id": "s",
+            "ts": "2024-01-02T00:00:00+00:00",
+            "x": 1.5,
+            "n": 3,
+            "trend": 1.0,
+            "label": "a",
+        },
+        {"id": "s", "ts": None, "x": None, "n": 4, "trend": None, "label": None},
+    ]
+    assert type(records[0]["n"]) is int
+    assert column_to_python(pd.Series(["2.7", "bad", None]), "int", default=0) == [2, 0, 0]
+
+
+def test_write_chunks_retries_and_reports_failures():
+    attempts = {}
+
+    def send(chunk):
+        first = chunk[0]["i"]
+        attempts[first] = attempts.get(first, 0) + 1
+        if first == 4 or (first == 2 and attempts[first] == 1):
+            raise RuntimeError(f"chunk {first} failed")
+
+    records = [{"i": i} for i in range(7)]
+    result = write_chunks(records, send, "t", chunk_size=2, max_workers=3, retry_backoff=0)
+
+    assert (result.total, result.written, result.failed) == (7, 5, 2)
+    assert [(f.start, f.size) for f in result.failures] == [(4, 2)]
+    assert attempts == {0: 1, 2: 2, 4: 3, 6: 1}
+    with pytest.raises(BulkWriteError):
+        result.raise_for_failures()
+
+
+def test_upsert_indicator_values_chunks(database, monkeypatch):
+    monkeypatch.setattr(supabase_db.settings, "db_write_chunk_size", 4)
+    df = pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=10, freq="h"),
+            "close": np.linspace(100, 101, 10),
+            "supertrend_trend": [1.0, -1.0, np.nan] + [1.0] * 7,
+            "not_a_column": 0,
+        }
+    )
+
+    result = database.upsert_indicator_values("sym", "h1", df)
+
+    sent = [payload for _, op, payload, _ in database.client.calls if op == "upsert"]
+    assert result.ok and result.written == 10
+    assert sorted(len(chunk) for chunk in sent) == [2, 4, 4]
+    rows = sorted((row for chunk in sent for row in chunk), key=lambda r: r["ts"])
+    assert rows[2] == {
+        "symbol_id": "sym",
+        "timeframe": "h1",
+        "ts": "2024-01-01T02:00:00",
+        "close": df["close"][2],
+        "supertrend_trend": None,
+    }
+    assert rows[1]["supertrend_trend"] == -1
+
+
+def test_insert_options_snapshots_raises_on_partial_failure(database, monkeypatch):
+    monkeypatch.setattr(supabase_db.settings, "db_write_max_retries", 0)
+    database.client.fail_next = 1
+    snapshots = pd.DataFrame(
+        {"contract_symbol": ["A", "B"], "strike": [100, None], "volume": [np.nan, 5]}
+    )
+
+    with pytest.raises(BulkWriteError) as excinfo:
+        database.insert_options_snapshots("sym", snapshots)
+    assert excinfo.value.result.failed == 2
+
+    assert database.insert_options_snapshots("sym", snapshots) == 2
+    rows = database.client.calls[-1][2]
+    assert rows[1]["strike"] == 0.0 and rows[0]["volume"] == 0 and rows[0]["bid"] == 0.0
+    assert rows[0]["option_type"] == "call" and rows[0]["snapshot_time"] == ""
+
+
+def test_save_indicator_snapshot_aliases(database):
+    indicators = [
+        {"ts": pd.Timestamp("2024-01-01"), "supertrend": 10.0, "volume": 7.9, "metadata": {"a": 1}},
+        {"ts": "2024-01-02", "supertrend_value": 0, "supertrend": 11.0, "mfi_14": 55.0},
+    ]
+
+    assert database.save_indicator_snapshot("sym", "d1", indicators) == 2
+    rows = database.client.calls[-1][2]
+    assert [r["supertrend_value"] for r in rows] == [10.0, 11.0]
+    assert [r["ts"] for r in rows] == ["2024-01-01T00:00:00", "2024-01-02"]
+    assert rows[0]["volume"] == 7 and rows[1]["mfi"] == 55.0
+    assert rows[0]["metadata"] == {"a": 1} and rows[1]["metadata"] == {}
+
+
+def test_upsert_option_ranks_last_record_wins(database):
+    base = {"underlying_symbol_id": "sym", "ranking_mode": "entry", "composite_rank": 1.0}
+    records = [
+        {**base, "contract_symbol": "C1"},
+        {**base, "contract_symbol": "C2"},
+        {**base, "contract_symbol": "C1", "composite_rank": 2.0},
+    ]
+
+    result = database.upsert_option_ranks(records)
+
+    deletes = [call for call in database.client.calls if call[1] == "delete"]
+    inserts = [call[2] for call in database.client.calls if call[1] == "insert"]
+    assert result.written == 2
+    assert deletes[0][3] == [("contract_symbol", ("C2", "C1")), ("ranking_mode", "entry")]
+    assert [row["composite_rank"] for row in inserts[0]] == [1.0, 2.0]
+    assert inserts[0][0]["liquidity_confidence"] == 1.0
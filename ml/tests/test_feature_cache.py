@@ -0,0 +1,325 @@
+"""
+Unit tests for the binary frame codec and DistributedFeatureCache.
+
+Validates:
+- Round trip preserves dtypes (float, int, bool, naive/tz-aware datetimes, objects, NaN/NaT)
+- Corrupt or foreign payloads raise FrameCodecError
+- DistributedFeatureCache writes v2 binary entries (per cutoff when bounded) and
+  migrates v1 JSON entries
+- fetch_or_build_features extends stale indicator rows incrementally, also up to
+  a current-day cutoff
+"""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.frame_codec import FrameCodecError, decode_frame, encode_frame
+from src.features import feature_cache
+from src.features.feature_cache import DistributedFeatureCache, fetch_or_build_features
+from src.features.incremental_indicators import INCREMENTAL_COLUMNS, build_indicator_state
+
+
+class _FakeRedis:
+    """Minimal in-memory stand-in for the redis client methods the cache uses."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.store.pop(key, None) is not None)
+
+    def keys(self, pattern):
+        prefix = pattern.rstrip("*")
+        return [key for key in self.store if key.startswith(prefix)]
+
+
+def _make_features(n: int = 50) -> pd.DataFrame:
+    np.random.seed(0)
+    close = 100 + np.cumsum(np.random.randn(n))
+    df = pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01", periods=n, freq="D"),
+            "close": close,
+            "volume": np.random.randint(1_000, 10_000, n).astype(np.int64),
+            "rsi_14": np.where(np.arange(n) < 14, np.nan, 50.0),
+            "supertrend_trend": np.arange(n) % 2,
+            "is_bull": np.arange(n) % 3 == 0,
+            "regime": ["up" if i % 2 else None for i in range(n)],
+        }
+    )
+    df.loc[3, "ts"] = pd.NaT
+    return df
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip_preserves_dtypes(compress):
+    df = _make_features()
+    out = decode_frame(encode_frame(df, compress=compress))
+    pd.testing.assert_frame_equal(out, df)
+
+
+def test_round_trip_tz_aware_and_custom_index():
+    df = _make_features(10)
+    df["ts"] = df["ts"].dt.tz_localize("UTC").dt.tz_convert("America/New_York")
+    df = df.set_index("ts")
+    out = decode_frame(encode_frame(df))
+    pd.testing.assert_frame_equal(out, df)
+
+
+def test_round_trip_empty_frame():
+    df = _make_features().iloc[:0]
+    out = decode_frame(encode_frame(df))
+    pd.testing.assert_frame_equal(out, df)
+
+
+def test_decode_rejects_foreign_payload():
+    with pytest.raises(FrameCodecError):
+        decode_frame(b'[{"close": 1.0}]')
+    with pytest.raises(FrameCodecError):
+        decode_frame(encode_frame(_make_features())[:-20])
+
+
+@pytest.fixture
+def redis_available(monkeypatch):
+    """Enable the cache with fake clients whether or not the redis package is installed."""
+    monkeypatch.setattr(feature_cache, "REDIS_AVAILABLE", True)
+
+
+def test_cache_set_get_binary_round_trip(redis_available):
+    client = _FakeRedis()
+    cache = DistributedFeatureCache(redis_client=client)
+    df = _make_features()
+
+    assert cache.set("AAPL", "d1", df)
+    assert isinstance(client.store["features:v2:AAPL:d1"], bytes)
+    pd.testing.assert_frame_equal(cache.get("AAPL", "d1"), df)
+
+
+def test_cache_reads_and_migrates_legacy_json(redis_available):
+    client = _FakeRedis()
+    cache = DistributedFeatureCache(redis_client=client)
+    df = _make_features(5).drop(columns=["regime"])
+    client.store["features:v1:AAPL:d1"] = df.to_json(orient="records", date_format="iso")
+
+    out = cache.get("AAPL", "d1")
+
+    assert out is not None
+    assert pd.api.types.is_datetime64_any_dtype(out["ts"])
+    np.testing.assert_allclose(out["close"].to_numpy(), df["close"].to_numpy())
+    assert "features:v2:AAPL:d1" in client.store
+    assert json.loads(client.store["features:v1:AAPL:d1"])
+
+
+def test_cache_delete_removes_both_versions(redis_available):
+    client = _FakeRedis()
+    cache = DistributedFeatureCache(redis_client=client)
+    cache.set("AAPL", "d1", _make_features(5))
+    client.store["features:v1:AAPL:d1"] = "[]"
+
+    assert cache.delete("AAPL", "d1")
+    assert client.store == {}
+
+
+def test_binary_client_built_once_per_decoding_client(redis_available, monkeypatch):
+    created = []
+
+    class _FakeRedisModule:
+        @staticmethod
+        def ConnectionPool(**kwargs):
+            created.append(kwargs)
+            return SimpleNamespace(connection_kwargs=kwargs)
+
+        @staticmethod
+        def Redis(connection_pool):
+            return SimpleNamespace(connection_pool=connection_pool)
+
+    monkeypatch.setattr(feature_cache, "redis", _FakeRedisModule, raising=False)
+    monkeypatch.setattr(feature_cache, "_binary_clients", {})
+    pool = SimpleNamespace(connection_class=object, connection_kwargs={"decode_responses": True})
+    decoding = SimpleNamespace(connection_pool=pool)
+
+    first = DistributedFeatureCache(redis_client=decoding).redis_client
+    second = DistributedFeatureCache(redis_client=decoding).redis_client
+    other = DistributedFeatureCache(redis_client=SimpleNamespace(connection_pool=pool))
+
+    assert first is second
+    assert first.connection_pool.connection_kwargs["decode_responses"] is False
+    assert other.redis_client is not first
+    assert len(created) == 2
+    # Clients that already return bytes are used as-is
+    plain = _FakeRedis()
+    assert DistributedFeatureCache(redis_client=plain).redis_client is plain
+
+
+class _FakeDB:
+    """Stale indicator_values rows plus persisted state; records writes."""
+
+    def __init__(self, cached, state, bars):
+        self.cached = cached
+        self.state = state
+        self.bars = bars
+        self.ohlc_calls = []
+        self.indicator_upserts = []
+        self.state_upserts = []
+
+    def get_symbol_id(self, symbol):
+        return "sym-1"
+
+    def fetch_indicator_values(self, symbol_id, timeframe, limit=None):
+        return self.cached.copy()
+
+    def fetch_indicator_state(self, symbol_id, timeframe):
+        return self.state
+
+    def fetch_ohlc_bars(self, symbol, timeframe="d1", limit=None, end_ts=None, start_ts=None):
+        self.ohlc_calls.append({"limit": limit, "start_ts": start_ts, "end_ts": end_ts})
+        bars = self.bars
+        if start_ts is not None:
+            bars = bars[bars["ts"] >= pd.Timestamp(start_ts)]
+        if end_ts is not None:
+            bars = bars[bars["ts"] < pd.Timestamp(end_ts).tz_localize(None)]
+        return bars.tail(limit).reset_index(drop=True) if limit else bars
+
+    def upsert_indicator_values(self, symbol_id, timeframe, df):
+        self.indicator_upserts.append(df)
+
+    def upsert_indicator_state(self, symbol_id, timeframe, state):
+        self.state_upserts.append(state)
+
+
+def test_fetch_or_build_extends_stale_rows(monkeypatch, indicator_bars, core_features):
+    monkeypatch.setenv("REDIS_FEATURE_CACHE", "0")
+    bars = indicator_bars
+    features = core_features(bars.iloc[:-5])
+    cached = features[INCREMENTAL_COLUMNS].copy()
+    cached["ts"] = cached["ts"].dt.tz_localize("UTC")
+    cached["created_at"] = pd.Timestamp("2020-01-01", tz="UTC")
+    db = _FakeDB(cached, build_indicator_state(features).to_dict(), bars)
+
+    out = fetch_or_build_features(db=db, symbol="AAPL", timeframes=["h1"])["h1"]
+
+    assert len(out) == len(bars)
+    assert db.ohlc_calls and db.ohlc_calls[0]["start_ts"] is not None
+    assert len(db.indicator_upserts) == 1 and len(db.indicator_upserts[0]) == 5
+    assert db.state_upserts[0]["bars_since_rebuild"] == 5
+    assert str(out["ts"].dt.tz) == "UTC"
+
+
+def test_fetch_or_build_rebuilds_when_state_missing(monkeypatch, indicator_bars, core_features):
+    monkeypatch.setenv("REDIS_FEATURE_CACHE", "0")
+    bars = indicator_bars
+    cached = core_features(bars.iloc[:-5])[INCREMENTAL_COLUMNS]
+    db = _FakeDB(cached, None, bars)
+    monkeypatch.setattr(
+        "src.features.feature_cache.add_technical_features", lambda df: core_features(df)
+    )
+
+    out = fetch_or_build_features(db=db, symbol="AAPL", timeframes=["h1"])["h1"]
+
+    assert len(out) == len(bars)
+    assert db.ohlc_calls[-1]["start_ts"] is None
+    assert len(db.state_upserts) == 1
+
+
+def test_fetch_or_build_extends_up_to_current_day_cutoff(
+    monkeypatch, indicator_bars, core_features
+):
+    monkeypatch.setenv("REDIS_FEATURE_CACHE", "0")
+    cutoff = pd.Timestamp.utcnow().normalize()
+    bars = indicator_bars.copy()
+    # The last two bars fall on/after the cutoff and must not be folded in
+    bars["ts"] += cutoff.tz_localize(None) - bars["ts"].iloc[-2]
+    features = core_features(bars.iloc[:-5])
+    cached = features[INCREMENTAL_COLUMNS].copy()
+    cached["created_at"] = pd.Timestamp("2020-01-01", tz="UTC")
+    db = _FakeDB(cached, build_indicator_state(features).to_dict(), bars)
+
+    out = fetch_or_build_features(db=db, symbol="AAPL", timeframes=["h1"], cutoff_ts=cutoff)["h1"]
+
+    assert len(db.ohlc_calls) == 1
+    assert db.ohlc_calls[0]["start_ts"] is not None and db.ohlc_calls[0]["end_ts"] == cutoff
+    assert len(out) == len(bars) - 2
+    assert len(db.indicator_upserts[0]) == 3
+    assert db.state_upserts[0]["bars_since_rebuild"] == 3
+
+
+def test_fetch_or_build_keys_redis_entries_by_cutoff(
+    redis_available, indicator_bars, core_features
+):
+    cutoff = pd.Timestamp.utcnow().normalize()
+    bars = indicator_bars.copy()
+    bars["ts"] += cutoff.tz_localize(None) - bars["ts"].iloc[-1] - pd.Timedelta(hours=1)
+    features = core_features(bars.iloc[:-5])
+    cached = features[INCREMENTAL_COLUMNS].copy()
+    cached["created_at"] = pd.Timestamp("2020-01-01", tz="UTC")
+    redis = _FakeRedis()
+
+    def run(db, cutoff_ts):
+        return fetch_or_build_features(
+            db=db, symbol="AAPL", timeframes=["h1"], redis_cache=redis, cutoff_ts=cutoff_ts
+        )["h1"]
+
+    first = run(_FakeDB(cached, build_indicator_state(features).to_dict(), bars), cutoff)
+    key = f"features:v2:AAPL:h1:lt{cutoff:%Y%m%d}T0000"
+    assert list(redis.store) == [key]
+
+    # A second worker with the same cutoff is served from Redis alone
+    empty = _FakeDB(pd.DataFrame(), None, bars.iloc[:0])
+    pd.testing.assert_frame_equal(run(empty, cutoff), first)
+    assert not empty.ohlc_calls
+    # Unbounded reads never see a cutoff-bounded entry
+    assert run(empty, None).empty
+    assert empty.ohlc_calls
+
+
+def test_fetch_or_build_rebuilds_past_cutoff_without_writes(
+    monkeypatch, indicator_bars, core_features
+):
+    monkeypatch.setenv("REDIS_FEATURE_CACHE", "0")
+    bars = indicator_bars
+    features = core_features(bars.iloc[:-5])
+    db = _FakeDB(features[INCREMENTAL_COLUMNS], build_indicator_state(features).to_dict(), bars)
+    monkeypatch.setattr(
+        "src.features.feature_cache.add_technical_features", lambda df: core_features(df)
+    )
+    cutoff = bars["ts"].iloc[-10]
+
+    out = fetch_or_build_features(db=db, symbol="AAPL", timeframes=["h1"], cutoff_ts=cutoff)["h1"]
+
+    assert len(out) == len(bars) - 10
+    assert db.ohlc_calls[-1]["start_ts"] is None
+    assert not db.indicator_upserts and not db.state_upserts
+
+
+def test_intraday_refresh_extends_cached_rows(
+    real_settings, monkeypatch, indicator_bars, core_features
+):
+    from src import intraday_forecast_job as job
+
+    monkeypatch.setenv("REDIS_FEATURE_CACHE", "0")
+    bars = indicator_bars
+    features = core_features(bars.iloc[:-5])
+    cached = features[INCREMENTAL_COLUMNS].copy()
+    cached["ts"] = cached["ts"].dt.tz_localize("UTC")
+    cached["created_at"] = pd.Timestamp("2020-01-01", tz="UTC")
+    db = _FakeDB(cached, build_indicator_state(features).to_dict(), bars)
+    monkeypatch.setattr(job, "db", db)
+
+    out = job._fetch_intraday_features("AAPL", "h1", len(bars))
+
+    assert "h1" in job.INCREMENTAL_FEATURE_TIMEFRAMES
+    assert len(db.ohlc_calls) == 1 and db.ohlc_calls[0]["start_ts"] is not None
+    assert len(out) == len(bars)
+    # Same naive-UTC ts as the OHLC frames the rest of the job works with
+    assert out["ts"].dt.tz is None
+    assert out["ts"].tolist() == bars["ts"].tolist()
@@ -0,0 +1,89 @@
+"""Tests for the shared live-forecast pollers in api/routers/forecast_charts_realtime.py."""
+
+import asyncio
+import threading
+from datetime import datetime
+
+import pytest
+
+from api.routers import forecast_charts_realtime as realtime
+from api.routers.forecast_charts_realtime import ConnectionManager, ForecastOverlay
+
+
+class _FakeWebSocket:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.sent.append(message)
+
+
+@pytest.fixture
+def overlays(monkeypatch):
+    """Patched fetch_forecast_overlays returning a mutable list; records calling threads."""
+    state = {"forecasts": [], "calls": 0, "threads": set()}
+
+    def fetch(symbol, horizon, days_back=30):
+        state["calls"] += 1
+        state["threads"].add(threading.get_ident())
+        return list(state["forecasts"])
+
+    monkeypatch.setattr(realtime, "fetch_forecast_overlays", fetch)
+    return state
+
+
+def _overlay(price, age_seconds=10):
+    now = int(datetime.now().timestamp())
+    return ForecastOverlay(time=now - age_seconds, price=price, confidence=0.7, direction="bullish")
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_one_poller(overlays):
+    manager = ConnectionManager(poll_interval=0.01)
+    clients = [_FakeWebSocket() for _ in range(5)]
+    keys = {await manager.subscribe(ws, "AAPL", "1h") for ws in clients}
+
+    assert keys == {"AAPL_1h"} and len(manager.pollers) == 1
+    overlays["forecasts"] = [_overlay(190.0)]
+    await asyncio.sleep(0.1)
+
+    # Every client got the forecast once, despite several polls
+    assert all(len(ws.sent) == 1 for ws in clients)
+    assert clients[0].sent[0]["data"]["price"] == 190.0
+    assert overlays["threads"] and threading.get_ident() not in overlays["threads"]
+
+    # Only a newer forecast is broadcast
+    overlays["forecasts"].append(_overlay(191.0, age_seconds=0))
+    await asyncio.sleep(0.05)
+    assert [m["data"]["price"] for m in clients[-1].sent] == [190.0, 191.0]
+
+    for ws in clients:
+        manager.disconnect(ws, "AAPL_1h")
+    await asyncio.sleep(0)
+    assert manager.pollers == {} and manager.active_connections == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_clients_are_dropped_and_stale_forecasts_skipped(overlays):
+    manager = ConnectionManager(poll_interval=0.01)
+    good, bad = _FakeWebSocket(), _FakeWebSocket(fail=True)
+    await manager.subscribe(good, "SPY", "15m")
+    await manager.subscribe(bad, "SPY", "15m")
+
+    overlays["forecasts"] = [_overlay(500.0, age_seconds=3600)]
+    await asyncio.sleep(0.05)
+    assert good.sent == []
+
+    overlays["forecasts"] = [_overlay(501.0)]
+    await asyncio.sleep(0.05)
+    assert len(good.sent) == 1
+    assert manager.get_connection_count("SPY_15m") == 1
+
+    manager.disconnect(good, "SPY_15m")
+    assert manager.pollers == {}
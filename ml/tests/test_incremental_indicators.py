@@ -0,0 +1,107 @@
+"""
+Unit tests for incremental indicator extension.
+
+Validates that extending a state captured from the first N bars over the next
+k bars reproduces a full recomputation over N + k bars, and that
+inconsistent input forces a full rebuild (None).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.incremental_indicators import (
+    INCREMENTAL_COLUMNS,
+    TAIL_BARS,
+    IndicatorState,
+    build_indicator_state,
+    extend_indicator_state,
+)
+
+
+@pytest.fixture
+def bars(indicator_bars):
+    return indicator_bars
+
+
+def test_state_round_trips_through_dict(bars, core_features):
+    state = build_indicator_state(core_features(bars))
+    assert state is not None
+    assert IndicatorState.from_dict(state.to_dict()) == state
+    assert IndicatorState.from_dict({**state.to_dict(), "version": 0}) is None
+
+
+def test_extension_matches_full_recompute(bars, core_features):
+    n_new = 12
+    history, new_bars = bars.iloc[:-n_new], bars.iloc[-n_new:]
+    state = build_indicator_state(core_features(history))
+
+    rows, new_state = extend_indicator_state(state, new_bars)
+    assert list(rows.columns) == INCREMENTAL_COLUMNS
+    assert len(rows) == n_new
+    assert new_state.bars_since_rebuild == n_new
+    assert pd.Timestamp(new_state.last_ts) == bars["ts"].iloc[-1]
+
+    full = core_features(bars, factor=state.st_factor).tail(n_new).reset_index(drop=True)
+    for col in [
+        "rsi_14",
+        "macd",
+        "macd_signal",
+        "macd_hist",
+        "adx",
+        "atr_14",
+        "bb_upper",
+        "bb_lower",
+        "stoch_k",
+        "stoch_d",
+        "williams_r",
+        "cci",
+        "mfi",
+        "obv",
+        "supertrend_value",
+        "supertrend_trend",
+    ]:
+        np.testing.assert_allclose(
+            rows[col].astype(float), full[col].astype(float), rtol=1e-9, err_msg=col
+        )
+
+
+def test_extension_is_chainable(bars, core_features):
+    history = bars.iloc[:-10]
+    state = build_indicator_state(core_features(history))
+
+    one_shot, _ = extend_indicator_state(state, bars.iloc[-10:])
+    first, mid_state = extend_indicator_state(state, bars.iloc[-10:-4])
+    second, _ = extend_indicator_state(mid_state, bars.iloc[-4:])
+    chained = pd.concat([first, second], ignore_index=True)
+
+    pd.testing.assert_frame_equal(chained, one_shot)
+
+
+def test_unchanged_overlap_bar_is_skipped(bars, core_features):
+    state = build_indicator_state(core_features(bars.iloc[:-3]))
+    rows, _ = extend_indicator_state(state, bars.iloc[-4:])
+    assert len(rows) == 3
+
+
+def test_inconsistent_input_forces_rebuild(bars, core_features):
+    state = build_indicator_state(core_features(bars.iloc[:-3]))
+
+    revised = bars.iloc[-4:].copy()
+    revised.loc[revised.index[0], "close"] *= 1.01
+    assert extend_indicator_state(state, revised) is None
+
+    gap = bars.iloc[-3:].copy()
+    gap.loc[gap.index[1], "close"] = np.nan
+    assert extend_indicator_state(state, gap) is None
+
+
+def test_no_new_bars_returns_state_unchanged(bars, core_features):
+    state = build_indicator_state(core_features(bars))
+    rows, same = extend_indicator_state(state, bars.iloc[-1:])
+    assert rows.empty
+    assert same == state
+
+
+def test_short_history_has_no_state(bars, core_features):
+    assert build_indicator_state(core_features(bars.iloc[: TAIL_BARS - 1])) is None
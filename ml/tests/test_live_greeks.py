@@ -0,0 +1,117 @@
+"""Tests for the vectorized option book in src/streaming/live_greeks.py."""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from src.models.options_pricing import BlackScholesModel
+from src.streaming import live_greeks
+from src.streaming.live_greeks import LiveGreeksCalculator, OptionBook
+
+
+@dataclass
+class Tick:
+    symbol: str
+    price: float
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(live_greeks.time, "time", lambda: now[0])
+    return now
+
+
+def test_book_matches_scalar_greeks():
+    calc = LiveGreeksCalculator(r=0.04, sigma=0.3)
+    strikes = np.arange(80.0, 121.0, 5.0)
+    calc.add_options("AAPL", K=strikes, T=45 / 365, option_type="call")
+    calc.add_options("AAPL", K=strikes, T=[0.1 + 0.01 * i for i in range(9)], option_type="put")
+    calc.add_option("AAPL", K=100, T=0.0, option_type="put", option_id="expired")
+
+    calc.on_price_update(Tick("AAPL", 101.5))
+    batch = calc.get_book_greeks("AAPL")
+    book = calc.books["AAPL"]
+
+    bs = BlackScholesModel(risk_free_rate=0.04)
+    assert len(book) == 19 and len(batch.delta) == 19
+    for i, option_id in enumerate(book.option_ids):
+        spec = book.spec(option_id)
+        expected = bs.calculate_greeks(
+            S=101.5, K=spec["K"], T=spec["T"], sigma=spec["sigma"], option_type=spec["type"]
+        )
+        assert batch.theoretical_price[i] == pytest.approx(expected.theoretical_price, abs=1e-9)
+        assert batch.delta[i] == pytest.approx(expected.delta, abs=1e-9)
+        assert batch.gamma[i] == pytest.approx(expected.gamma, abs=1e-9)
+        assert batch.theta[i] == pytest.approx(expected.theta, abs=1e-9)
+        assert batch.vega[i] == pytest.approx(expected.vega, abs=1e-9)
+
+    single = calc.get_current_greeks("AAPL", "expired")
+    assert single["price"] == pytest.approx(0.0) and single["underlying_price"] == 101.5
+
+
+def test_ticks_inside_interval_are_coalesced(clock):
+    calc = LiveGreeksCalculator(update_interval=1.0)
+    calc.add_options("SPY", K=[440, 450, 460], T=30 / 365, option_ids=["a", "b", "c"])
+    batches = []
+    calc.set_batch_callback(lambda symbol, ids, greeks, S: batches.append((ids, S)))
+    updates = []
+    calc.set_callback(lambda option_id, greeks: updates.append((option_id, greeks)))
+
+    calc.on_price_update(Tick("SPY", 450.0))
+    for price in (450.5, 451.0, 452.0):
+        clock[0] += 0.2
+        calc.on_price_update(Tick("SPY", price))
+
+    assert batches == [(["a", "b", "c"], 450.0)]
+    assert calc.last_prices["SPY"] == 452.0
+    assert calc.flush() == 0
+
+    clock[0] += 1.0
+    assert calc.flush() == 1
+    assert batches[-1] == (["a", "b", "c"], 452.0)
+    assert [option_id for option_id, _ in updates] == ["a", "b", "c"] * 2
+    assert updates[-1][1]["underlying_price"] == 452.0
+    assert calc.flush(force=True) == 0
+
+
+def test_last_tick_of_a_burst_is_emitted_without_flush():
+    calc = LiveGreeksCalculator(update_interval=0.3)
+    calc.add_options("SPY", K=[440, 450], T=30 / 365, option_ids=["a", "b"])
+    batches = []
+    calc.set_batch_callback(lambda symbol, ids, greeks, S: batches.append(S))
+
+    for price in (450.0, 450.5, 451.0):
+        calc.on_price_update(Tick("SPY", price))
+    assert batches == [450.0]
+
+    deadline = time.time() + 5
+    while len(batches) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert batches == [450.0, 451.0]
+    assert not calc.pending and not calc._timers
+
+    # stop() cancels the timer but keeps the price for flush()
+    calc.on_price_update(Tick("SPY", 452.0))
+    calc.stop()
+    time.sleep(0.4)
+    assert batches == [450.0, 451.0]
+    assert calc.flush(force=True) == 1 and batches[-1] == 452.0
+
+
+def test_remove_option_keeps_book_consistent():
+    book = OptionBook()
+    for i, strike in enumerate([90.0, 100.0, 110.0]):
+        book.upsert(f"o{i}", strike, 0.5, "call", 0.2)
+
+    assert book.remove("o0") and not book.remove("o0")
+    assert book.option_ids == ["o2", "o1"]
+    assert book.arrays()[0].tolist() == [110.0, 100.0]
+    book.upsert("o1", 105.0, 0.5, "put", 0.2)
+    assert book.spec("o1") == {"K": 105.0, "T": 0.5, "type": "put", "sigma": 0.2}
+
+    calc = LiveGreeksCalculator()
+    calc.add_option("TSLA", K=200, T=0.25)
+    assert calc.remove_option("TSLA") and "TSLA" not in calc.books
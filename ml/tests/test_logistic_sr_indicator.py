@@ -0,0 +1,62 @@
+"""Tests for the logistic regression S/R indicator (src/features/logistic_sr_indicator.py)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.logistic_sr_indicator import LogisticSRIndicator, LogisticSRSettings
+
+
+def make_bars(n: int, seed: int, with_ts: bool = True, rounded: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = close + rng.normal(0, 0.5, n)
+    high = np.maximum(open_, close) + rng.exponential(0.5, n)
+    low = np.minimum(open_, close) - rng.exponential(0.5, n)
+    if rounded:
+        # Integer prices create equal highs/lows, exercising pivot tie handling
+        open_, high, low, close = (np.round(x) for x in (open_, high, low, close))
+    df = pd.DataFrame({"open": open_, "high": high, "low": low, "close": close})
+    if with_ts:
+        df.insert(0, "ts", pd.date_range("2024-01-01", periods=n, freq="h"))
+    return df
+
+
+SETTINGS = [
+    LogisticSRSettings(),
+    LogisticSRSettings(
+        pivot_length=5, target_respects=1, retest_cooldown=0, probability_threshold=0.5
+    ),
+]
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("n", [10, 29, 400, 1200])
+def test_vectorized_matches_sequential(settings, seed, n):
+    df = make_bars(n, seed, with_ts=seed % 2 == 0, rounded=seed == 3)
+
+    vectorized = LogisticSRIndicator(settings)
+    sequential = LogisticSRIndicator(settings, engine="sequential")
+
+    assert vectorized.calculate(df) == sequential.calculate(df)
+    assert vectorized._all_levels == sequential._all_levels
+
+
+def test_vectorized_matches_sequential_with_missing_prices():
+    df = make_bars(400, 5, with_ts=False)
+    df.loc[50, "high"] = np.nan
+    df.loc[70, "close"] = np.nan
+
+    vectorized = LogisticSRIndicator()
+    sequential = LogisticSRIndicator(engine="sequential")
+    vectorized.calculate(df)
+    sequential.calculate(df)
+
+    # NaN levels compare unequal, so compare the serialized form
+    assert repr(vectorized._all_levels) == repr(sequential._all_levels)
+
+
+def test_invalid_engine():
+    with pytest.raises(ValueError):
+        LogisticSRIndicator(engine="numba")
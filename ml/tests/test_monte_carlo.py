@@ -0,0 +1,106 @@
+"""Tests for Monte Carlo simulation (src/simulation/monte_carlo.py)."""
+
+import numpy as np
+import pytest
+
+from src.models.options_pricing import BlackScholesModel
+from src.simulation.monte_carlo import MonteCarloSimulator, PathGenerator
+
+S0, R, SIGMA, T = 100.0, 0.05, 0.30, 0.25
+STRIKES = np.array([90.0, 100.0, 110.0])
+
+
+@pytest.fixture
+def simulator():
+    return MonteCarloSimulator(S0=S0, r=R, sigma=SIGMA, T=T, n_simulations=200_000, seed=11)
+
+
+class TestGreeksLadder:
+    """Single-pass strike ladder with pathwise/likelihood-ratio Greeks."""
+
+    @pytest.mark.parametrize("option_type", ["call", "put"])
+    def test_matches_black_scholes(self, simulator, option_type):
+        ladder = simulator.calculate_greeks_ladder(STRIKES, option_type, chunk_size=30_000)
+        bs = BlackScholesModel(risk_free_rate=R).calculate_greeks_batch(
+            S0, STRIKES, T, SIGMA, option_type
+        )
+
+        np.testing.assert_allclose(
+            ladder["price"], bs.theoretical_price, atol=4 * ladder["std_error"].max()
+        )
+        np.testing.assert_allclose(ladder["delta"], bs.delta, atol=0.01)
+        np.testing.assert_allclose(ladder["gamma"], bs.gamma, rtol=0.05)
+        np.testing.assert_allclose(ladder["vega"], bs.vega, rtol=0.03)
+        np.testing.assert_allclose(ladder["theta"], bs.theta, rtol=0.03)
+        np.testing.assert_allclose(ladder["rho"], bs.rho, rtol=0.05, atol=0.002)
+
+    def test_chunk_size_does_not_change_results(self):
+        sim = MonteCarloSimulator(S0=S0, r=R, sigma=SIGMA, T=T, n_simulations=10_001, seed=3)
+        small = sim.calculate_greeks_ladder(STRIKES, chunk_size=17)
+        large = sim.calculate_greeks_ladder(STRIKES, chunk_size=100_000)
+
+        for name in ("price", "delta", "gamma", "vega", "theta", "rho"):
+            np.testing.assert_allclose(small[name], large[name], rtol=1e-10)
+
+    def test_pathwise_method_matches_ladder(self, simulator):
+        greeks = simulator.calculate_greeks(100.0, "call", method="pathwise")
+        ladder = simulator.calculate_greeks_ladder([100.0], "call")
+
+        assert greeks["delta"] == pytest.approx(ladder["delta"][0])
+        assert greeks["vega"] == pytest.approx(ladder["vega"][0])
+
+    def test_invalid_arguments(self, simulator):
+        with pytest.raises(ValueError):
+            simulator.calculate_greeks_ladder(STRIKES, "straddle")
+        with pytest.raises(ValueError):
+            simulator.calculate_greeks_ladder(STRIKES, chunk_size=0)
+        with pytest.raises(ValueError):
+            simulator.calculate_greeks(100.0, method="bumpless")
+
+
+class TestJumpDiffusionPaths:
+    """Array-based Merton jump-diffusion generator."""
+
+    params = dict(S0=S0, r=R, sigma=SIGMA, T=1.0, n_steps=50, lambda_jump=3.0)
+
+    def test_identical_across_block_sizes(self):
+        full = PathGenerator.geometric_brownian_motion_with_jumps(
+            n_paths=1_001, seed=42, **self.params
+        )
+        for block_size in (1, 97, 512, 5_000):
+            blocks = list(
+                PathGenerator.jump_diffusion_blocks(
+                    n_paths=1_001, seed=42, block_size=block_size, **self.params
+                )
+            )
+            assert all(block.shape[1] <= block_size for block in blocks)
+            np.testing.assert_array_equal(np.concatenate(blocks, axis=1), full)
+
+    def test_antithetic_pairs_mirror_shocks(self):
+        params = {**self.params, "lambda_jump": 0.0}
+        paths = PathGenerator.geometric_brownian_motion_with_jumps(n_paths=10, seed=1, **params)
+        drift = (R - 0.5 * SIGMA**2) * params["T"] / params["n_steps"]
+        increments = np.diff(np.log(paths), axis=0) - drift
+
+        assert paths.shape == (51, 10)
+        np.testing.assert_allclose(paths[0], S0)
+        np.testing.assert_allclose(increments[:, 0::2], -increments[:, 1::2], atol=1e-12)
+
+    def test_log_return_moments(self):
+        jump_mean, jump_std = -0.1, 0.2
+        paths = PathGenerator.geometric_brownian_motion_with_jumps(
+            n_paths=40_000, seed=7, jump_mean=jump_mean, jump_std=jump_std, **self.params
+        )
+        log_returns = np.log(paths[-1] / S0)
+        lam = self.params["lambda_jump"]
+
+        expected_mean = R - 0.5 * SIGMA**2 + lam * jump_mean
+        expected_var = SIGMA**2 + lam * (jump_mean**2 + jump_std**2)
+        assert log_returns.mean() == pytest.approx(expected_mean, abs=0.01)
+        assert log_returns.var() == pytest.approx(expected_var, rel=0.05)
+
+    def test_compensated_drift_is_martingale(self):
+        paths = PathGenerator.geometric_brownian_motion_with_jumps(
+            n_paths=40_000, seed=3, compensated=True, **self.params
+        )
+        assert np.exp(-R) * paths[-1].mean() == pytest.approx(S0, rel=0.01)
@@ -0,0 +1,91 @@
+"""Tests for batched OHLC fetches and the job-level prefetch in SupabaseDatabase."""
+
+import pandas as pd
+import pytest
+
+from src.data import supabase_db
+from src.data.supabase_db import SupabaseDatabase
+from src.data.symbol_registry import SymbolRegistry
+
+END = pd.Timestamp("2024-06-01", tz="UTC")
+
+
+@pytest.fixture
+def database(make_ohlc_rows, fake_supabase_client):
+    rows = (
+        make_ohlc_rows("id-aapl", "alpaca", "2023-01-01", 500)
+        + make_ohlc_rows("id-aapl", "yfinance", "2023-01-01", 500)
+        + make_ohlc_rows("id-msft", "polygon", "2023-01-01", 500)
+        + make_ohlc_rows("id-spy", "legacy", "2023-06-01", 300)
+        + make_ohlc_rows("id-new", "alpaca", "2024-05-20", 5)
+        + make_ohlc_rows("id-aapl", "alpaca", "2024-05-01", 400, freq="h", timeframe="h1")
+    )
+    db = SupabaseDatabase()
+    db.client = fake_supabase_client(rows)
+    db.symbol_registry = SymbolRegistry(ttl_seconds=60)
+    return db
+
+
+def test_batch_matches_single_symbol_fetch(database, monkeypatch):
+    # Small pages and symbol chunks exercise pagination and concurrent chunks
+    monkeypatch.setattr(supabase_db, "SUPABASE_MAX_ROWS", 70)
+    monkeypatch.setattr(supabase_db, "OHLC_BATCH_SYMBOLS", 2)
+    symbols = ["AAPL", "msft", "SPY", "NEW", "NOPE"]
+
+    batch = database.fetch_ohlc_bars_batch(
+        symbols, timeframes=["d1", "h1"], limit={"d1": 100, "h1": 50}, end_ts=END
+    )
+
+    assert set(batch) == {"AAPL", "MSFT", "SPY", "NEW", "NOPE"}
+    for symbol in ("AAPL", "MSFT", "SPY", "NEW"):
+        for timeframe, limit in (("d1", 100), ("h1", 50)):
+            expected = database.fetch_ohlc_bars(symbol, timeframe, limit=limit, end_ts=END)
+            got = batch[symbol][timeframe]
+            pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+            assert got.attrs.get("provider") == expected.attrs.get("provider")
+
+    assert batch["AAPL"]["d1"].attrs["provider"] == "alpaca"
+    assert batch["MSFT"]["d1"].attrs["provider"] == "polygon"
+    assert batch["SPY"]["d1"].attrs["provider"] == "any"
+    assert batch["MSFT"]["h1"].attrs["skip_reason"] == "0 bars returned"
+    assert batch["NOPE"]["d1"].attrs["skip_reason"] == "symbol not in symbols table"
+
+
+def test_batch_uses_few_queries(database):
+    database.fetch_ohlc_bars_batch(["AAPL", "MSFT", "SPY"], limit=100, end_ts=END)
+
+    queries = database.client.bar_queries()
+    assert len(queries) == 1
+    assert ("symbol_id", "in", ("id-aapl", "id-msft", "id-spy")) in queries[0]
+    # Ts window sized from the limit rather than scanning the full history
+    assert any(op == "gte" for _, op, _ in queries[0])
+
+
+def test_short_window_falls_back_to_single_fetch(database):
+    batch = database.fetch_ohlc_bars_batch(["NEW", "AAPL"], limit=100, end_ts=END)
+
+    assert len(batch["NEW"]["d1"]) == 5
+    assert len(batch["AAPL"]["d1"]) == 100
+    per_symbol = [q for q in database.client.bar_queries() if ("symbol_id", "eq", "id-new") in q]
+    assert per_symbol
+
+
+def test_prefetch_serves_matching_fetches(database):
+    assert database.prefetch_ohlc_bars(["AAPL", "MSFT"], ["d1"], limit={"d1": 100}, end_ts=END)
+    database.client.calls.clear()
+
+    smaller = database.fetch_ohlc_bars("aapl", "d1", limit=60, end_ts=END)
+    assert len(smaller) == 60 and smaller.attrs["provider"] == "alpaca"
+    assert smaller["ts"].iloc[-1] == pd.Timestamp("2024-05-14")
+    assert database.client.bar_queries() == []
+
+    # Larger limit, other cutoff or provider override go to the database
+    database.fetch_ohlc_bars("AAPL", "d1", limit=200, end_ts=END)
+    database.fetch_ohlc_bars("AAPL", "d1", limit=60)
+    database.fetch_ohlc_bars("AAPL", "d1", limit=60, end_ts=END, providers=["yfinance"])
+    assert len(database.client.bar_queries()) == 3
+
+    database.clear_ohlc_prefetch()
+    database.client.calls.clear()
+    database.fetch_ohlc_bars("AAPL", "d1", limit=60, end_ts=END)
+    assert database.client.bar_queries()
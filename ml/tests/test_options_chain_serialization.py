@@ -0,0 +1,257 @@
+"""Parity tests for the column-wise options chain serialization in api/routers/options.py."""
+
+import asyncio
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.routers import options
+from api.routers.options import _json_safe_float, _parse_expiration_to_unix, _parse_occ_symbol
+
+
+def legacy_row_to_contract(row, underlying):
+    """Per-row conversion the chain endpoint used before the column-wise path."""
+    bid = _json_safe_float(row.get("bid"))
+    ask = _json_safe_float(row.get("ask"))
+    last = _json_safe_float(row.get("last"))
+    mark = _json_safe_float((bid + ask) / 2) if bid is not None and ask is not None else None
+    if mark is None and last is not None:
+        mark = last
+    try:
+        volume = int(row.get("volume") or 0)
+    except (TypeError, ValueError):
+        volume = 0
+    try:
+        oi = int(row.get("open_interest") or 0)
+    except (TypeError, ValueError):
+        oi = 0
+    opt_type = str(row.get("option_type", "call")).lower()
+    contract = {
+        "symbol": str(row.get("symbol", "")),
+        "underlying": underlying,
+        "strike": _json_safe_float(row.get("strike", 0)) or 0.0,
+        "expiration": _parse_expiration_to_unix(str(row.get("expiration_date", ""))),
+        "type": "call" if opt_type == "call" else "put",
+        "bid": bid,
+        "ask": ask,
+        "last": last,
+        "mark": mark,
+        "volume": volume,
+        "openInterest": oi,
+    }
+    for name in ("delta", "gamma", "theta", "vega", "rho"):
+        contract[name] = _json_safe_float(row.get(f"greek_{name}") or row.get(name))
+    contract["impliedVolatility"] = _json_safe_float(
+        row.get("greek_mid_iv") or row.get("iv") or row.get("implied_volatility")
+    )
+    contract.update(lastTradeTime=None, changePercent=None, change=None)
+    return contract
+
+
+def legacy_row_to_quote(row, sym, now_iso):
+    bid = _json_safe_float(row.get("bid"))
+    ask = _json_safe_float(row.get("ask"))
+    last = _json_safe_float(row.get("last"))
+    mark = _json_safe_float((bid + ask) / 2) if bid is not None and ask is not None else None
+    if mark is None and last is not None:
+        mark = last
+    try:
+        oi = int(row.get("open_interest") or 0)
+    except (TypeError, ValueError):
+        oi = None
+    try:
+        vol = int(row.get("volume") or 0)
+    except (TypeError, ValueError):
+        vol = None
+    quote = {
+        "contract_symbol": sym,
+        "bid": bid,
+        "ask": ask,
+        "mark": mark,
+        "last": last,
+        "volume": vol,
+        "open_interest": oi,
+        "implied_vol": _json_safe_float(row.get("greek_mid_iv") or row.get("iv")),
+    }
+    for name in ("delta", "gamma", "theta", "vega", "rho"):
+        quote[name] = _json_safe_float(row.get(f"greek_{name}") or row.get(name))
+    quote["updated_at"] = now_iso
+    return quote
+
+
+def legacy_chain(chain_df, underlying):
+    calls, puts, expirations = [], [], set()
+    for _, row in chain_df.iterrows():
+        contract = legacy_row_to_contract(row, underlying)
+        if str(row.get("expiration_date", "")):
+            expirations.add(contract["expiration"])
+        (calls if contract["type"] == "call" else puts).append(contract)
+    return sorted(expirations), calls, puts
+
+
+@pytest.fixture
+def chain_df():
+    nan, inf = float("nan"), float("inf")
+    return pd.DataFrame(
+        {
+            "symbol": [
+                "AAPL  300118C00100000",
+                "AAPL  300118P00100000",
+                "AAPL  300215C00105500",
+                "AAPL  300215P00105500",
+                "AAPL  300215C00110000",
+            ],
+            "expiration_date": ["2030-01-18", "2030-01-18", "2030-02-15", "2030-02-15", "bad"],
+            "strike": [100.0, 100.0, 105.5, nan, 110.0],
+            "option_type": ["call", "PUT", "Call", "put", "call"],
+            "bid": [1.0, nan, 2.0, inf, 0.0],
+            "ask": [1.5, 1.1, nan, 3.0, 0.0],
+            "last": [1.2, 1.05, 2.1, nan, nan],
+            "volume": [10, nan, 0, 7.9, 3],
+            "open_interest": [100, 50, nan, 0, 1],
+            "greek_delta": [0.55, 0.0, nan, -0.4, 0.1],
+            "delta": [0.5, -0.45, 0.3, nan, None],
+            "greek_gamma": [0.02, 0.03, 0.01, 0.0, 0.0],
+            "greek_mid_iv": [0.0, 0.25, nan, 0.3, 0.0],
+            "iv": [0.21, 0.0, 0.22, nan, 0.0],
+        }
+    )
+
+
+def _assert_records_equal(actual, expected):
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert list(got) == list(want)
+        for key in want:
+            if isinstance(want[key], float) and math.isnan(want[key]):
+                assert math.isnan(got[key]), key
+            else:
+                assert got[key] == want[key] and type(got[key]) is type(want[key]), key
+
+
+def test_tradier_chain_columns_match_row_conversion(chain_df):
+    expirations, calls, puts = options._tradier_chain_columns(chain_df, "AAPL")
+    want_exp, want_calls, want_puts = legacy_chain(chain_df, "AAPL")
+
+    assert expirations == want_exp and expirations[0] == 0  # "bad" parses to 0, as before
+    _assert_records_equal(options._rows_from_columns(calls), want_calls)
+    _assert_records_equal(options._rows_from_columns(puts), want_puts)
+
+
+def test_missing_and_string_columns_match_row_conversion():
+    df = pd.DataFrame(
+        {
+            "symbol": ["X1", "X2", "X3"],
+            "volume": ["12", "", "junk"],
+            "open_interest": [None, "4", "5.5"],
+            "implied_volatility": [0.4, None, 0.0],
+        }
+    )
+    _, calls, puts = options._tradier_chain_columns(df, "X")
+    _, want_calls, want_puts = legacy_chain(df, "X")
+    assert puts == {name: [] for name in options.CONTRACT_FIELDS}
+    _assert_records_equal(options._rows_from_columns(calls), want_calls)
+
+
+def test_chain_quotes_match_row_conversion(chain_df):
+    chain_df = chain_df.assign(volume=[10, "n/a", 0, 7.9, None])
+    wanted = {"AAPL  300118P00100000", "AAPL  300215C00105500", "AAPL  300215C00110000"}
+    quotes = options._chain_df_to_quotes(chain_df, wanted, "now")
+
+    expected = [
+        legacy_row_to_quote(row, row["symbol"], "now")
+        for _, row in chain_df.iterrows()
+        if row["symbol"] in wanted
+    ]
+    _assert_records_equal(quotes, expected)
+
+
+def test_occ_parsing_matches_scalar_parser():
+    symbols = pd.Series(
+        [
+            "AAPL  300118C00100000",
+            "SPY   991231P00450500",
+            "BRKB  250230C00100000",  # invalid date
+            "SHORT",
+            " MSFT  260320c00012345 ",
+            "TSLA  26x320C00012345",
+            None,
+        ]
+    )
+    parsed = options._parse_occ_symbols(symbols)
+    for symbol, (_, row) in zip(symbols, parsed.iterrows()):
+        expected = _parse_occ_symbol(symbol)
+        assert row["valid"] == (expected is not None), symbol
+        if expected:
+            assert row["underlying"] == expected["underlying"]
+            assert row["expiration"] == expected["expiration"]
+            assert row["type"] == expected["type"]
+            assert row["strike"] == expected["strike"]
+
+
+def test_alpaca_chain_is_sorted_and_sanitized():
+    data = {
+        "snapshots": {
+            "AAPL  300118C00110000": {
+                "latestQuote": {"bp": 1.0, "ap": 1.4},
+                "latestTrade": {"p": 1.2, "t": "2030-01-02T15:04:05.123Z"},
+                "dailyBar": {"v": 30},
+                "openInterest": 7,
+                "greeks": {"delta": 0.4},
+                "impliedVolatility": float("nan"),
+            },
+            "AAPL  300118C00100000": {"latestTrade": {"p": 2.0}},
+            "AAPL  300118P00100000": {"latestQuote": {"bp": 0.5}, "greeks": None},
+            "MSFT  300118C00100000": {},
+        }
+    }
+    expirations, calls, puts = options._parse_alpaca_options_chain("AAPL", data)
+
+    assert expirations == [_parse_expiration_to_unix("2030-01-18")]
+    assert calls["strike"] == [100.0, 110.0]
+    assert calls["mark"] == [2.0, 1.2] and calls["volume"] == [0, 30]
+    assert calls["impliedVolatility"] == [None, None]
+    assert calls["lastTradeTime"] == [None, 1893596645]
+    assert puts["bid"] == [0.5] and puts["mark"] == [None] and puts["delta"] == [None]
+
+
+class _Tradier:
+    def __init__(self, chain):
+        self.chain = chain
+
+    def get_options_chain(self, symbol, expiration, greeks=True):
+        return self.chain
+
+
+def test_chain_endpoint_formats(chain_df, monkeypatch):
+    monkeypatch.setenv("ENABLE_OPTIONS_CACHE", "false")
+    monkeypatch.setattr(options, "_redis_client", None)
+    monkeypatch.setattr(options, "_alpaca_configured", lambda: False)
+    monkeypatch.setattr(options, "_get_tradier", lambda: _Tradier(chain_df))
+
+    def fetch(fmt):
+        response = asyncio.run(
+            options.get_options_chain(underlying="aapl", expiration=1894060800, response_format=fmt)
+        )
+        assert response.media_type == "application/json"
+        return json.loads(response.body)
+
+    rows, columnar = fetch("rows"), fetch("columnar")
+    assert "format" not in rows and columnar["format"] == "columnar"
+    assert columnar["calls"]["symbol"] == [c["symbol"] for c in rows["calls"]]
+    assert [dict(zip(columnar["puts"], v)) for v in zip(*columnar["puts"].values())] == rows["puts"]
+    assert rows["puts"][1]["bid"] is None and rows["puts"][1]["strike"] == 0.0
+
+    with pytest.raises(options.HTTPException) as err:
+        fetch("csv")
+    assert err.value.status_code == 400
+
+
+def test_dump_json_without_orjson(monkeypatch):
+    payload = {"a": [1, None, 2.5], "b": "x"}
+    monkeypatch.setattr(options, "orjson", None)
+    assert json.loads(options._dump_json(payload)) == payload
+    assert np.isnan(options._float_array(pd.Series(["inf", None, "1"])))[:2].all()
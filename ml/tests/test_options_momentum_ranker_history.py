@@ -0,0 +1,304 @@
+"""Parity tests for keyed history matching in OptionsMomentumRanker.
+
+``LegacyRanker`` keeps the original per-row lookups as the reference.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.options_momentum_ranker import OptionsMomentumRanker, RankingMode
+
+
+class LegacyRanker(OptionsMomentumRanker):
+    def _apply_temporal_smoothing(
+        self,
+        current: pd.DataFrame,
+        previous: pd.DataFrame,
+    ) -> pd.DataFrame:
+        alpha = 2 / (self.MOMENTUM_SMOOTHING_WINDOW + 1)  # ~0.5 for 3-day
+
+        for idx, row in current.iterrows():
+            expiration = row.get("expiration", "")
+            contract_id = row.get("contract_symbol", f"{row['strike']}_{row['side']}_{expiration}")
+
+            if "contract_symbol" in previous.columns:
+                prev_match = previous[previous["contract_symbol"] == contract_id]
+            else:
+                if "expiration" in previous.columns and expiration:
+                    prev_match = previous[
+                        (previous["strike"] == row["strike"])
+                        & (previous["side"] == row["side"])
+                        & (previous["expiration"] == expiration)
+                    ]
+                else:
+                    prev_match = previous[
+                        (previous["strike"] == row["strike"]) & (previous["side"] == row["side"])
+                    ]
+
+            if len(prev_match) > 0:
+                prev_momentum = prev_match.iloc[0].get("momentum_score", row["momentum_score"])
+
+                smoothed = alpha * row["momentum_score"] + (1 - alpha) * prev_momentum
+
+                if abs(smoothed - prev_momentum) > self.MOMENTUM_MAX_DAILY_CHANGE:
+                    smoothed = prev_momentum + (
+                        np.sign(smoothed - prev_momentum) * self.MOMENTUM_MAX_DAILY_CHANGE
+                    )
+                current.at[idx, "momentum_score"] = np.clip(smoothed, 0, 100)
+
+                mode = str(row.get("ranking_mode", "entry") or "entry").lower()
+                if mode == "exit":
+                    weights = self.EXIT_MODE_WEIGHTS
+                    composite = (
+                        row.get("profit_protection_score", 0) * weights["profit_protection"]
+                        + row.get("deterioration_score", 0) * weights["deterioration"]
+                        + row.get("time_urgency_score", 0) * weights["time_urgency"]
+                    )
+                elif mode == "entry":
+                    weights = self.ENTRY_MODE_WEIGHTS
+                    composite = (
+                        row.get("entry_value_score", 0) * weights["value"]
+                        + row.get("catalyst_score", 0) * weights["catalyst"]
+                        + row.get("greeks_score", 0) * weights["greeks"]
+                    )
+                else:
+                    composite = (
+                        smoothed * self.MOMENTUM_WEIGHT
+                        + row["value_score"] * self.VALUE_WEIGHT
+                        + row["greeks_score"] * self.GREEKS_WEIGHT
+                    )
+
+                if mode == "entry":
+                    entry_diff = row.get("entry_difficulty_score", 50.0)
+                    rel_val = row.get("relative_value_score", 50.0)
+                    if composite > self.BUY_COMPOSITE_THRESHOLD:
+                        composite = composite * 0.90 + entry_diff * 0.10
+                    composite = composite * 0.90 + rel_val * 0.10
+                elif mode == "exit":
+                    theta_bonus = self._calculate_theta_bonus(current.loc[[idx]]).iloc[0]
+                    composite = composite * 0.90 + theta_bonus * 0.10
+
+                current.at[idx, "composite_rank"] = float(max(0.0, min(100.0, composite)))
+
+        return current
+
+    def _calculate_ranking_stability_score(
+        self,
+        current: pd.DataFrame,
+        previous: Optional[pd.DataFrame],
+    ) -> pd.Series:
+        if previous is None or previous.empty:
+            return pd.Series(np.nan, index=current.index)
+
+        scores = pd.Series(np.nan, index=current.index)
+
+        for idx, row in current.iterrows():
+            expiration = row.get("expiration", "")
+            contract_id = row.get("contract_symbol", f"{row['strike']}_{row['side']}_{expiration}")
+
+            if "contract_symbol" in previous.columns:
+                prev_match = previous[previous["contract_symbol"] == contract_id]
+            else:
+                if "expiration" in previous.columns and expiration:
+                    prev_match = previous[
+                        (previous["strike"] == row["strike"])
+                        & (previous["side"] == row["side"])
+                        & (previous["expiration"] == expiration)
+                    ]
+                else:
+                    prev_match = previous[
+                        (previous["strike"] == row["strike"]) & (previous["side"] == row["side"])
+                    ]
+
+            if len(prev_match) > 0:
+                prev_rank = prev_match.iloc[0].get("composite_rank", np.nan)
+                curr_rank = row.get("composite_rank", np.nan)
+                if np.isfinite(prev_rank) and np.isfinite(curr_rank):
+                    delta = abs(curr_rank - prev_rank)
+                    scores[idx] = max(0.0, min(100.0, 100.0 - (delta * 2.0)))
+
+        return scores
+
+    def _calculate_price_momentum(
+        self,
+        df: pd.DataFrame,
+        history: Optional[pd.DataFrame] = None,
+    ) -> pd.Series:
+        if history is None or history.empty:
+            if "volume" in df.columns:
+                vol_normalized = df["volume"] / (df["volume"].max() + 1)
+                return vol_normalized * 20 - 10  # Range -10% to +10%
+            return pd.Series(0.0, index=df.index)
+
+        momentum = pd.Series(0.0, index=df.index)
+
+        for idx, row in df.iterrows():
+            contract_id = row.get("contract_symbol", f"{row['strike']}_{row['side']}")
+
+            if "contract_symbol" in history.columns:
+                hist_match = history[history["contract_symbol"] == contract_id]
+            else:
+                hist_match = history[
+                    (history["strike"] == row["strike"]) & (history["side"] == row["side"])
+                ]
+
+            if len(hist_match) >= 2:
+                old_price = hist_match.iloc[0].get("last", hist_match.iloc[0].get("mark", 0))
+                new_price = row.get("last", row.get("mark", 0))
+
+                if old_price > 0:
+                    momentum[idx] = ((new_price - old_price) / old_price) * 100
+
+        return momentum
+
+    def _calculate_oi_growth(
+        self,
+        df: pd.DataFrame,
+        history: Optional[pd.DataFrame] = None,
+    ) -> pd.Series:
+        if history is None or history.empty:
+            return pd.Series(0.0, index=df.index)
+
+        growth = pd.Series(0.0, index=df.index)
+
+        for idx, row in df.iterrows():
+            contract_id = row.get("contract_symbol", f"{row['strike']}_{row['side']}")
+
+            if "contract_symbol" in history.columns:
+                hist_match = history[history["contract_symbol"] == contract_id]
+            else:
+                hist_match = history[
+                    (history["strike"] == row["strike"]) & (history["side"] == row["side"])
+                ]
+
+            if len(hist_match) >= 1:
+                old_oi = hist_match.iloc[0].get("open_interest", 0)
+                new_oi = row.get("open_interest", 0)
+
+                if old_oi > 0:
+                    growth[idx] = ((new_oi - old_oi) / old_oi) * 100
+
+        return growth
+
+
+def make_chain(seed: int, n_strikes: int = 12) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = []
+    for expiration in ("2024-03-15", "2024-04-19"):
+        for strike in np.linspace(90, 110, n_strikes):
+            for side in ("call", "put"):
+                mark = float(rng.uniform(0.5, 8.0))
+                rows.append(
+                    {
+                        "contract_symbol": f"X{expiration[5:7]}{side[0]}{strike:.2f}",
+                        "strike": strike,
+                        "expiration": expiration,
+                        "side": side,
+                        "bid": mark * 0.97,
+                        "ask": mark * 1.03,
+                        "mark": mark,
+                        "last": mark * rng.uniform(0.95, 1.05),
+                        "volume": int(rng.integers(0, 2_000)),
+                        "open_interest": int(rng.integers(0, 5_000)),
+                        "iv": rng.uniform(0.15, 0.6),
+                        "delta": rng.uniform(-0.9, 0.9),
+                        "gamma": rng.uniform(0.0, 0.08),
+                        "theta": -rng.uniform(0.0, 0.3),
+                        "vega": rng.uniform(0.0, 0.3),
+                        "rho": rng.uniform(-0.05, 0.05),
+                    }
+                )
+    return pd.DataFrame(rows)
+
+
+def make_history(chain: pd.DataFrame, seed: int, days: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    snapshots = []
+    for _ in range(days):
+        day = chain.sample(frac=0.8, random_state=int(rng.integers(1_000))).copy()
+        day["last"] *= rng.uniform(0.7, 1.3, len(day))
+        day["mark"] *= rng.uniform(0.7, 1.3, len(day))
+        day["open_interest"] = (day["open_interest"] * rng.uniform(0.5, 1.5, len(day))).round()
+        snapshots.append(day)
+    history = pd.concat(snapshots, ignore_index=True)
+    history.loc[history.sample(frac=0.05, random_state=seed).index, "last"] = np.nan
+    history.loc[history.sample(frac=0.05, random_state=seed + 1).index, "open_interest"] = 0
+    return history
+
+
+def _variants(seed: int):
+    chain = make_chain(seed)
+    history = make_history(chain, seed)
+    previous = LegacyRanker().rank_options(
+        make_chain(seed + 100), mode=RankingMode.MONITOR, options_history=history
+    )
+
+    nan_expiry = chain.copy()
+    nan_expiry.loc[::7, "expiration"] = np.nan
+    synthetic = history.copy()
+    synthetic["contract_symbol"] = (
+        synthetic["strike"].astype(str) + "_" + synthetic["side"] + "_" + synthetic["expiration"]
+    )
+
+    return {
+        "by_symbol": (chain, history, previous),
+        "by_strike_side": (
+            chain,
+            history.drop(columns=["contract_symbol"]),
+            previous.drop(columns=["contract_symbol"]),
+        ),
+        "missing_expiration": (
+            nan_expiry,
+            history.drop(columns=["contract_symbol"]),
+            previous.drop(columns=["contract_symbol", "expiration"]),
+        ),
+        "nan_expiration": (
+            nan_expiry,
+            history.drop(columns=["contract_symbol"]),
+            previous.drop(columns=["contract_symbol"]),
+        ),
+        "synthetic_ids": (
+            chain.drop(columns=["contract_symbol"]),
+            synthetic.drop(columns=["last"]),
+            previous.assign(contract_symbol=synthetic["contract_symbol"].iloc[: len(previous)]),
+        ),
+    }
+
+
+@pytest.mark.parametrize("mode", list(RankingMode))
+@pytest.mark.parametrize(
+    "variant",
+    ["by_symbol", "by_strike_side", "missing_expiration", "nan_expiration", "synthetic_ids"],
+)
+@pytest.mark.parametrize("seed", range(3))
+def test_rank_options_matches_legacy(mode, variant, seed):
+    chain, history, previous = _variants(seed)[variant]
+    if mode is not RankingMode.MONITOR and "contract_symbol" not in history.columns:
+        # Entry/exit history features group by contract_symbol
+        history = None
+
+    def rank(ranker):
+        return ranker.rank_options(
+            chain.copy(), mode=mode, options_history=history, previous_rankings=previous
+        )
+
+    pd.testing.assert_frame_equal(rank(OptionsMomentumRanker()), rank(LegacyRanker()))
+
+
+def test_history_scores_match_legacy_per_method():
+    chain, history, _ = _variants(0)["by_symbol"]
+    history = pd.concat([history, history.iloc[:3].assign(contract_symbol=None)])
+    chain = chain.assign(strike=chain["strike"].round().astype(int))
+    ranker, legacy = OptionsMomentumRanker(), LegacyRanker()
+
+    pd.testing.assert_series_equal(
+        ranker._calculate_price_momentum(chain, history),
+        legacy._calculate_price_momentum(chain, history),
+    )
+    pd.testing.assert_series_equal(
+        ranker._calculate_oi_growth(chain, history.drop(columns=["contract_symbol"])),
+        legacy._calculate_oi_growth(chain, history.drop(columns=["contract_symbol"])),
+    )
@@ -12,6 +12,11 @@ import numpy as np
 import pytest
 
 from src.models.options_pricing import (
+    IV_STATUS_BRACKETED,
+    IV_STATUS_EXPIRED,
+    IV_STATUS_INVALID,
+    IV_STATUS_NEWTON,
+    IV_STATUS_NOT_CONVERGED,
     BlackScholesModel,
     OptionsPricing,
     get_current_risk_free_rate,
@@ -313,6 +318,115 @@ class TestBlackScholesModel:
         assert "Rho:" in str_repr
 
 
+class TestBatchAPI:
+    """Vectorized pricing, Greeks and implied volatility for whole chains."""
+
+    @pytest.fixture
+    def bs_model(self):
+        return BlackScholesModel(risk_free_rate=0.05)
+
+    @pytest.fixture
+    def chain(self):
+        rng = np.random.default_rng(7)
+        n = 200
+        return {
+            "K": rng.uniform(60, 140, n),
+            "T": rng.choice([7 / 365, 30 / 365, 0.25, 1.0], n),
+            "sigma": rng.uniform(0.1, 1.2, n),
+            "type": np.where(rng.random(n) < 0.5, "call", "put"),
+        }
+
+    def test_greeks_batch_matches_scalar(self, bs_model, chain):
+        batch = bs_model.calculate_greeks_batch(
+            S=100, K=chain["K"], T=chain["T"], sigma=chain["sigma"], option_type=chain["type"]
+        )
+        for i in range(len(chain["K"])):
+            scalar = bs_model.calculate_greeks(
+                100, chain["K"][i], chain["T"][i], chain["sigma"][i], chain["type"][i]
+            )
+            for field in ("theoretical_price", "delta", "gamma", "theta", "vega", "rho"):
+                assert getattr(batch, field)[i] == pytest.approx(getattr(scalar, field), abs=1e-10)
+
+    def test_batch_expired_matches_scalar(self, bs_model):
+        K = np.array([90.0, 110.0, 90.0, 110.0])
+        types = ["call", "call", "put", "put"]
+        batch = bs_model.calculate_greeks_batch(S=100, K=K, T=0.0, sigma=0.2, option_type=types)
+        prices = bs_model.price_batch(S=100, K=K, T=0.0, sigma=0.2, option_type=types)
+
+        np.testing.assert_array_equal(batch.theoretical_price, [10.0, 0.0, 0.0, 10.0])
+        np.testing.assert_array_equal(batch.delta, [1.0, 0.0, 0.0, -1.0])
+        np.testing.assert_array_equal(prices, batch.theoretical_price)
+
+    def test_implied_volatility_batch_recovers_sigma(self, bs_model, chain):
+        greeks = bs_model.calculate_greeks_batch(
+            S=100, K=chain["K"], T=chain["T"], sigma=chain["sigma"], option_type=chain["type"]
+        )
+        prices = greeks.theoretical_price
+        # IV is only identifiable where the price actually responds to volatility
+        solvable = greeks.vega > 1e-3
+        result = bs_model.calculate_implied_volatility_batch(
+            prices[solvable],
+            S=100,
+            K=chain["K"][solvable],
+            T=chain["T"][solvable],
+            option_type=chain["type"][solvable],
+            tolerance=1e-8,
+        )
+
+        assert result.converged.all()
+        np.testing.assert_allclose(result.implied_vol, chain["sigma"][solvable], atol=1e-4)
+
+    def test_implied_volatility_batch_matches_scalar(self, bs_model):
+        K = np.array([90.0, 100.0, 110.0])
+        prices = bs_model.price_batch(S=100, K=K, T=0.5, sigma=np.array([0.3, 0.25, 0.22]))
+        result = bs_model.calculate_implied_volatility_batch(prices, S=100, K=K, T=0.5)
+
+        for i in range(3):
+            scalar = bs_model.calculate_implied_volatility(prices[i], S=100, K=K[i], T=0.5)
+            assert result.implied_vol[i] == pytest.approx(scalar, abs=1e-12)
+        assert (result.status == IV_STATUS_NEWTON).all()
+
+    def test_implied_volatility_batch_falls_back_to_bracketing(self, bs_model):
+        # Deep OTM short-dated call: vega at the initial guess is ~0, Newton stalls
+        price = bs_model.price_call(S=100, K=200, T=0.05, sigma=2.5)
+        result = bs_model.calculate_implied_volatility_batch(
+            [price], S=100, K=200, T=0.05, initial_guess=0.1
+        )
+
+        assert result.status[0] == IV_STATUS_BRACKETED
+        assert result.converged[0]
+        assert result.implied_vol[0] == pytest.approx(2.5, abs=1e-4)
+
+    def test_implied_volatility_batch_flags(self, bs_model):
+        result = bs_model.calculate_implied_volatility_batch(
+            market_prices=[10.0, 10.0, -1.0, 150.0, 5.0],
+            S=100,
+            K=[100.0, 100.0, 100.0, 100.0, 150.0],
+            T=[0.5, 0.0, 0.5, 0.5, 0.5],
+            option_type=["call", "call", "call", "call", "put"],
+        )
+
+        # The last put trades below its discounted intrinsic value
+        assert result.status.tolist() == [
+            IV_STATUS_NEWTON,
+            IV_STATUS_EXPIRED,
+            IV_STATUS_INVALID,
+            IV_STATUS_INVALID,
+            IV_STATUS_INVALID,
+        ]
+        assert result.converged.tolist() == [True, False, False, False, False]
+        assert np.isnan(result.implied_vol[1:]).all()
+
+    def test_implied_volatility_batch_unreachable_price(self, bs_model):
+        # At-the-forward call priced below its value at the 1% volatility floor
+        K = 100 * np.exp(0.05)
+        floor_price = bs_model.price_call(S=100, K=K, T=1.0, sigma=0.01)
+        result = bs_model.calculate_implied_volatility_batch([floor_price * 0.5], S=100, K=K, T=1.0)
+
+        assert result.status[0] == IV_STATUS_NOT_CONVERGED
+        assert result.implied_vol[0] == 0.01
+
+
 class TestRiskFreeRate:
     """Test risk-free rate utilities."""
 
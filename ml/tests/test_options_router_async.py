@@ -0,0 +1,118 @@
+"""Tests for non-blocking provider I/O and single-flight in api/routers/options.py."""
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pandas as pd
+import pytest
+
+from api.routers import options
+
+
+class _SlowTradier:
+    """Blocking Tradier stand-in that records call counts and peak concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = {"expirations": 0, "chain": 0}
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get_expirations(self, symbol):
+        with self.lock:
+            self.calls["expirations"] += 1
+        time.sleep(self.delay)
+        return [f"2030-01-{day:02d}" for day in range(1, 10)]
+
+    def get_options_chain(self, symbol, expiration, greeks=True):
+        with self.lock:
+            self.calls["chain"] += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return pd.DataFrame(
+            {
+                "symbol": [f"{symbol}300101C00100000", f"{symbol}300101P00100000"],
+                "expiration_date": expiration,
+                "strike": 100.0,
+                "option_type": ["call", "put"],
+                "bid": 1.0,
+                "ask": 1.2,
+                "last": 1.1,
+                "volume": 10,
+                "open_interest": 100,
+            }
+        )
+
+
+@pytest.fixture
+def tradier(monkeypatch):
+    client = _SlowTradier()
+    monkeypatch.setenv("ENABLE_OPTIONS_CACHE", "false")
+    monkeypatch.setattr(options, "_redis_client", None)
+    monkeypatch.setattr(options, "_alpaca_configured", lambda: False)
+    monkeypatch.setattr(options, "_get_tradier", lambda: client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_chain_requests_share_one_fetch(tradier):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    requests = [
+        options.get_options_chain(underlying="aapl", expiration=None, response_format="rows")
+        for _ in range(10)
+    ]
+    results = await asyncio.gather(*requests)
+    ticking.cancel()
+
+    assert tradier.calls == {"expirations": 1, "chain": 6}
+    assert tradier.peak > 1
+    assert all(r.body == results[0].body for r in results)
+    chain = json.loads(results[0].body)
+    assert len(chain["calls"]) == 6 and len(chain["expirations"]) == 6
+    # The loop kept running while the chains were fetched
+    assert ticks >= 5
+    assert options._single_flight._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_quotes_use_pooled_alpaca_client(tradier, monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"quotes": {"AAPL300101C00100000": {"bp": 1.0, "ap": 1.5}}})
+
+    monkeypatch.setattr(options, "_alpaca_configured", lambda: True)
+    monkeypatch.setattr(options, "_alpaca_headers", lambda: {"Accept": "application/json"})
+    monkeypatch.setattr(
+        options, "_alpaca_http", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    body = options.OptionsQuotesRequest(
+        symbol="AAPL", contracts=["AAPL300101C00100000", "AAPL300101P00100000"]
+    )
+    results = await asyncio.gather(*(options.post_options_quotes(body) for _ in range(4)))
+
+    assert len(requests) == 1
+    result = results[0]
+    assert result["providers_tried"] == ["alpaca", "tradier"]
+    assert result["missing_contracts"] == []
+    quotes = {q["contract_symbol"]: q for q in result["quotes"]}
+    assert quotes["AAPL300101C00100000"]["mark"] == 1.25
+    assert quotes["AAPL300101P00100000"]["bid"] == 1.0
+    await options.close_options_clients()
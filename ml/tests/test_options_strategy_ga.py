@@ -0,0 +1,172 @@
+"""Tests for the options strategy GA (src/options_strategy_ga.py)."""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.options_strategy_ga import (
+    BacktestFrame,
+    OptionsStrategy,
+    OptionsStrategyGA,
+    StrategyGenes,
+)
+
+
+def make_rankings(days: int = 4, contracts: int = 6, seed: int = 0) -> pd.DataFrame:
+    """Synthetic intraday ranking snapshots: one row per contract every 30 minutes."""
+    rng = np.random.default_rng(seed)
+    times = [
+        ts
+        for day in pd.bdate_range("2024-03-04", periods=days)
+        for ts in pd.date_range(day + pd.Timedelta(hours=9, minutes=30), periods=13, freq="30min")
+    ]
+    rows = []
+    marks = rng.uniform(1.0, 6.0, contracts)
+    for ts in times:
+        marks = np.maximum(marks * np.exp(rng.normal(0, 0.08, contracts)), 0.05)
+        for c in range(contracts):
+            rows.append(
+                {
+                    "run_at": ts,
+                    "symbol": "AAPL" if c % 2 else "MSFT",
+                    "contract_symbol": f"C{c}",
+                    "composite_rank": rng.uniform(40, 100),
+                    "momentum_score": rng.uniform(20, 90),
+                    "value_score": rng.uniform(10, 80),
+                    "signal_buy": rng.random() < 0.5,
+                    "signal_discount": rng.random() < 0.3,
+                    "signal_runner": rng.random() < 0.2,
+                    "signal_greeks": rng.random() < 0.3,
+                    "mark": marks[c] if rng.random() > 0.05 else np.nan,
+                    "delta": rng.uniform(-0.9, 0.9),
+                    "gamma": rng.uniform(0.0, 0.09),
+                    "vega": rng.uniform(0.0, 0.3),
+                    "theta": rng.uniform(-0.5, 0.0),
+                    "iv_rank": rng.uniform(5, 95),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def permissive_genes() -> StrategyGenes:
+    genes = StrategyGenes.default()
+    genes.min_composite_rank = 55
+    genes.min_momentum_score = 0.35
+    genes.min_value_score = 0.25
+    genes.signal_filter = "any"
+    genes.entry_hour_min = 9
+    genes.theta_min = -0.45
+    genes.iv_rank_min = 10
+    genes.iv_rank_max = 90
+    genes.max_trades_per_day = 3
+    genes.max_trades_per_symbol = 6
+    return genes
+
+
+@pytest.fixture
+def rankings():
+    return make_rankings()
+
+
+def test_fingerprint_is_stable_and_sensitive():
+    genes = StrategyGenes.default()
+    same = StrategyGenes.from_dict(genes.to_dict())
+    same.max_concurrent_trades = np.int64(same.max_concurrent_trades)
+
+    assert genes.fingerprint() == same.fingerprint()
+    same.stop_loss_pct -= 0.5
+    assert genes.fingerprint() != same.fingerprint()
+
+
+def test_backtest_produces_trades(rankings):
+    fitness = OptionsStrategy(permissive_genes()).backtest(rankings)
+    assert fitness.num_trades > 0
+
+
+def test_evolve_memoizes_unchanged_genomes(rankings, monkeypatch):
+    calls = []
+    original = OptionsStrategy.backtest
+
+    def counting_backtest(self, *args, **kwargs):
+        calls.append(self.genes.fingerprint())
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(OptionsStrategy, "backtest", counting_backtest)
+    random.seed(1)
+    np.random.seed(1)
+    ga = OptionsStrategyGA(population_size=12, generations=4)
+    results = ga.evolve(rankings, verbose=False)
+
+    # Every genome is scored once; only the reported top strategies are re-run for trades
+    n_best = len(results["best_strategies"])
+    assert len(set(calls[:-n_best])) == len(calls) - n_best
+    assert len(ga._fitness_memo) == len(calls) - n_best
+    assert all(s.fitness is not None for s in ga.population)
+
+
+def test_parallel_evolve_matches_serial(rankings):
+    def run(n_jobs):
+        random.seed(7)
+        np.random.seed(7)
+        ga = OptionsStrategyGA(population_size=8, generations=2, n_jobs=n_jobs)
+        return ga.evolve(rankings, verbose=False)
+
+    serial, parallel = run(1), run(2)
+
+    assert serial["fitness_history"] == parallel["fitness_history"]
+    assert serial["best_genes"] == parallel["best_genes"]
+
+
+def _trade_log(strategy):
+    return [
+        (t.contract_symbol, t.entry_date, t.exit_date, t.exit_price, t.exit_reason)
+        for t in strategy.trades
+    ]
+
+
+def _frame_variants():
+    base = make_rankings(days=5, contracts=6, seed=3)
+    tz_aware = base.assign(run_at=base["run_at"].dt.tz_localize("America/New_York"))
+    duplicated = pd.concat([base, base.sample(frac=0.3, random_state=1)])
+    no_contract = base.drop(columns=["contract_symbol", "signal_runner", "mark"])
+    as_strings = base.rename(columns={"run_at": "datetime"}).astype({"datetime": str})
+    return {
+        "base": base,
+        "tz_aware": tz_aware,
+        "duplicated_shuffled": duplicated.sample(frac=1, random_state=2),
+        "no_contract": no_contract,
+        "string_datetime": as_strings,
+    }
+
+
+@pytest.mark.parametrize("variant", sorted(_frame_variants()))
+def test_array_engine_matches_rows(variant):
+    df = _frame_variants()[variant]
+    frame = BacktestFrame(df)
+    np.random.seed(5)
+    random.seed(5)
+    genes_list = [permissive_genes(), StrategyGenes.default()]
+    genes_list += [StrategyGenes.random() for _ in range(25)]
+    genes_list[-1].min_hold_minutes = 0
+
+    assert frame.supported
+    for genes in genes_list:
+        array_strategy, rows_strategy = OptionsStrategy(genes), OptionsStrategy(genes)
+        array_fitness = array_strategy.backtest(frame)
+        rows_fitness = rows_strategy.backtest(df, engine="rows")
+
+        assert array_fitness == rows_fitness
+        assert _trade_log(array_strategy) == _trade_log(rows_strategy)
+
+
+def test_array_engine_falls_back_without_timestamps(rankings):
+    df = rankings.copy()
+    df.loc[0, "run_at"] = pd.NaT
+    genes = permissive_genes()
+
+    assert not BacktestFrame(df).supported
+    assert OptionsStrategy(genes).backtest(df) == OptionsStrategy(genes).backtest(df, engine="rows")
+    with pytest.raises(ValueError):
+        OptionsStrategy(genes).backtest(df, engine="numba")
@@ -467,5 +467,62 @@ class TestPredict:
         assert "atr" in result.columns
 
 
+class TestArrayEngineParity:
+    """The numpy engine must reproduce the pandas reference implementation."""
+
+    @pytest.fixture
+    def sample_data(self):
+        """Generate choppy OHLCV data so every factor sees several flips."""
+        np.random.seed(7)
+        n = 300
+        dates = pd.date_range("2024-01-01", periods=n, freq="h")
+        close = 50 * np.cumprod(1 + np.random.randn(n) * 0.015)
+        high = close * (1 + np.abs(np.random.randn(n)) * 0.008)
+        low = close * (1 - np.abs(np.random.randn(n)) * 0.008)
+
+        return pd.DataFrame(
+            {
+                "ts": dates,
+                "open": close,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": np.random.randint(1000, 5000, n),
+            }
+        )
+
+    def test_invalid_engine(self, sample_data):
+        """Unknown engines are rejected."""
+        with pytest.raises(ValueError):
+            SuperTrendAI(sample_data, engine="numba")
+
+    def test_factor_sweep_matches_reference(self, sample_data):
+        """Every factor's bands, trend and performance match the per-factor loop."""
+        st = SuperTrendAI(sample_data)
+        atr = st.calculate_atr()
+        supertrend, trend, perf = st.evaluate_factors(atr, st.factors)
+
+        for j, factor in enumerate(st.factors):
+            ref_st, ref_trend = st.calculate_supertrend(atr, factor)
+            np.testing.assert_array_equal(supertrend[:, j], ref_st.to_numpy())
+            np.testing.assert_array_equal(trend[:, j], ref_trend.to_numpy())
+            assert perf[j] == st.calculate_performance(ref_st, ref_trend)
+
+    def test_calculate_matches_reference(self, sample_data):
+        """Full calculate() output is identical across engines."""
+        fast_df, fast_info = SuperTrendAI(sample_data, engine="numpy").calculate()
+        ref_df, ref_info = SuperTrendAI(sample_data, engine="pandas").calculate()
+
+        pd.testing.assert_frame_equal(fast_df, ref_df)
+        assert fast_info == ref_info
+
+    def test_predict_matches_reference(self, sample_data):
+        """predict() with a fixed factor is identical across engines."""
+        fast = SuperTrendAI(sample_data, engine="numpy").predict(sample_data, 2.5)
+        ref = SuperTrendAI(sample_data, engine="pandas").predict(sample_data, 2.5)
+
+        pd.testing.assert_frame_equal(fast, ref)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
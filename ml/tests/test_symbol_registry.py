@@ -0,0 +1,114 @@
+"""Tests for the shared symbol-id registry and SupabaseDatabase lookups that use it."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.data import symbol_registry as registry_module
+from src.data.supabase_db import SupabaseDatabase
+from src.data.symbol_registry import SymbolRegistry
+
+SYMBOLS = {"AAPL": "id-aapl", "MSFT": "id-msft", "SPY": "id-spy"}
+
+
+class _FakeQuery:
+    def __init__(self, client):
+        self.client = client
+        self.filters = {}
+        self.single_row = False
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = [value]
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = list(values)
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def execute(self):
+        self.client.calls.append(dict(self.filters))
+        rows = [{"id": SYMBOLS[t], "ticker": t} for t in self.filters["ticker"] if t in SYMBOLS]
+        if self.single_row:
+            if len(rows) != 1:
+                raise RuntimeError(
+                    "PGRST116: JSON object requested, multiple (or no) rows returned"
+                )
+            return SimpleNamespace(data=rows[0])
+        return SimpleNamespace(data=rows)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def table(self, name):
+        assert name == "symbols"
+        return _FakeQuery(self)
+
+
+@pytest.fixture
+def database():
+    registry = SymbolRegistry(ttl_seconds=60)
+    db = SupabaseDatabase()
+    db.client = _FakeClient()
+    db.symbol_registry = registry
+    return db
+
+
+def test_registry_ttl_and_invalidation(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(registry_module.time, "monotonic", lambda: now[0])
+    registry = SymbolRegistry(ttl_seconds=10)
+    registry.update({"aapl ": "id-aapl", "MSFT": "id-msft"})
+
+    assert registry.get("AAPL") == "id-aapl"
+    registry.invalidate(["msft"])
+    assert registry.get("MSFT") is None
+
+    now[0] += 10
+    assert registry.get("AAPL") is None
+    assert len(registry) == 0
+
+
+def test_get_symbol_id_hits_table_once(database):
+    assert database.get_symbol_id("aapl") == "id-aapl"
+    assert database.get_symbol_id("AAPL") == "id-aapl"
+    assert len(database.client.calls) == 1
+
+    database.invalidate_symbol_ids(["AAPL"])
+    database.get_symbol_id("AAPL")
+    assert len(database.client.calls) == 2
+
+
+def test_unknown_symbol_is_not_cached(database):
+    with pytest.raises(RuntimeError):
+        database.get_symbol_id("NOPE")
+    with pytest.raises(RuntimeError):
+        database.get_symbol_id("NOPE")
+    assert len(database.client.calls) == 2
+
+
+def test_prefetch_resolves_in_bulk(database):
+    resolved = database.prefetch_symbol_ids(["aapl", "MSFT", "NOPE", "AAPL"])
+
+    assert resolved == {"AAPL": "id-aapl", "MSFT": "id-msft"}
+    assert database.client.calls == [{"ticker": ["AAPL", "MSFT", "NOPE"]}]
+
+    # Cached tickers are not requested again; lookups are served locally
+    database.prefetch_symbol_ids(["AAPL", "SPY"])
+    assert database.client.calls[-1] == {"ticker": ["SPY"]}
+    assert database.get_symbol_id("MSFT") == "id-msft"
+    assert len(database.client.calls) == 2
+
+
+def test_fetch_ohlc_bars_soft_fails_for_unknown_symbol(database):
+    out = database.fetch_ohlc_bars("NOPE")
+    assert out.empty
+    assert out.attrs["skip_reason"] == "symbol not in symbols table"
@@ -0,0 +1,157 @@
+"""Tests for the rate-limited concurrent scheduler in src/data/tradier_client.py."""
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.data.tradier_client import TokenBucket, TradierClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_bursts_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=3, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Refill is one token per second at 60/min
+    assert bucket.acquire() == pytest.approx(1.0)
+    clock.now += 10
+    assert bucket.acquire() == 0.0
+
+
+def test_token_bucket_follows_provider_headers():
+    clock = FakeClock()
+    bucket = TokenBucket(120, clock=clock, sleep=clock.sleep)
+
+    bucket.sync(available=0, resume_in=5.0)
+    assert bucket.acquire() == pytest.approx(5.0)
+    bucket.sync(available=1)
+    bucket.acquire()
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+class FakeTradier:
+    """MockTransport handler serving expirations, chains and quotes with latency."""
+
+    def __init__(self, delay=0.05, rate_limited=0, unquoted=()):
+        self.delay = delay
+        self.rate_limited = rate_limited
+        self.unquoted = set(unquoted)
+        self.paths = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        with self.lock:
+            self.paths.append(request.url.path)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            limited = self.rate_limited > 0
+            self.rate_limited -= limited
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        headers = {"X-Ratelimit-Allowed": "120", "X-Ratelimit-Available": "100"}
+        if limited:
+            expiry = int((time.time() + 0.05) * 1000)
+            headers.update({"X-Ratelimit-Available": "0", "X-Ratelimit-Expiry": str(expiry)})
+            return httpx.Response(429, headers=headers, text="Quota exceeded")
+
+        params = request.url.params
+        if request.url.path.endswith("/expirations"):
+            body = {"expirations": {"date": ["2030-01-18", "2030-02-15", "2030-03-15"]}}
+        elif request.url.path.endswith("/chains"):
+            option = {
+                "symbol": f"{params['symbol']}-{params['expiration']}",
+                "strike": 100.0,
+                "option_type": "call",
+                "greeks": {"delta": 0.5, "mid_iv": 0.2},
+            }
+            body = {"options": {"option": [option]}}
+        else:
+            requested = params["symbols"].split(",")
+            quotes = [{"symbol": s, "last": 10.0} for s in requested if s not in self.unquoted]
+            body = {"quotes": {"quote": quotes[0] if len(quotes) == 1 else quotes}}
+        return httpx.Response(200, headers=headers, json=body)
+
+
+def make_client(handler, max_concurrency=8):
+    client = TradierClient(
+        api_key="test", base_url="https://api.tradier.test/v1", max_concurrency=max_concurrency
+    )
+    client._client = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    # Pace on a fake clock so hundreds of mocked requests never sleep for real
+    clock = FakeClock()
+    client._limiter = TokenBucket(client._rpm_limit, clock=clock, sleep=clock.sleep)
+    return client
+
+
+def test_batch_chains_run_concurrently_in_input_order():
+    handler = FakeTradier()
+    client = make_client(handler)
+    pairs = [(f"S{i}", "2030-01-18") for i in range(16)]
+
+    started = time.perf_counter()
+    chains = client.get_options_chains(pairs + pairs[:2])
+    elapsed = time.perf_counter() - started
+
+    assert list(chains) == pairs
+    assert [c["symbol"].iloc[0] for c in chains.values()] == [f"{s}-{e}" for s, e in pairs]
+    assert chains[pairs[0]]["greek_delta"].iloc[0] == 0.5
+    assert handler.peak == 8 and len(handler.paths) == 16
+    # Bounded by concurrency, not 16 sequential round trips
+    assert elapsed < 16 * handler.delay / 2
+
+
+def test_snapshot_chains_for_a_universe():
+    handler = FakeTradier(delay=0.01)
+    client = make_client(handler)
+    symbols = [f"s{i}" for i in range(150)]
+
+    snapshots = client.snapshot_options_chains(symbols, max_expirations=2)
+
+    assert len(snapshots) == 150
+    snapshot = snapshots["S7"]
+    assert snapshot["contract_symbol"].tolist() == ["S7-2030-01-18", "S7-2030-02-15"]
+    assert (snapshot["underlying_price"] == 10.0).all()
+    # Two quote chunks of up to 100 symbols, then per-symbol expirations and chains
+    assert handler.paths.count("/v1/markets/quotes") == 2
+    assert len(handler.paths) == 2 + 150 + 300
+    assert handler.peak > 1
+
+
+def test_snapshot_skips_chain_requests_for_unquoted_symbols():
+    handler = FakeTradier(delay=0.0, unquoted={"S1", "S3"})
+    client = make_client(handler)
+
+    snapshots = client.snapshot_options_chains(["s0", "s1", "s2", "s3"], max_expirations=2)
+
+    assert list(snapshots) == ["S0", "S1", "S2", "S3"]
+    assert snapshots["S1"].empty and snapshots["S3"].empty
+    assert len(snapshots["S0"]) == 2
+    # One quote batch, then expirations and two chains for each quoted symbol only
+    assert len(handler.paths) == 1 + 2 + 4
+
+
+def test_rate_limited_requests_are_retried_after_window():
+    handler = FakeTradier(delay=0.0, rate_limited=1)
+    client = make_client(handler, max_concurrency=1)
+
+    assert client.get_expirations("AAPL") == ["2030-01-18", "2030-02-15", "2030-03-15"]
+    assert len(handler.paths) == 2
+    assert client._limiter._tokens <= 100
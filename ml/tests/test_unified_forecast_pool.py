@@ -0,0 +1,190 @@
+"""
+Tests for the worker-pool mode of UnifiedForecastProcessor.process_universe.
+
+The spawn workers unpickle the fake entry points below by importing this
+module, so it must stay cheap to import: src.unified_forecast_job is only
+imported inside the fixture.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+_started = None
+
+
+def _fake_init_worker(model_type, io_workers, symbol_ids=None, started=None):
+    global _started
+    _started = started
+
+
+def _fake_process_symbol(idx, symbol, force_refresh):
+    _started[idx] = time.time()
+    if symbol == "HANG":
+        time.sleep(120)
+    if symbol == "BOOM":
+        raise RuntimeError("boom")
+    # Later symbols finish first so completion order differs from input order
+    time.sleep(0.4 if idx == 0 else 0.05)
+    result = {
+        "symbol": symbol,
+        "success": True,
+        "error": None,
+        "forecasts": {},
+        "processing_time": 0.1,
+        "feature_cache_hit": True,
+        "weight_source": {},
+    }
+    metrics = {
+        "symbols_processed": 1,
+        "feature_cache_hits": 1,
+        "feature_cache_misses": 0,
+        "forecast_times": [0.1],
+        "weight_sources": {"default": 1, symbol: 1},
+        "db_writes": 2,
+        "errors": [],
+    }
+    return result, metrics
+
+
+def _slow_process_symbol(idx, symbol, force_refresh):
+    _started[idx] = time.time()
+    if symbol == "HANG":
+        time.sleep(120)
+    time.sleep(0.4)
+    result = {"symbol": symbol, "success": True, "error": None, "processing_time": 0.4}
+    return result, {"symbols_processed": 1, "forecast_times": [0.4], "db_writes": 1}
+
+
+def _crashing_process_symbol(idx, symbol, force_refresh):
+    if symbol == "CRASH":
+        _started[idx] = time.time()
+        # Crash while "A" (idx 0, 0.4s) is running so it is caught in the broken pool
+        deadline = time.time() + 10
+        while not _started[0] and time.time() < deadline:
+            time.sleep(0.01)
+        # Kills the worker process, which breaks the pool for every in-flight task
+        os._exit(1)
+    return _fake_process_symbol(idx, symbol, force_refresh)
+
+
+@pytest.fixture(scope="module")
+def ufj(real_settings):
+    from src import unified_forecast_job
+
+    return unified_forecast_job
+
+
+@pytest.fixture
+def processor(ufj, monkeypatch):
+    monkeypatch.setattr(ufj, "db", MagicMock(**{"symbol_registry.snapshot.return_value": {}}))
+    monkeypatch.setattr(ufj, "_init_worker", _fake_init_worker)
+    monkeypatch.setattr(ufj, "_process_symbol_in_worker", _fake_process_symbol)
+    proc = ufj.UnifiedForecastProcessor.__new__(ufj.UnifiedForecastProcessor)
+    proc.model_type = "xgboost"
+    proc.metrics = {
+        "symbols_processed": 0,
+        "feature_cache_hits": 0,
+        "feature_cache_misses": 0,
+        "forecast_times": [],
+        "weight_sources": {"default": 3},
+        "db_writes": 0,
+        "errors": [],
+    }
+    proc._io_executor = None
+    proc._pending_writes = []
+    return proc
+
+
+def _run(processor, symbols, timeout=30.0, workers=2):
+    return processor._process_symbols_parallel(
+        symbols, force_refresh=False, max_workers=workers, io_workers=0, symbol_timeout=timeout
+    )
+
+
+def test_parallel_results_keep_input_order_and_merge_metrics(processor):
+    symbols = ["AAPL", "MSFT", "BOOM", "NVDA"]
+    results = _run(processor, symbols)
+
+    assert [r["symbol"] for r in results] == symbols
+    assert [r["success"] for r in results] == [True, True, False, True]
+    assert "boom" in results[2]["error"]
+
+    metrics = processor.metrics
+    assert metrics["symbols_processed"] == 4
+    assert metrics["db_writes"] == 6
+    assert metrics["feature_cache_hits"] == 3
+    assert metrics["weight_sources"]["default"] == 6
+    assert metrics["weight_sources"]["MSFT"] == 1
+    assert [e["symbol"] for e in metrics["errors"]] == ["BOOM"]
+
+
+def test_timeout_terminates_hung_worker_without_starving_the_queue(ufj, processor, monkeypatch):
+    monkeypatch.setattr(ufj, "_process_symbol_in_worker", _slow_process_symbol)
+    symbols = ["HANG", "A", "B", "C", "D"]
+
+    started = time.time()
+    results = _run(processor, symbols, timeout=1.0)
+    elapsed = time.time() - started
+
+    assert [r["symbol"] for r in results] == symbols
+    assert results[0]["error"] == "timeout"
+    # Four 0.4s symbols behind the hung one exceed 1s of wall time in total, but
+    # each deadline starts when the symbol starts, so none is falsely timed out
+    assert all(r["success"] for r in results[1:])
+    assert elapsed < 30
+    # The hung worker was terminated rather than left holding a pool slot
+    assert not multiprocessing.active_children()
+
+
+def test_deferred_writes_count_only_after_completion(processor):
+    def ok(**kwargs):
+        time.sleep(0.05)
+
+    def fail(**kwargs):
+        raise RuntimeError("write rejected")
+
+    processor._io_executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        processor._submit_write("1D", "saved 1D", ok, symbol_id="x")
+        processor._submit_write("5D", "saved 5D", fail, symbol_id="x")
+        assert processor.metrics["db_writes"] == 0
+
+        failed = processor._drain_writes("AAPL")
+    finally:
+        processor._io_executor.shutdown()
+
+    assert failed == ["5D"]
+    assert processor.metrics["db_writes"] == 1
+    assert processor.metrics["errors"][-1]["horizon"] == "5D"
+    assert processor._pending_writes == []
+
+
+def test_inline_write_counts_and_propagates(processor):
+    processor._submit_write("1D", "saved", lambda **kwargs: None)
+    assert processor.metrics["db_writes"] == 1
+
+    def fail(**kwargs):
+        raise RuntimeError("write rejected")
+
+    with pytest.raises(RuntimeError):
+        processor._submit_write("1D", "saved", fail)
+    assert processor.metrics["db_writes"] == 1
+
+
+def test_broken_pool_retries_in_flight_symbols_and_fails_the_crasher(ufj, processor, monkeypatch):
+    monkeypatch.setattr(ufj, "_process_symbol_in_worker", _crashing_process_symbol)
+    symbols = ["A", "CRASH", "B", "C"]
+
+    results = _run(processor, symbols)
+
+    assert [r["symbol"] for r in results] == symbols
+    assert [r["success"] for r in results] == [True, False, True, True]
+    assert results[1]["error"] == "worker crashed"
+    assert processor.metrics["symbols_processed"] == 4
+    assert [e["symbol"] for e in processor.metrics["errors"]] == ["CRASH"]
+    assert not multiprocessing.active_children()
@@ -0,0 +1,26 @@
+-- Migration: Incremental indicator state
+-- Purpose: Carry-forward state (EMA/Wilder smoothers, SuperTrend bands, OHLCV tail)
+-- that lets fetch_or_build_features extend indicator_values with only the bars
+-- that arrived since the last write instead of recomputing the full history.
+
+CREATE TABLE IF NOT EXISTS indicator_state (
+    symbol_id UUID NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    timeframe VARCHAR(10) NOT NULL,
+    last_ts TIMESTAMPTZ,
+    state JSONB NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    CONSTRAINT indicator_state_pkey PRIMARY KEY (symbol_id, timeframe)
+);
+
+ALTER TABLE indicator_state ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role manages indicator_state"
+ON indicator_state FOR ALL
+USING (auth.role() = 'service_role');
+
+COMMENT ON TABLE indicator_state IS
+'Incremental indicator state per symbol/timeframe. Written by forecast jobs; safe to truncate (forces a full rebuild).';
+
+COMMENT ON COLUMN indicator_state.state IS
+'Serialized src.features.incremental_indicators.IndicatorState';
@@ -0,0 +1,244 @@
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import psycopg2
+import psycopg2.pool
+
+from main_production_system.data_infrastructure.timescale_fetcher import (
+    FEATURE_COLUMNS,
+    OHLCV_COLUMNS,
+    TimescaleDBFetcher,
+)
+
+EST = timezone(timedelta(hours=-5))
+EDT = timezone(timedelta(hours=-4))
+
+
+def _candles(symbol, count, start=datetime(2024, 3, 1, 16, tzinfo=EST), features=True):
+    rows = []
+    for i in range(count):
+        # Crosses the March DST change, so offsets differ between rows
+        ts = start + timedelta(days=i)
+        if ts.date() >= datetime(2024, 3, 10).date():
+            ts = ts.astimezone(EDT)
+        close = 100.0 + i
+        ohlcv = (ts, close - 0.5, close + 1.0, close - 1.0, close, 1000.0 + i)
+        feature_values = tuple(float(i) for _ in FEATURE_COLUMNS)
+        if not features or i == 0:
+            feature_values = (None,) * len(FEATURE_COLUMNS)
+        rows.append((symbol,) + ohlcv + feature_values)
+    return rows
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        db = self.conn.db
+        db.queries.append((query, params))
+        if db.errors:
+            error = db.errors.pop(0)
+            if error is not None:
+                if isinstance(error, psycopg2.OperationalError):
+                    self.conn.closed = 1
+                raise error
+        with_features = "features_" in query
+        columns = ["symbol"] + OHLCV_COLUMNS + (FEATURE_COLUMNS if with_features else [])
+        symbols, limit = params
+        rows = []
+        for symbol in sorted(symbols):
+            candles = db.candles.get(symbol, [])[-limit:]
+            rows.extend(row[: len(columns)] for row in candles)
+        self.description = [(name,) for name in columns]
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.autocommit = False
+        self.closed = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakePool:
+    """ThreadedConnectionPool stand-in: raises PoolError once every connection is out."""
+
+    def __init__(self, size, candles=None, errors=None, hold=0.0):
+        self.size = size
+        self.candles = candles or {}
+        self.errors = list(errors or [])
+        self.hold = hold
+        self.queries = []
+        self.closed = False
+        self.in_use = 0
+        self.peak = 0
+        self.discarded = 0
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        with self._lock:
+            if self.in_use >= self.size:
+                raise psycopg2.pool.PoolError("connection pool exhausted")
+            self.in_use += 1
+            self.peak = max(self.peak, self.in_use)
+        time.sleep(self.hold)
+        return FakeConnection(self)
+
+    def putconn(self, conn, close=False):
+        with self._lock:
+            self.in_use -= 1
+            self.discarded += bool(close)
+
+    def closeall(self):
+        self.closed = True
+
+
+def make_fetcher(pool):
+    fetcher = TimescaleDBFetcher(max_connections=pool.size)
+    fetcher._pool = pool
+    return fetcher
+
+
+def test_batch_splits_rows_per_symbol():
+    pool = FakePool(2, candles={"AAPL": _candles("AAPL", 20), "MSFT": _candles("MSFT", 5)})
+    fetcher = make_fetcher(pool)
+
+    results = fetcher.fetch_ohlcv_batch(["msft", "AAPL", "NVDA"], candle_count=12)
+
+    assert list(results) == ["msft", "AAPL", "NVDA"]
+    assert len(pool.queries) == 1
+    assert pool.queries[0][1] == (["MSFT", "AAPL", "NVDA"], 12)
+
+    aapl, aapl_features = results["AAPL"]
+    assert list(aapl.columns) == OHLCV_COLUMNS
+    assert aapl["close"].tolist() == [100.0 + i for i in range(8, 20)]
+    assert len(aapl_features) == 12
+    assert list(aapl_features.columns) == ["time"] + FEATURE_COLUMNS
+
+    msft, msft_features = results["msft"]
+    assert len(msft) == 5
+    # The first candle has no indicator row
+    assert msft_features["time"].tolist() == msft["time"].iloc[1:].tolist()
+
+
+def test_symbols_without_rows_get_empty_frames():
+    fetcher = make_fetcher(FakePool(1, candles={"AAPL": _candles("AAPL", 3)}))
+
+    results = fetcher.fetch_ohlcv_batch(["AAPL", "ZZZZ"])
+    ohlcv, features = results["ZZZZ"]
+    assert ohlcv.empty and list(ohlcv.columns) == OHLCV_COLUMNS
+    assert features is None
+
+    results = fetcher.fetch_ohlcv_batch(["QQQQ"])
+    assert results["QQQQ"][0].empty
+
+
+def test_mixed_utc_offsets_parse_to_utc():
+    fetcher = make_fetcher(FakePool(1, candles={"SPY": _candles("SPY", 15)}))
+
+    ohlcv, _ = fetcher.fetch_ohlcv_batch(["SPY"])["SPY"]
+
+    assert str(ohlcv["time"].dt.tz) == "UTC"
+    assert (ohlcv["time"].dt.hour == 21).all()
+    assert ohlcv["time"].is_monotonic_increasing
+
+
+def test_features_failure_falls_back_to_ohlcv_only():
+    error = psycopg2.ProgrammingError('relation "features_1d" does not exist')
+    pool = FakePool(1, candles={"AAPL": _candles("AAPL", 4)}, errors=[error])
+    fetcher = make_fetcher(pool)
+
+    ohlcv, features = fetcher.fetch_ohlcv_batch(["AAPL"])["AAPL"]
+
+    assert len(ohlcv) == 4 and features is None
+    assert ["features_" in query for query, _ in pool.queries] == [True, False]
+
+
+def test_dropped_connection_is_discarded_and_retried():
+    error = psycopg2.OperationalError("server closed the connection unexpectedly")
+    pool = FakePool(1, candles={"AAPL": _candles("AAPL", 4)}, errors=[error])
+    fetcher = make_fetcher(pool)
+
+    ohlcv, features = fetcher.fetch_ohlcv_batch(["AAPL"])["AAPL"]
+
+    assert len(ohlcv) == 4 and len(features) == 3
+    assert len(pool.queries) == 2
+    assert pool.discarded == 1
+    assert pool.in_use == 0
+
+
+def test_second_dropped_connection_returns_empty_frames():
+    errors = [psycopg2.OperationalError("connection lost")] * 2
+    pool = FakePool(1, candles={"AAPL": _candles("AAPL", 4)}, errors=errors)
+
+    ohlcv, features = make_fetcher(pool).fetch_ohlcv_batch(["AAPL"])["AAPL"]
+
+    assert ohlcv.empty and features is None
+    assert len(pool.queries) == 2
+
+
+def test_pool_error_is_not_mistaken_for_a_features_failure(monkeypatch):
+    pool = FakePool(1, candles={"AAPL": _candles("AAPL", 4)})
+    fetcher = make_fetcher(pool)
+
+    attempts = []
+
+    def exhausted():
+        attempts.append(1)
+        raise psycopg2.pool.PoolError("connection pool exhausted")
+
+    monkeypatch.setattr(pool, "getconn", exhausted)
+    ohlcv, features = fetcher.fetch_ohlcv_batch(["AAPL"])["AAPL"]
+
+    assert ohlcv.empty and features is None
+    # Not retried as an OHLCV-only query
+    assert len(attempts) == 1
+
+
+def test_concurrent_fetches_wait_for_a_free_connection():
+    pool = FakePool(2, candles={"AAPL": _candles("AAPL", 4)}, hold=0.05)
+    fetcher = make_fetcher(pool)
+    results = []
+
+    def fetch():
+        results.append(fetcher.fetch_ohlcv_batch(["AAPL"])["AAPL"])
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.peak == 2
+    assert all(len(ohlcv) == 4 for ohlcv, _ in results) and len(results) == 8
+
+
+def test_unsupported_timeframe_and_empty_symbol_list_skip_the_query():
+    pool = FakePool(1)
+    fetcher = make_fetcher(pool)
+
+    assert fetcher.fetch_ohlcv_batch(["AAPL"], timeframe="5m")["AAPL"][0].empty
+    assert fetcher.fetch_ohlcv_batch([]) == {}
+    assert pool.queries == []